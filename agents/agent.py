@@ -11,7 +11,6 @@ from dotenv import load_dotenv
 from livekit import agents, rtc
 from livekit.agents import AgentSession, Agent, RoomInputOptions, RoomOutputOptions
 from livekit.agents.voice import VoiceAgent
-from livekit.plugins import openai, silero, deepgram
 
 from tools.lead_tools import get_lead_context, update_disposition, log_communication
 from tools.callback_tools import schedule_callback
@@ -32,6 +31,10 @@ class DailyEventInsuranceAgent(VoiceAgent):
         self.call_transcript = []
         self.sentiment_scores = []
 
+        # Plugins are imported in the job process that uses them, so the
+        # worker's main process registers without loading them
+        from livekit.plugins import deepgram, openai, silero
+
         super().__init__(
             instructions=get_system_prompt(),
             stt=deepgram.STT(
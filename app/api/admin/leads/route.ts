@@ -1,7 +1,7 @@
 import { NextRequest } from "next/server"
 import { requireAdmin, withAuth } from "@/lib/api-auth"
 import { db, isDbConfigured, leads } from "@/lib/db"
-import { eq, and, ilike, or, desc, asc, count } from "drizzle-orm"
+import { eq, and, gt, ilike, or, desc, asc, count } from "drizzle-orm"
 import { isDevMode } from "@/lib/mock-data"
 import {
   successResponse,
@@ -36,7 +36,8 @@ const createLeadSchema = z.object({
 
 /**
  * GET /api/admin/leads
- * List leads with filtering and pagination
+ * List leads with filtering and pagination. `updatedSince` (ISO timestamp)
+ * lists only leads updated after it, for the voice agent's change feeds.
  */
 export async function GET(request: NextRequest) {
   return withAuth(async () => {
@@ -53,6 +54,11 @@ export async function GET(request: NextRequest) {
       const businessType = searchParams.get("businessType") || ""
       const sortBy = searchParams.get("sortBy") || "createdAt"
       const sortOrder = searchParams.get("sortOrder") || "desc"
+      const updatedSince = searchParams.get("updatedSince") ? new Date(searchParams.get("updatedSince")!) : null
+
+      if (updatedSince && isNaN(updatedSince.getTime())) {
+        return validationError("Invalid updatedSince timestamp")
+      }
 
       if (isDevMode || !isDbConfigured()) {
         let filtered = [...mockLeads]
@@ -71,6 +77,8 @@ export async function GET(request: NextRequest) {
         if (source) filtered = filtered.filter(l => l.source === source)
         if (interestLevel) filtered = filtered.filter(l => l.interestLevel === interestLevel)
         if (businessType) filtered = filtered.filter(l => l.businessType === businessType)
+        // Mock leads are never edited, so they were last updated when created
+        if (updatedSince) filtered = filtered.filter(l => new Date(l.createdAt) > updatedSince)
 
         filtered.sort((a, b) => {
           const aVal = a[sortBy as keyof typeof a] ?? ""
@@ -99,6 +107,7 @@ export async function GET(request: NextRequest) {
       if (source) conditions.push(eq(leads.source, source))
       if (interestLevel) conditions.push(eq(leads.interestLevel, interestLevel))
       if (businessType) conditions.push(eq(leads.businessType, businessType))
+      if (updatedSince) conditions.push(gt(leads.updatedAt, updatedSince))
 
       const whereClause = conditions.length > 0 ? and(...conditions) : undefined
 
@@ -1,12 +1,13 @@
 import { NextRequest } from "next/server"
 import { requireAdmin, withAuth } from "@/lib/api-auth"
 import { db, isDbConfigured, partners, policies, partnerTierOverrides, commissionTiers } from "@/lib/db"
-import { eq, sql, count, desc, asc, ilike, or, and } from "drizzle-orm"
+import { eq, sql, count, desc, asc, gt, ilike, or, and } from "drizzle-orm"
 import { isDevMode } from "@/lib/mock-data"
 import {
   successResponse,
   paginatedResponse,
   serverError,
+  validationError,
 } from "@/lib/api-responses"
 
 // Mock data for development
@@ -22,7 +23,9 @@ const mockPartners = [
 
 /**
  * GET /api/admin/partners
- * List all partners with filtering and pagination
+ * List all partners with filtering and pagination. `updatedSince` (ISO
+ * timestamp) lists only partners updated after it, for the voice agent's
+ * change feeds.
  */
 export async function GET(request: NextRequest) {
   return withAuth(async () => {
@@ -36,6 +39,11 @@ export async function GET(request: NextRequest) {
       const status = searchParams.get("status") || ""
       const sortBy = searchParams.get("sortBy") || "createdAt"
       const sortOrder = searchParams.get("sortOrder") || "desc"
+      const updatedSince = searchParams.get("updatedSince") ? new Date(searchParams.get("updatedSince")!) : null
+
+      if (updatedSince && isNaN(updatedSince.getTime())) {
+        return validationError("Invalid updatedSince timestamp")
+      }
 
       // Dev mode - return mock data
       if (isDevMode || !isDbConfigured()) {
@@ -56,6 +64,11 @@ export async function GET(request: NextRequest) {
           filtered = filtered.filter(p => p.status === status)
         }
 
+        // Apply change feed filter
+        if (updatedSince) {
+          filtered = filtered.filter(p => new Date(p.updatedAt) > updatedSince)
+        }
+
         // Apply sorting
         filtered.sort((a, b) => {
           const aVal = a[sortBy as keyof typeof a] ?? ""
@@ -90,6 +103,10 @@ export async function GET(request: NextRequest) {
         conditions.push(eq(partners.status, status))
       }
 
+      if (updatedSince) {
+        conditions.push(gt(partners.updatedAt, updatedSince))
+      }
+
       const whereClause = conditions.length > 0 ? and(...conditions) : undefined
 
       // Get total count
@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from "next/server"
 import { db, scheduledActions, leads } from "@/lib/db"
-import { eq, lte, and } from "drizzle-orm"
+import { eq, lte, and, notInArray } from "drizzle-orm"
 import { successResponse, serverError, unauthorizedError } from "@/lib/api-responses"
 
 /**
@@ -23,6 +23,17 @@ import { successResponse, serverError, unauthorizedError } from "@/lib/api-respo
  * Security: Requires CRON_SECRET in Authorization header
  */
 
+/**
+ * Action types run by the voice agent's scheduled actions executor
+ * (livekit-agent/scheduler.py). The cron leaves them alone, so an action is
+ * never processed twice or marked completed by the placeholder handlers below.
+ * Set SCHEDULED_ACTIONS_EXECUTOR_TYPES="" to process every type here again.
+ */
+const EXECUTOR_ACTION_TYPES = (process.env.SCHEDULED_ACTIONS_EXECUTOR_TYPES ?? "call,sms")
+  .split(",")
+  .map((type) => type.trim())
+  .filter(Boolean)
+
 interface ProcessingResult {
   actionId: string
   actionType: string
@@ -168,18 +179,25 @@ async function processEmailAction(
  */
 async function processAction(
   action: typeof scheduledActions.$inferSelect
-): Promise<ProcessingResult> {
+): Promise<ProcessingResult | null> {
   const currentAttempts = (action.attempts || 0) + 1
   const maxAttempts = action.maxAttempts || 3
 
+  // Claim: only a still-pending row moves to processing, so a row another
+  // processor claimed in the meantime is skipped
+  const claimed = await db!.update(scheduledActions)
+    .set({
+      status: "processing",
+      attempts: currentAttempts,
+    })
+    .where(and(eq(scheduledActions.id, action.id), eq(scheduledActions.status, "pending")))
+    .returning({ id: scheduledActions.id })
+  if (claimed.length === 0) {
+    console.log(`[ProcessActions] Action ${action.id} was claimed elsewhere, skipping`)
+    return null
+  }
+
   try {
-    // Mark as processing
-    await db!.update(scheduledActions)
-      .set({
-        status: "processing",
-        attempts: currentAttempts,
-      })
-      .where(eq(scheduledActions.id, action.id))
 
     // Fetch lead details for processing
     const leadResult = await db!.select()
@@ -344,7 +362,10 @@ export async function GET(request: NextRequest) {
       .where(
         and(
           eq(scheduledActions.status, "pending"),
-          lte(scheduledActions.scheduledFor, now)
+          lte(scheduledActions.scheduledFor, now),
+          EXECUTOR_ACTION_TYPES.length > 0
+            ? notInArray(scheduledActions.actionType, EXECUTOR_ACTION_TYPES)
+            : undefined
         )
       )
       .limit(100) // Process in batches to avoid timeout
@@ -370,7 +391,9 @@ export async function GET(request: NextRequest) {
     const results: ProcessingResult[] = []
     for (const action of pendingActions) {
       const result = await processAction(action)
-      results.push(result)
+      if (result) {
+        results.push(result)
+      }
     }
 
     // Calculate summary
@@ -1,6 +1,7 @@
 """
 Daily Event Insurance Voice Agent
-B2B Partnership Sales Agent using LiveKit + OpenAI Realtime API
+B2B Partnership Sales Agent using LiveKit + OpenAI (realtime, hybrid or cascade
+pipeline, see agent_core.py)
 
 Sarah - Partnership Development Specialist
 Helps gyms, climbing facilities, and rental businesses offer same-day insurance coverage.
@@ -17,113 +18,37 @@ from typing import Optional
 
 from livekit.agents import (
     Agent,
-    AgentSession,
     AutoSubscribe,
+    BackgroundAudioPlayer,
     JobContext,
     WorkerOptions,
     cli,
 )
-from livekit.plugins import openai
-from openai.types.realtime import realtime_audio_input_turn_detection
-
-from workflow import init_workflow, ALL_TOOLS
-from livekit.agents.llm import ToolContext
+from workflow import (
+    ALL_TOOLS,
+    detect_business_type,
+    init_workflow,
+    speculate_lead_context,
+    speculate_recommended_script,
+    speculator,
+)
+from agent_core import build_session, parse_metadata, prewarm, resolve_mode, start_worker_services
+from callerid import caller_ids, identify_caller
+from context_window import ContextWindow
+from dnc import dnc_index
+from fillers import filler_player
+from funnel import funnel
+from prompts import PROMPTS
+from resilience import backend_guards
+from shared_cache import shared_cache
+from startup import startup
+from tts_cache import CachedAudio, audio_cache
+from utterances import FIXED_UTTERANCES, SALES_VOICE, sales_greeting
+from warmup import CallAnswer, start_before_answer
 
 logger = logging.getLogger("daily-event-insurance-agent")
 logging.basicConfig(level=logging.INFO)
 
-# =============================================================================
-# SYSTEM PROMPT - Daily Event Insurance B2B Partnership Sales
-# =============================================================================
-
-SYSTEM_PROMPT = """You are Sarah, a Partnership Development Specialist at Daily Event Insurance.
-You help gyms, climbing facilities, rental businesses, and adventure companies offer same-day
-liability insurance coverage to their members - creating a new revenue stream with zero overhead.
-
-## YOUR ROLE
-- You're calling leads who inquired about our B2B embedded insurance platform
-- Your goal: Qualify the lead, understand their business, and schedule a demo or send a proposal
-- You are NOT selling insurance to consumers - you're selling a PARTNERSHIP to business owners
-
-## COMPANY VALUE PROPOSITION
-Daily Event Insurance is an embedded insurance platform that lets businesses:
-- Offer same-day liability coverage to members/visitors ($5-15/day)
-- Earn 15-25% commission on every policy sold
-- Zero implementation cost - we handle everything
-- Setup takes only 2-3 hours, then it's fully automated
-- Reduces claims against their existing liability policy
-
-## BUSINESS TYPES WE SERVE
-| Type | Key Value |
-|------|-----------|
-| Gyms | Day-pass and drop-in coverage for non-members |
-| Climbing Gyms | First-timer and visitor accident protection |
-| Equipment Rental | Equipment damage + injury coverage bundled |
-| Adventure/Outdoor | High-risk activity coverage on demand |
-
-## YOUR SCRIPT FLOW
-
-### 1. Opening (Warm, Professional)
-"Hi [NAME], this is Sarah calling from Daily Event Insurance. You recently submitted an inquiry
-about offering insurance coverage at [BUSINESS NAME]. Do you have a quick moment?"
-
-### 2. Discovery (Get These 4 Items)
-- Business name and type (gym, climbing, rental, etc.)
-- Number of locations / estimated daily visitors
-- Current insurance situation (existing coverage? gaps?)
-- Timeline / urgency
-
-### 3. Qualification & Value
-"Based on what you've shared, our embedded coverage solution could be a great fit.
-Partners like yours typically see [benefit for their business type]."
-
-### 4. Next Step
-- If Qualified & Ready: "Let me schedule a quick 15-minute demo to show you exactly how this works..."
-- If Interested, Not Ready: "I'll send you our partner overview with pricing. When would be a good time for a follow-up call?"
-- If Not a Fit: "I appreciate you reaching out. Based on [reason], we may not be the best fit right now."
-
-### 5. Close
-"You'll receive a confirmation email shortly. Is there anything else I can help you with today?"
-
-## OBJECTION HANDLING
-
-**"We already have insurance"**
-> "That's great - liability coverage is essential. What we offer is different. This is participant
-> accident coverage that your members purchase themselves. It actually protects YOUR insurance by
-> reducing claims against your policy. Many partners see it as an additional revenue stream."
-
-**"Our members won't pay for it"**
-> "I understand that concern. When coverage is optional and affordable - $5-15 per session - members
-> who want extra protection are happy to pay. It's especially popular with first-timers and visitors."
-
-**"We don't have time to implement"**
-> "That's exactly why we built this to be hands-off. Setup takes about 2-3 hours with our team
-> handling most of the technical work. After that, it runs automatically with no daily work."
-
-**"What does it cost?"**
-> "There's no cost to your business - we handle all the insurance and administration. You actually
-> earn a commission on each policy sold. For members, coverage starts at around $5 per day."
-
-**"Send me some information"**
-> "Happy to! Before I do, what specific information would be most helpful? Also, when would be
-> a good time for a quick follow-up call to answer any questions?"
-
-## COMPLIANCE RULES
-- You are NOT a licensed insurance agent - do not provide insurance advice
-- If asked about specific coverage limits, exclusions, or claims, say:
-  "That's a great question. Let me have one of our licensed specialists follow up with you."
-- Never disparage competitors
-- Honor Do Not Call requests immediately
-
-## TONE & STYLE
-- Warm, professional, confident (not pushy)
-- Keep responses SHORT (1-2 sentences when possible)
-- Use natural language: "gotcha", "totally", "for sure"
-- Match the prospect's energy level
-- Be helpful, not salesy
-"""
-
-
 # =============================================================================
 # AGENT CLASS
 # =============================================================================
@@ -140,8 +65,20 @@ class DailyEventInsuranceAgent(Agent):
         lead_name: Optional[str] = None,
         business_name: Optional[str] = None,
         call_direction: str = "outbound",
+        greeting_audio: Optional[asyncio.Future] = None,
+        answer: Optional[CallAnswer] = None,
     ):
-        super().__init__(instructions=SYSTEM_PROMPT)
+        # Per-call details go after the static prompt so its prefix stays cacheable
+        super().__init__(
+            instructions=PROMPTS.render(
+                "sales",
+                {
+                    "Lead name": lead_name if lead_name != "there" else None,
+                    "Business": business_name if business_name != "your business" else None,
+                    "Call direction": call_direction,
+                },
+            )
+        )
 
         self.lead_id = lead_id
         self.lead_name = lead_name or "there"
@@ -149,35 +86,46 @@ class DailyEventInsuranceAgent(Agent):
         self.call_direction = call_direction
         self.call_start_time = datetime.utcnow()
 
+        # Opening line and its audio, synthesized while the phone rings
+        self.greeting = sales_greeting(call_direction, self.lead_name, self.business_name)
+        self.greeting_audio = greeting_audio
+        self.greeting_path: Optional[str] = None
+        self.answer = answer
+
         logger.info(
             f"Agent initialized: lead_id={lead_id}, lead_name={lead_name}, "
             f"business={business_name}, direction={call_direction}"
         )
 
+    def ready_greeting_audio(self) -> Optional[CachedAudio]:
+        """The pre-synthesized greeting, if it finished before pickup."""
+        task = self.greeting_audio
+        if task is None or not task.done() or task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
     async def on_enter(self):
-        """Called when the agent session starts - generate appropriate greeting."""
+        """Called when the agent session starts - play or generate the greeting once answered."""
 
+        # The session starts while the phone is still ringing
+        if self.answer is not None and not await self.answer.wait():
+            return
+
+        audio = self.ready_greeting_audio()
+        if audio is not None:
+            self.greeting_path = "presynthesized"
+            logger.info(f"Playing pre-synthesized greeting for {self.call_direction} call")
+            self.session.say(self.greeting, audio=audio.aframes())
+            return
+
+        # Not ready in time - let the model speak it live
+        self.greeting_path = "live"
         if self.call_direction == "outbound" and self.lead_name != "there":
-            # Outbound call with lead context - personalized greeting
-            greeting_instruction = (
-                f"Greet {self.lead_name} warmly. Say: 'Hi {self.lead_name}, this is Sarah "
-                f"calling from Daily Event Insurance. You recently submitted an inquiry about "
-                f"offering insurance coverage at {self.business_name}. Do you have a quick moment?'"
-            )
+            greeting_instruction = f"Greet {self.lead_name} warmly. Say: '{self.greeting}'"
         elif self.call_direction == "outbound":
-            # Outbound call without full context
-            greeting_instruction = (
-                "Introduce yourself warmly. Say: 'Hi, this is Sarah calling from Daily Event "
-                "Insurance. We help gyms, climbing facilities, and rental businesses offer "
-                "same-day insurance to their members. I'm following up on an inquiry we received. "
-                "Do you have a quick moment?'"
-            )
+            greeting_instruction = f"Introduce yourself warmly. Say: '{self.greeting}'"
         else:
-            # Inbound call - they're calling us
-            greeting_instruction = (
-                "Greet the caller warmly. Say: 'Thank you for calling Daily Event Insurance! "
-                "This is Sarah. How can I help you today?'"
-            )
+            greeting_instruction = f"Greet the caller warmly. Say: '{self.greeting}'"
 
         logger.info(f"Generating greeting for {self.call_direction} call")
         self.session.generate_reply(instructions=greeting_instruction)
@@ -190,75 +138,134 @@ class DailyEventInsuranceAgent(Agent):
 async def entrypoint(ctx: JobContext):
     """Main entry point for the voice agent."""
 
+    startup.mark("job started")
     logger.info(f"Agent starting for room: {ctx.room.name}")
 
     # Connect to the room with audio subscription
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
     # Extract metadata from job context
-    room_metadata = ctx.job.metadata if ctx.job.metadata else {}
+    room_metadata = parse_metadata(ctx.job.metadata)
+    mode = resolve_mode(room_metadata)
     lead_id = room_metadata.get("lead_id")
     lead_name = room_metadata.get("lead_name", "there")
     business_name = room_metadata.get("business_name", "your business")
     call_direction = room_metadata.get("direction", "outbound")
 
+    # Inbound calls carry no lead ID: look the caller's number up instead
+    if not lead_id:
+        caller = await identify_caller(ctx)
+        if caller is not None:
+            call_direction = room_metadata.get("direction", "inbound")
+            if caller.kind == "lead":
+                lead_id = caller.id
+
     logger.info(
         f"Lead context: id={lead_id}, name={lead_name}, "
-        f"business={business_name}, direction={call_direction}"
+        f"business={business_name}, direction={call_direction}, mode={mode.value}"
     )
 
-    # Wait for participant to join
-    participant = await ctx.wait_for_participant()
-    logger.info(f"Participant joined: {participant.identity}")
-
     # Initialize the workflow state with lead context
     init_workflow(
         lead_id=lead_id,
         api_base_url=os.getenv("API_BASE_URL", "http://localhost:3000"),
         api_key=os.getenv("AGENT_API_KEY", ""),
+        script_id=room_metadata.get("script_id"),
     )
 
-    # Create tool context with all workflow tools
-    tool_ctx = ToolContext(ALL_TOOLS)
+    # The lead ID is known now, so fetch the lead while the phone rings
+    speculate_lead_context()
 
-    # Create the OpenAI Realtime model for lowest-latency voice interaction
-    realtime_model = openai.realtime.RealtimeModel(
-        model="gpt-4o-realtime-preview",
-        voice="coral",  # Warm, professional female voice
-        modalities=["audio", "text"],
-        input_audio_transcription=openai.realtime.AudioTranscription(
-            model="gpt-4o-transcribe",
-        ),
-        turn_detection=realtime_audio_input_turn_detection.SemanticVad(
-            type="semantic_vad",
-            eagerness="auto",
-            create_response=True,
-            interrupt_response=True,
-        ),
+    # The greeting only depends on metadata - synthesize it during ring time too.
+    # A greeting with the lead's name is never reused and is personal data, so
+    # it stays in memory for this call instead of going into the disk cache
+    greeting = sales_greeting(call_direction, lead_name, business_name)
+    greeting_audio = asyncio.ensure_future(
+        audio_cache.presynthesize(greeting, SALES_VOICE, store=(greeting, SALES_VOICE) in FIXED_UTTERANCES)
     )
 
+    def on_greeting_synthesized(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Greeting pre-synthesis failed, will generate live: {task.exception()}")
+
+    greeting_audio.add_done_callback(on_greeting_synthesized)
+
+    # Keep the chat context bounded on long calls
+    context_window = ContextWindow()
+
+    # Report per-endpoint breaker state, hedge win rates, speculation hit rate,
+    # filler usage and context compaction when the call ends, and flush the
+    # call's funnel counts
+    async def log_backend_metrics():
+        logger.info(f"Backend endpoint metrics: {backend_guards.metrics()}")
+        speculator.close()
+        logger.info(f"Speculation metrics: {speculator.metrics()}")
+        logger.info(f"Shared cache metrics: {shared_cache.metrics()}")
+        logger.info(f"Caller ID metrics: {caller_ids.metrics()}")
+        logger.info(f"DNC index metrics: {dnc_index.metrics()}")
+        await funnel.flush()
+        logger.info(f"Funnel metrics: {funnel.metrics()}")
+        filler_player.detach()
+        logger.info(f"Filler metrics: {filler_player.metrics()}")
+        context_window.detach()
+        logger.info(f"Context window metrics: {context_window.metrics()}")
+
+    ctx.add_shutdown_callback(log_backend_metrics)
+
+    answer = CallAnswer()
+
     # Create the agent instance with lead context
     agent = DailyEventInsuranceAgent(
         lead_id=lead_id,
         lead_name=lead_name,
         business_name=business_name,
         call_direction=call_direction,
+        greeting_audio=greeting_audio,
+        answer=answer,
     )
 
-    # Create and start the agent session
-    session = AgentSession(
-        llm=realtime_model,
-        fnc_ctx=tool_ctx,  # Attach workflow tools
-    )
+    # Create the agent session with all workflow tools in the selected pipeline mode
+    session = build_session(mode, SALES_VOICE, tools=ALL_TOOLS, vad_model=ctx.proc.userdata.get("vad"))
+
+    # Precompute talking points as soon as the prospect names their business type
+    @session.on("user_input_transcribed")
+    def on_user_input_transcribed(event):
+        if event.is_final:
+            business_type = detect_business_type(event.transcript)
+            if business_type:
+                speculate_recommended_script(business_type)
+
+    answer.track_first_audio(session, lambda: f"{agent.greeting_path} greeting")
+    context_window.attach(session, agent)
+
+    # Acknowledge slow tool calls on a separate track instead of leaving silence
+    background_audio = BackgroundAudioPlayer()
+    await background_audio.start(room=ctx.room)
+    filler_player.reset()
+    filler_player.attach(background_audio, SALES_VOICE, session)
+
+    # Post-call analysis of the full transcript (session history is never compacted)
+    async def analyze_call():
+        from analysis import AnalysisWorker
+
+        transcript = "".join(
+            f"{item.role}: {item.text_content}\n"
+            for item in session.history.items
+            if item.type == "message" and item.role in ("user", "assistant") and item.text_content
+        )
+        if transcript.strip():
+            await AnalysisWorker().analyze_call(ctx.job.id, transcript)
+        else:
+            logger.warning("No transcript to analyze.")
 
     logger.info("Starting voice agent session...")
 
-    await session.start(
-        room=ctx.room,
-        agent=agent,
-        participant=participant,
-    )
+    # Open and configure the model connection while the phone rings
+    participant = await start_before_answer(ctx, session, agent, answer)
+    if participant is None:
+        return
 
+    ctx.add_shutdown_callback(analyze_call)
     logger.info("Voice agent session started successfully")
 
 
@@ -277,11 +284,15 @@ if __name__ == "__main__":
     print("  Daily Event Insurance Voice Agent")
     print("  B2B Partnership Sales - Sarah")
     print("=" * 60)
+    startup.worker_starting()
+
+    start_worker_services()
 
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
             request_fnc=request_fnc,
+            prewarm_fnc=prewarm,
             agent_name="daily-event-insurance",
         ),
     )
@@ -0,0 +1,256 @@
+"""
+Daily Event Insurance - Agent Core
+One place that builds the voice pipeline, so the mode is a runtime setting.
+
+Each entrypoint used to construct its own models, and each did it a little
+differently (and some with APIs that no longer exist), which made it
+impossible to compare latency fairly. Every entrypoint now builds its
+`AgentSession` here, in one of three modes:
+
+- realtime: speech-to-speech with the OpenAI Realtime model
+- hybrid: the Realtime model listens and answers in text, a separate TTS speaks
+- cascade: STT -> LLM -> TTS, turns segmented by Silero VAD
+
+The mode comes from the job metadata (`"mode"`), then the `AGENT_MODE`
+environment variable, then the entrypoint's default. Agents, tools and
+prompts do not depend on the mode.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from livekit.agents import AgentSession, JobProcess, llm
+from livekit.agents.stt import STT
+from livekit.agents.tts import TTS
+from livekit.agents.vad import VAD
+
+from assets import bundle as asset_bundle
+from assets import precompiled_tools
+from startup import startup
+
+logger = logging.getLogger("agent-core")
+
+
+class PipelineMode(str, Enum):
+    REALTIME = "realtime"
+    HYBRID = "hybrid"
+    CASCADE = "cascade"
+
+
+@dataclass
+class ModelSettings:
+    """Model names and sampling shared by all modes."""
+
+    realtime_model: str = "gpt-4o-realtime-preview"
+    transcribe_model: str = "gpt-4o-transcribe"
+    llm_model: str = "gpt-4o-mini"
+    tts_model: str = "gpt-4o-mini-tts"
+    temperature: float | None = None
+
+
+@dataclass
+class Pipeline:
+    """The models for one mode; `stt`, `tts` and `vad` are None where the mode has none."""
+
+    mode: PipelineMode
+    llm: llm.LLM | llm.RealtimeModel
+    stt: STT | None = None
+    tts: TTS | None = None
+    vad: VAD | None = None
+
+
+def parse_metadata(raw: Any) -> dict:
+    """Job metadata as a dict; dispatch sends it as a JSON string."""
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        metadata = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning(f"Failed to parse metadata JSON: {raw}")
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def resolve_mode(metadata: dict, default: PipelineMode = PipelineMode.REALTIME) -> PipelineMode:
+    """The job's `"mode"`, else `AGENT_MODE`, else `default`."""
+    for source, value in (("metadata", metadata.get("mode")), ("AGENT_MODE", os.getenv("AGENT_MODE"))):
+        if not value:
+            continue
+        try:
+            return PipelineMode(value)
+        except ValueError:
+            logger.warning(f"Unknown pipeline mode {value!r} from {source}, ignoring")
+    return default
+
+
+def _turn_detection():
+    from openai.types.realtime import realtime_audio_input_turn_detection
+
+    return realtime_audio_input_turn_detection.SemanticVad(
+        type="semantic_vad",
+        eagerness="auto",
+        create_response=True,
+        interrupt_response=True,
+    )
+
+
+def build_pipeline(
+    mode: PipelineMode,
+    voice: str,
+    settings: ModelSettings | None = None,
+    vad_model: VAD | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> Pipeline:
+    """
+    Construct the models for `mode`.
+
+    Args:
+        mode: Pipeline mode
+        voice: Output voice (realtime voice or TTS voice)
+        settings: Model names and temperature
+        vad_model: Preloaded VAD for cascade mode (see `prewarm`); loaded here if None
+        base_url: OpenAI-compatible endpoint, e.g. a local fake for benchmarks
+        api_key: API key for `base_url`
+    """
+    # Imported here rather than at module level: the plugin takes about a
+    # second to import and the worker's main process never builds a pipeline
+    from livekit.plugins import openai
+    from openai.types.realtime import AudioTranscription
+
+    settings = settings or ModelSettings()
+    client: dict[str, Any] = {}
+    if base_url is not None:
+        client["base_url"] = base_url
+    if api_key is not None:
+        client["api_key"] = api_key
+    temperature = {} if settings.temperature is None else {"temperature": settings.temperature}
+
+    if mode == PipelineMode.CASCADE:
+        if vad_model is None:
+            from livekit.plugins import silero
+
+            vad_model = silero.VAD.load()
+        return Pipeline(
+            mode=mode,
+            stt=openai.STT(model=settings.transcribe_model, use_realtime=False, **client),
+            llm=openai.LLM(model=settings.llm_model, **temperature, **client),
+            # Raw PCM skips decoding mp3 on the first audio chunk
+            tts=openai.TTS(model=settings.tts_model, voice=voice, response_format="pcm", **client),
+            vad=vad_model,
+        )
+
+    realtime_model = openai.realtime.RealtimeModel(
+        model=settings.realtime_model,
+        voice=voice,
+        modalities=["audio", "text"] if mode == PipelineMode.REALTIME else ["text"],
+        input_audio_transcription=AudioTranscription(model=settings.transcribe_model),
+        turn_detection=_turn_detection(),
+        **temperature,
+        **client,
+    )
+    if mode == PipelineMode.REALTIME:
+        return Pipeline(mode=mode, llm=realtime_model)
+    return Pipeline(
+        mode=mode,
+        llm=realtime_model,
+        tts=openai.TTS(model=settings.tts_model, voice=voice, response_format="pcm", **client),
+    )
+
+
+def build_session(
+    mode: PipelineMode,
+    voice: str,
+    tools: list | None = None,
+    settings: ModelSettings | None = None,
+    vad_model: VAD | None = None,
+) -> AgentSession:
+    """An `AgentSession` for `mode` with the given tools."""
+    pipeline = build_pipeline(mode, voice, settings, vad_model)
+    logger.info(f"Pipeline mode: {mode.value} (voice={voice})")
+    options: dict[str, Any] = {"llm": pipeline.llm}
+    if pipeline.stt is not None:
+        options["stt"] = pipeline.stt
+    if pipeline.tts is not None:
+        options["tts"] = pipeline.tts
+    if pipeline.vad is not None:
+        options["vad"] = pipeline.vad
+    if tools:
+        # Bundled tool schemas skip the per-request schema build; the realtime
+        # API path converts raw schemas differently, so cascade only
+        options["tools"] = precompiled_tools(tools) if mode == PipelineMode.CASCADE else list(tools)
+    return AgentSession(**options)
+
+
+def prewarm(proc: JobProcess, default: PipelineMode = PipelineMode.REALTIME) -> None:
+    """
+    Map the asset bundle once per job process, so jobs do not wait for it,
+    and load the VAD when the worker runs in cascade mode (`AGENT_MODE`,
+    else `default`). Only cascade uses the VAD; a job that asks for cascade
+    in its metadata on another worker loads it in `build_pipeline`.
+
+    Entrypoints that default to another mode pass it with `functools.partial`.
+    """
+    if resolve_mode({}, default) == PipelineMode.CASCADE:
+        from livekit.plugins import silero
+
+        proc.userdata["vad"] = silero.VAD.load()
+    asset_bundle()
+    startup.mark("job process ready")
+
+
+def start_worker_services(shared_cache: bool = True, caller_id: bool = True, dnc_sync: bool = True) -> None:
+    """
+    Start the worker main process's background services, before `cli.run_app`:
+
+    - the shared lead and script cache for the job processes (`AGENT_SHARED_CACHE`),
+      with the cache invalidation listener when `CACHE_INVALIDATION=1`
+    - the caller ID index for inbound calls (`AGENT_CALLER_ID`)
+    - the host's DNC list sync with the backend (`AGENT_DNC_SYNC`)
+
+    Each can be turned off with its variable set to 0; entrypoints turn off
+    the services they do not use.
+    """
+    api = {
+        "api_base_url": os.getenv("API_BASE_URL", "http://localhost:3000"),
+        "api_key": os.getenv("AGENT_API_KEY", ""),
+    }
+
+    if shared_cache and os.getenv("AGENT_SHARED_CACHE", "1") != "0":
+        from invalidation import InvalidationListener
+        from shared_cache import SharedCacheOwner
+
+        owner = SharedCacheOwner(**api)
+        owner.start()
+        # Nothing sends invalidation events yet, so the listener is opt-in
+        if os.getenv("CACHE_INVALIDATION", "0") != "0":
+            try:
+                listener = InvalidationListener(owner.writer)
+                listener.start()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cache invalidation listener not started: {e}")
+            else:
+                # With signed dashboard pushes arriving, the timed refresh only
+                # has to pick up new records
+                if listener.secret and "SHARED_CACHE_REFRESH" not in os.environ:
+                    owner.interval = 3600.0
+                    logger.info("Cache invalidation on, shared cache refreshing every 3600s")
+
+    # Inbound callers are identified from a phone number index the main process keeps
+    if caller_id and os.getenv("AGENT_CALLER_ID", "1") != "0":
+        from callerid import CallerIdOwner
+
+        CallerIdOwner(**api).start()
+
+    # Numbers added to the DNC list mid-call are blocked on this host at once;
+    # the main process also keeps the host's list in sync with the backend
+    if dnc_sync and os.getenv("AGENT_DNC_SYNC", "1") != "0":
+        from dnc import DncSync
+
+        DncSync(**api).start()
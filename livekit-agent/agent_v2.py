@@ -1,15 +1,19 @@
 """
 Daily Event Insurance Voice Agent v2
-Simplified version using latest LiveKit agents patterns
+Race-event coverage agent (Sarah from Mutual) on the shared agent core.
+
+Runs in the realtime pipeline by default (agent_core.py); `AGENT_MODE` or the
+job's `"mode"` can switch it to hybrid or cascade.
 """
 
 from dotenv import load_dotenv
 load_dotenv()
 
 import logging
-from livekit import agents
-from livekit.agents import AutoSubscribe, JobContext, WorkerOptions, cli
-from livekit.plugins import openai
+from livekit.agents import Agent, AutoSubscribe, JobContext, WorkerOptions, cli
+
+from agent_core import ModelSettings, build_session, parse_metadata, prewarm, resolve_mode
+from startup import startup
 
 logger = logging.getLogger("voice-agent")
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +36,13 @@ Your script flow:
 Be natural - use "gotcha", "totally", "for sure". Match their energy.
 """
 
+GREETING = (
+    "Hey! This is Sarah from Mutual - the official coverage provider for the race. "
+    "Quick question - did you see the text to activate your coverage yet?"
+)
+
+VOICE = "coral"  # High-energy voice
+
 
 async def entrypoint(ctx: JobContext):
     """Voice agent entry point"""
@@ -40,46 +51,38 @@ async def entrypoint(ctx: JobContext):
     # Connect to the room
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
     logger.info("✅ Connected to LiveKit room")
+    mode = resolve_mode(parse_metadata(ctx.job.metadata))
 
     # Wait for user to join
     participant = await ctx.wait_for_participant()
     logger.info(f"👤 User joined: {participant.identity}")
 
-    # Create OpenAI Realtime model
-    model = openai.realtime.RealtimeModel(
-        voice="coral",
-        temperature=0.8,
-        modalities=["audio", "text"],
+    session = build_session(
+        mode,
+        VOICE,
+        settings=ModelSettings(temperature=0.8),
+        vad_model=ctx.proc.userdata.get("vad"),
     )
+    await session.start(room=ctx.room, participant=participant, agent=Agent(instructions=SYSTEM_PROMPT))
+    logger.info(f"🎤 Voice agent is now active! ({mode.value})")
 
-    # Create and start the agent
-    assistant = agents.voice.VoicePipelineAgent(
-        llm=model,
-        chat_ctx=agents.llm.ChatContext().append(
-            role="system",
-            text=SYSTEM_PROMPT,
-        ),
-    )
-
-    assistant.start(ctx.room, participant)
-    logger.info("🎤 Voice agent is now active!")
-
-    # Initial greeting
-    await assistant.say(
-        "Hey! This is Sarah from Mutual - the official coverage provider for the race. "
-        "Quick question - did you see the text to activate your coverage yet?",
-        allow_interruptions=True,
-    )
+    # Initial greeting - spoken by the model itself when the mode has no TTS
+    if session.tts is not None:
+        session.say(GREETING, allow_interruptions=True)
+    else:
+        session.generate_reply(instructions=f"Say: '{GREETING}'")
 
 
 if __name__ == "__main__":
     print("=" * 50)
     print("Daily Event Insurance Voice Agent v2")
     print("=" * 50)
+    startup.worker_starting()
 
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             agent_name="daily-event-insurance",
         ),
     )
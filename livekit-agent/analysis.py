@@ -4,7 +4,6 @@ import json
 import logging
 import asyncio
 from typing import Dict, Any, List
-from supabase import create_client, Client
 
 # Set up logging
 logger = logging.getLogger("analysis-worker")
@@ -24,7 +23,10 @@ class AnalysisWorker:
             logger.warning("Supabase credentials not found. Analysis will not be saved.")
             self.supabase = None
         else:
-            self.supabase: Client = create_client(self.url, self.key)
+            # Imported only when a client is needed: supabase is slow to import
+            from supabase import create_client
+
+            self.supabase = create_client(self.url, self.key)
 
     async def analyze_call(self, call_id: str, transcript: str):
         """
@@ -0,0 +1,368 @@
+"""
+Daily Event Insurance - Asset Bundle
+Prompts, scripts and tool schemas precompiled into one file mapped at startup.
+
+Every job process used to rebuild the same static assets on first use: the
+system prompts joined from their sections, the recommended-script talking
+points, the knowledge base articles and - on every LLM request - the strict
+JSON schema of each function tool, which the SDK derives from the tool's
+signature through pydantic. `python assets.py build` renders all of them
+once into `agent-assets.bin`; job processes map the file read-only and
+decode an entry only when it is first asked for.
+
+Layout: a header (magic, format, section count, source digest), a section
+directory, then per section its entries back to back followed by a msgpack
+index of (key, offset, length). TEXT sections hold UTF-8 strings, PACKED
+sections msgpack values. Section indexes are decoded on first access and
+decoded entries are memoized, so an unused section costs nothing.
+
+The bundle records a hash of every source file it was built from. A bundle
+whose sources have changed since (or that is missing) is ignored and the
+callers fall back to building the asset in-process, so a stale build can
+slow a deploy down but never change what the agent says.
+
+    python assets.py build
+
+    prompt = text("prompts", "sales")          # None without a current bundle
+    session_tools = precompiled_tools(ALL_TOOLS)
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any
+
+import msgspec
+
+logger = logging.getLogger("asset-bundle")
+
+_MAGIC = b"DEIASSET"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII32s")  # magic, format, section count, sha256 of the source hashes
+_SECTION = struct.Struct("<24sIIQQ")  # name, kind, entry count, index offset, index length
+
+TEXT, PACKED = 0, 1
+
+DEFAULT_PATH = Path(__file__).with_name("agent-assets.bin")
+
+# Files the bundle is rendered from, relative to this directory
+SOURCES = (
+    "assets.py",
+    "prompts.py",
+    "workflow.py",
+    "support_agent.py",
+    "../agents/prompts/scripts.py",
+)
+
+
+def source_hashes(root: Path | None = None) -> dict[str, str]:
+    """sha256 of each source file that exists, keyed by its path in SOURCES."""
+    root = root or Path(__file__).parent
+    hashes = {}
+    for source in SOURCES:
+        path = root / source
+        if path.is_file():
+            hashes[source] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return hashes
+
+
+# =============================================================================
+# FORMAT
+# =============================================================================
+
+def write_bundle(path: Path, sections: dict[str, tuple[int, dict[str, Any]]], meta: dict[str, Any]) -> None:
+    """
+    Write `sections` (name -> (kind, {key: value})) as a bundle file, with
+    `meta` (source hashes under "sources", SDK version under "sdk") as a
+    PACKED "meta" section.
+
+    Raises:
+        ValueError: A section name is longer than 24 bytes, or a TEXT value is not a string
+    """
+    sections = {**sections, "meta": (PACKED, {**meta, "built_at": time.time()})}
+    encoder = msgspec.msgpack.Encoder()
+    directory_offset = _HEADER.size
+    offset = directory_offset + len(sections) * _SECTION.size
+
+    directory = bytearray()
+    body = bytearray()
+    for name, (kind, entries) in sections.items():
+        encoded_name = name.encode()
+        if len(encoded_name) > 24:
+            raise ValueError(f"Section name too long: {name}")
+        index = []
+        for key, value in entries.items():
+            if kind == TEXT:
+                if not isinstance(value, str):
+                    raise ValueError(f"{name}/{key}: TEXT sections hold strings")
+                data = value.encode()
+            else:
+                data = encoder.encode(value)
+            index.append((key, offset + len(body), len(data)))
+            body += data
+        packed_index = encoder.encode(index)
+        directory += _SECTION.pack(encoded_name, kind, len(entries), offset + len(body), len(packed_index))
+        body += packed_index
+
+    digest = hashlib.sha256(encoder.encode(sorted(meta.get("sources", {}).items()))).digest()
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, len(sections), digest))
+        f.write(directory)
+        f.write(body)
+    os.replace(tmp, path)
+
+
+class AssetBundle:
+    """A bundle file mapped read-only, decoded one entry at a time."""
+
+    def __init__(self, path: Path):
+        """
+        Raises:
+            OSError: The file can't be opened or mapped
+            ValueError: It isn't a bundle of this format version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"{self.path} is not an asset bundle")
+        magic, version, count, digest = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{self.path} is not an asset bundle (format {version})")
+        self.digest = digest.hex()
+
+        self._sections: dict[str, tuple[int, int, int, int]] = {}
+        for position in range(count):
+            name, kind, entries, index_offset, index_length = _SECTION.unpack_from(
+                self._map, _HEADER.size + position * _SECTION.size
+            )
+            self._sections[name.rstrip(b"\x00").decode()] = (kind, entries, index_offset, index_length)
+        self._indexes: dict[str, dict[str, tuple[int, int]]] = {}
+        self._values: dict[tuple[str, str], Any] = {}
+
+    @property
+    def sections(self) -> list[str]:
+        return list(self._sections)
+
+    def _index(self, section: str) -> dict[str, tuple[int, int]] | None:
+        index = self._indexes.get(section)
+        if index is None:
+            found = self._sections.get(section)
+            if found is None:
+                return None
+            _, _, offset, length = found
+            index = self._indexes[section] = {
+                key: (entry_offset, entry_length)
+                for key, entry_offset, entry_length in msgspec.msgpack.decode(self._map[offset:offset + length])
+            }
+        return index
+
+    def keys(self, section: str) -> list[str]:
+        return list(self._index(section) or ())
+
+    def get(self, section: str, key: str) -> Any | None:
+        """The entry's string (TEXT) or value (PACKED), or None if it isn't bundled."""
+        cache_key = (section, key)
+        if cache_key in self._values:
+            return self._values[cache_key]
+        index = self._index(section)
+        location = index.get(key) if index is not None else None
+        if location is None:
+            return None
+        offset, length = location
+        data = self._map[offset:offset + length]
+        value = data.decode() if self._sections[section][0] == TEXT else msgspec.msgpack.decode(data)
+        self._values[cache_key] = value
+        return value
+
+    def stale_sources(self, root: Path | None = None) -> list[str]:
+        """Source files that changed since the build (files absent here are not checked)."""
+        built = self.get("meta", "sources") or {}
+        current = source_hashes(root)
+        return [source for source, digest in current.items() if built.get(source) != digest]
+
+    def close(self) -> None:
+        self._map.close()
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+_bundle: AssetBundle | None | bool = False
+
+
+def bundle_path() -> Path:
+    return Path(os.environ.get("AGENT_ASSET_BUNDLE") or DEFAULT_PATH)
+
+
+def bundle() -> AssetBundle | None:
+    """This process's bundle, opened on first use; None when missing or stale."""
+    global _bundle
+    if _bundle is False:
+        _bundle = _open(bundle_path())
+    return _bundle
+
+
+def _open(path: Path) -> AssetBundle | None:
+    if not path.is_file():
+        logger.info(f"No asset bundle at {path}; building assets in-process")
+        return None
+    try:
+        loaded = AssetBundle(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Asset bundle unusable: {e}")
+        return None
+    stale = loaded.stale_sources()
+    if stale:
+        logger.warning(f"Asset bundle {path} is stale ({', '.join(stale)} changed); run `python assets.py build`")
+        loaded.close()
+        return None
+    logger.info(f"Asset bundle {path} ({loaded.digest[:12]}) mapped")
+    return loaded
+
+
+def value(section: str, key: str) -> Any | None:
+    """A bundled entry, or None without a current bundle."""
+    loaded = bundle()
+    return loaded.get(section, key) if loaded is not None else None
+
+
+def text(section: str, key: str) -> str | None:
+    """A bundled TEXT entry, or None without a current bundle."""
+    return value(section, key)
+
+
+def precompiled_tools(tools: list) -> list:
+    """
+    `tools` with each function tool swapped for a raw tool carrying its
+    bundled strict schema, so the LLM request no longer rebuilds it. Calls
+    are validated and bound exactly as the SDK does for the original tool.
+
+    Only for chat-completions LLMs (cascade mode): the realtime API path
+    converts raw schemas differently. Tools without a bundled schema, and
+    all tools when the bundle was built against another SDK version, are
+    returned unchanged.
+    """
+    loaded = bundle()
+    if loaded is None:
+        return list(tools)
+    from livekit.agents import __version__ as sdk_version
+    from livekit.agents import llm
+
+    if loaded.get("meta", "sdk") != sdk_version:
+        logger.warning(f"Asset bundle tool schemas were built for livekit-agents {loaded.get('meta', 'sdk')}")
+        return list(tools)
+
+    compiled = []
+    for tool in tools:
+        schema = None
+        if isinstance(tool, llm.FunctionTool) and tool.info.on_duplicate != "confirm":
+            schema = loaded.get("tool_schemas", tool.info.name)
+        compiled.append(_raw_tool(tool, schema) if schema is not None else tool)
+    return compiled
+
+
+def _raw_tool(original, schema: dict[str, Any]):
+    from livekit.agents import RunContext
+    from livekit.agents import llm
+
+    async def call(raw_arguments: dict[str, object], context=None):
+        args, kwargs = llm.utils.prepare_function_arguments(
+            fnc=original, json_arguments=raw_arguments, call_ctx=context
+        )
+        result = original(*args, **kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    call.__annotations__["context"] = RunContext
+    call.__name__ = call.__qualname__ = original.info.name
+    return llm.function_tool(
+        call,
+        raw_schema=schema,
+        flags=original.info.flags,
+        on_duplicate=original.info.on_duplicate,
+        duplicate_scope=original.info.duplicate_scope,
+    )
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def _sample_scripts() -> dict[str, dict]:
+    """SAMPLE_SCRIPTS from the legacy agents package, when it is checked out."""
+    path = Path(__file__).parent / "../agents/prompts/scripts.py"
+    if not path.is_file():
+        logger.warning(f"No sample scripts at {path}; bundling without them")
+        return {}
+    spec = importlib.util.spec_from_file_location("sample_scripts", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SAMPLE_SCRIPTS
+
+
+def render_sections() -> dict[str, tuple[int, dict[str, Any]]]:
+    """Every bundled asset, rendered from source (never from the bundle)."""
+    from livekit.agents import llm
+
+    import support_agent
+    import workflow
+    from prompts import PROMPTS
+
+    tools = [*workflow.ALL_TOOLS, *support_agent.SUPPORT_TOOLS]
+    return {
+        "prompts": (TEXT, {name: PROMPTS.compose(name) for name in PROMPTS.names}),
+        "recommended_scripts": (TEXT, {
+            f"{business_type}/{interest_level}": workflow.render_recommended_script(business_type, interest_level)
+            for business_type in workflow.BUSINESS_VALUE_PROPS
+            for interest_level in workflow.INTEREST_APPROACHES
+        }),
+        "value_props": (PACKED, workflow.BUSINESS_VALUE_PROPS),
+        "interest_approaches": (TEXT, workflow.INTEREST_APPROACHES),
+        "knowledge": (TEXT, support_agent.KNOWLEDGE_ARTICLES),
+        "scripts": (PACKED, _sample_scripts()),
+        "tool_schemas": (PACKED, {
+            tool.info.name: llm.utils.build_strict_openai_schema(tool)["function"]
+            for tool in tools
+            if isinstance(tool, llm.FunctionTool)
+        }),
+    }
+
+
+def build(path: Path | None = None) -> Path:
+    """Render every asset and write the bundle to `path` (default: bundle_path())."""
+    from livekit.agents import __version__ as sdk_version
+
+    path = Path(path or bundle_path())
+    write_bundle(path, render_sections(), {"sources": source_hashes(), "sdk": sdk_version})
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--output", type=Path, default=None, help="bundle file (default: $AGENT_ASSET_BUNDLE or agent-assets.bin)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, force=True)
+    started = time.perf_counter()
+    path = build(args.output)
+    loaded = AssetBundle(path)
+    entries = {name: len(loaded.keys(name)) for name in loaded.sections}
+    loaded.close()
+    print(f"Built {path} ({path.stat().st_size / 1024:.0f}kB) in {(time.perf_counter() - started) * 1000:.0f}ms: "
+          + ", ".join(f"{name} {count}" for name, count in entries.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Benchmarks for the voice agent I/O and hot paths.
+
+Run from the livekit-agent directory, e.g.:
+
+    python -m benchmarks.tool_latency
+
+Benchmarks get a scratch `DNC_INDEX_DIR`, removed on exit, so numbers the
+agent tools or the dialer put on the DNC list never reach the host's index.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+os.environ["DNC_INDEX_DIR"] = tempfile.mkdtemp(prefix="dnc-benchmark-")
+atexit.register(shutil.rmtree, os.environ["DNC_INDEX_DIR"], ignore_errors=True)
@@ -0,0 +1,120 @@
+"""
+Asset bundle benchmark.
+
+Builds the bundle into a temporary file, then compares a job process with
+and without it (`AGENT_ASSET_BUNDLE` pointing at the file or at nothing):
+
+- first use: in a fresh interpreter, the time to get every prompt, every
+  recommended script and knowledge article, and the tool schemas of a
+  first LLM request, across `--runs` processes
+- per request: the tool schemas the OpenAI plugin sends with every LLM
+  request (`to_fnc_ctx`) for the sales agent's tools, originals against
+  `precompiled_tools`, checked to be identical
+
+Every bundled asset is checked against the text rendered from source.
+
+    python -m benchmarks.assets --runs 10 --requests 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import format_summary
+
+FIRST_USE = """
+import json, time
+import agent_core, support_agent, workflow
+from assets import bundle, precompiled_tools, text
+from livekit.agents import llm
+from livekit.agents.llm._provider_format.openai import to_fnc_ctx
+from prompts import PROMPTS
+imported = time.perf_counter()
+bundle()
+for name in PROMPTS.names:
+    PROMPTS.get(name)
+for business_type in workflow.BUSINESS_VALUE_PROPS:
+    for interest_level in workflow.INTEREST_APPROACHES:
+        workflow._recommended_script(business_type, interest_level)
+for category in support_agent.KNOWLEDGE_ARTICLES:
+    text("knowledge", category) or support_agent.KNOWLEDGE_ARTICLES[category]
+to_fnc_ctx(llm.ToolContext(precompiled_tools(workflow.ALL_TOOLS)))
+print(json.dumps({"first_use": time.perf_counter() - imported, "bundled": bundle() is not None}))
+"""
+
+
+def first_use(bundle_path: Path, runs: int) -> list[float]:
+    env = {**os.environ, "AGENT_ASSET_BUNDLE": str(bundle_path)}
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_USE], env=env, capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        assert report["bundled"] == bundle_path.is_file(), result.stderr
+        samples.append(report["first_use"])
+    return samples
+
+
+def check_assets(path: Path) -> None:
+    """Every bundled entry matches what the source renders."""
+    from assets import AssetBundle, render_sections
+
+    loaded = AssetBundle(path)
+    for section, (_, entries) in render_sections().items():
+        for key, rendered in entries.items():
+            assert loaded.get(section, key) == rendered, f"{section}/{key} differs from source"
+    assert not loaded.stale_sources()
+    loaded.close()
+
+
+def per_request(requests: int) -> None:
+    import workflow
+    from assets import precompiled_tools
+    from livekit.agents import llm
+    from livekit.agents.llm._provider_format.openai import to_fnc_ctx
+
+    original = llm.ToolContext(workflow.ALL_TOOLS)
+    compiled = llm.ToolContext(precompiled_tools(workflow.ALL_TOOLS))
+    assert to_fnc_ctx(original) == to_fnc_ctx(compiled), "precompiled schemas differ"
+    for label, context in (("tool schemas, built", original), ("tool schemas, bundled", compiled)):
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            to_fnc_ctx(context)
+            samples.append(time.perf_counter() - started)
+        print(format_summary(f"per request: {label}", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="fresh processes per setup")
+    parser.add_argument("--requests", type=int, default=200, help="LLM requests for the per-request timing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "agent-assets.bin"
+        os.environ["AGENT_ASSET_BUNDLE"] = str(path)
+        import assets
+
+        started = time.perf_counter()
+        assets.build(path)
+        print(f"built {path.stat().st_size / 1024:.0f}kB bundle in {(time.perf_counter() - started) * 1000:.0f}ms")
+        check_assets(path)
+
+        print(format_summary("first use, no bundle", first_use(Path(tmp) / "missing.bin", args.runs)))
+        print(format_summary("first use, bundle", first_use(path, args.runs)))
+        per_request(args.requests)
+        assets.bundle().close()
+
+
+if __name__ == "__main__":
+    main()
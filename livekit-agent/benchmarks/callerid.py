@@ -0,0 +1,133 @@
+"""
+Caller ID index benchmark.
+
+Builds the index over `--numbers` (default 5M) random US numbers (10%
+partners, UUID-length record IDs), then measures:
+
+- build: `CallerIdIndex.build` from arrays (dedup, ID blob, vectorized
+  probing), and `from_records` over `--records` API-shaped dicts with
+  formatted phone fields (normalization included)
+- save/load: writing the index file and mapping it as a job process does
+- lookup: scalar `lookup` of SIP-style "+1..." numbers on the mapped index,
+  hits and misses, and `lookup_keys` over every number at once
+- sync: `apply` of two change feed pages of `--changes` records (new
+  numbers, changed numbers)
+
+Every number is checked to resolve to its own record.
+
+    python -m benchmarks.callerid --numbers 5000000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import summarize
+from callerid import LEAD, PARTNER, CallerIdIndex
+
+
+def record_id(i: int) -> str:
+    return f"00000000-0000-4000-8000-{i:012d}"
+
+
+def microseconds(label: str, samples: list[float]) -> str:
+    s = summarize(samples)
+    return (f"{label:<30} n={s['n']:<7} p50={s['p50'] * 1e6:6.2f}us p99={s['p99'] * 1e6:6.2f}us "
+            f"max={s['max'] * 1e6:7.1f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--numbers", type=int, default=5_000_000)
+    parser.add_argument("--records", type=int, default=200_000, help="API-shaped records for from_records")
+    parser.add_argument("--lookups", type=int, default=200_000, help="scalar lookups of each kind")
+    parser.add_argument("--changes", type=int, default=1_000, help="records in the change feed page")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = np.random.default_rng(args.seed)
+    # Distinct +1 NPA-NXX-XXXX numbers in random order; the rest of the range are misses
+    numbers = np.unique(rng.integers(12_002_000_000, 19_999_999_999, int(args.numbers * 1.1)))
+    numbers = rng.permutation(numbers)[:args.numbers]
+    kinds = np.where(rng.random(numbers.size) < 0.1, PARTNER, LEAD).astype(np.uint8)
+    ids = [record_id(i) for i in range(numbers.size)]
+
+    started = time.perf_counter()
+    index = CallerIdIndex.build(numbers, kinds, ids)
+    built = time.perf_counter() - started
+    print(f"build x {numbers.size:,}: {built:.2f}s ({built / numbers.size * 1e9:.0f}ns/number), "
+          f"{index.nbytes / 1e6:.0f}MB, load factor {index.load_factor:.2f}")
+
+    records = [
+        {"id": ids[i], "phone": f"({n // 10**7 % 1000:03d}) {n // 10**4 % 1000:03d}-{n % 10**4:04d}"}
+        for i, n in enumerate(numbers[:args.records].tolist())
+    ]
+    started = time.perf_counter()
+    small = CallerIdIndex.from_records(records)
+    from_records = time.perf_counter() - started
+    assert len(small) == len(records)
+    print(f"from_records x {len(records):,}: {from_records * 1000:.0f}ms "
+          f"({from_records / len(records) * 1e9:.0f}ns/record)")
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        path = os.path.join(directory, "callerid.bin")
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        mapped = CallerIdIndex.load(path)
+        loaded = time.perf_counter() - started
+        print(f"save: {saved * 1000:.0f}ms ({os.path.getsize(path) / 1e6:.0f}MB), load: {loaded * 1000:.2f}ms")
+
+        sample = rng.integers(0, numbers.size, args.lookups)
+        hits = [f"+{numbers[i]}" for i in sample.tolist()]
+        absent = np.setdiff1d(rng.integers(12_002_000_000, 19_999_999_999, args.lookups * 2), numbers)
+        misses = [f"+{n}" for n in absent[:args.lookups].tolist()]
+        for label, queries in (("lookup, hit", hits), ("lookup, miss", misses)):
+            samples = []
+            lookup = mapped.lookup
+            for number in queries:
+                started = time.perf_counter()
+                lookup(number)
+                samples.append(time.perf_counter() - started)
+            print(microseconds(label, samples))
+        for i, number in zip(sample[:1000].tolist(), hits):
+            match = mapped.lookup(number)
+            assert match is not None and match.id == ids[i] and match.kind == ("lead", "partner")[kinds[i] - 1], number
+        assert all(mapped.lookup(number) is None for number in misses[:1000])
+
+        started = time.perf_counter()
+        entries = mapped.lookup_keys(numbers)
+        batch = time.perf_counter() - started
+        assert np.array_equal(entries, np.arange(numbers.size)), "an indexed number resolved to another record"
+        print(f"lookup_keys x {numbers.size:,}: {batch * 1000:.0f}ms ({batch / numbers.size * 1e9:.0f}ns/number)")
+        del mapped, entries
+
+    # Change feed pages: half new records, half existing records with a new number.
+    # The first page after a build also sorts the entries by ID checksum.
+    taken = set()
+    for label in ("first", "second"):
+        fresh = np.setdiff1d(rng.integers(12_002_000_000, 19_999_999_999, args.changes * 2), numbers)
+        fresh = np.array([n for n in fresh.tolist() if n not in taken][:args.changes])
+        taken.update(fresh.tolist())
+        moved = rng.choice(numbers.size, args.changes // 2, replace=False)
+        page = [{"id": record_id(numbers.size + len(taken) + i), "phone": f"+{n}"}
+                for i, n in enumerate(fresh[:args.changes // 2].tolist())]
+        page += [{"id": ids[i], "phone": f"+{n}"} for i, n in zip(moved.tolist(), fresh[args.changes // 2:].tolist())]
+        started = time.perf_counter()
+        changed = index.apply(LEAD, page)
+        applied = time.perf_counter() - started
+        print(f"apply the {label} page of {len(page):,} changes: {applied * 1000:.0f}ms ({changed:,} changed)")
+        for record in page:
+            match = index.lookup(record["phone"])
+            assert match is not None and match.id == record["id"], record
+        moved = moved[kinds[moved] == LEAD]
+        assert all(index.lookup(int(numbers[i])) is None for i in moved), "a moved record kept its old number"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Bounded chat context benchmark.
+
+Simulates a 45-minute support call - a caller turn every ~15 seconds, tool
+calls every few turns - and reports, per turn, the context tokens sent to
+the model and the turn latency, with the chat context left to grow and
+with `context_window.ContextWindow` bounding it.
+
+Turn latency is the measured cost of preparing the request (serializing the
+chat context to the provider format) plus a fake provider whose time to
+first token grows linearly with prompt tokens (`--base-ms` +
+`--per-1k-tokens-ms`). Compaction runs in the background between turns with
+a fake summarizer that takes `--summarize-ms`, exactly as in a live call.
+
+    python -m benchmarks.chat_context --minutes 45 --keep-turns 6 --max-tokens 4000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from livekit.agents import llm
+
+from benchmarks.common import format_summary
+from context_window import ContextWindow, context_tokens, extractive_summary
+
+SECONDS_PER_TURN = 15
+
+CALLER_LINES = [
+    "The booking widget stopped showing the insurance option on our checkout page since this morning.",
+    "We changed our website theme last week, could that have broken the embed code?",
+    "How do I see how many participants opted in last month?",
+    "Our front desk says the waiver screen and the insurance screen look different now.",
+    "Can you explain again how the commission is calculated for our second location?",
+    "We're using the API key from the old dashboard, is that still valid?",
+    "I tried clearing the cache and it's still not showing on mobile.",
+    "When does the next commission payout go out?",
+    "Okay, and if a participant cancels, does the coverage still apply?",
+    "Could you send that to my email so I can forward it to our developer?",
+]
+AGENT_LINES = [
+    "Thanks for walking me through that. Let me make sure I understand: the insurance option disappeared from checkout after the theme change, and it's affecting both desktop and mobile. I'll check the integration on our side.",
+    "Good question. Each location has its own participant count, and the commission tier is based on the combined monthly total, so adding a second location usually moves you up a tier rather than down.",
+    "That key was migrated automatically when we moved to the new dashboard, so it's still valid. If you'd like, I can walk you through rotating it once the widget is working again.",
+    "Payouts go out on the fifteenth for the previous month's policies, as long as the total is above the minimum threshold. You can see the running total in the partner dashboard under Earnings.",
+    "Coverage follows the event date, so if a participant cancels before the event the premium is refunded and no commission is paid on that policy.",
+    "I can definitely do that. I'll include the embed snippet, the troubleshooting steps we just went through, and the ticket number so your developer has everything in one place.",
+]
+TOOLS = {
+    "get_partner_account": lambda rng: {
+        "partner_id": "p_1042",
+        "business_name": "Summit Fitness",
+        "locations": rng.randint(1, 6),
+        "monthly_participants": rng.randint(800, 6000),
+        "tier": "Silver",
+        "integration": {"type": "widget", "status": "degraded", "last_seen": "2026-10-18T09:12:00Z"},
+        "contacts": [{"name": "Dana Reyes", "role": "Owner", "email": "dana@summitfitness.example"}],
+    },
+    "check_integration_status": lambda rng: {
+        "widget": {"status": rng.choice(["ok", "degraded", "error"]), "errors_24h": rng.randint(0, 40)},
+        "api": {"status": "ok", "latency_ms": rng.randint(80, 300)},
+        "recent_errors": [{"code": "EMBED_NOT_FOUND", "count": rng.randint(1, 30), "page": "/checkout"}] * 3,
+    },
+    "create_support_ticket": lambda rng: {"ticket_id": f"T-{rng.randint(10000, 99999)}", "priority": "high", "eta_hours": 24},
+    "search_help_articles": lambda rng: {
+        "articles": [
+            {"title": f"Troubleshooting the booking widget, part {n}", "excerpt": "Check that the embed snippet is " * 8}
+            for n in range(3)
+        ]
+    },
+}
+
+
+class SimulatedSession:
+    """Stands in for `AgentSession` events (`ContextWindow.attach` only needs `on`)."""
+
+    def __init__(self):
+        self._handlers: dict[str, list] = {}
+
+    def on(self, event: str, callback=None):
+        def register(fn):
+            self._handlers.setdefault(event, []).append(fn)
+            return fn
+
+        return register(callback) if callback is not None else register
+
+    def emit(self, event: str, payload) -> None:
+        for fn in self._handlers.get(event, []):
+            fn(payload)
+
+
+class SimulatedAgent:
+    """Holds the chat context the way `Agent` does."""
+
+    def __init__(self, instructions: str):
+        self.chat_ctx = llm.ChatContext()
+        self.chat_ctx.add_message(role="system", content=instructions)
+
+    async def update_chat_ctx(self, chat_ctx: llm.ChatContext) -> None:
+        self.chat_ctx = chat_ctx
+
+
+class _StateChanged:
+    def __init__(self, new_state: str):
+        self.new_state = new_state
+
+
+def _finish_turn(agent: SimulatedAgent, rng: random.Random, turn: int) -> None:
+    ctx = agent.chat_ctx
+    if turn == 0 or rng.random() < 0.3:
+        name = "get_partner_account" if turn == 0 else rng.choice(list(TOOLS))
+        call_id = f"call_{turn}"
+        ctx.insert(llm.FunctionCall(call_id=call_id, name=name, arguments="{}"))
+        ctx.insert(
+            llm.FunctionCallOutput(call_id=call_id, name=name, output=json.dumps(TOOLS[name](rng)), is_error=False)
+        )
+    ctx.add_message(role="assistant", content=rng.choice(AGENT_LINES))
+
+
+async def simulate_call(turns: int, window: ContextWindow | None, args, seed: int):
+    rng = random.Random(seed)
+    agent = SimulatedAgent("You are Alex, a partner support specialist for Daily Event Insurance. " * 40)
+    session = SimulatedSession()
+    if window is not None:
+        window.attach(session, agent)
+
+    latencies: list[float] = []
+    tokens: list[int] = []
+    for turn in range(turns):
+        agent.chat_ctx.add_message(role="user", content=rng.choice(CALLER_LINES))
+
+        # Reply: prepare the request from the context as it is right now
+        started = time.perf_counter()
+        messages, _ = agent.chat_ctx.to_provider_format("openai")
+        prepare = time.perf_counter() - started
+        prompt_tokens = context_tokens(agent.chat_ctx)
+        latencies.append(prepare + (args.base_ms + args.per_1k_tokens_ms * prompt_tokens / 1000) / 1000)
+        tokens.append(prompt_tokens)
+        assert messages
+
+        # The rest of the turn: tool calls and the agent's answer
+        _finish_turn(agent, rng, turn)
+        session.emit("agent_state_changed", _StateChanged("listening"))
+        # Real time between turns, compressed - the background summary lands a few turns later
+        await asyncio.sleep(args.turn_gap_ms / 1000)
+
+    if window is not None:
+        window.detach()
+    return latencies, tokens, agent.chat_ctx
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=45)
+    parser.add_argument("--keep-turns", type=int, default=6)
+    parser.add_argument("--max-tokens", type=int, default=4000)
+    parser.add_argument("--base-ms", type=float, default=280)
+    parser.add_argument("--per-1k-tokens-ms", type=float, default=45)
+    parser.add_argument("--summarize-ms", type=float, default=40)
+    parser.add_argument("--turn-gap-ms", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    turns = int(args.minutes * 60 / SECONDS_PER_TURN)
+
+    async def fake_summarizer(previous: str, transcript: str) -> str:
+        await asyncio.sleep(args.summarize_ms / 1000)
+        return extractive_summary(previous, transcript)
+
+    window = ContextWindow(keep_turns=args.keep_turns, max_tokens=args.max_tokens, summarizer=fake_summarizer)
+
+    async def run():
+        unbounded = await simulate_call(turns, None, args, args.seed)
+        bounded = await simulate_call(turns, window, args, args.seed)
+        return unbounded, bounded
+
+    (lat_without, tok_without, _), (lat_with, tok_with, final_ctx) = asyncio.run(run())
+
+    print(f"\nSimulated call: {args.minutes:g} minutes, {turns} turns; fake provider "
+          f"{args.base_ms:g}ms + {args.per_1k_tokens_ms:g}ms per 1k prompt tokens")
+    for label, lat, tok in (("unbounded", lat_without, tok_without), ("bounded", lat_with, tok_with)):
+        print(f"{label}: context tokens first {tok[0]}, last {tok[-1]}, peak {max(tok)}, "
+              f"total sent {sum(tok):,}")
+        print(format_summary(f"  turn latency ({label})", lat))
+        last_tenth = lat[-max(1, turns // 10):]
+        print(format_summary(f"  turn latency, last 10% ({label})", last_tenth))
+    print(f"Window metrics: {window.metrics()}")
+
+    # The bounded context stays near the ceiling (it can overshoot by the turns
+    # added while a summary is being computed) and keeps the pinned account facts
+    assert max(tok_with) < max(tok_without)
+    assert max(tok_with) <= args.max_tokens * 1.5, f"bounded context reached {max(tok_with)} tokens"
+    assert any(
+        item.type == "function_call_output" and item.name == "get_partner_account" for item in final_ctx.items
+    ), "pinned tool result was folded"
+    assert sum(lat_with) < sum(lat_without)
+
+
+if __name__ == "__main__":
+    main()
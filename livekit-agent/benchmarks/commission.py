@@ -0,0 +1,73 @@
+"""
+Commission projection benchmark.
+
+Projects `--leads` (default 1M) leads with random participant counts
+(log-uniform, 10 to 100k a month) and location counts, three ways:
+
+- scalar: `commission.project` per lead (bisect lookups), timed on the
+  first `--scalar` leads and extrapolated
+- batch: `commission.project_batch` over the whole arrays
+- leads: `commission.project_leads` from API-shaped lead dicts (includes
+  pulling the fields out of the dicts)
+
+Every batch result is checked against the scalar projection of a sample.
+
+    python -m benchmarks.commission --leads 1000000
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.common import format_summary
+from commission import DAYS_PER_MONTH, project, project_batch, project_leads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--scalar", type=int, default=100_000, help="leads projected one at a time")
+    parser.add_argument("--repeat", type=int, default=5, help="batch runs")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = np.random.default_rng(args.seed)
+    participants = np.round(10 ** rng.uniform(1, 5, args.leads)).astype(np.int64)
+    locations = np.where(rng.random(args.leads) < 0.7, 1, rng.integers(2, 40, args.leads))
+
+    sample = min(args.scalar, args.leads)
+    pairs = list(zip(participants[:sample].tolist(), locations[:sample].tolist()))
+    started = time.perf_counter()
+    scalar = [project(p, n).monthly for p, n in pairs]
+    scalar_seconds = (time.perf_counter() - started) * args.leads / sample
+    print(f"scalar project x {args.leads:,} (from {sample:,}): {scalar_seconds * 1000:9.1f}ms "
+          f"({scalar_seconds / args.leads * 1e9:.0f}ns/lead)")
+
+    batch_samples = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        batch = project_batch(participants, locations)
+        batch_samples.append(time.perf_counter() - started)
+    assert np.array_equal(batch.monthly[:sample], np.array(scalar)), "batch and scalar projections differ"
+    assert np.array_equal(batch.annual, batch.monthly * 12)
+    print(format_summary(f"project_batch x {args.leads:,}", batch_samples))
+    print(f"{'':<6}{min(batch_samples) / args.leads * 1e9:.1f}ns/lead, "
+          f"{scalar_seconds / min(batch_samples):.0f}x the scalar path")
+
+    # Leads carry daily estimates; pick monthly totals that are whole days
+    daily = np.maximum(participants // DAYS_PER_MONTH, 1)
+    leads = [
+        {"id": f"lead_{i}", "estimatedParticipants": p, "locations": n}
+        for i, (p, n) in enumerate(zip(daily.tolist(), locations.tolist()))
+    ]
+    started = time.perf_counter()
+    from_leads = project_leads(leads)
+    print(f"project_leads x {args.leads:,} (from dicts): {(time.perf_counter() - started) * 1000:.1f}ms")
+    assert np.array_equal(from_leads.monthly, project_batch(daily * DAYS_PER_MONTH, locations).monthly)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Shared helpers for benchmark scripts.
+"""
+
+import math
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max summary of latency samples in seconds."""
+    return {
+        "n": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def format_summary(label: str, samples: list[float]) -> str:
+    """One aligned report line with latencies in milliseconds."""
+    s = summarize(samples)
+    return (
+        f"{label:<38} n={s['n']:<6} p50={s['p50'] * 1000:8.1f}ms "
+        f"p95={s['p95'] * 1000:8.1f}ms p99={s['p99'] * 1000:8.1f}ms max={s['max'] * 1000:8.1f}ms"
+    )
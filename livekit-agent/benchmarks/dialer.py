@@ -0,0 +1,157 @@
+"""
+Campaign dialer benchmark.
+
+Dials a seeded lead segment from `fake_backend.FakeBackend` through
+`dialer.FakeDispatcher` for a calling window of `--hours` - one call per
+free seat (how calls were placed before), then adaptive pacing at each
+`--targets` overflow rate - and reports calls and connects per hour, agent
+idle time and the overflow rate, in two scenarios: a steady answer rate
+(`--answer-rate` all window), and one that drops part-way through
+(`--late-answer-rate` after `--shift-hours`) to show the pacer adapting.
+Adaptive pacing must connect more calls per hour than one call per seat in
+both. The window opens at 9am Pacific; every dial is checked against the
+lead's local calling hours, and a short run that starts an hour before they
+close checks that retries coming due after closing wait for the next day.
+
+Time is simulated: `--scale` real seconds per simulated second.
+
+    python -m benchmarks.dialer --seats 20 --hours 6 --targets 0.03 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from dialer import CampaignDialer, FakeDispatcher, Pacer, load_segment, seconds_until_callable
+from fake_backend import FakeBackend
+
+# 9am Pacific (the fake backend's leads are all on Pacific time)
+WINDOW_START = datetime(2026, 7, 14, 16, 0, tzinfo=timezone.utc).timestamp()
+
+
+class ScaledClock:
+    """Simulated seconds on top of the event loop, `scale` real seconds each."""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.origin = time.monotonic()
+
+    def now(self) -> float:
+        return (time.monotonic() - self.origin) / self.scale
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds * self.scale)
+
+
+async def run_campaign(
+    leads: list[dict],
+    target: float | None,
+    late_answer_rate: float,
+    args,
+    hours: float | None = None,
+    window_start: float = WINDOW_START,
+    retry_hours: float | None = None,
+) -> tuple[CampaignDialer, dict]:
+    """One calling window; `target` is the overflow rate for adaptive pacing, None for one call per seat."""
+    clock = ScaledClock(args.scale)
+    shift = args.shift_hours * 3600
+
+    def answer_rate(now: float) -> float:
+        return args.answer_rate if now < shift else late_answer_rate
+
+    def wall_clock() -> float:
+        return window_start + clock.now()
+
+    dispatcher = FakeDispatcher(answer_rate=answer_rate, seed=args.seed, clock=clock.now, sleep=clock.sleep)
+    place_call = dispatcher.place_call
+
+    async def checked_place_call(lead, metadata, on_answer):
+        assert seconds_until_callable(lead, wall_clock()) == 0, "dialed outside the lead's calling hours"
+        return await place_call(lead, metadata, on_answer)
+
+    dispatcher.place_call = checked_place_call
+    dialer = CampaignDialer(
+        dispatcher,
+        seats=args.seats,
+        max_lines=args.max_lines,
+        max_attempts=args.max_attempts,
+        retry_delay=(args.retry_hours if retry_hours is None else retry_hours) * 3600,
+        adaptive=target is not None,
+        pacer=Pacer(target_overflow_rate=target or 0.0),
+        campaign="benchmark",
+        clock=clock.now,
+        sleep=clock.sleep,
+        wall_clock=wall_clock,
+    )
+    metrics = await dialer.run(leads, until=clock.now() + (args.hours if hours is None else hours) * 3600)
+
+    attempts = [p.attempts for p in dialer.progress.values()]
+    assert max(attempts) <= args.max_attempts, "attempt limit exceeded"
+    assert metrics["queued"] > 0, "ran out of leads before the window closed; use more --leads"
+    return dialer, metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=12000)
+    parser.add_argument("--hours", type=float, default=6.0, help="calling window")
+    parser.add_argument("--seats", type=int, default=20)
+    parser.add_argument("--max-lines", type=int, default=120)
+    parser.add_argument("--targets", type=float, nargs="+", default=[0.03, 0.1], help="overflow rates to pace for")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--retry-hours", type=float, default=2.0)
+    parser.add_argument("--answer-rate", type=float, default=0.35)
+    parser.add_argument("--late-answer-rate", type=float, default=0.15)
+    parser.add_argument("--shift-hours", type=float, default=3.0)
+    parser.add_argument("--scale", type=float, default=0.001, help="real seconds per simulated second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    backend = FakeBackend(seed=args.seed, lead_count=args.leads)
+    leads = asyncio.run(load_segment(api_base_url="http://fake-backend", transport=httpx.ASGITransport(app=backend)))
+    print(f"\n{len(leads)} leads, {args.hours:g}h window, {args.seats} seats, up to {args.max_attempts} attempts "
+          f"{args.retry_hours:g}h apart")
+
+    scenarios = {
+        f"steady answer rate {args.answer_rate:.0%}": args.answer_rate,
+        f"answer rate {args.answer_rate:.0%} then {args.late_answer_rate:.0%} after {args.shift_hours:g}h":
+            args.late_answer_rate,
+    }
+    header = (f"{'pacing':<14} {'dialed':>7} {'answered':>9} {'calls/h':>8} "
+              f"{'connects/h':>11} {'agent idle':>11} {'overflow':>9} {'peak ringing':>13}")
+    runs = [("per seat", None)] + [(f"adaptive {target:.0%}", target) for target in args.targets]
+    for scenario, late_answer_rate in scenarios.items():
+        print(f"\n{scenario}\n{header}")
+        results = {}
+        for name, target in runs:
+            _, metrics = asyncio.run(run_campaign(leads, target, late_answer_rate, args))
+            results[name] = metrics
+            print(f"{name:<14} {metrics['dialed']:>7} {metrics['outcomes']['answered']:>9} "
+                  f"{metrics['calls_per_hour']:>8.1f} {metrics['connects_per_hour']:>11.1f} "
+                  f"{metrics['agent_idle']:>10.0%} {metrics['overflow_rate']:>8.1%} {metrics['peak_ringing']:>13}")
+
+        per_seat = results.pop("per seat")
+        assert per_seat["overflow_rate"] == 0.0
+        for name, metrics in results.items():
+            print(f"  {name}: {metrics['connects_per_hour'] / per_seat['connects_per_hour']:.2f}x connects per hour, "
+                  f"agent idle {per_seat['agent_idle']:.0%} -> {metrics['agent_idle']:.0%}")
+            assert metrics["connects_per_hour"] > per_seat["connects_per_hour"], f"{scenario}: {name}"
+
+    # 7pm Pacific: calling hours close after one hour, retries come due after that
+    dialer, metrics = asyncio.run(run_campaign(
+        leads, args.targets[0], args.answer_rate, args, hours=2.0, window_start=WINDOW_START + 10 * 3600,
+        retry_hours=0.5,
+    ))
+    assert metrics["outside_hours"] > 0, "no attempt came due after calling hours"
+    print(f"\nwindow opening 1h before calling hours close: {metrics['dialed']} dialed, "
+          f"{metrics['outside_hours']} attempts held for the next day, none dialed late")
+
+
+if __name__ == "__main__":
+    main()
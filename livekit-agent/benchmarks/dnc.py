@@ -0,0 +1,244 @@
+"""
+Do Not Call index benchmark.
+
+Builds a snapshot of `--numbers` (default 5M) random US numbers plus 1%
+international ones, then measures:
+
+- size: snapshot file bytes per number, and the Bloom filter's false
+  positive rate (the share of absent numbers that reach the exact store)
+- checks: `contains` of "+1..." strings and `contains_key` of number keys,
+  for listed and absent numbers, as the time of a loop over `--checks`
+  numbers divided by the count; and `contains_many` over a segment of
+  "+1..." strings (as the dialer checks a segment) and `contains_keys`
+  over the same segment as number keys (Bloom filter first)
+- adds: `add` of `--adds` numbers (journal append under the file lock) and
+  how long a second index on the same directory - what another process
+  sees - takes to block them; then a rebuild that keeps them
+- sync: a full and an incremental `sync` against the fake backend (which
+  must only page the DNC leads, while as many other leads change too), and
+  a campaign that loses half its queued leads to the list before dialing
+- threads: a sync thread adding and compacting on the index the main
+  thread checks (as `DncSync` runs next to the dialer's event loop), while
+  numbers another process adds must be blocked on the next check
+
+    python -m benchmarks.dnc --numbers 5000000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.common import summarize
+from dialer import CampaignDialer, FakeDispatcher, load_segment
+from dnc import DncIndex, DncSnapshot, _bloom_positions, write_snapshot
+from fake_backend import FakeBackend
+from phones import number_key
+
+
+def microseconds(label: str, samples: list[float]) -> str:
+    s = summarize(samples)
+    return (f"{label:<32} n={s['n']:<7} p50={s['p50'] * 1e6:6.1f}us p99={s['p99'] * 1e6:6.1f}us "
+            f"max={s['max'] * 1e6:7.1f}us")
+
+
+def per_check(label: str, check, queries: list) -> float:
+    started = time.perf_counter()
+    for query in queries:
+        check(query)
+    seconds = (time.perf_counter() - started) / len(queries)
+    print(f"{label:<32} {seconds * 1e9:6.0f}ns/check")
+    return seconds
+
+
+class CountingTransport(httpx.ASGITransport):
+    """Counts the requests a sync makes."""
+
+    requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        return await super().handle_async_request(request)
+
+
+async def sync_and_dial(directory: str, args) -> None:
+    backend = FakeBackend(seed=args.seed, lead_count=args.leads)
+    transport = CountingTransport(app=backend)
+    options = {"api_base_url": "http://fake-backend", "transport": transport}
+    index = DncIndex(directory)
+    leads = list(backend.leads.values())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://fake-backend") as client:
+        for lead in leads[:args.leads // 10]:
+            await client.patch(f"/api/admin/leads/{lead['id']}", json={"status": "dnc"})
+        started = time.perf_counter()
+        added = await index.sync(**options)
+        print(f"full sync of {args.leads // 10:,} DNC leads: {(time.perf_counter() - started) * 1000:.0f}ms "
+              f"({added:,} numbers added)")
+        assert all(index.contains(lead["phone"]) for lead in leads[:args.leads // 10])
+
+        changes = leads[args.leads // 10:args.leads // 5]
+        for lead in changes:
+            await client.patch(f"/api/admin/leads/{lead['id']}", json={"status": "dnc"})
+        for lead in leads[args.leads // 5:args.leads * 3 // 10]:
+            await client.patch(f"/api/admin/leads/{lead['id']}", json={"notes": "called back"})
+        requests, started = transport.requests, time.perf_counter()
+        added = await index.sync(**options)
+        requests = transport.requests - requests
+        print(f"incremental sync of {len(changes):,} DNC changes: {(time.perf_counter() - started) * 1000:.0f}ms "
+              f"({added:,} numbers added, {requests} requests)")
+        assert all(index.contains(lead["phone"]) for lead in leads[:args.leads // 5])
+        assert requests <= -(-len(changes) // 100), "the incremental sync paged leads that are not DNC"
+
+    # Queued before their numbers went on the list: blocked at dispatch, never dialed
+    segment = await load_segment(status="new", **options)
+    dispatcher = FakeDispatcher(answer_rate=0.3, seed=args.seed, clock=lambda: 0.0, sleep=lambda s: asyncio.sleep(0))
+    dialer = CampaignDialer(
+        dispatcher, seats=20, max_lines=50, max_attempts=1, dnc=index, campaign="benchmark", calling_hours=None
+    )
+    dialer.add_leads(segment)
+    blocked = segment[::2]
+    for lead in blocked:
+        index.add(lead["phone"])
+    metrics = await dialer.run([])
+    assert all(dialer.progress[lead["id"]].attempts == 0 for lead in blocked), "a DNC number was dialed"
+    print(f"campaign of {len(segment):,} queued leads: {metrics['dialed']:,} dialed, "
+          f"{metrics['dnc_blocked']:,} blocked at dispatch")
+
+
+def concurrent_sync(directory: str, numbers: np.ndarray, rounds: int) -> None:
+    """
+    A sync thread adding and compacting on one index while the main thread
+    checks numbers another process (a second index) has just added.
+    """
+    index, other = DncIndex(directory), DncIndex(directory)
+    index.rebuild(numbers[:1000])
+    batches = np.array_split(numbers[1000:-rounds], rounds)
+    probes = numbers[-rounds:].tolist()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def sync() -> None:
+        try:
+            i = 0
+            while not stop.is_set():
+                index.add_keys(batches[i % rounds].tolist())
+                if i % 8 == 7:
+                    index.compact()
+                i += 1
+        except BaseException as e:
+            errors.append(e)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=sync)
+    thread.start()
+    started = time.perf_counter()
+    try:
+        for n in probes:
+            other.add(n)
+            assert index.contains_keys(np.array([n])).all(), "a number on the list was dialable"
+            assert index.contains_key(n), "a number on the list was dialable"
+    finally:
+        stop.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
+    assert not errors, errors
+    print(f"{len(probes):,} numbers added by another process, checked while a sync thread added and compacted: "
+          f"{time.perf_counter() - started:.2f}s, none missed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--numbers", type=int, default=5_000_000)
+    parser.add_argument("--checks", type=int, default=200_000, help="checks of each kind")
+    parser.add_argument("--adds", type=int, default=2_000)
+    parser.add_argument("--leads", type=int, default=2_000, help="fake backend leads for the sync runs")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = np.random.default_rng(args.seed)
+    drawn = np.unique(np.concatenate([
+        rng.integers(12_002_000_000, 19_999_999_999, int(args.numbers * 1.2)),
+        rng.integers(440_000_000_000, 449_999_999_999, args.numbers // 50),
+    ]))
+    drawn = rng.permutation(drawn)
+    numbers, absent = drawn[:args.numbers], drawn[args.numbers:]
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        path = os.path.join(directory, "snapshot.bin")
+        started = time.perf_counter()
+        write_snapshot(path, 1, numbers, np.zeros(0, np.int64))
+        written = time.perf_counter() - started
+        size = os.path.getsize(path)
+        print(f"write_snapshot x {numbers.size:,}: {written:.2f}s, {size / 1e6:.1f}MB "
+              f"({size / numbers.size:.2f} bytes/number)")
+
+        snapshot = DncSnapshot(path)
+        bloom = np.frombuffer(snapshot._bloom, dtype=np.uint64)
+        word, bits = _bloom_positions(absent, bloom.size)
+        false_positives = np.count_nonzero((bloom[word] & bits) == bits)
+        print(f"Bloom filter: {bloom.nbytes / 1e6:.1f}MB, false positive rate "
+              f"{false_positives / absent.size:.4f} over {absent.size:,} absent numbers")
+        assert np.array_equal(np.sort(snapshot.keys()), np.sort(numbers)), "snapshot keys differ"
+        del snapshot, bloom
+
+        index = DncIndex(directory)
+        index.rebuild(numbers)
+        listed = rng.choice(numbers, args.checks).tolist()
+        missing = rng.choice(absent, args.checks).tolist()
+        per_check("contains_key, absent", index.contains_key, missing)
+        per_check("contains_key, listed", index.contains_key, listed)
+        per_check("contains '+1...', absent", index.contains, [f"+{n}" for n in missing])
+        per_check("contains '+1...', listed", index.contains, [f"+{n}" for n in listed])
+        segment = [f"+{n}" for n in missing[:args.checks * 9 // 10] + listed[:args.checks // 10]]
+        started = time.perf_counter()
+        found = index.contains_many(segment)
+        seconds = (time.perf_counter() - started) / len(segment)
+        print(f"{'contains_many, 10% listed':<32} {seconds * 1e9:6.0f}ns/number")
+        assert np.count_nonzero(found) == args.checks // 10 and found[args.checks * 9 // 10:].all()
+        segment = np.array(missing[:args.checks * 9 // 10] + listed[:args.checks // 10])
+        started = time.perf_counter()
+        assert np.array_equal(index.contains_keys(segment), found)
+        seconds = (time.perf_counter() - started) / len(segment)
+        print(f"{'contains_keys, 10% listed':<32} {seconds * 1e9:6.0f}ns/number")
+        assert all(index.contains_key(n) for n in listed[:10_000])
+        assert not any(index.contains_key(n) for n in missing[:10_000])
+
+        other = DncIndex(directory)
+        other.contains_key(1)
+        adds, visible = [], []
+        for n in missing[:args.adds]:
+            started = time.perf_counter()
+            index.add(n)
+            added_at = time.perf_counter()
+            assert other.contains_key(n)
+            visible.append(time.perf_counter() - added_at)
+            adds.append(added_at - started)
+        print(microseconds(f"add x {args.adds:,}", adds))
+        print(microseconds("visible to another reader", visible))
+
+        started = time.perf_counter()
+        index.rebuild(numbers)
+        print(f"rebuild x {numbers.size:,} (journal folded in): {time.perf_counter() - started:.2f}s")
+        assert all(other.contains_key(n) for n in missing[:args.adds]), "a local addition was lost in the rebuild"
+        assert not other.contains_key(missing[args.adds])
+        assert number_key("(415) 555-0100") == 14155550100
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        asyncio.run(sync_and_dial(directory, args))
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        concurrent_sync(directory, absent[:args.adds * 20], rounds=args.adds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Latency-masking filler benchmark.
+
+Runs the masked sales and support tools against the fake backend and reports,
+per tool, the silence the caller hears before any audio - the full tool
+latency without fillers, or the time until the filler clip starts - along
+with how often each tool crossed its threshold and a filler played. Filler
+clips are synthetic tones in a temporary cache, played on a recording
+stand-in for `BackgroundAudioPlayer`.
+
+    python -m benchmarks.fillers --profile degraded --calls 100
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import struct
+import tempfile
+import time
+
+import httpx
+
+import support_agent
+import workflow
+from benchmarks.common import format_summary
+from benchmarks.tool_latency import PROFILES
+from fake_backend import FakeBackend
+from fillers import PLAYER_SAMPLE_RATE, filler_player
+from tts_cache import OPENAI_PCM_SAMPLE_RATE, TTSAudioCache
+from utterances import FILLER_CLIPS, SALES_VOICE, SUPPORT_VOICE
+
+SALES_CALL = {
+    "load_lead_context": lambda: workflow.load_lead_context(),
+    "schedule_demo": lambda: workflow.schedule_demo("2026-11-02", "10:30", "dana@example.com", "Dana", "Peak Climbing"),
+    "send_sms": lambda: workflow.send_sms("Here is the partner overview."),
+}
+SUPPORT_CALL = {
+    "get_partner_account": lambda: support_agent.get_partner_account(),
+    "check_integration_status": lambda: support_agent.check_integration_status(),
+    "create_support_ticket": lambda: support_agent.create_support_ticket("Widget", "Not showing"),
+}
+
+
+class _PlayHandle:
+    def __init__(self, task: asyncio.Task):
+        self._task = task
+
+    def done(self) -> bool:
+        return self._task.done()
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+
+class RecordingPlayer:
+    """Consumes clips like `BackgroundAudioPlayer.play` and records when each started."""
+
+    def __init__(self):
+        self.started: list[float] = []
+        self.frames = 0
+
+    def play(self, config) -> _PlayHandle:
+        self.started.append(time.perf_counter())
+
+        async def _consume():
+            async for frame in config.source:
+                assert frame.sample_rate == PLAYER_SAMPLE_RATE
+                self.frames += 1
+
+        return _PlayHandle(asyncio.ensure_future(_consume()))
+
+
+def _tone(seconds: float) -> bytes:
+    samples = int(seconds * OPENAI_PCM_SAMPLE_RATE)
+    return struct.pack(
+        f"<{samples}h",
+        *(int(6000 * math.sin(2 * math.pi * 330 * i / OPENAI_PCM_SAMPLE_RATE)) for i in range(samples)),
+    )
+
+
+async def run(profile_name: str, calls: int, seed: int, cache_dir: str):
+    cache = TTSAudioCache(cache_dir)
+    for voice in (SALES_VOICE, SUPPORT_VOICE):
+        for text in FILLER_CLIPS:
+            cache.put(text, voice, _tone(1.2))
+
+    backend = FakeBackend(seed=seed, default_profile=PROFILES[profile_name])
+    transport = httpx.ASGITransport(app=backend)
+    player = RecordingPlayer()
+    filler_player.cache = cache
+    # Tool calls in a real call are separated by conversation turns; don't let
+    # the cooldown hide threshold crossings here.
+    filler_player.cooldown = 0.0
+    filler_player.max_per_call = 10
+
+    silence: dict[str, dict[str, list[float]]] = {}
+    for i in range(calls):
+        lead_id = backend.lead_ids[i % len(backend.lead_ids)]
+        workflow.init_workflow(lead_id=lead_id, api_base_url="http://fake-backend", transport=transport)
+        support_agent.init_support_workflow(
+            partner_id=backend.partner_ids[i % len(backend.partner_ids)],
+            api_base_url="http://fake-backend",
+            transport=transport,
+        )
+
+        for voice, tools in ((SALES_VOICE, SALES_CALL), (SUPPORT_VOICE, SUPPORT_CALL)):
+            filler_player.reset()
+            filler_player.attach(player, voice)
+            for name, call in tools.items():
+                played = len(player.started)
+                start = time.perf_counter()
+                await call()
+                latency = time.perf_counter() - start
+                heard = player.started[played] - start if len(player.started) > played else latency
+                entry = silence.setdefault(name, {"without": [], "with": []})
+                entry["without"].append(latency)
+                entry["with"].append(heard)
+                filler_player.stop()  # the agent starts speaking the tool result
+            metrics = filler_player.metrics()
+            for name in tools:
+                entry = silence[name]
+                for key, value in metrics[name].items():
+                    if key != "fire_rate":
+                        entry.setdefault(key, 0)
+                        entry[key] += value
+            filler_player.detach()
+
+    return silence, player
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="degraded")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    for name in ("partnership-workflow", "partner-support-agent", "agent-resilience"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        silence, player = asyncio.run(run(args.profile, args.calls, args.seed, cache_dir))
+
+    print(f"\nProfile: {args.profile} ({args.calls} calls, {player.frames} filler frames played)")
+    for name, entry in silence.items():
+        print(f"{name}: slow {entry['slow']}/{entry['calls']}, fired {entry['fired']}, "
+              f"suppressed {entry['suppressed']}, uncached {entry['uncached']}")
+        print(format_summary("  silence without fillers", entry["without"]))
+        print(format_summary("  silence with fillers", entry["with"]))
+        assert max(entry["with"]) <= max(entry["without"]) + 1e-6
+
+
+if __name__ == "__main__":
+    main()
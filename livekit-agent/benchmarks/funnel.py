@@ -0,0 +1,204 @@
+"""
+Conversion funnel rollup benchmark.
+
+Generates `--events` (default 1M) dispositions and sentiment readings (one
+sentiment reading per call on average) spread over `--days` days, `--scripts`
+scripts and the business types, then measures:
+
+- record: `record_disposition` / `record_sentiment` into a `FunnelAggregator`
+  (hourly and daily windows), per event
+- flush: the rows and JSON bytes of one flush against the raw events as
+  communication-shaped JSON, and `FunnelStore.apply` of that flush
+- dashboard query: funnel, conversion and sentiment mix per script for the
+  last 7 days, by scanning the raw events (what the dashboard queries do
+  over communications) and from the daily rollups (`FunnelStore.query` +
+  `combine`), `--repeat` times each
+- end to end: flushes from several aggregators through the fake backend,
+  read back with `FunnelClient`; an aggregator left at the default never
+  posts, and one whose flushes keep failing keeps at most
+  `max_pending_rows`, the newest
+
+Every rollup answer is checked against the scan.
+
+    python -m benchmarks.funnel --events 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.common import format_summary
+from fake_backend import EndpointProfile, FakeBackend
+from funnel import DISPOSITIONS, SENTIMENTS, STAGES, FunnelAggregator, FunnelClient, FunnelStore, combine
+
+BUSINESS_TYPES = ("gym", "climbing", "rental", "adventure", "other")
+NOW = 1_790_000_000.0
+
+
+def generate(args, rng: np.random.Generator) -> list[tuple[str, str, str, str, float]]:
+    """(kind, value, script, business type, at) events, oldest first."""
+    sentiment = rng.random(args.events) < 0.5
+    dispositions = rng.choice(len(DISPOSITIONS), args.events, p=[0.1, 0.05, 0.02, 0.25, 0.3, 0.08, 0.12, 0.05, 0.03])
+    sentiments = rng.choice(len(SENTIMENTS), args.events, p=[0.1, 0.3, 0.35, 0.17, 0.08])
+    scripts = rng.integers(0, args.scripts, args.events)
+    business_types = rng.integers(0, len(BUSINESS_TYPES), args.events)
+    at = np.sort(NOW - rng.random(args.events) * args.days * 86400)
+    return [
+        ("sentiment", SENTIMENTS[v], f"script-{s + 1}", BUSINESS_TYPES[b], t) if is_sentiment
+        else ("disposition", DISPOSITIONS[d], f"script-{s + 1}", BUSINESS_TYPES[b], t)
+        for is_sentiment, d, v, s, b, t in zip(
+            sentiment.tolist(), dispositions.tolist(), sentiments.tolist(), scripts.tolist(),
+            business_types.tolist(), at.tolist(),
+        )
+    ]
+
+
+def scan(events: list[tuple[str, str, str, str, float]], since: float) -> dict[str, dict]:
+    """The dashboard query over raw events: funnel and sentiment counts per script since `since`."""
+    stage_of = {d: [stage for stage, dispositions in STAGES.items() if d in dispositions] for d in DISPOSITIONS}
+    result: dict[str, dict] = {}
+    for kind, value, script, _, at in events:
+        if at < since:
+            continue
+        counts = result.setdefault(script, {"funnel": dict.fromkeys(STAGES, 0), "sentiments": {}})
+        if kind == "disposition":
+            for stage in stage_of[value]:
+                counts["funnel"][stage] += 1
+        else:
+            counts["sentiments"][value] = counts["sentiments"].get(value, 0) + 1
+    return result
+
+
+def from_rollups(store: FunnelStore, since: float) -> dict[str, dict]:
+    return {
+        script: {"funnel": rollup.funnel, "sentiments": rollup.sentiments}
+        for script, rollup in combine(store.query("day", since=since), by="script").items()
+    }
+
+
+async def end_to_end(events: list, expected: dict[str, dict], args) -> None:
+    backend = FakeBackend(seed=args.seed, lead_count=1, partner_count=1)
+    transport = httpx.ASGITransport(app=backend)
+    aggregators = [
+        FunnelAggregator(api_base_url="http://fake-backend", transport=transport, flush_interval=1e9, flushing=True)
+        for _ in range(args.processes)
+    ]
+    flushes = []
+    # Each process sees a share of the calls and flushes once per simulated hour
+    for hour in range(int(args.days * 24)):
+        for aggregator in aggregators:
+            started = time.perf_counter()
+            await aggregator.flush()
+            flushes.append(time.perf_counter() - started)
+        cutoff = NOW - args.days * 86400 + (hour + 1) * 3600
+        while events and events[-1][4] < cutoff:
+            kind, value, script, business_type, at = events.pop()
+            aggregator = aggregators[int(script.split("-")[1]) % len(aggregators)]
+            if kind == "disposition":
+                aggregator.record_disposition(value, script, business_type, at)
+            else:
+                aggregator.record_sentiment(value, script, business_type, at)
+    for aggregator in aggregators:
+        await aggregator.flush()
+    flushes = [f for f in flushes if f > 0]
+    print(format_summary(f"flush through the fake backend x {len(flushes):,}", flushes))
+
+    client = FunnelClient("http://fake-backend", transport=transport)
+    started = time.perf_counter()
+    since = NOW - 7 * 86400
+    rollups = await client.read("day", since=time.strftime("%Y-%m-%dT00:00:00Z", time.gmtime(since)))
+    read = time.perf_counter() - started
+    await client.aclose()
+    print(f"FunnelClient.read of 7 daily windows: {read * 1000:.1f}ms ({len(rollups):,} rollups)")
+    rolled = {
+        script: {"funnel": rollup.funnel, "sentiments": rollup.sentiments}
+        for script, rollup in combine(rollups, by="script").items()
+    }
+    assert rolled == expected, "rollups flushed through the backend disagree with the scan"
+
+    # Flushing is off by default: nothing is posted and the counts are let go
+    posted = backend.stats["flush_funnel"].requests
+    aggregator = FunnelAggregator(api_base_url="http://fake-backend", transport=transport, flush_interval=1e9)
+    for hour in range(48):
+        aggregator.record_disposition("no_answer", "script-0", "gym", NOW - hour * 3600)
+    await aggregator.flush()
+    assert backend.stats["flush_funnel"].requests == posted and len(aggregator) == 0, "flushed with flushing off"
+
+    # A backend that keeps failing: the rows kept are capped, newest first
+    backend.configure("flush_funnel", EndpointProfile(error_rate=1.0))
+    aggregator = FunnelAggregator(api_base_url="http://fake-backend", transport=transport, flush_interval=1e9,
+                                  flushing=True, max_pending_rows=100)
+    for hour in range(24 * 30):
+        aggregator.record_disposition("no_answer", "script-0", "gym", NOW - hour * 3600)
+        if hour % 24 == 0:
+            await aggregator.flush()
+    await aggregator.flush()
+    oldest = min(start for _, start, _, _ in aggregator._rows)
+    assert len(aggregator) == 100 and oldest > NOW - 5 * 86400, "pending rows not capped to the newest"
+    print(f"flushing off: nothing posted; failing backend: {len(aggregator)} newest rows kept, "
+          f"{aggregator.dropped_rows:,} dropped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--scripts", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5, help="dashboard query runs")
+    parser.add_argument("--processes", type=int, default=8, help="agent processes flushing in the end-to-end run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    logging.getLogger("conversion-funnel").setLevel(logging.ERROR)  # the failing backend's flushes
+    rng = np.random.default_rng(args.seed)
+    events = generate(args, rng)
+
+    aggregator = FunnelAggregator(flush_interval=1e9, clock=lambda: NOW)
+    record = {"disposition": aggregator.record_disposition, "sentiment": aggregator.record_sentiment}
+    started = time.perf_counter()
+    for kind, value, script, business_type, at in events:
+        record[kind](value, script, business_type, at)
+    recorded = time.perf_counter() - started
+    print(f"record x {len(events):,}: {recorded:.2f}s ({recorded / len(events) * 1e9:.0f}ns/event), "
+          f"{len(aggregator):,} rows pending")
+
+    payload = json.dumps(aggregator.payload(aggregator._rows)).encode()
+    raw = sum(
+        len(json.dumps({"channel": "call", "disposition": value, "script": script, "businessType": business_type,
+                        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(at))}))
+        for kind, value, script, business_type, at in events[:10_000]
+    ) * len(events) / min(len(events), 10_000)
+    print(f"flush payload: {len(payload) / 1e6:.2f}MB for {len(aggregator):,} rows "
+          f"(raw events as JSON: {raw / 1e6:.0f}MB, {raw / len(payload):.0f}x)")
+
+    store = FunnelStore()
+    started = time.perf_counter()
+    store.apply(json.loads(payload))
+    print(f"FunnelStore.apply: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    since = NOW - 7 * 86400
+    since_day = since // 86400 * 86400
+    scans, reads = [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        scanned = scan(events, since_day)
+        scans.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        rolled = from_rollups(store, since_day)
+        reads.append(time.perf_counter() - started)
+    assert scanned == rolled, "rollups disagree with the scan"
+    print(format_summary("7-day funnel per script, scan", scans))
+    print(format_summary("7-day funnel per script, rollups", reads))
+    print(f"{'':<6}{min(scans) / min(reads):.0f}x faster from rollups")
+
+    asyncio.run(end_to_end(events[::-1], scanned, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cache invalidation propagation benchmark.
+
+Publishes `--leads` leads with `SharedCacheWriter`, starts an
+`InvalidationListener` on a free port and `--readers` job processes that
+map the cache. Then it pushes `--events` signed change events one at a
+time and measures, per event:
+
+- acknowledged: the webhook POST round trip (the entry is already
+  invalidated when the listener answers)
+- propagated: POST sent -> every reader process misses on the lead
+  (readers poll their current lead every `--poll-ms`)
+
+It also times one batch of 100 events, checks that unsigned and badly
+signed events are rejected, and that a refresh fetched before a change
+can't put the stale record back.
+
+    python -m benchmarks.invalidation --events 200 --readers 4
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import format_summary
+from invalidation import SIGNATURE_HEADER, InvalidationListener, sign
+from shared_cache import SharedCache, SharedCacheWriter
+
+SECRET = "benchmark-secret"
+
+
+def reader(directory: str, lead_ids: list[str], poll: float, ready, results) -> None:
+    """A job process: wait for each lead in turn to disappear, report when it did."""
+    cache = SharedCache(directory)
+    assert all(cache.get("lead", lead_id) is not None for lead_id in lead_ids)
+    ready.put(os.getpid())
+    seen = []
+    for lead_id in lead_ids:
+        while cache.get("lead", lead_id) is not None:
+            time.sleep(poll)
+        seen.append(time.perf_counter())
+    results.put(seen)
+
+
+def post(client: httpx.Client, url: str, events, secret: str | None = SECRET) -> httpx.Response:
+    body = json.dumps(events).encode()
+    headers = {"Content-Type": "application/json"}
+    if secret is not None:
+        headers[SIGNATURE_HEADER] = sign(body, secret)
+    return client.post(url, content=body, headers=headers)
+
+
+def bench_propagation(url: str, directory: str, lead_ids: list[str], readers: int, poll: float) -> None:
+    context = multiprocessing.get_context("spawn")
+    ready, results = context.Queue(), context.Queue()
+    processes = [context.Process(target=reader, args=(directory, lead_ids, poll, ready, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get(timeout=120)
+
+    sent, acknowledged = [], []
+    with httpx.Client() as client:
+        for lead_id in lead_ids:
+            started = time.perf_counter()
+            response = post(client, url, {"entity": "lead", "id": lead_id, "action": "updated"})
+            acknowledged.append(time.perf_counter() - started)
+            assert response.status_code == 200 and response.json()["invalidated"] == 1, response.text
+            sent.append(started)
+            # Let every reader see this event before the next one
+            time.sleep(poll * 3)
+    seen = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join()
+
+    propagated = [max(times[i] for times in seen) - sent[i] for i in range(len(lead_ids))]
+    print(format_summary("acknowledged (POST round trip)", acknowledged))
+    print(format_summary(f"propagated to {readers} readers", propagated))
+
+
+def bench_batch(client: httpx.Client, url: str, lead_ids: list[str]) -> None:
+    events = [{"entity": "lead", "id": lead_id} for lead_id in lead_ids]
+    started = time.perf_counter()
+    response = post(client, url, events)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200 and response.json()["invalidated"] == len(events), response.text
+    print(f"batch of {len(events)} events acknowledged in {elapsed * 1000:.1f}ms")
+
+
+def check_rejections(client: httpx.Client, url: str, listener: InvalidationListener, lead_id: str) -> None:
+    event = {"entity": "lead", "id": lead_id}
+    assert post(client, url, event, secret=None).status_code == 401
+    assert post(client, url, event, secret="wrong").status_code == 401
+    assert post(client, url, {"entity": "invoice", "id": lead_id}).status_code == 400
+    assert listener.writer.invalidate("lead", lead_id) is True, "rejected events must not invalidate"
+    print("unsigned, badly signed and unknown-entity events rejected")
+
+
+def check_refresh_race(writer: SharedCacheWriter, directory: str, lead_id: str, value: bytes) -> None:
+    """A refresh fetched before an invalidation must not resurrect the record."""
+    fetched_at = time.monotonic()
+    writer.invalidate("lead", lead_id)
+    writer.replace_namespace("lead", {lead_id: value}, fetched_at)
+    writer.publish()
+    assert SharedCache(directory).get("lead", lead_id) is None, "stale refresh resurrected the record"
+    writer.replace_namespace("lead", {lead_id: value}, time.monotonic())
+    writer.publish()
+    assert SharedCache(directory).get("lead", lead_id) is not None, "a later refresh must restore it"
+    print("refresh fetched before a change leaves the record out; the next one restores it")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leads", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=4, help="job processes watching the cache")
+    parser.add_argument("--poll-ms", type=float, default=1.0, help="reader lookup interval")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = random.Random(args.seed)
+    lead_ids = [f"lead_{i:06d}" for i in range(args.leads)]
+    record = json.dumps({"id": "lead", "businessName": "Summit Climbing"}).encode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = SharedCacheWriter(os.path.join(tmp, "cache"))
+        writer.replace_namespace("lead", {lead_id: record for lead_id in lead_ids})
+        writer.publish()
+        listener = InvalidationListener(writer, host="127.0.0.1", port=0, secret=SECRET)
+        listener.start()
+
+        sample = rng.sample(lead_ids, args.events + 101)
+        bench_propagation(listener.url, str(writer.directory), sample[:args.events], args.readers, args.poll_ms / 1000)
+        with httpx.Client() as client:
+            bench_batch(client, listener.url, sample[args.events:args.events + 100])
+            check_rejections(client, listener.url, listener, sample[-1])
+        check_refresh_race(writer, str(writer.directory), lead_ids[0], record)
+        print(f"listener metrics: {listener.metrics()}")
+        listener.stop()
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+API model decoding benchmark.
+
+Times turning a lead response body into the text `load_lead_context`
+returns, the way the tools did it (`json.loads`, unwrap `data`, format with
+`.get()` lookups) against `models.decode_response` into a `Lead` and its
+cached `summary`. Leads come back with their communication history, so it
+runs with `--communications` calls logged per lead, each with a transcript
+of `--turns` turns. The partner account and integration responses of the
+support agent are timed the same way. Every summary is checked against the
+dict path's text.
+
+    python -m benchmarks.models --communications 0 10 100
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from fake_backend import FakeBackend
+from models import Lead, Partner, PartnerIntegration, decode_response
+
+
+# The dict path as the tools had it
+def format_lead(lead: dict) -> str:
+    return f"""Lead Information:
+- Name: {lead.get('firstName', '')} {lead.get('lastName', '')}
+- Business: {lead.get('businessName', 'Unknown')} ({lead.get('businessType', 'Unknown type')})
+- Email: {lead.get('email', '')}
+- Phone: {lead.get('phone', '')}
+- Location: {lead.get('city', '')}, {lead.get('state', '')}
+- Interest Level: {lead.get('interestLevel', 'cold')}
+- Status: {lead.get('status', 'new')}
+- Source: {lead.get('source', 'Unknown')}
+- Estimated Daily Visitors: {lead.get('estimatedParticipants', 'Unknown')}"""
+
+
+def format_partner(partner: dict) -> str:
+    return f"""
+Partner Account Details:
+- Business: {partner.get('businessName', 'Unknown')}
+- Plan: {partner.get('plan', 'Standard')}
+- Status: {partner.get('status', 'Active')}
+- Integration: {partner.get('integrationStatus', 'Pending')}
+- Commission Rate: {partner.get('commissionRate', '15')}%
+- Total Policies Sold: {partner.get('totalPolicies', 0)}
+"""
+
+
+def format_integration(data: dict) -> str:
+    return f"""
+Integration Status:
+- Widget Installed: {'Yes' if data.get('widgetInstalled') else 'No'}
+- API Key Generated: {'Yes' if data.get('apiKeyGenerated') else 'No'}
+- Webhooks Configured: {'Yes' if data.get('webhooksConfigured') else 'No'}
+- Domain Whitelisted: {'Yes' if data.get('domainWhitelisted') else 'No'}
+- Test Mode Completed: {'Yes' if data.get('testCompleted') else 'No'}
+- Live Mode Enabled: {'Yes' if data.get('liveEnabled') else 'No'}
+
+Last Activity: {data.get('lastActivity', 'Unknown')}
+"""
+
+
+def dict_path(body: bytes, format_fn) -> str:
+    payload = json.loads(body)
+    return format_fn(payload.get("data", payload))
+
+
+def lead_body(backend: FakeBackend, communications: int, turns: int, rng: random.Random) -> bytes:
+    """A GET /api/admin/leads/{id} body as the backend returns it."""
+    lead = backend.leads[backend.lead_ids[0]]
+    history = []
+    for i in range(communications):
+        transcript = [
+            {"speaker": "agent" if t % 2 == 0 else "prospect",
+             "text": rng.choice(["Do you have a quick minute?", "We already have insurance.",
+                                 "How does the commission work?", "Send it over by email."]),
+             "timestamp": f"2026-03-02T15:{t % 60:02d}:00"}
+            for t in range(turns)
+        ]
+        history.append({
+            "id": f"comm-{i}", "leadId": lead["id"], "channel": "call", "direction": "outbound",
+            "callDuration": 60 + i, "disposition": "callback_requested",
+            "callSummary": "Asked for a callback next week.", "callTranscript": json.dumps(transcript),
+            "agentId": "sarah-voice-agent", "createdAt": f"2026-03-{1 + i % 28:02d}T15:00:00",
+        })
+    return json.dumps({"success": True, "data": {**lead, "communications": history}}).encode()
+
+
+def _time(fn, runs: int) -> tuple[float, str]:
+    started = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return (time.perf_counter() - started) / runs, result
+
+
+def report(label: str, body: bytes, format_fn, model, runs: int) -> None:
+    dict_seconds, expected = _time(lambda: dict_path(body, format_fn), runs)
+    model_seconds, text = _time(lambda: decode_response(body, model).summary, runs)
+    record = decode_response(body, model)
+    record.summary
+    cached_seconds, _ = _time(lambda: record.summary, runs)
+    assert text == expected, f"{label}: summary differs from the dict path"
+    print(f"{label:<32} {len(body):>9,} {dict_seconds * 1e6:>9.1f}us {model_seconds * 1e6:>9.1f}us "
+          f"{dict_seconds / model_seconds:>6.1f}x {cached_seconds * 1e9:>8.0f}ns")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--communications", type=int, nargs="+", default=[0, 10, 100],
+                        help="calls in the lead's history")
+    parser.add_argument("--turns", type=int, default=60, help="transcript turns per call")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = random.Random(args.seed)
+    backend = FakeBackend(seed=args.seed, lead_count=1, partner_count=1)
+
+    print(f"{'response':<32} {'bytes':>9} {'dict path':>11} {'models':>11} {'speedup':>7} {'cached':>10}")
+    for count in args.communications:
+        body = lead_body(backend, count, args.turns, rng)
+        runs = max(args.runs // max(count, 1), 20)
+        report(f"lead, {count} calls in history", body, format_lead, Lead, runs)
+
+    partner = backend.partners[backend.partner_ids[0]]
+    body = json.dumps({"success": True, "data": {k: v for k, v in partner.items() if k != "integration"}}).encode()
+    report("partner account", body, format_partner, Partner, args.runs)
+    body = json.dumps({"success": True, "data": partner["integration"]}).encode()
+    report("partner integration", body, format_integration, PartnerIntegration, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Pipeline mode comparison benchmark.
+
+Runs the same scripted sales conversation through the three pipeline modes
+of `agent_core` - realtime, hybrid and cascade - with the models built by
+`agent_core.build_pipeline`, pointed at `fake_realtime.FakeRealtimeServer`
+(realtime websocket plus transcription, chat and speech endpoints). The fake
+runs in a separate process, so the CPU time reported is the agent side
+only: resampling and encoding caller audio, the websocket and HTTP clients,
+parsing streamed tokens and decoding reply audio.
+
+Per caller turn, from the end of the caller's speech:
+
+- realtime: first audio from the realtime model
+- hybrid: first text token and first sentence from the realtime model, then
+  first audio from TTS for that sentence
+- cascade: transcript from STT, first token and first sentence from the LLM,
+  then first audio from TTS for that sentence
+
+Caller audio is pushed faster than real time; only the stages after the end
+of speech are timed.
+
+    python -m benchmarks.pipeline_modes --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import re
+import socket
+import time
+
+from livekit import rtc
+from livekit.agents import llm
+
+from agent_core import PipelineMode, build_pipeline
+from benchmarks.common import format_summary
+from fake_realtime import FakeRealtimeServer
+from prompts import PROMPTS
+from utterances import SALES_VOICE
+
+SAMPLE_RATE = 48000
+FRAME_MS = 20
+
+# (caller transcript, seconds of caller speech, agent reply)
+SCRIPT = [
+    ("Yes, I have a couple of minutes.", 1.5,
+     "Great, thanks Dana. What kind of business are you running at Peak Climbing?"),
+    ("We're a climbing gym, two locations, about three hundred visitors a day.", 3.5,
+     "That's a great fit. Partners your size usually offer day-pass coverage to first-timers."),
+    ("We already have insurance though.", 1.5,
+     "Totally, and you should. This is participant coverage that members buy themselves, so it protects your policy."),
+    ("Okay, how much does it cost us?", 1.5,
+     "Nothing at all. You earn a commission on every policy, and members pay about five dollars a day."),
+    ("Sounds good, can we set up a demo?", 1.5,
+     "For sure. Does Tuesday at ten work for a fifteen-minute demo?"),
+]
+
+_SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+
+def _caller_audio(seconds: float) -> list[rtc.AudioFrame]:
+    samples = SAMPLE_RATE * FRAME_MS // 1000
+    return [
+        rtc.AudioFrame(bytes(samples * 2), SAMPLE_RATE, 1, samples)
+        for _ in range(int(seconds * 1000 / FRAME_MS))
+    ]
+
+
+def _serve(port: int, options: dict) -> None:
+    async def run():
+        async with FakeRealtimeServer(port=port, **options):
+            await asyncio.Event().wait()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+class TurnTimer:
+    """Stage timestamps for one turn, relative to the end of caller speech."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.stages: dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        self.stages.setdefault(stage, time.perf_counter() - self.start)
+
+
+async def _first_sentence(text_stream, timer: TurnTimer) -> tuple[str, asyncio.Task]:
+    """Read text until the first sentence ends; the rest is drained in the background."""
+    text = ""
+    async for delta in text_stream:
+        timer.mark("first token")
+        text += delta
+        if _SENTENCE_END.search(text):
+            break
+    timer.mark("first sentence")
+
+    async def drain():
+        async for _ in text_stream:
+            pass
+
+    return text, asyncio.ensure_future(drain())
+
+
+async def _tts_first_audio(tts, text: str, timer: TurnTimer) -> None:
+    async with tts.synthesize(text) as stream:
+        async for _ in stream:
+            timer.mark("first audio")
+
+
+async def _realtime_turn(rt_session, seconds: float, tts) -> TurnTimer:
+    for frame in _caller_audio(seconds):
+        rt_session.push_audio(frame)
+    timer = TurnTimer()
+    rt_session.commit_audio()
+    generation = await rt_session.generate_reply()
+    async for message in generation.message_stream:
+        if tts is None:
+            async for _ in message.audio_stream:
+                timer.mark("first audio")
+            async for _ in message.text_stream:
+                pass
+        else:
+            sentence, rest = await _first_sentence(message.text_stream, timer)
+            await _tts_first_audio(tts, sentence, timer)
+            await rest
+    return timer
+
+
+async def _cascade_turn(pipeline, chat_ctx: llm.ChatContext, seconds: float) -> TurnTimer:
+    frames = _caller_audio(seconds)
+    timer = TurnTimer()
+    event = await pipeline.stt.recognize(frames)
+    timer.mark("transcript")
+    chat_ctx.add_message(role="user", content=event.alternatives[0].text)
+
+    async def text_stream():
+        async with pipeline.llm.chat(chat_ctx=chat_ctx) as stream:
+            async for chunk in stream:
+                if chunk.delta and chunk.delta.content:
+                    yield chunk.delta.content
+
+    stream = text_stream()
+    sentence, rest = await _first_sentence(stream, timer)
+    await _tts_first_audio(pipeline.tts, sentence, timer)
+    await rest
+    chat_ctx.add_message(role="assistant", content=sentence)
+    return timer
+
+
+async def run_mode(mode: PipelineMode, base_url: str, rounds: int) -> list[tuple[dict[str, float], float]]:
+    """Returns (stage latencies, agent CPU seconds) per caller turn."""
+    # The script marks the end of each caller turn, so cascade mode gets a
+    # placeholder instead of loading Silero VAD
+    pipeline = build_pipeline(mode, SALES_VOICE, vad_model=object(), base_url=base_url, api_key="fake")
+    instructions = PROMPTS.render("sales.discovery")
+    turns: list[tuple[dict[str, float], float]] = []
+
+    if mode == PipelineMode.CASCADE:
+        for _ in range(rounds):
+            chat_ctx = llm.ChatContext()
+            chat_ctx.add_message(role="system", content=instructions)
+            for _caller, seconds, _reply in SCRIPT:
+                timer = await _cascade_turn(pipeline, chat_ctx, seconds)
+                turns.append((timer.stages, time.process_time() - timer.cpu_start))
+        await pipeline.stt.aclose()
+        await pipeline.tts.aclose()
+        await pipeline.llm.aclose()
+        return turns
+
+    for _ in range(rounds):
+        rt_session = pipeline.llm.session()
+        await rt_session.update_instructions(instructions)
+        for _caller, seconds, _reply in SCRIPT:
+            timer = await _realtime_turn(rt_session, seconds, pipeline.tts)
+            turns.append((timer.stages, time.process_time() - timer.cpu_start))
+        await rt_session.aclose()
+    if pipeline.tts is not None:
+        await pipeline.tts.aclose()
+    await pipeline.llm.aclose()
+    return turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5, help="times the script is replayed per mode")
+    parser.add_argument("--modes", nargs="+", choices=[m.value for m in PipelineMode], default=[m.value for m in PipelineMode])
+    parser.add_argument("--realtime-first-delay", type=float, default=0.3)
+    parser.add_argument("--stt-delay", type=float, default=0.25)
+    parser.add_argument("--llm-first-token-delay", type=float, default=0.35)
+    parser.add_argument("--tts-first-audio-delay", type=float, default=0.2)
+    parser.add_argument("--token-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    options = {
+        "connect_delay": 0.0,
+        "session_update_delay": 0.0,
+        "first_audio_delay": args.realtime_first_delay,
+        "stt_delay": args.stt_delay,
+        "llm_first_token_delay": args.llm_first_token_delay,
+        "tts_first_audio_delay": args.tts_first_audio_delay,
+        "token_interval": args.token_interval,
+        "transcripts": [caller for caller, _, _ in SCRIPT],
+        "replies": [reply for _, _, reply in SCRIPT],
+    }
+
+    print(f"\nFake provider: realtime first delta {args.realtime_first_delay}s, STT {args.stt_delay}s, "
+          f"LLM first token {args.llm_first_token_delay}s, TTS first audio {args.tts_first_audio_delay}s, "
+          f"{args.token_interval * 1000:g}ms per token; {len(SCRIPT)} turns x {args.rounds} rounds")
+
+    for mode in map(PipelineMode, args.modes):
+        port = _free_port()
+        server = multiprocessing.get_context("spawn").Process(target=_serve, args=(port, options), daemon=True)
+        server.start()
+        try:
+            asyncio.run(_wait_for_port(port))
+            turns = asyncio.run(run_mode(mode, f"http://127.0.0.1:{port}/v1", args.rounds))
+        finally:
+            server.terminate()
+            server.join()
+
+        print(f"\n{mode.value}")
+        stage_names = list(dict.fromkeys(name for stages, _ in turns for name in stages))
+        for name in stage_names:
+            print(format_summary(f"  {name}", [stages[name] for stages, _ in turns if name in stages]))
+        assert all("first audio" in stages for stages, _ in turns), f"{mode.value}: a turn produced no audio"
+        cpu = [seconds for _, seconds in turns]
+        print(f"  agent CPU per turn: mean {sum(cpu) / len(cpu) * 1000:.1f}ms, max {max(cpu) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
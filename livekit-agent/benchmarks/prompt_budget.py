@@ -0,0 +1,69 @@
+"""
+Prompt budget check.
+
+Reports size and token count for every prompt in `prompts.PROMPTS`, whether
+its static prefix is long enough for provider-side prompt caching, and
+verifies that per-call rendering never changes the static prefix. Exits
+non-zero if a prompt is over its token budget or the prefix is unstable.
+
+    python -m benchmarks.prompt_budget
+"""
+
+import sys
+import time
+
+from prompts import CACHEABLE_PREFIX_TOKENS, PROMPTS, count_tokens
+
+CALL_CONTEXTS = [
+    {"Lead name": "Dana", "Business": "Peak Climbing", "Call direction": "outbound"},
+    {"Lead name": "Sam", "Business": "Harbor Kayak Tours", "Call direction": "inbound"},
+    {"Partner": "Summit Fitness"},
+]
+
+
+def main() -> None:
+    try:
+        import tiktoken  # noqa: F401
+
+        method = "tiktoken o200k_base"
+    except ImportError:
+        method = "estimate, 4 chars/token (pip install tiktoken for exact counts)"
+
+    print(f"Token counts: {method}\n")
+    print(f"{'prompt':<20} {'chars':>7} {'tokens':>7} {'budget':>7}  cacheable  status")
+
+    failures = []
+    for name in PROMPTS.names:
+        prompt = PROMPTS.get(name)
+        tokens = count_tokens(prompt)
+        budget = PROMPTS.budget(name)
+        over = tokens > budget
+        cacheable = "yes" if tokens >= CACHEABLE_PREFIX_TOKENS else "no"
+        print(f"{name:<20} {len(prompt):>7} {tokens:>7} {budget:>7}  {cacheable:<9}  {'OVER' if over else 'ok'}")
+        if over:
+            failures.append(f"{name}: {tokens} tokens > budget {budget}")
+
+        if PROMPTS.get(name) is not prompt:
+            failures.append(f"{name}: recomposed on a second get()")
+        for context in CALL_CONTEXTS:
+            if not PROMPTS.render(name, context).startswith(prompt):
+                failures.append(f"{name}: per-call context changed the static prefix")
+                break
+
+    iterations = 100_000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        PROMPTS.render("sales", CALL_CONTEXTS[0])
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"\nrender('sales', context): {per_call_us:.2f}us per call")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll prompts within budget with stable prefixes")
+
+
+if __name__ == "__main__":
+    main()
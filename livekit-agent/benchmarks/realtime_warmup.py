@@ -0,0 +1,128 @@
+"""
+Realtime session warm-up benchmark.
+
+Measures answer-to-first-response latency - from the callee picking up to
+the first audio frame of the greeting - against `fake_realtime.FakeRealtimeServer`:
+
+- cold: the realtime session is created and configured (instructions,
+  tools, voice, turn detection) only after the answer, as before
+- warm: the session is created when the job starts and configured while
+  the phone rings (`warmup.start_before_answer`)
+
+    python -m benchmarks.realtime_warmup --calls 20 --connect-delay 0.4
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from livekit.plugins import openai
+from openai.types.realtime import realtime_audio_input_turn_detection
+
+from benchmarks.common import format_summary
+from fake_realtime import FakeRealtimeServer
+from prompts import PROMPTS
+from utterances import SALES_VOICE, sales_greeting
+from workflow import ALL_TOOLS
+
+SYSTEM_PROMPT = PROMPTS.get("sales")
+
+GREETING = f"Greet the prospect warmly. Say: '{sales_greeting('outbound', 'Dana', 'Peak Climbing')}'"
+
+
+def _model(server: FakeRealtimeServer) -> openai.realtime.RealtimeModel:
+    # Same configuration as agent.py
+    return openai.realtime.RealtimeModel(
+        model="gpt-4o-realtime-preview",
+        base_url=server.base_url,
+        api_key="fake",
+        voice=SALES_VOICE,
+        modalities=["audio", "text"],
+        turn_detection=realtime_audio_input_turn_detection.SemanticVad(
+            type="semantic_vad",
+            eagerness="auto",
+            create_response=True,
+            interrupt_response=True,
+        ),
+    )
+
+
+async def _open(model: openai.realtime.RealtimeModel):
+    rt_session = model.session()
+    await rt_session.update_instructions(SYSTEM_PROMPT)
+    await rt_session.update_tools(list(ALL_TOOLS))
+    return rt_session
+
+
+async def _first_audio(rt_session) -> None:
+    generation = await rt_session.generate_reply(instructions=GREETING)
+    async for message in generation.message_stream:
+        async for _frame in message.audio_stream:
+            return
+
+
+async def simulate_call(server: FakeRealtimeServer, ring_seconds: float, warm: bool) -> float:
+    server.reset()
+    model = _model(server)
+    rt_session = await _open(model) if warm else None
+
+    await asyncio.sleep(ring_seconds)
+    if warm:
+        # Everything the model needs must be configured before the answer
+        audio = server.session.get("audio", {})
+        assert server.session.get("instructions") == SYSTEM_PROMPT, "instructions not configured"
+        assert len(server.session.get("tools", [])) == len(ALL_TOOLS), "tools not configured"
+        assert audio.get("output", {}).get("voice") == SALES_VOICE, "voice not configured"
+        assert audio.get("input", {}).get("turn_detection", {}).get("type") == "semantic_vad", "turn detection not configured"
+
+    answered_at = time.perf_counter()
+    if rt_session is None:
+        rt_session = await _open(model)
+    await _first_audio(rt_session)
+    latency = time.perf_counter() - answered_at
+
+    await rt_session.aclose()
+    await model.aclose()
+    return latency
+
+
+async def run(calls: int, ring_seconds: float, server_options: dict) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {"cold": [], "warm": []}
+    async with FakeRealtimeServer(**server_options) as server:
+        for _ in range(calls):
+            for mode in samples:
+                samples[mode].append(await simulate_call(server, ring_seconds, warm=mode == "warm"))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--ring-seconds", type=float, default=1.5)
+    parser.add_argument("--connect-delay", type=float, default=0.4)
+    parser.add_argument("--session-update-delay", type=float, default=0.1)
+    parser.add_argument("--first-audio-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    samples = asyncio.run(
+        run(
+            args.calls,
+            args.ring_seconds,
+            {
+                "connect_delay": args.connect_delay,
+                "session_update_delay": args.session_update_delay,
+                "first_audio_delay": args.first_audio_delay,
+            },
+        )
+    )
+
+    print(f"\nFake realtime: connect {args.connect_delay}s, session.update {args.session_update_delay}s, "
+          f"first audio {args.first_audio_delay}s, ring {args.ring_seconds}s")
+    print(format_summary("answer-to-first-response (cold)", samples["cold"]))
+    print(format_summary("answer-to-first-response (warm)", samples["warm"]))
+
+
+if __name__ == "__main__":
+    main()
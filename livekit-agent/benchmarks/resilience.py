@@ -0,0 +1,152 @@
+"""
+Circuit breaker and hedged request benchmark against the fake backend.
+
+Two scenarios, each run with and without the resilience layer:
+
+- slow tail: `get_lead` / `get_partner` answer in ~40ms but 8% of requests
+  stall for 2s. Hedging should cut p99 to roughly the hedge delay.
+- outage: `update_lead` fails every request after 1s. The breaker should
+  open after a handful of failures and reject the rest immediately.
+
+Also checks that a hedge answering with a fast 5xx doesn't beat a slower
+200 from the first attempt.
+
+    python -m benchmarks.resilience --iterations 200
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+import support_agent
+import workflow
+from benchmarks.common import format_summary, percentile
+from distributions import LatencyDistribution
+from fake_backend import EndpointProfile, FakeBackend
+from resilience import HedgeStats, backend_guards, hedged, is_server_error
+
+SLOW_TAIL = EndpointProfile(
+    latency=LatencyDistribution.lognormal(median=0.04, sigma=0.25),
+    slow_tail_rate=0.08,
+    slow_tail_seconds=2.0,
+)
+OUTAGE = EndpointProfile(latency=LatencyDistribution.fixed(1.0), error_rate=1.0)
+
+# Baseline: a breaker that never opens and no hedging.
+UNGUARDED = {"failure_threshold": 10**9, "hedging": False}
+GUARDED = {"failure_threshold": 5, "recovery_timeout": 30.0}
+
+
+def _init(backend: FakeBackend) -> None:
+    transport = httpx.ASGITransport(app=backend)
+    workflow.init_workflow(lead_id=backend.lead_ids[0], api_base_url="http://fake-backend", transport=transport)
+    support_agent.init_support_workflow(
+        partner_id=backend.partner_ids[0], api_base_url="http://fake-backend", transport=transport
+    )
+
+
+async def slow_tail(iterations: int, guard_options: dict, seed: int) -> dict[str, list[float]]:
+    backend_guards.configure(**guard_options)
+    backend = FakeBackend(seed=seed)
+    backend.configure("get_lead", SLOW_TAIL)
+    backend.configure("get_partner", SLOW_TAIL)
+    _init(backend)
+
+    samples: dict[str, list[float]] = {"load_lead_context": [], "get_partner_account": []}
+    for _ in range(iterations):
+        for name, call in (
+            ("load_lead_context", workflow.load_lead_context),
+            ("get_partner_account", support_agent.get_partner_account),
+        ):
+            start = time.perf_counter()
+            await call()
+            samples[name].append(time.perf_counter() - start)
+    return samples
+
+
+async def outage(iterations: int, guard_options: dict, seed: int) -> tuple[float, int]:
+    backend_guards.configure(**guard_options)
+    backend = FakeBackend(seed=seed)
+    backend.configure("update_lead", OUTAGE)
+    _init(backend)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await workflow.add_to_dnc_list("benchmark")
+    return time.perf_counter() - start, backend.stats["update_lead"].requests
+
+
+async def fast_server_error() -> None:
+    """A hedge that fails fast must not beat a slower success, nor hide a failure."""
+
+    def attempts(*plan: tuple[float, int]):
+        responses = iter(plan)
+
+        async def attempt() -> httpx.Response:
+            seconds, status = next(responses)
+            await asyncio.sleep(seconds)
+            return httpx.Response(status)
+
+        return attempt
+
+    stats = HedgeStats()
+    response = await hedged(attempts((0.2, 200), (0.01, 503)), 0.05, stats, is_server_error)
+    assert response.status_code == 200 and stats.hedge_wins == 0, "a fast 5xx from the hedge won"
+    response = await hedged(attempts((0.2, 502), (0.01, 503)), 0.05, stats, is_server_error)
+    assert response.status_code == 502, "both attempts failed but a success was reported"
+    print("hedge answering 503 fast: waited for the first attempt's 200")
+
+
+async def run(iterations: int, outage_iterations: int, seed: int) -> None:
+    await fast_server_error()
+
+    print("== Slow tail (8% of reads stall for 2s) ==")
+    results = {}
+    for label, options in (("unguarded", UNGUARDED), ("guarded", GUARDED)):
+        samples = await slow_tail(iterations, options, seed)
+        results[label] = samples
+        for name, values in samples.items():
+            print(format_summary(f"{label}/{name}", values))
+        if label == "guarded":
+            for name, metrics in backend_guards.metrics().items():
+                print(
+                    f"  {name}: state={metrics['state']} hedges={metrics['hedges_sent']} "
+                    f"hedge_win_rate={metrics['hedge_win_rate']:.0%} hedge_delay={metrics['hedge_delay'] * 1000:.0f}ms"
+                )
+
+    for name in ("load_lead_context", "get_partner_account"):
+        before = percentile(results["unguarded"][name], 99)
+        after = percentile(results["guarded"][name], 99)
+        assert after < before, f"hedging did not improve {name} p99 ({after:.3f}s vs {before:.3f}s)"
+
+    print(f"\n== Outage (update_lead fails after 1s, {outage_iterations} calls) ==")
+    totals = {}
+    for label, options in (("unguarded", UNGUARDED), ("guarded", GUARDED)):
+        elapsed, requests = await outage(outage_iterations, options, seed)
+        totals[label] = elapsed
+        print(f"{label:<10} total={elapsed:6.2f}s backend_requests={requests}")
+    print(f"  breaker: {backend_guards.metrics()['update_lead']}")
+
+    assert backend_guards.metrics()["update_lead"]["state"] == "open"
+    assert totals["guarded"] < totals["unguarded"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--outage-iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    for name in ("httpx", "partnership-workflow", "partner-support-agent", "agent-resilience"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    asyncio.run(run(args.iterations, args.outage_iterations, args.seed))
+
+
+if __name__ == "__main__":
+    main()
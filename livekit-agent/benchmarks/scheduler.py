@@ -0,0 +1,290 @@
+"""
+Scheduled actions executor benchmark.
+
+With `--actions` (default 1M) actions due over `--days`:
+
+1. Structures: add every action, cancel `--cancel-share` of them and drain
+   the rest in due order, with `scheduler.TimerWheel` versus a heapq with
+   cancelled-id tombstones
+2. Restart: bulk-load `scheduler.ActionStore`, then reopen it and restore
+   the executor (next `--horizon` only) versus reading every pending row
+   back into a heap
+3. Change feed: cancels and reschedules made through the fake backend's
+   `/api/admin/scheduled-actions` reach the wheel in one incremental sync
+4. Firing: the executor runs for `--run-minutes` of simulated time
+   (`--speed`x) on the full store; firing lag versus the 5 minute cron
+5. Claims: two executors on the same fake backend fire the same
+   `--claim-actions` due actions; each must run exactly once
+
+    python -m benchmarks.scheduler --actions 1000000
+"""
+
+import argparse
+import asyncio
+import gc
+import heapq
+import json
+import logging
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import format_summary
+from fake_backend import FakeBackend
+from scheduler import ActionExecutor, ActionStore, ScheduledActionsAPI, TimerWheel, _iso
+
+CRON_INTERVAL = 300.0
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def bench_structures(dues: list[float], cancel: list[int], tick: float) -> None:
+    n = len(dues)
+    ids = [f"a{i:07d}" for i in range(n)]
+
+    def wheel_run():
+        wheel = TimerWheel(tick)
+        for action_id, due in zip(ids, dues):
+            wheel.add(action_id, due, action_id)
+        added = time.perf_counter()
+        for i in cancel:
+            wheel.cancel(ids[i])
+        cancelled = time.perf_counter()
+        fired = 0
+        now = min(dues)
+        while wheel:
+            fired += len(wheel.pop_due(now))
+            now += 60.0
+        return fired, added, cancelled
+
+    def heap_run():
+        heap: list[tuple[float, str]] = []
+        for action_id, due in zip(ids, dues):
+            heapq.heappush(heap, (due, action_id))
+        added = time.perf_counter()
+        tombstones = set()
+        for i in cancel:
+            tombstones.add(ids[i])
+        cancelled = time.perf_counter()
+        fired = 0
+        now = min(dues)
+        while heap:
+            while heap and heap[0][0] <= now:
+                _, action_id = heapq.heappop(heap)
+                if action_id not in tombstones:
+                    fired += 1
+            now += 60.0
+        return fired, added, cancelled
+
+    print(f"\n1. Structures ({n:,} actions, {len(cancel):,} cancelled, drained minute by minute)")
+    print(f"{'':<16} {'add':>12} {'cancel':>12} {'drain':>12}")
+    for name, run in (("timer wheel", wheel_run), ("heap+tombstones", heap_run)):
+        gc.collect()
+        started = time.perf_counter()
+        fired, added, cancelled = run()
+        done = time.perf_counter()
+        assert fired == n - len(cancel), f"{name}: fired {fired}"
+        print(f"{name:<16} {(added - started) / n * 1e9:>10.0f}ns {(cancelled - added) / len(cancel) * 1e9:>10.0f}ns "
+              f"{(done - cancelled) / fired * 1e9:>10.0f}ns")
+    print("(per action; the heap keeps cancelled entries until they come due, the wheel drops them)")
+
+
+def _rows(n: int, start: float, span: float, rng: random.Random):
+    kinds = ("call", "sms", "email")
+    for i in range(n):
+        due = start + rng.random() * span
+        action_id = f"a{i:07d}"
+        body = json.dumps({
+            "id": action_id, "leadId": f"lead-{i % 5000}", "actionType": kinds[i % 3],
+            "scheduledFor": _iso(due), "status": "pending", "attempts": 0, "maxAttempts": 3,
+        })
+        yield action_id, due, body
+
+
+def bench_restart(path: Path, n: int, start: float, span: float, horizon: float, seed: int) -> None:
+    print(f"\n2. Restart ({n:,} pending actions over {span / 86400:g} days, horizon {horizon:g}s)")
+    store = ActionStore(path)
+    _, load = _timed(store.upsert, _rows(n, start, span, random.Random(seed)))
+    store.close()
+    print(f"bulk load into SQLite: {load:.1f}s ({n / load:,.0f} actions/s), {path.stat().st_size / 1e6:.0f}MB")
+
+    def restore():
+        executor = ActionExecutor({}, store=ActionStore(path), horizon=horizon, clock=lambda: start)
+        loaded = executor.restore()
+        executor.store.close()
+        return loaded
+
+    def full_rescan():
+        db = ActionStore(path)
+        heap = [(due, action_id, json.loads(body)) for action_id, due, body in
+                db._db.execute("SELECT id, due, body FROM actions WHERE state = 'pending'")]
+        heapq.heapify(heap)
+        db.close()
+        return len(heap)
+
+    gc.collect()
+    loaded, restore_seconds = _timed(restore)
+    gc.collect()
+    rescanned, rescan_seconds = _timed(full_rescan)
+    assert rescanned == n and 0 < loaded < n
+    print(f"restore next horizon:  {restore_seconds * 1000:8.1f}ms ({loaded:,} actions into the wheel)")
+    print(f"full rescan into heap: {rescan_seconds * 1000:8.1f}ms ({rescanned:,} actions)")
+
+
+async def bench_change_feed(path: Path, count: int, changes: int, seed: int) -> None:
+    print(f"\n3. Change feed ({count:,} actions in the fake backend, {changes:,} cancels + {changes:,} reschedules)")
+    rng = random.Random(seed)
+    now = time.time()
+    backend = FakeBackend(seed=seed, lead_count=10)
+    for i in range(count):
+        backend.add_scheduled_action({"leadId": backend.lead_ids[i % 10], "actionType": "sms",
+                                      "scheduledFor": _iso(now + 60 + rng.random() * 600)})
+    api = ScheduledActionsAPI(api_base_url="http://fake-backend", transport=httpx.ASGITransport(app=backend))
+    executor = ActionExecutor({}, store=ActionStore(path), api=api, horizon=3600, clock=time.time)
+    executor.restore()
+    initial, initial_seconds = await _timed_async(executor.sync)
+    assert initial == count and len(executor.wheel) == count
+
+    ids = list(backend.scheduled_actions)
+    rng.shuffle(ids)
+    cancelled, moved = ids[:changes], ids[changes:2 * changes]
+    for action_id in cancelled:
+        await api.update(action_id, {"status": "cancelled"})
+    for action_id in moved:
+        await api.update(action_id, {"scheduledFor": _iso(now + 7200)})  # past the horizon
+
+    applied, sync_seconds = await _timed_async(executor.sync)
+    assert applied == 2 * changes, applied
+    assert not any(action_id in executor.wheel for action_id in cancelled + moved)
+    assert len(executor.wheel) == count - 2 * changes
+    assert len(executor.store) == count - changes
+    print(f"initial sync:     {initial_seconds * 1000:8.1f}ms ({initial:,} actions)")
+    print(f"incremental sync: {sync_seconds * 1000:8.1f}ms ({applied:,} changes applied, wheel and store updated)")
+    await api.aclose()
+    executor.store.close()
+
+
+async def _timed_async(fn):
+    started = time.perf_counter()
+    result = await fn()
+    return result, time.perf_counter() - started
+
+
+async def bench_firing(path: Path, start: float, minutes: float, speed: float, concurrency: int,
+                       handler_seconds: float) -> None:
+    print(f"\n4. Firing ({minutes:g} simulated minutes at {speed:g}x, {concurrency} workers, "
+          f"{handler_seconds * 1000:g}ms per action)")
+    origin = time.monotonic()
+
+    def clock() -> float:
+        return start + (time.monotonic() - origin) * speed
+
+    async def sleep(seconds: float) -> None:
+        await asyncio.sleep(seconds / speed)
+
+    async def handler(action: dict) -> str:
+        await sleep(handler_seconds)
+        return "ok"
+
+    store = ActionStore(path)
+    executor = ActionExecutor({"call": handler, "sms": handler, "email": handler}, store=store,
+                              concurrency=concurrency, clock=clock, sleep=sleep)
+    cpu = time.process_time()
+    task = asyncio.create_task(executor.run())
+    await sleep(minutes * 60)
+    executor.stop()
+    await task
+    cpu = time.process_time() - cpu
+    metrics = executor.metrics()
+    store.close()
+
+    lags = list(executor.lags)
+    assert metrics["fired"] == metrics["completed"] > 0
+    # The same number of actions under the cron, picked up at the next 5 minute boundary
+    rng = random.Random(0)
+    cron = [CRON_INTERVAL - rng.random() * CRON_INTERVAL for _ in lags]
+    print(f"fired {metrics['fired']:,} actions, peak {metrics['peak_running']} running, "
+          f"executor CPU {cpu / metrics['fired'] * 1e6:.0f}us per action")
+    print(format_summary("firing lag (executor, 1s tick)", lags))
+    print(format_summary("firing lag (cron every 5 min)", cron))
+
+
+async def bench_claims(tmp: Path, count: int, seed: int) -> None:
+    print(f"\n5. Claims (two executors, {count:,} due actions)")
+    backend = FakeBackend(seed=seed, lead_count=10)
+    now = time.time()
+    for i in range(count):
+        backend.add_scheduled_action({"leadId": backend.lead_ids[i % 10], "actionType": "sms", "scheduledFor": _iso(now)})
+    runs: Counter[str] = Counter()
+
+    async def handler(action: dict) -> str:
+        runs[action["id"]] += 1
+        await asyncio.sleep(0.001)
+        return "ok"
+
+    transport = httpx.ASGITransport(app=backend)
+    apis = [ScheduledActionsAPI(api_base_url="http://fake-backend", transport=transport) for _ in range(2)]
+    executors = [
+        ActionExecutor({"sms": handler}, store=ActionStore(tmp / f"claims-{i}.db"), api=api, sync_interval=0.1)
+        for i, api in enumerate(apis)
+    ]
+    tasks = [asyncio.create_task(executor.run()) for executor in executors]
+    started = time.perf_counter()
+    while any(a["status"] != "completed" for a in backend.scheduled_actions.values()):
+        assert time.perf_counter() - started < 60, "actions left unprocessed"
+        await asyncio.sleep(0.05)
+    for executor in executors:
+        executor.stop()
+    await asyncio.gather(*tasks)
+    for api in apis:
+        await api.aclose()
+
+    skipped = sum(executor.counts["claimed_elsewhere"] for executor in executors)
+    assert len(runs) == count and max(runs.values()) == 1, "an action ran twice"
+    print(f"{count:,} actions ran once each; {skipped:,} claims lost to the other executor were skipped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--actions", type=int, default=1_000_000)
+    parser.add_argument("--days", type=float, default=1.0, help="actions are due uniformly over this span")
+    parser.add_argument("--cancel-share", type=float, default=0.1)
+    parser.add_argument("--horizon", type=float, default=900.0)
+    parser.add_argument("--feed-actions", type=int, default=20_000)
+    parser.add_argument("--feed-changes", type=int, default=1_000)
+    parser.add_argument("--run-minutes", type=float, default=5.0)
+    parser.add_argument("--speed", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handler-ms", type=float, default=200.0)
+    parser.add_argument("--claim-actions", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    rng = random.Random(args.seed)
+    span = args.days * 86400
+    start = time.time()
+
+    dues = [start + rng.random() * span for _ in range(args.actions)]
+    cancel = rng.sample(range(args.actions), int(args.actions * args.cancel_share))
+    bench_structures(dues, cancel, tick=1.0)
+    del dues, cancel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scheduler.db"
+        bench_restart(path, args.actions, start, span, args.horizon, args.seed)
+        asyncio.run(bench_change_feed(Path(tmp) / "feed.db", args.feed_actions, args.feed_changes, args.seed))
+        asyncio.run(bench_firing(path, start, args.run_minutes, args.speed, args.concurrency, args.handler_ms / 1000))
+        asyncio.run(bench_claims(Path(tmp), args.claim_actions, args.seed))
+
+
+if __name__ == "__main__":
+    main()
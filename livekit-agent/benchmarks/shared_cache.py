@@ -0,0 +1,169 @@
+"""
+Shared cache benchmark.
+
+Starts `--jobs` (default 20) concurrent job processes the way a LiveKit
+worker does (spawned interpreters) and measures per-call cache startup,
+the time from job start to the first lead summary, and the memory of all
+jobs together (RSS and PSS, which splits shared pages between the
+processes mapping them). Three setups:
+
+- none:   no cache, the memory baseline of a job process
+- local:  each job builds its own cache of the `--leads` lead segment,
+          decoded into `Lead` models (read from a file here; in production
+          it would come from the API)
+- shared: the main process publishes the segment with `SharedCacheWriter`
+          and each job maps it with `SharedCache`
+
+It also times a lookup in each (in one process) and an in-place
+invalidation as seen from a reader.
+
+    python -m benchmarks.shared_cache --jobs 20 --leads 20000
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import format_summary
+from fake_backend import FakeBackend
+from models import Lead, decode_response
+from shared_cache import SharedCache, SharedCacheWriter, default_base_directory
+
+
+def memory_kb() -> tuple[int, int]:
+    """(RSS, PSS) of this process in kB."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+def job(mode: str, segment: str, directory: str, lead_ids: list[str], started, finished, results) -> None:
+    """One job process: initialize the lead cache, load a lead, report, wait for the others."""
+    started.wait()
+    begin = time.perf_counter()
+    if mode == "local":
+        with open(segment, "rb") as f:
+            cache = {lead.id: lead for lead in decode_response(f.read(), list[Lead])}
+
+        def lookup(lead_id: str) -> Lead | None:
+            return cache.get(lead_id)
+    elif mode == "shared":
+        cache = SharedCache(directory)
+
+        def lookup(lead_id: str) -> Lead | None:
+            return cache.get_model("lead", lead_id, Lead)
+    else:
+        def lookup(lead_id: str) -> Lead | None:
+            return None
+
+    lead = lookup(lead_ids[0])
+    summary = lead.summary if lead is not None else ""
+    ready = time.perf_counter() - begin
+    for lead_id in lead_ids:
+        lookup(lead_id)
+    rss, pss = memory_kb()
+    results.put((ready, rss, pss, bool(summary) or mode == "none"))
+    finished.wait()
+
+
+def run_jobs(mode: str, jobs: int, segment: Path, directory: Path, lead_ids: list[str]) -> dict:
+    context = multiprocessing.get_context("spawn")
+    started, finished = context.Barrier(jobs + 1), context.Barrier(jobs + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=job, args=(mode, str(segment), str(directory), lead_ids, started, finished, results))
+        for _ in range(jobs)
+    ]
+    for process in processes:
+        process.start()
+    started.wait()
+    collected = [results.get(timeout=300) for _ in range(jobs)]
+    finished.wait()
+    for process in processes:
+        process.join()
+    ready, rss, pss, ok = zip(*collected)
+    assert all(ok), f"{mode}: a job could not load its lead"
+    return {"ready": list(ready), "rss": sum(rss), "pss": sum(pss)}
+
+
+def bench_lookups(segment: Path, directory: Path, lead_ids: list[str]) -> None:
+    """Lead lookups in one process (the job processes above share one CPU with each other)."""
+    cache = {lead.id: lead for lead in decode_response(segment.read_bytes(), list[Lead])}
+    shared = SharedCache(directory)
+    for label, lookup in (
+        ("local dict", cache.get),
+        ("shared get", lambda lead_id: shared.get("lead", lead_id)),
+        ("shared get_model", lambda lead_id: shared.get_model("lead", lead_id, Lead)),
+    ):
+        started = time.perf_counter()
+        for lead_id in lead_ids:
+            assert lookup(lead_id) is not None
+        print(f"lookup, {label:<17} {(time.perf_counter() - started) / len(lead_ids) * 1e6:6.2f}us")
+
+
+def bench_invalidation(directory: Path, writer: SharedCacheWriter, lead_id: str) -> None:
+    reader = SharedCache(directory)
+    assert reader.get("lead", lead_id) is not None
+    started = time.perf_counter()
+    writer.invalidate("lead", lead_id)
+    assert reader.get("lead", lead_id) is None
+    seen = time.perf_counter() - started
+    started = time.perf_counter()
+    writer.publish()
+    published = time.perf_counter() - started
+    assert reader.get("lead", lead_id) is None and reader.generation == writer.generation
+    print(f"\ninvalidate one lead, visible to readers: {seen * 1e6:.0f}us; "
+          f"republish {len(writer):,} records: {published * 1000:.0f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20, help="concurrent job processes")
+    parser.add_argument("--leads", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=1000, help="lead lookups per job")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    backend = FakeBackend(seed=args.seed, lead_count=args.leads, partner_count=1)
+    leads = list(backend.leads.values())
+    lead_ids = random.Random(args.seed).sample(backend.lead_ids, min(args.lookups, len(leads)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        segment = Path(tmp) / "segment.json"
+        segment.write_text(json.dumps(leads))
+        writer = SharedCacheWriter(default_base_directory() / f"benchmark-{os.getpid()}")
+        for lead in leads:
+            writer.put("lead", lead["id"], json.dumps(lead).encode())
+        started = time.perf_counter()
+        writer.publish()
+        print(f"published {len(writer):,} leads ({segment.stat().st_size / 1e6:.1f}MB JSON) "
+              f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        print(f"\n{args.jobs} concurrent job processes")
+        baseline = None
+        for mode in ("none", "local", "shared"):
+            result = run_jobs(mode, args.jobs, segment, writer.directory, lead_ids)
+            baseline = baseline or result
+            print(format_summary(f"{mode}: job start -> lead ready", result["ready"]))
+            print(f"{'':<6}total RSS {result['rss'] / 1024:7.0f}MB PSS {result['pss'] / 1024:7.0f}MB "
+                  f"(PSS over baseline {(result['pss'] - baseline['pss']) / 1024:6.0f}MB)")
+
+        print()
+        bench_lookups(segment, writer.directory, lead_ids)
+        bench_invalidation(writer.directory, writer, lead_ids[0])
+        writer.close(remove=True)
+
+
+if __name__ == "__main__":
+    main()
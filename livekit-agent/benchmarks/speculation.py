@@ -0,0 +1,128 @@
+"""
+Speculative tool execution benchmark.
+
+Simulates the start of an outbound call against the fake backend: the job
+starts, the phone rings, the callee answers and the model calls
+`load_lead_context`; later the prospect names their business type and the
+model calls `get_recommended_script`. Reports tool latency as seen by the
+model with and without speculation, plus hit rate and wasted work. Also
+takes a speculation the moment its task is done, before asyncio has run
+the task's done callbacks.
+
+    python -m benchmarks.speculation --calls 50 --ring-seconds 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+import workflow
+from benchmarks.common import format_summary
+from distributions import LatencyDistribution
+from fake_backend import EndpointProfile, FakeBackend
+from speculation import Speculator
+
+TRANSCRIPTS = [
+    ("We run a bouldering gym downtown", "climbing"),
+    ("It's a crossfit box with about 300 members", "gym"),
+    ("We do kayak tours on the bay", "adventure"),
+    ("Mostly ski and snowboard rentals", "rental"),
+    ("We host community events", None),
+]
+
+
+async def simulate_call(backend: FakeBackend, lead_id: str, ring_seconds: float, speculate: bool, rng: random.Random):
+    workflow.init_workflow(
+        lead_id=lead_id,
+        api_base_url="http://fake-backend",
+        transport=httpx.ASGITransport(app=backend),
+    )
+    if speculate:
+        workflow.speculate_lead_context()
+
+    await asyncio.sleep(ring_seconds)
+
+    start = time.perf_counter()
+    await workflow.load_lead_context()
+    lead_latency = time.perf_counter() - start
+
+    text, business_type = rng.choice(TRANSCRIPTS)
+    if speculate:
+        detected = workflow.detect_business_type(text)
+        if detected:
+            workflow.speculate_recommended_script(detected)
+    interest_level = workflow._workflow_state["lead_context"].interest_level or "warm"
+
+    start = time.perf_counter()
+    await workflow.get_recommended_script(business_type or "other", interest_level)
+    script_latency = time.perf_counter() - start
+
+    workflow.speculator.close()
+    return lead_latency, script_latency, dict(workflow.speculator.metrics())
+
+
+async def just_finished() -> None:
+    """A hit on a speculation whose task finished in the loop iteration just before `take`."""
+    speculator = Speculator()
+
+    async def lookup() -> dict:
+        return {"script": "gym"}
+
+    speculator.speculate("get_recommended_script", {"business_type": "gym"}, lookup)
+    task = next(iter(speculator._entries.values())).task
+    while not task.done():
+        await asyncio.sleep(0)
+    hit, result = await speculator.take("get_recommended_script", {"business_type": "gym"})
+    assert hit and result == {"script": "gym"}, "a just-finished speculation was not served"
+    assert speculator.stats.saved_seconds >= 0
+    print("just-finished speculation: hit")
+
+
+async def run(calls: int, ring_seconds: float, seed: int) -> None:
+    await just_finished()
+
+    backend = FakeBackend(seed=seed, lead_count=max(calls, 10))
+    backend.configure("get_lead", EndpointProfile(latency=LatencyDistribution.lognormal(median=0.15, sigma=0.4)))
+
+    for speculate in (False, True):
+        rng = random.Random(seed)
+        lead_samples, script_samples = [], []
+        totals = {"launched": 0, "hits": 0, "misses": 0, "wasted": 0, "wasted_seconds": 0.0}
+        for lead_id in backend.lead_ids[:calls]:
+            lead_latency, script_latency, metrics = await simulate_call(backend, lead_id, ring_seconds, speculate, rng)
+            lead_samples.append(lead_latency)
+            script_samples.append(script_latency)
+            for key in totals:
+                totals[key] += metrics[key]
+
+        label = "speculative" if speculate else "live"
+        print(format_summary(f"{label}/load_lead_context", lead_samples))
+        print(format_summary(f"{label}/get_recommended_script", script_samples))
+        if speculate:
+            lookups = totals["hits"] + totals["misses"]
+            print(
+                f"  launched={totals['launched']} hits={totals['hits']} "
+                f"hit_rate={totals['hits'] / lookups if lookups else 0:.0%} "
+                f"wasted={totals['wasted']} wasted_seconds={totals['wasted_seconds']:.3f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--ring-seconds", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name in ("httpx", "partnership-workflow", "tool-speculation"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    asyncio.run(run(args.calls, args.ring_seconds, args.seed))
+
+
+if __name__ == "__main__":
+    main()
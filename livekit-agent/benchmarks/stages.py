@@ -0,0 +1,181 @@
+"""
+Conversation stage benchmark.
+
+Replays scripted sales calls (caller transcripts and tool calls) through
+`stages.StageTracker` and reports, per caller turn, the instruction tokens
+sent with the full sales prompt, the current stage's prompt (the full prompt
+plus the stage section), and a trimmed prompt (the sales sections without
+the script flow, plus the stage section), and the
+resulting time to first token on a fake provider whose latency grows with
+prompt tokens (`--base-ms` + `--per-1k-tokens-ms`). Like OpenAI, the fake
+provider caches prompt prefixes: the longest prefix shared with an earlier
+prompt, once it is at least `CACHEABLE_PREFIX_TOKENS` long and in 128-token
+steps, costs `--cached-per-1k-tokens-ms` instead. Also checks that each
+replay walks the expected stages and every staged turn hits the cache, and
+times the tracker itself.
+
+The trimmed prompt falls under the caching minimum and the staged one is
+longer than the full prompt, so neither beats the full prompt once caching
+is counted; the sales agent sends the full prompt.
+
+    python -m benchmarks.stages
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from benchmarks.common import format_summary
+from prompts import _SALES_SECTIONS, CACHEABLE_PREFIX_TOKENS, PROMPTS, SALES_SCRIPT_FLOW, count_tokens
+from stages import Stage, StageTracker
+
+CALL_CONTEXT = {"Lead name": "Dana", "Business": "Peak Climbing", "Call direction": "outbound"}
+
+# ("user", transcript) or ("tool", name), in call order
+REPLAYS = {
+    "booked demo": (
+        [
+            ("user", "Hi, yes, I have a couple of minutes."),
+            ("tool", "load_lead_context"),
+            ("user", "We run a climbing gym, two locations, about 300 visitors a day."),
+            ("tool", "get_recommended_script"),
+            ("user", "Interesting. So the members buy it themselves?"),
+            ("user", "Okay, that sounds good, can we do a demo next week?"),
+            ("tool", "schedule_demo"),
+            ("user", "Great, thanks Sarah."),
+        ],
+        [Stage.OPENING, Stage.DISCOVERY, Stage.QUALIFICATION, Stage.NEXT_STEP, Stage.CLOSE],
+    ),
+    "objection then info": (
+        [
+            ("user", "Sure, what's this about?"),
+            ("user", "We already have insurance for the gym though."),
+            ("user", "It's a fitness studio, we don't really have a timeline."),
+            ("user", "Hm, how much does it cost the members?"),
+            ("user", "Just send me some information and I'll look at it."),
+            ("tool", "send_sms"),
+            ("user", "Bye."),
+        ],
+        [Stage.OPENING, Stage.DISCOVERY, Stage.QUALIFICATION, Stage.NEXT_STEP, Stage.CLOSE],
+    ),
+    "long discovery": (
+        [
+            ("user", "Yeah this is Sam."),
+            ("user", "We do kayak tours on the river."),
+            ("user", "It's mostly seasonal."),
+            ("user", "I'd have to ask my partner about a lot of this."),
+            ("user", "Maybe."),
+            ("user", "I'm not sure it's for us."),
+            ("user", "Can you call me back later in the month?"),
+            ("tool", "schedule_callback"),
+        ],
+        [Stage.OPENING, Stage.DISCOVERY, Stage.QUALIFICATION, Stage.NEXT_STEP, Stage.CLOSE],
+    ),
+    "do not call": (
+        [
+            ("user", "Who is this?"),
+            ("user", "Take me off your list, please."),
+            ("tool", "add_to_dnc_list"),
+        ],
+        [Stage.OPENING, Stage.DISCOVERY, Stage.CLOSE],
+    ),
+}
+
+
+def replay(events: list[tuple[str, str]]) -> tuple[StageTracker, list[str], float]:
+    """Returns the tracker, the instructions at each caller turn, and tracker seconds."""
+    tracker = StageTracker()
+    prompts: list[str] = []
+    spent = 0.0
+    for kind, value in events:
+        started = time.perf_counter()
+        if kind == "tool":
+            tracker.observe_tool(value)
+        else:
+            tracker.observe_transcript(value)
+            instructions = tracker.instructions(CALL_CONTEXT)
+        spent += time.perf_counter() - started
+        if kind == "user":
+            prompts.append(instructions)
+    return tracker, prompts, spent
+
+
+class PromptCache:
+    """The provider's prefix cache: prompts it has seen, shared by every call."""
+
+    def __init__(self):
+        self.seen: list[str] = []
+
+    def send(self, prompt: str) -> tuple[int, int]:
+        """(prompt tokens, cached tokens) for one request."""
+        shared = max((len(os.path.commonprefix([prompt, earlier])) for earlier in self.seen), default=0)
+        self.seen.append(prompt)
+        cached = count_tokens(prompt[:shared]) // 128 * 128
+        return count_tokens(prompt), cached if cached >= CACHEABLE_PREFIX_TOKENS else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-ms", type=float, default=280)
+    parser.add_argument("--per-1k-tokens-ms", type=float, default=45)
+    parser.add_argument("--cached-per-1k-tokens-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    def ttft(tokens: int, cached: int = 0) -> float:
+        return (args.base_ms + (args.per_1k_tokens_ms * (tokens - cached)
+                                + args.cached_per_1k_tokens_ms * cached) / 1000) / 1000
+
+    full_prompt = PROMPTS.render("sales", CALL_CONTEXT)
+    sales_prefix = PROMPTS.get("sales")
+    trimmed_core = "\n\n".join(section.strip() for section in _SALES_SECTIONS if section is not SALES_SCRIPT_FLOW)
+    labels = ("full", "staged", "trimmed")
+    caches = {label: PromptCache() for label in labels}
+    results: dict[str, dict[str, list[float]]] = {label: {"uncached": [], "cached": []} for label in labels}
+    totals = {label: [0, 0] for label in labels}  # prompt tokens, uncached tokens
+    turns = 0
+    tracker_seconds = 0.0
+
+    for name, (events, expected) in REPLAYS.items():
+        tracker, prompts, spent = replay(events)
+        path = [stage for stage, _ in tracker.history]
+        assert path == expected, f"{name}: walked {[s.value for s in path]}"
+
+        turns += len(prompts)
+        tracker_seconds += spent
+        turn_tokens: dict[str, list[int]] = {label: [] for label in labels}
+        for label, turn_prompts in (
+            ("full", [full_prompt] * len(prompts)),
+            ("staged", prompts),
+            ("trimmed", [trimmed_core + prompt[len(sales_prefix):] for prompt in prompts]),
+        ):
+            cache = caches[label]
+            for prompt in turn_prompts:
+                tokens, cached = cache.send(prompt)
+                turn_tokens[label].append(tokens)
+                if label == "staged":
+                    assert cached or len(cache.seen) == 1, f"{name}: staged prompt missed the prompt cache"
+                totals[label][0] += tokens
+                totals[label][1] += tokens - cached
+                results[label]["uncached"].append(ttft(tokens))
+                results[label]["cached"].append(ttft(tokens, cached))
+        print(f"{name:<20} {' -> '.join(s.value for s in path)}")
+        print(f"{'':<20} instruction tokens per turn: full {count_tokens(full_prompt)}, "
+              f"staged {turn_tokens['staged']}, trimmed {turn_tokens['trimmed']}")
+
+    print()
+    for label in labels:
+        tokens, uncached = totals[label]
+        print(f"{label} prompt: {tokens:,} instruction tokens over {turns} caller turns, {uncached:,} not cached")
+    print(f"\nFake provider: {args.base_ms:g}ms + {args.per_1k_tokens_ms:g}ms per 1k prompt tokens, "
+          f"{args.cached_per_1k_tokens_ms:g}ms per 1k cached")
+    for cache in ("uncached", "cached"):
+        for label in labels:
+            print(format_summary(f"time to first token ({label}, {cache})", results[label][cache]))
+    print(f"Tracker overhead: {tracker_seconds / turns * 1e6:.1f}us per caller turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Startup budget check.
+
+Times, in fresh interpreters (median of `--runs`):
+
+- main process: importing each entrypoint module, which is all the
+  worker's main process does before `cli.run_app` registers it
+- job process: importing the entrypoint and running its `prewarm` (the
+  asset bundle, and the Silero VAD on cascade workers when installed)
+
+and prints the slowest imports under the sales entrypoint. Exits non-zero
+if an entrypoint's import is over its budget in `startup.IMPORT_BUDGETS_MS`
+or a job process is over the "job process ready" budget.
+
+    python -m benchmarks.startup --runs 3
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from startup import BUDGETS_MS, IMPORT_BUDGETS_MS, format_tree, import_seconds, import_tree
+
+JOB_PROCESS = """
+import time
+import types
+started = time.perf_counter()
+import {module}
+from agent_core import PipelineMode, prewarm
+try:
+    prewarm(types.SimpleNamespace(userdata={{}}), PipelineMode.{mode})
+except ImportError:
+    from assets import bundle
+    bundle()
+print(time.perf_counter() - started)
+"""
+
+# Entrypoints whose worker defaults to the cascade pipeline, so prewarm loads the VAD
+CASCADE_ENTRYPOINTS = {"agent_openai_only"}
+
+
+def job_process_seconds(module: str, runs: int) -> float:
+    mode = "CASCADE" if module in CASCADE_ENTRYPOINTS else "REALTIME"
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", JOB_PROCESS.format(module=module, mode=mode)],
+            capture_output=True, text=True, check=True,
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--min-ms", type=float, default=50.0, help="import tree cutoff")
+    args = parser.parse_args()
+
+    print(format_tree(import_tree("agent"), args.min_ms, max_depth=3))
+    print(f"\n{'entrypoint':<24} {'main process':>13} {'budget':>8} {'job process':>12}")
+    failed = []
+    job_budget = BUDGETS_MS["job process ready"]
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        imported = import_seconds(module, args.runs) * 1000
+        job = job_process_seconds(module, args.runs) * 1000
+        status = "ok"
+        if imported > budget:
+            failed.append(f"{module} import")
+            status = "OVER"
+        if job > job_budget:
+            failed.append(f"{module} job process")
+            status = "OVER"
+        print(f"{module:<24} {imported:11.0f}ms {budget:6.0f}ms {job:10.0f}ms  {status}")
+
+    if failed:
+        print(f"\nOver budget: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\nAll entrypoints within budget (job process budget {job_budget}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Tool latency benchmark against the local fake backend.
+
+Drives the I/O-bound tools in workflow.py and support_agent.py through
+`fake_backend.FakeBackend` under a chosen latency/failure profile and reports
+per-tool latency percentiles.
+
+    python -m benchmarks.tool_latency --profile degraded --iterations 200
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+import support_agent
+import workflow
+from benchmarks.common import format_summary
+from distributions import LatencyDistribution
+from fake_backend import EndpointProfile, FakeBackend
+
+PROFILES = {
+    "healthy": EndpointProfile(latency=LatencyDistribution.lognormal(median=0.02, sigma=0.3)),
+    "degraded": EndpointProfile(
+        latency=LatencyDistribution.lognormal(median=0.08, sigma=0.6),
+        error_rate=0.05,
+        slow_tail_rate=0.03,
+        slow_tail_seconds=1.5,
+    ),
+    "outage": EndpointProfile(
+        latency=LatencyDistribution.fixed(0.25),
+        error_rate=0.9,
+    ),
+}
+
+
+def _tool_calls():
+    return {
+        "load_lead_context": lambda: workflow.load_lead_context(),
+        "schedule_callback": lambda: workflow.schedule_callback("2026-11-02", "10:30"),
+        "send_sms": lambda: workflow.send_sms("Here is the partner overview."),
+        "escalate_to_specialist": lambda: workflow.escalate_to_specialist("Coverage limits question"),
+        "get_partner_account": lambda: support_agent.get_partner_account(),
+        "check_integration_status": lambda: support_agent.check_integration_status(),
+        "create_support_ticket": lambda: support_agent.create_support_ticket("Widget", "Not showing"),
+    }
+
+
+async def run(profile_name: str, iterations: int, seed: int) -> dict[str, list[float]]:
+    backend = FakeBackend(seed=seed, default_profile=PROFILES[profile_name])
+    transport = httpx.ASGITransport(app=backend)
+    workflow.init_workflow(lead_id=backend.lead_ids[0], api_base_url="http://fake-backend", transport=transport)
+    support_agent.init_support_workflow(
+        partner_id=backend.partner_ids[0], api_base_url="http://fake-backend", transport=transport
+    )
+
+    samples: dict[str, list[float]] = {}
+    for name, call in _tool_calls().items():
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await call()
+            samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    errors = sum(s.errors for s in backend.stats.values())
+    requests = sum(s.requests for s in backend.stats.values())
+    print(f"Backend: {requests} requests, {errors} injected errors")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="degraded")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    samples = asyncio.run(run(args.profile, args.iterations, args.seed))
+    print(f"\nProfile: {args.profile}")
+    for name, values in samples.items():
+        print(format_summary(name, values))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Transcript index benchmark.
+
+Builds a `transcript_index.TranscriptIndex` over `--calls` (default 1M)
+synthetic call transcripts spread over `--days`, then times QA queries:
+phrases, prefixes, exclusions, disposition and date filters, newest-first
+and by relevance, and compares one against a LIKE scan of the same
+transcripts. Finally logs `--feed-calls` calls through the fake backend and
+times the incremental sync that picks them up, and checks that calls sharing
+a timestamp across page boundaries are all indexed, from both the
+communications feed and `voice_call_logs`.
+
+    python -m benchmarks.transcript_index --calls 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import format_summary
+from fake_backend import FakeBackend
+from transcript_index import CommunicationsFeed, TranscriptIndex, sync_call_logs, sync_communications
+
+DISPOSITIONS = [
+    "reached_qualified", "demo_scheduled", "proposal_sent", "left_voicemail", "no_answer",
+    "callback_requested", "not_interested", "bad_fit", "do_not_call",
+]
+AGENT_LINES = [
+    "Hi this is Sarah from Daily Event Insurance, do you have a quick minute",
+    "We offer same day coverage for your members at zero cost to your business",
+    "Partners earn a commission on every policy your participants buy",
+    "Setup takes about ten minutes with our booking widget",
+    "Would a fifteen minute demo on Tuesday or Thursday work better",
+    "I can send over the partner agreement by email today",
+    "Totally understand, what does your current waiver process look like",
+]
+# (line, weight): objections come up far less often than small talk
+PROSPECT_LINES = [
+    ("Sure I have a couple of minutes", 30),
+    ("Send me something by email and I will take a look", 20),
+    ("Can you call me back next week", 12),
+    ("How does the commission get paid out", 10),
+    ("We run about four hundred climbers a month", 10),
+    ("We already have insurance through our landlord", 8),
+    ("I need to talk to my business partner first", 5),
+    ("That sounds too expensive for our members", 3),
+    ("Our members sign a liability waiver already", 2),
+    ("Not interested please take us off your list", 0.1),
+]
+QUERIES = [
+    ("phrase, common", '"already have insurance"', {}),
+    ("phrase, rare", '"take us off your list"', {}),
+    ("prefix", "commiss*", {}),
+    ("words + exclusion", 'demo -"too expensive"', {}),
+    ("phrase + disposition", '"too expensive"', {"disposition": "not_interested"}),
+    ("phrase + last 7 days", '"business partner"', {"since_days": 7}),
+    ("phrase + dispo + 30 days", '"call me back"', {"disposition": "callback_requested", "since_days": 30}),
+    ("phrase + dispo, a year ago", '"business partner"', {"disposition": "bad_fit", "since_days": 365, "until_days": 335}),
+    ("phrase, by relevance", '"liability waiver"', {"order": "relevance"}),
+]
+
+
+def synthetic_calls(n: int, days: float, seed: int, start: float):
+    rng = random.Random(seed)
+    span = days * 86400
+    lines, weights = zip(*PROSPECT_LINES)
+    for i in range(n):
+        turns = []
+        for turn in range(rng.randint(4, 8)):
+            if turn % 2 == 0:
+                turns.append({"role": "assistant", "content": rng.choice(AGENT_LINES)})
+            else:
+                turns.append({"role": "user", "content": rng.choices(lines, weights)[0]})
+        yield {
+            "id": f"comm:{i:07d}",
+            "source": "communication",
+            "lead_id": f"lead-{rng.randrange(n // 4 or 1)}",
+            "disposition": rng.choice(DISPOSITIONS),
+            # Ingested in creation order, as the change feed delivers them
+            "created": start + span * i / n,
+            "duration": rng.randint(20, 600),
+            "sentiment": round(rng.uniform(-1, 1), 2),
+            "transcript": "\n".join(f"{t['role']}: {t['content']}" for t in turns),
+            "summary": rng.choice(["Prospect asked for a callback", "Left voicemail", "Demo booked", "Not a fit"]),
+            "analysis": "",
+        }
+
+
+def bench_queries(index: TranscriptIndex, now: float, runs: int) -> None:
+    print(f"\n2. Queries (limit 50, {runs} runs each)")
+    for label, query, options in QUERIES:
+        kwargs = {"limit": 50, "order": options.get("order", "recent"), "disposition": options.get("disposition")}
+        if "since_days" in options:
+            kwargs["since"] = now - options["since_days"] * 86400
+        if "until_days" in options:
+            kwargs["until"] = now - options["until_days"] * 86400
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            hits = index.search(query, **kwargs)
+            samples.append(time.perf_counter() - started)
+        assert hits, f"no hits for {query}"
+        if kwargs["disposition"]:
+            assert all(hit["disposition"] == kwargs["disposition"] for hit in hits)
+        print(f"{format_summary(label, samples)}  {index.count(query):>9,} matches")
+
+
+def bench_like_scan(index: TranscriptIndex) -> None:
+    """Counting the calls with a phrase, with the index and with a LIKE over every transcript."""
+    db = sqlite3.connect(index.path)
+    started = time.perf_counter()
+    like = db.execute("SELECT COUNT(*) FROM calls_fts WHERE transcript LIKE '%take us off your list%'").fetchone()[0]
+    like_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    matches = index.count('"take us off your list"')
+    fts_seconds = time.perf_counter() - started
+    db.close()
+    assert like == matches, (like, matches)
+    print(f"\ncounting the rare phrase ({matches:,} calls): LIKE scan {like_seconds * 1000:.0f}ms, "
+          f"FTS5 {fts_seconds * 1000:.1f}ms")
+
+
+async def bench_feed(path: Path, count: int, seed: int) -> None:
+    print(f"\n3. Incremental sync ({count:,} calls logged through the fake backend)")
+    rng = random.Random(seed)
+    backend = FakeBackend(seed=seed, lead_count=20)
+    feed = CommunicationsFeed(api_base_url="http://fake-backend", transport=httpx.ASGITransport(app=backend))
+    index = TranscriptIndex(path)
+
+    def log(n: int) -> None:
+        for _ in range(n):
+            transcript = [{"role": "user", "content": rng.choice(PROSPECT_LINES)[0]} for _ in range(4)]
+            backend.add_communication(rng.choice(backend.lead_ids), {
+                "channel": "call", "direction": "outbound", "disposition": rng.choice(DISPOSITIONS),
+                "callTranscript": json.dumps(transcript), "callSummary": "Synthetic call",
+            })
+
+    log(count)
+    started = time.perf_counter()
+    first = await sync_communications(index, feed)
+    first_seconds = time.perf_counter() - started
+    log(count // 10)
+    started = time.perf_counter()
+    second = await sync_communications(index, feed)
+    second_seconds = time.perf_counter() - started
+    idle = await sync_communications(index, feed)
+    assert first == count and second == count // 10 and idle == 0, (first, second, idle)
+    assert len(index) == count + count // 10
+    print(f"first sync:       {first_seconds * 1000:8.0f}ms ({first:,} calls)")
+    print(f"incremental sync: {second_seconds * 1000:8.0f}ms ({second:,} new calls since the cursor)")
+    await feed.aclose()
+    index.close()
+
+
+class CallLogsTable:
+    """`voice_call_logs` through the calls `sync_call_logs` makes on a Supabase client."""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.requests = 0
+
+    def table(self, name: str) -> "CallLogsTable":
+        self._query = {"order": [], "gte": None, "range": (0, len(self.rows) - 1)}
+        return self
+
+    def select(self, columns: str) -> "CallLogsTable":
+        return self
+
+    def order(self, column: str) -> "CallLogsTable":
+        self._query["order"].append(column)
+        return self
+
+    def gte(self, column: str, value: str) -> "CallLogsTable":
+        self._query["gte"] = (column, value)
+        return self
+
+    def range(self, start: int, end: int) -> "CallLogsTable":
+        self._query["range"] = (start, end)
+        return self
+
+    def execute(self):
+        self.requests += 1
+        rows = self.rows
+        if self._query["gte"]:
+            column, value = self._query["gte"]
+            rows = [row for row in rows if row[column] >= value]
+        rows = sorted(rows, key=lambda row: tuple(row[column] for column in self._query["order"]))
+        start, end = self._query["range"]
+        return type("Response", (), {"data": rows[start:end + 1]})
+
+
+async def bench_ties(path: Path, page_size: int, seed: int) -> None:
+    print(f"\n4. Tied timestamps (pages of {page_size}, runs of up to {page_size * 3} calls in one instant)")
+    rng = random.Random(seed)
+    backend = FakeBackend(seed=seed, lead_count=20)
+    feed = CommunicationsFeed(api_base_url="http://fake-backend", transport=httpx.ASGITransport(app=backend),
+                              page_size=page_size)
+    index = TranscriptIndex(path)
+
+    # Runs of calls logged in the same instant, straddling page boundaries
+    runs = [rng.randint(1, page_size * 3) for _ in range(20)]
+    instants = [f"2026-06-01T12:00:{second:02d}.000000Z" for second in range(len(runs))]
+    for run, instant in zip(runs, instants):
+        for _ in range(run):
+            backend.add_communication(rng.choice(backend.lead_ids), {"channel": "call", "callSummary": "Tied"}, instant)
+    first = await sync_communications(index, feed)
+    for _ in range(page_size + 1):
+        backend.add_communication(rng.choice(backend.lead_ids), {"channel": "call", "callSummary": "Tied"},
+                                  "2026-06-01T12:01:00.000000Z")
+    second = await sync_communications(index, feed)
+    idle = await sync_communications(index, feed)
+    assert (first, second, idle) == (sum(runs), page_size + 1, 0), (first, second, idle)
+    assert len(index) == sum(runs) + page_size + 1, "a communication sharing a timestamp was skipped"
+    await feed.aclose()
+
+    rows = [
+        {"id": f"{i:06d}", "created_at": f"2026-06-01T12:00:{second:02d}+00:00", "outcome": "callback_requested"}
+        for i, second in enumerate(sorted(rng.randrange(len(runs)) for _ in range(sum(runs))))
+    ]
+    table = CallLogsTable(rng.sample(rows, len(rows)))
+    logs = sync_call_logs(index, table, page_size=page_size)
+    assert logs == len(rows) and len(index) == sum(runs) + page_size + 1 + len(rows), "a call log was skipped"
+    index.close()
+    print(f"{first + second:,} communications and {logs:,} call logs in {len(runs)} instants: none skipped, "
+          f"{table.requests} call log pages")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--days", type=float, default=365.0, help="calls are spread over this span")
+    parser.add_argument("--batch", type=int, default=10_000, help="calls per ingest transaction")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--feed-calls", type=int, default=5_000)
+    parser.add_argument("--tie-page-size", type=int, default=100, help="feed page size for the tied timestamps check")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    now = time.time()
+    start = now - args.days * 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "transcripts.db"
+        index = TranscriptIndex(path)
+        print(f"\n1. Ingest ({args.calls:,} calls over {args.days:g} days)")
+        started = time.perf_counter()
+        batch = []
+        for doc in synthetic_calls(args.calls, args.days, args.seed, start):
+            batch.append(doc)
+            if len(batch) == args.batch:
+                index.upsert(batch)
+                batch.clear()
+        index.upsert(batch)
+        ingest_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        index.optimize()
+        optimize_seconds = time.perf_counter() - started
+        assert len(index) == args.calls
+        size = sum(p.stat().st_size for p in Path(tmp).iterdir()) / 1e6
+        print(f"indexed in {ingest_seconds:.0f}s ({args.calls / ingest_seconds:,.0f} calls/s), "
+              f"optimize {optimize_seconds:.0f}s, {size:,.0f}MB on disk")
+
+        bench_queries(index, now, args.runs)
+        bench_like_scan(index)
+        index.close()
+        asyncio.run(bench_feed(Path(tmp) / "feed.db", args.feed_calls, args.seed))
+        asyncio.run(bench_ties(Path(tmp) / "ties.db", args.tie_page_size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
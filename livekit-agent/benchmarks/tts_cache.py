@@ -0,0 +1,68 @@
+"""
+TTS audio cache benchmark.
+
+Fills a temporary cache with synthetic PCM for every fixed utterance and
+measures time-to-first-frame on a cache hit (lookup + mmap + first 20ms
+frame), then checks that LRU eviction keeps the most recently used entries.
+Live TTS time-to-first-byte is typically 200-600ms for comparison.
+
+    python -m benchmarks.tts_cache --iterations 1000
+"""
+
+import argparse
+import math
+import os
+import struct
+import tempfile
+import time
+
+from benchmarks.common import format_summary
+from tts_cache import OPENAI_PCM_SAMPLE_RATE, TTSAudioCache
+from utterances import FIXED_UTTERANCES, SALES_VOICE, VOICEMAIL_MESSAGE
+
+
+def _tone(seconds: float, sample_rate: int = OPENAI_PCM_SAMPLE_RATE) -> bytes:
+    samples = int(seconds * sample_rate)
+    return struct.pack(
+        f"<{samples}h",
+        *(int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate)) for i in range(samples)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory, max_bytes=10 * 1024 * 1024)
+        for text, voice in FIXED_UTTERANCES:
+            # ~15 words per 5 seconds of speech
+            cache.put(text, voice, _tone(len(text.split()) / 3.0))
+
+        samples = []
+        for i in range(args.iterations):
+            text, voice = FIXED_UTTERANCES[i % len(FIXED_UTTERANCES)]
+            start = time.perf_counter()
+            audio = cache.get(text, voice)
+            next(audio.frames())
+            samples.append(time.perf_counter() - start)
+        print(format_summary("cache hit time-to-first-frame", samples))
+
+        start = time.perf_counter()
+        frames = sum(1 for _ in cache.get(VOICEMAIL_MESSAGE, SALES_VOICE).frames())
+        print(f"Full voicemail message: {frames} frames sliced in {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        # LRU: touch the first utterance, then shrink the budget to one entry's worth
+        first_text, first_voice = FIXED_UTTERANCES[0]
+        time.sleep(0.01)
+        cache.get(first_text, first_voice)
+        largest = max(os.path.getsize(p) for p in cache.directory.glob("*.pcm"))
+        cache.max_bytes = largest
+        removed = cache.evict()
+        assert cache.get(first_text, first_voice) is not None, "most recently used entry was evicted"
+        print(f"Eviction removed {removed} entries and kept the most recently used one")
+
+
+if __name__ == "__main__":
+    main()
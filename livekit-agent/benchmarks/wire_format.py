@@ -0,0 +1,178 @@
+"""
+Wire format benchmark.
+
+Builds realistic communication payloads for short, typical and long calls
+(`--minutes`): transcript turns as `workflow.log_conversation_segment` and
+`analyze_sentiment` record them, plus the disposition fields. For each one
+it reports the body size and encode/decode time as the JSON the API takes
+today, msgpack alone, msgpack with interned fields and the transcript as a
+table, JSON + zstd, and the full compact encoding (`wire.encode`). The
+compact decode includes turning the transcript back into the JSON string
+the API stores. It then uploads a long call
+through `workflow.update_disposition` to the fake backend. Those uploads
+check the negotiation, once with a backend that advertises the compact
+encoding and once with one that rejects it.
+
+    python -m benchmarks.wire_format --minutes 2 10 45
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import msgpack
+import zstandard
+
+import wire
+import workflow
+from fake_backend import FakeBackend
+
+AGENT_LINES = [
+    "Hi {name}, this is Sarah from Daily Event Insurance. Do you have a quick minute?",
+    "We provide same-day coverage your members can buy when they book, at zero cost to you.",
+    "You'd earn a commission on every policy, and with {count} participants a month that adds up quickly.",
+    "Setup is a snippet on your booking page; most partners are live in about ten minutes.",
+    "That's a fair question. The coverage sits on top of your waiver, so it protects the participant directly.",
+    "Would a fifteen-minute demo on Tuesday or Thursday afternoon work better for you?",
+    "I'll send the partner agreement over by email today so you can look it over.",
+]
+PROSPECT_LINES = [
+    "Yeah, I've got a couple of minutes, what's this about?",
+    "We already have insurance through the landlord, so I'm not sure we need it.",
+    "How much does it cost us to set up?",
+    "Okay, and how does the commission actually get paid out?",
+    "We run about {count} climbers through here a month, more in the summer.",
+    "I'd need to talk to my business partner before we sign anything.",
+    "Thursday could work, maybe around two?",
+    "Sure, send it over and I'll take a look.",
+]
+SENTIMENTS = [("positive", 0.5), ("neutral", 0.0), ("very_positive", 1.0), ("negative", -0.5)]
+
+
+def transcript(minutes: float, rng: random.Random) -> list[dict]:
+    """About six turns a minute, with a sentiment check every ten turns."""
+    started = datetime(2026, 3, 2, 15, 0)
+    turns = []
+    name, count = rng.choice(["Maya", "Jordan", "Priya"]), rng.choice([400, 1500, 3000])
+    for i in range(int(minutes * 6)):
+        at = (started + timedelta(seconds=i * 10 + rng.random() * 5)).isoformat()
+        if i % 10 == 9:
+            sentiment, score = rng.choice(SENTIMENTS)
+            turns.append({"type": "sentiment", "sentiment": sentiment, "score": score,
+                          "indicators": rng.sample(["engaged", "asked about pricing", "hesitant", "laughed"], 2),
+                          "timestamp": at})
+            continue
+        speaker, lines = ("agent", AGENT_LINES) if i % 2 == 0 else ("prospect", PROSPECT_LINES)
+        turns.append({"speaker": speaker, "text": rng.choice(lines).format(name=name, count=count), "timestamp": at})
+    return turns
+
+
+def payload(minutes: float, rng: random.Random) -> dict:
+    return {
+        "channel": "call",
+        "direction": "outbound",
+        "callDuration": int(minutes * 60),
+        "disposition": "callback_requested",
+        "callSummary": "Interested in the commission; wants to loop in a business partner. Callback Thursday 2pm.",
+        "agentId": "sarah-voice-agent",
+        "callTranscript": transcript(minutes, rng),
+    }
+
+
+def _time(fn, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return (time.perf_counter() - started) / runs, result
+
+
+def bench_sizes(minutes: float, runs: int, seed: int) -> None:
+    data = payload(minutes, random.Random(seed))
+    turns = len(data["callTranscript"])
+    compressor, decompressor = zstandard.ZstdCompressor(level=wire.ZSTD_LEVEL), zstandard.ZstdDecompressor()
+
+    formats = {
+        # What the API takes today: the transcript as a JSON string inside the JSON body
+        "json": (lambda: json.dumps(wire._json_ready(data)).encode(), json.loads),
+        "msgpack": (lambda: msgpack.packb(data), lambda body: msgpack.unpackb(body)),
+        "msgpack + interned table": (
+            lambda: msgpack.packb([wire.FIELDS_VERSION, wire._intern(data)]),
+            lambda body: wire._expand(msgpack.unpackb(body, strict_map_key=False)[1]),
+        ),
+        "json + zstd": (
+            lambda: compressor.compress(json.dumps(wire._json_ready(data)).encode()),
+            lambda body: json.loads(decompressor.decompress(body)),
+        ),
+        "compact (wire.encode)": (
+            lambda: wire.encode(data, compact=True)[0],
+            lambda body: wire.decode(body, wire.COMPACT_TYPE, wire.ZSTD),
+        ),
+    }
+    print(f"\n{minutes:g} min call ({turns} transcript entries)")
+    print(f"{'format':<24} {'bytes':>9} {'vs json':>8} {'encode':>10} {'decode':>10}")
+    json_size = None
+    for name, (encode, decode) in formats.items():
+        encode_seconds, body = _time(encode, runs)
+        decode_seconds, decoded = _time(lambda: decode(body), runs)
+        json_size = json_size or len(body)
+        if name == "compact (wire.encode)":
+            assert decoded == wire._json_ready(data), "compact round trip differs"
+        print(f"{name:<24} {len(body):>9,} {len(body) / json_size:>7.0%} "
+              f"{encode_seconds * 1e6:>8.0f}us {decode_seconds * 1e6:>8.0f}us")
+
+
+async def upload(backend: FakeBackend, data: dict, mode: str) -> dict[str, int]:
+    """One call's lead fetch and disposition upload; request body bytes by content type."""
+    wire.negotiator.mode = mode
+    wire.negotiator.reset()
+    workflow.init_workflow(backend.lead_ids[0], api_base_url="http://fake-backend",
+                           transport=httpx.ASGITransport(app=backend))
+    workflow._workflow_state["call_transcript"] = data["callTranscript"]
+    await workflow._fetch_lead(backend.lead_ids[0])
+    await workflow.update_disposition("callback_requested", data["callSummary"])
+    comms = backend.communications[backend.lead_ids[0]]
+    stored = comms[-1]["callTranscript"]
+    assert json.loads(stored) == data["callTranscript"], "stored transcript differs"
+    sizes = dict(backend.body_bytes)
+    backend.reset_stats()
+    return sizes
+
+
+async def bench_negotiation(minutes: float, seed: int) -> None:
+    data = payload(minutes, random.Random(seed))
+    print(f"\nUpload of a {minutes:g} min call through workflow.update_disposition")
+    advertising = FakeBackend(seed=seed, lead_count=1)
+    sizes = await upload(advertising, data, "auto")
+    assert sizes[wire.COMPACT_TYPE] > 0, "compact was not negotiated"
+    compact_bytes = sizes[wire.COMPACT_TYPE]
+    sizes = await upload(advertising, data, "json")
+    json_bytes = sizes[wire.JSON_TYPE]
+    print(f"backend advertises compact: {compact_bytes:,} bytes for the communication "
+          f"(JSON mode: {json_bytes:,} bytes including the status update)")
+
+    legacy = FakeBackend(seed=seed, lead_count=1, accept_compact=False)
+    sizes = await upload(legacy, data, "msgpack")
+    assert sizes[wire.COMPACT_TYPE] == 0 and sizes[wire.JSON_TYPE] > 0
+    print("backend without compact support: 415, resent as JSON, host remembered as JSON-only")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[2, 10, 45], help="call lengths")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+    for minutes in args.minutes:
+        bench_sizes(minutes, args.runs, args.seed)
+    asyncio.run(bench_negotiation(max(args.minutes), args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,665 @@
+"""
+Daily Event Insurance - Caller ID
+Reverse lookup of an inbound caller's number to a lead or partner.
+
+Inbound calls arrive without a lead ID, so the agent used to start blind
+("inbound call without lead context"). This index maps every lead's and
+partner's phone number, normalized to E.164, to its record. The worker's
+main process builds it from the leads and partners APIs, keeps it current
+from their `updatedSince` change feeds and writes it to a file next to the
+shared cache (tmpfs); job processes map the file read-only and resolve the
+SIP caller at job start, so the lead ID feeds the usual lead context path
+(speculative fetch, shared cache, `load_lead_context`).
+
+Layout: an open-addressing hash table (linear probing, load factor at most
+0.75) keyed by the E.164 digits as an int64, whose slots hold an entry
+index; each entry has a kind and a record ID (offsets into one byte blob).
+`build` inserts every number at once with NumPy; `lookup` is a
+multiplicative hash and a few probes through memoryviews.
+
+    # worker main process, before cli.run_app
+    CallerIdOwner().start()
+
+    # job process
+    match = caller_ids.lookup(participant.attributes.get("sip.phoneNumber"))
+    if match is not None and match.kind == "lead":
+        lead_id = match.id
+"""
+
+import asyncio
+import atexit
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable, NamedTuple
+
+import httpx
+import numpy as np
+from livekit import rtc
+
+from phones import number_key
+from shared_cache import default_base_directory
+
+logger = logging.getLogger("caller-id")
+
+_MAGIC = b"DEICID01"
+FORMAT_VERSION = 1
+# magic, format, entry count, slot count, built at, then the offsets of the
+# slot keys, slot entries, entry kinds, ID offsets and ID blob
+_HEADER = struct.Struct("<8sIIQdQQQQQ")
+
+REMOVED, LEAD, PARTNER = 0, 1, 2
+KIND_NAMES = {LEAD: "lead", PARTNER: "partner"}
+
+MAX_LOAD = 0.75
+# Load factor of a fresh build, leaving room for incremental inserts
+BUILD_LOAD = 0.6
+
+# Fibonacci hashing: the top bits of key * 2^64 / phi
+_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class CallerMatch(NamedTuple):
+    kind: str  # "lead" or "partner"
+    id: str
+    number: str  # E.164
+
+
+def _record_phone(record: dict[str, Any]) -> str | None:
+    return record.get("phone") or record.get("contactPhone")
+
+
+def _home_slots(keys: np.ndarray, shift: int) -> np.ndarray:
+    return ((keys.astype(np.uint64) * np.uint64(_MULTIPLIER)) >> np.uint64(shift)).astype(np.int64)
+
+
+def _table_bits(entries: int, load: float) -> int:
+    return max(4, int(entries / load).bit_length())
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class CallerIdIndex:
+    """
+    Phone number -> lead or partner.
+
+    Built in one pass with `build`/`from_records`, changed with `apply` (a
+    change feed page), `upsert` and `remove`, written with `save` and mapped
+    read-only with `load`. A number resolves to one record: when several
+    share it, the last one given wins.
+
+    Args:
+        capacity: Entries to size the table and entry arrays for
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.readonly = False
+        self._new_table(_table_bits(capacity, BUILD_LOAD))
+        self._count = 0  # entries, removed ones included
+        self._live = 0
+        capacity = max(capacity, 16)
+        self._kinds = np.zeros(capacity, np.uint8)
+        self._numbers = np.zeros(capacity, np.int64)
+        self._id_crcs = np.zeros(capacity, np.uint32)
+        self._id_offsets = np.zeros(capacity + 1, np.int64)
+        self._ids: bytearray | memoryview = bytearray()
+        self._crc_order: np.ndarray | None = None  # see _entries_of
+        self._views()
+
+    def _new_table(self, bits: int) -> None:
+        self._size = 1 << bits
+        self._shift = 64 - bits
+        self._keys = np.zeros(self._size, np.int64)  # 0 = empty slot
+        self._slots = np.zeros(self._size, np.int32)  # entry index + 1
+        self._used = 0
+
+    def _views(self) -> None:
+        # Scalar probes through memoryviews skip NumPy's per-item overhead
+        self._keys_view = memoryview(self._keys)
+        self._slots_view = memoryview(self._slots)
+        self._kinds_view = memoryview(self._kinds)
+        self._offsets_view = memoryview(self._id_offsets)
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def load_factor(self) -> float:
+        return self._used / self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the table, the entries and the IDs (what `save` writes, less the header)."""
+        count = self._count
+        return (self._keys.nbytes + self._slots.nbytes + count + (count + 1) * 8
+                + int(self._id_offsets[count]))
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, numbers: np.ndarray, kinds: np.ndarray, ids: list[str]) -> "CallerIdIndex":
+        """
+        Index parallel arrays of number keys (see `number_key`; 0 is
+        skipped), kinds (LEAD or PARTNER) and record IDs.
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        kinds = np.asarray(kinds, dtype=np.uint8)
+        valid = np.flatnonzero(numbers > 0)
+        # The last record of each number is the first one in reverse order
+        _, last = np.unique(numbers[valid][::-1], return_index=True)
+        keep = np.sort(valid[valid.size - 1 - last])
+        index = cls(capacity=keep.size)
+        index._append(kinds[keep], numbers[keep], [ids[i].encode() for i in keep.tolist()])
+        index._place(numbers[keep], np.arange(1, keep.size + 1, dtype=np.int32))
+        return index
+
+    @classmethod
+    def from_records(cls, leads: Iterable[dict[str, Any]], partners: Iterable[dict[str, Any]] = ()) -> "CallerIdIndex":
+        """Index API-shaped records; a lead wins over a partner with the same number."""
+        numbers, kinds, ids = [], [], []
+        for kind, records in ((PARTNER, partners), (LEAD, leads)):
+            for record in records:
+                if record.get("id"):
+                    numbers.append(number_key(_record_phone(record)))
+                    kinds.append(kind)
+                    ids.append(str(record["id"]))
+        return cls.build(np.array(numbers, dtype=np.int64), np.array(kinds, dtype=np.uint8), ids)
+
+    def _append(self, kinds: np.ndarray, numbers: np.ndarray, ids: list[bytes]) -> None:
+        """Add entries (not yet in the table)."""
+        start, end = self._count, self._count + len(ids)
+        if end > self._kinds.size:
+            capacity = max(end, 2 * self._kinds.size)
+            self._kinds = np.concatenate([self._kinds[:start], np.zeros(capacity - start, np.uint8)])
+            self._numbers = np.concatenate([self._numbers[:start], np.zeros(capacity - start, np.int64)])
+            self._id_crcs = np.concatenate([self._id_crcs[:start], np.zeros(capacity - start, np.uint32)])
+            self._id_offsets = np.concatenate([self._id_offsets[:start + 1], np.zeros(capacity - start, np.int64)])
+            self._views()
+        self._kinds[start:end] = kinds
+        self._numbers[start:end] = numbers
+        self._id_crcs[start:end] = np.fromiter(map(zlib.crc32, ids), dtype=np.uint32, count=len(ids))
+        lengths = np.fromiter(map(len, ids), dtype=np.int64, count=len(ids))
+        self._id_offsets[start + 1:end + 1] = self._id_offsets[start] + np.cumsum(lengths)
+        self._ids += b"".join(ids)
+        self._count = end
+        self._live += int(np.count_nonzero(kinds))
+
+    def _place(self, keys: np.ndarray, entries: np.ndarray) -> None:
+        """Insert distinct keys that are not in the table yet, all at once."""
+        mask = self._size - 1
+        slots = _home_slots(keys, self._shift)
+        self._used += keys.size
+        while keys.size:
+            free = self._keys[slots] == 0
+            # Of the keys probing the same free slot the last write wins; the others probe on
+            self._keys[slots[free]] = keys[free]
+            placed = np.zeros(keys.size, dtype=bool)
+            placed[free] = self._keys[slots[free]] == keys[free]
+            self._slots[slots[placed]] = entries[placed]
+            keys, entries, slots = keys[~placed], entries[~placed], (slots[~placed] + 1) & mask
+
+    def _compact(self, extra: int) -> None:
+        """Drop removed entries and rebuild the table with room for `extra` more."""
+        count = self._count
+        live = self._kinds[:count] != REMOVED
+        lengths = np.diff(self._id_offsets[:count + 1])
+        ids = np.frombuffer(self._ids, dtype=np.uint8)[np.repeat(live, lengths)].tobytes()
+        kinds, numbers, crcs = self._kinds[:count][live], self._numbers[:count][live], self._id_crcs[:count][live]
+        live_count = kinds.size
+        self._new_table(_table_bits(live_count + extra, BUILD_LOAD))
+        capacity = max(live_count + extra, 16)
+        self._kinds = np.zeros(capacity, np.uint8)
+        self._numbers = np.zeros(capacity, np.int64)
+        self._id_crcs = np.zeros(capacity, np.uint32)
+        self._id_offsets = np.zeros(capacity + 1, np.int64)
+        self._kinds[:live_count], self._numbers[:live_count], self._id_crcs[:live_count] = kinds, numbers, crcs
+        self._id_offsets[1:live_count + 1] = np.cumsum(lengths[live])
+        self._ids = bytearray(ids)
+        self._crc_order = None
+        self._count = self._live = live_count
+        self._place(numbers, np.arange(1, live_count + 1, dtype=np.int32))
+        self._views()
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def _find_slot(self, key: int) -> int:
+        """The slot holding `key`, or the empty slot it would go in."""
+        keys = self._keys_view
+        mask = self._size - 1
+        slot = ((key * _MULTIPLIER) & _MASK64) >> self._shift
+        while True:
+            found = keys[slot]
+            if found == key or not found:
+                return slot
+            slot = (slot + 1) & mask
+
+    def lookup(self, number: str | int | None) -> CallerMatch | None:
+        """The lead or partner with this number (any format `phones.normalize_e164` takes), or None."""
+        key = number_key(number)
+        if not key or not self._live:
+            return None
+        index = self._slots_view[self._find_slot(key)] - 1
+        kind = self._kinds_view[index] if index >= 0 else REMOVED
+        if kind == REMOVED:
+            return None
+        offsets = self._offsets_view
+        return CallerMatch(KIND_NAMES[kind], str(self._ids[offsets[index]:offsets[index + 1]], "utf-8"), f"+{key}")
+
+    def lookup_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Entry index of each number key (-1 if absent or removed), probing all keys at once."""
+        keys = np.asarray(keys, dtype=np.int64)
+        result = np.full(keys.size, -1, dtype=np.int64)
+        pending = np.flatnonzero(keys > 0)
+        slots = _home_slots(keys[pending], self._shift)
+        mask = self._size - 1
+        while pending.size:
+            found = self._keys[slots]
+            hit = found == keys[pending]
+            result[pending[hit]] = self._slots[slots[hit]] - 1
+            probing = ~hit & (found != 0)
+            pending, slots = pending[probing], (slots[probing] + 1) & mask
+        matched = np.flatnonzero(result >= 0)
+        result[matched[self._kinds[result[matched]] == REMOVED]] = -1
+        return result
+
+    # -------------------------------------------------------------------------
+    # Changes
+    # -------------------------------------------------------------------------
+
+    def apply(self, kind: int, records: Iterable[dict[str, Any]]) -> int:
+        """Apply a page of changed API records of one kind; returns how many changed the index."""
+        return self._change(kind, [
+            (str(record["id"]), number_key(_record_phone(record))) for record in records if record.get("id")
+        ])
+
+    def upsert(self, kind: int, record_id: str, number: str | int | None) -> bool:
+        """Point `number` at a record, replacing the record's previous number; True if anything changed."""
+        return self._change(kind, [(record_id, number_key(number))]) > 0
+
+    def remove(self, kind: int, record_id: str) -> bool:
+        """Drop a record's number; True if it had one."""
+        return self._change(kind, [(record_id, 0)]) > 0
+
+    def _change(self, kind: int, changes: list[tuple[str, int]]) -> int:
+        if self.readonly:
+            raise ValueError("A mapped caller ID index is read-only")
+        encoded = [(record_id.encode(), key) for record_id, key in changes]
+        # Make room first: compacting renumbers the entries
+        if self._used + len(encoded) > self._size * MAX_LOAD:
+            self._compact(extra=max(len(encoded), self._count // 4))
+        current = self._entries_of(kind, [record_id for record_id, _ in encoded])
+        changed = 0
+        for record_id, key in encoded:
+            index = current.get(record_id)
+            if index is not None and self._kinds[index] == REMOVED:
+                index = None  # lost its number to a record earlier in this batch
+            if (index is None and not key) or (index is not None and self._numbers[index] == key):
+                continue
+            if index is not None:
+                self._kinds[index] = REMOVED
+                self._live -= 1
+            if key:
+                current[record_id] = self._insert(kind, record_id, key)
+            changed += 1
+        return changed
+
+    def _entries_of(self, kind: int, ids: list[bytes]) -> dict[bytes, int]:
+        """Live entries of `kind` for these record IDs."""
+        count = self._count
+        if not ids or not count:
+            return {}
+        crcs = np.fromiter(map(zlib.crc32, ids), dtype=np.uint32, count=len(ids))
+        # Entries sorted by ID checksum, plus the ones appended since the sort
+        if self._crc_order is None or count - self._crc_order.size > max(4096, self._crc_order.size // 8):
+            self._crc_order = np.argsort(self._id_crcs[:count])
+            self._crc_sorted = self._id_crcs[self._crc_order]
+        sorted_count = self._crc_order.size
+        starts = np.searchsorted(self._crc_sorted, crcs, side="left").tolist()
+        ends = np.searchsorted(self._crc_sorted, crcs, side="right").tolist()
+        candidates = np.concatenate([
+            *(self._crc_order[start:end] for start, end in zip(starts, ends) if end > start),
+            sorted_count + np.flatnonzero(np.isin(self._id_crcs[sorted_count:count], crcs)),
+        ])
+        candidates = candidates[self._kinds[candidates] == kind]
+        wanted = set(ids)
+        found = {}
+        for index in candidates.tolist():
+            record_id = bytes(self._ids[self._offsets_view[index]:self._offsets_view[index + 1]])
+            if record_id in wanted:
+                found[record_id] = index
+        return found
+
+    def _insert(self, kind: int, record_id: bytes, key: int) -> int:
+        index = self._count
+        self._append(np.array([kind], np.uint8), np.array([key], np.int64), [record_id])
+        slot = self._find_slot(key)
+        if self._keys[slot] == key:
+            previous = int(self._slots[slot]) - 1
+            if previous >= 0 and self._kinds[previous] != REMOVED:
+                # The number moved to this record
+                self._kinds[previous] = REMOVED
+                self._live -= 1
+        else:
+            self._keys[slot] = key
+            self._used += 1
+        self._slots[slot] = index + 1
+        return index
+
+    # -------------------------------------------------------------------------
+    # Files
+    # -------------------------------------------------------------------------
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the index to `path` (through a temporary file and a rename)."""
+        count = self._count
+        sections = [
+            self._keys, self._slots, self._kinds[:count], self._id_offsets[:count + 1],
+            np.frombuffer(self._ids, dtype=np.uint8)[:int(self._id_offsets[count])],
+        ]
+        offsets = []
+        offset = _HEADER.size
+        for section in sections:
+            offset = _align(offset)
+            offsets.append(offset)
+            offset += section.nbytes
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, count, self._size, time.time(), *offsets))
+            for section, section_offset in zip(sections, offsets):
+                f.seek(section_offset)
+                f.write(memoryview(section))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "CallerIdIndex":
+        """Map an index file read-only; every process mapping it shares its pages."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, count, size, built_at,
+         keys_offset, slots_offset, kinds_offset, id_offsets_offset, ids_offset) = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            mm.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} caller ID index: {path}")
+        index = cls.__new__(cls)
+        index.readonly = True
+        index.built_at = built_at
+        index._size = size
+        index._shift = 64 - (size.bit_length() - 1)
+        index._keys = np.frombuffer(mm, dtype=np.int64, count=size, offset=keys_offset)
+        index._slots = np.frombuffer(mm, dtype=np.int32, count=size, offset=slots_offset)
+        index._kinds = np.frombuffer(mm, dtype=np.uint8, count=count, offset=kinds_offset)
+        index._id_offsets = np.frombuffer(mm, dtype=np.int64, count=count + 1, offset=id_offsets_offset)
+        index._ids = memoryview(mm)[ids_offset:ids_offset + int(index._id_offsets[count])]
+        index._numbers = index._id_crcs = None
+        index._count = count
+        index._live = int(np.count_nonzero(index._kinds))
+        index._used = int(np.count_nonzero(index._keys))
+        index._views()
+        return index
+
+
+# =============================================================================
+# OWNER (worker main process)
+# =============================================================================
+
+# Cursor of a full sync: every record is updated after it
+_EPOCH = "1970-01-01T00:00:00Z"
+FEEDS = {LEAD: "/api/admin/leads", PARTNER: "/api/admin/partners"}
+
+
+class ChangeFeed:
+    """
+    Leads or partners updated after a cursor (`updatedSince`).
+
+    The list routes filter on `updatedSince` and page by `page`/`hasNext` in
+    creation order. Records are filtered on `updatedAt` here too, so an
+    older backend that ignores `updatedSince` is still correct, only slower.
+
+    Args:
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+        page_size: Records per request (the API caps this at 100)
+    """
+
+    def __init__(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        page_size: int = 100,
+    ):
+        self.base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+        api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.page_size = page_size
+        self._client = httpx.AsyncClient(transport=transport, headers=headers, timeout=30.0)
+
+    async def pages(
+        self, kind: int, since: str, status: str | None = None
+    ) -> AsyncIterator[tuple[list[dict[str, Any]], str]]:
+        """
+        Yield (records, cursor) pages of `kind` records updated after `since`,
+        only those in `status` if given. Pages come in creation order, so a
+        later page can still hold an older update: the cursor stays at
+        `since` until the last page.
+        """
+        latest, page = since, 1
+        params = {"updatedSince": since, "sortBy": "createdAt", "sortOrder": "asc", "pageSize": self.page_size}
+        if status:
+            params["status"] = status
+        while True:
+            response = await self._client.get(f"{self.base_url}{FEEDS[kind]}", params={**params, "page": page})
+            response.raise_for_status()
+            body = response.json()
+            records = [record for record in body.get("data", []) if (record.get("updatedAt") or "") > since]
+            latest = max([latest, *(record["updatedAt"] for record in records)])
+            if not body.get("pagination", {}).get("hasNext"):
+                yield records, latest
+                return
+            yield records, since
+            page += 1
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class CallerIdOwner:
+    """
+    Builds a worker's caller ID index and keeps it current from a
+    background thread in the main process: change feed syncs every
+    `interval` seconds, and a full rebuild every `rebuild_interval` to drop
+    the numbers of deleted records (which the feeds never return).
+
+    Args:
+        interval: Seconds between syncs (default $CALLER_ID_REFRESH, else 60)
+        rebuild_interval: Seconds between full rebuilds
+        path: Index file (default callerid.bin in the worker's tmpfs directory)
+        **feed_options: Passed to `ChangeFeed` (api_base_url, api_key, transport, page_size)
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        rebuild_interval: float = 6 * 3600,
+        path: str | os.PathLike | None = None,
+        **feed_options: Any,
+    ):
+        self.interval = interval if interval is not None else float(os.getenv("CALLER_ID_REFRESH", "60"))
+        self.rebuild_interval = rebuild_interval
+        self.path = Path(path) if path else default_base_directory() / f"worker-{os.getpid()}" / "callerid.bin"
+        self.feed_options = feed_options
+        self.index: CallerIdIndex | None = None
+        self.cursors = {kind: _EPOCH for kind in FEEDS}
+        self._rebuild_at = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    async def sync(self) -> int:
+        """
+        Apply the records updated since the last sync (all of them on a
+        rebuild) and write the index if anything changed; returns how many
+        records changed it.
+        """
+        rebuild = self.index is None or time.monotonic() >= self._rebuild_at
+        cursors = {kind: _EPOCH for kind in FEEDS} if rebuild else dict(self.cursors)
+        feed = ChangeFeed(**self.feed_options)
+        try:
+            if rebuild:
+                records: dict[int, list[dict[str, Any]]] = {kind: [] for kind in FEEDS}
+                for kind in FEEDS:
+                    async for page, cursors[kind] in feed.pages(kind, cursors[kind]):
+                        records[kind].extend(page)
+                index = CallerIdIndex.from_records(records[LEAD], records[PARTNER])
+                changed = len(index)
+            else:
+                index, changed = self.index, 0
+                for kind in (PARTNER, LEAD):
+                    async for page, cursors[kind] in feed.pages(kind, cursors[kind]):
+                        changed += index.apply(kind, page)
+        finally:
+            await feed.aclose()
+        if rebuild:
+            self.index = index
+            self._rebuild_at = time.monotonic() + self.rebuild_interval
+        self.cursors = cursors
+        if changed or rebuild:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            index.save(self.path)
+        return changed
+
+    def start(self) -> None:
+        """Export the index path to job processes and start syncing."""
+        os.environ["CALLER_ID_INDEX"] = str(self.path)
+        atexit.register(self.stop)
+        self._thread = threading.Thread(target=self._run, name="caller-id-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"Caller ID index at {self.path}, syncing every {self.interval:g}s")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                changed = asyncio.run(self.sync())
+                if changed:
+                    logger.info(
+                        f"Caller ID index synced: {changed} changes, {len(self.index)} numbers "
+                        f"in {time.perf_counter() - started:.1f}s"
+                    )
+            except Exception as e:
+                logger.warning(f"Caller ID sync failed, keeping the current index: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.path.unlink(missing_ok=True)
+
+
+# =============================================================================
+# READER (job processes)
+# =============================================================================
+
+class CallerIdReader:
+    """
+    Read side of a worker's caller ID index: maps the owner's file and
+    remaps it when the owner replaces it. Without an owner (a standalone
+    run) every lookup misses.
+
+    Args:
+        path: Index file (default $CALLER_ID_INDEX)
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self._path = path
+        self._index: CallerIdIndex | None = None
+        self._version: tuple[int, int] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.remaps = 0
+
+    def _current(self) -> CallerIdIndex | None:
+        path = self._path or os.getenv("CALLER_ID_INDEX")
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version != self._version:
+            try:
+                self._index = CallerIdIndex.load(path)
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning(f"Caller ID index not loaded: {e}")
+                return self._index
+            self._version = version
+            self.remaps += 1
+        return self._index
+
+    def lookup(self, number: str | int | None) -> CallerMatch | None:
+        index = self._current()
+        match = index.lookup(number) if index is not None else None
+        if match is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match
+
+    def metrics(self) -> dict[str, Any]:
+        index = self._index
+        return {"numbers": len(index) if index is not None else 0, "hits": self.hits,
+                "misses": self.misses, "remaps": self.remaps}
+
+
+caller_ids = CallerIdReader()
+
+
+async def identify_caller(ctx: Any, timeout: float = 1.0) -> CallerMatch | None:
+    """
+    The lead or partner calling in, from the SIP participant's
+    `sip.phoneNumber`. Waits up to `timeout` seconds for the participant
+    if it has not joined yet (an inbound caller usually has).
+
+    Args:
+        ctx: The job's `JobContext`
+        timeout: Seconds to wait for the SIP participant
+    """
+    participant = next(
+        (p for p in ctx.room.remote_participants.values() if p.kind == rtc.ParticipantKind.PARTICIPANT_KIND_SIP),
+        None,
+    )
+    if participant is None:
+        try:
+            participant = await asyncio.wait_for(
+                ctx.wait_for_participant(kind=rtc.ParticipantKind.PARTICIPANT_KIND_SIP), timeout
+            )
+        except asyncio.TimeoutError:
+            return None
+    number = participant.attributes.get("sip.phoneNumber")
+    started = time.perf_counter()
+    match = caller_ids.lookup(number)
+    elapsed_us = (time.perf_counter() - started) * 1e6
+    if match is None:
+        logger.info(f"Caller {number or 'unknown'} not in the caller ID index ({elapsed_us:.0f}us)")
+    else:
+        logger.info(f"Caller {match.number} is {match.kind} {match.id} ({elapsed_us:.0f}us)")
+    return match
@@ -0,0 +1,225 @@
+"""
+Daily Event Insurance - Commission Projections
+Exact partner earnings from the commission tiers and multi-location bonuses.
+
+The agents used to quote earnings by doing the arithmetic themselves from
+the tier table in their prompts. The tables here mirror
+lib/commission-tiers.ts: the tier comes from the total monthly
+participants across all locations, the location bonus is added to the
+tier's dollars per participant, and every participant is covered.
+
+    projection = project(monthly_participants=1200, locations=3)
+    projection.monthly      # 1200 * 3 participants at $12.00 + $0.50 -> 45000.0
+
+Leads estimate participants per day (`estimatedParticipants`, asked for as
+daily visitors); `monthly_from_daily` is the one place that turns that into
+the monthly count the tiers use, at 30 days a month as
+lib/services/lead-value.ts does.
+
+`project` looks the tier and bonus up with `bisect`; `project_batch` does
+the same for whole arrays (a lead segment) with NumPy.
+"""
+
+import bisect
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+class CommissionTier(NamedTuple):
+    min_participants: int
+    percentage: float
+    per_participant: float
+
+
+# Commission tiers (lib/commission-tiers.ts), by total monthly participants
+TIERS = (
+    CommissionTier(0, 25.0, 10.0),
+    CommissionTier(1000, 27.5, 11.0),
+    CommissionTier(2500, 30.0, 12.0),
+    CommissionTier(5000, 32.5, 13.0),
+    CommissionTier(10000, 35.0, 14.0),
+    CommissionTier(25000, 37.5, 15.0),
+)
+TIER_FLOORS = np.array([tier.min_participants for tier in TIERS], dtype=np.float64)
+TIER_PER_PARTICIPANT = np.array([tier.per_participant for tier in TIERS])
+TIER_PERCENTAGE = np.array([tier.percentage for tier in TIERS])
+
+# Multi-location bonus per participant: 1, 2-5, 6-10, 11-25, 26+ locations
+LOCATION_FLOORS = (1, 2, 6, 11, 26)
+LOCATION_BONUSES = (0.0, 0.5, 1.0, 1.5, 2.0)
+
+_TIER_FLOORS = [tier.min_participants for tier in TIERS]
+_LOCATION_BONUSES = np.array(LOCATION_BONUSES)
+
+# lib/services/lead-value.ts
+DAYS_PER_MONTH = 30
+
+
+def monthly_from_daily(daily_participants: Any) -> Any:
+    """Monthly participants from a lead's daily estimate (a number or an array)."""
+    return daily_participants * DAYS_PER_MONTH
+
+
+def tier_for(total_participants: float) -> CommissionTier:
+    """The tier a monthly participant total falls in."""
+    return TIERS[max(bisect.bisect_right(_TIER_FLOORS, total_participants) - 1, 0)]
+
+
+def location_bonus(locations: int) -> float:
+    """Dollars per participant added for a partner with `locations` locations."""
+    return LOCATION_BONUSES[max(bisect.bisect_right(LOCATION_FLOORS, locations) - 1, 0)]
+
+
+# =============================================================================
+# SINGLE PROJECTION
+# =============================================================================
+
+@dataclass(frozen=True)
+class Projection:
+    """Earnings for one partner."""
+
+    monthly_participants: int
+    locations: int
+    total_participants: int
+    tier: CommissionTier
+    location_bonus: float
+    per_participant: float
+    monthly: float
+    annual: float
+    # The next tier up and how many more monthly participants reach it
+    next_tier: CommissionTier | None
+    participants_to_next: int
+
+    @property
+    def summary(self) -> str:
+        """The projection as the earnings tool presents it to the model."""
+        where = "1 location" if self.locations == 1 else f"{self.locations} locations"
+        lines = [
+            f"Projected earnings for {self.monthly_participants:,} monthly participants at {where}:",
+            f"- Total participants: {self.total_participants:,}/month",
+            f"- Tier: {self.tier.percentage:g}% (${self.tier.per_participant:.2f}/participant)",
+        ]
+        if self.location_bonus:
+            lines.append(f"- Multi-location bonus: +${self.location_bonus:.2f}/participant")
+        lines += [
+            f"- Monthly commission: ${self.monthly:,.0f}",
+            f"- Annual commission: ${self.annual:,.0f}",
+        ]
+        if self.next_tier is not None:
+            lines.append(
+                f"- Next tier: {self.next_tier.percentage:g}% at {self.next_tier.min_participants:,} participants "
+                f"({self.participants_to_next:,} more)"
+            )
+        return "\n".join(lines)
+
+
+def project(monthly_participants: int, locations: int = 1) -> Projection:
+    """
+    Project a partner's commission.
+
+    Args:
+        monthly_participants: Participants per month at each location
+        locations: Number of locations
+
+    Raises:
+        ValueError: A negative participant count or fewer than one location
+    """
+    if monthly_participants < 0:
+        raise ValueError("monthly_participants must not be negative")
+    if locations < 1:
+        raise ValueError("locations must be at least 1")
+    total = monthly_participants * locations
+    tier = tier_for(total)
+    bonus = location_bonus(locations)
+    per_participant = tier.per_participant + bonus
+    monthly = total * per_participant
+    index = TIERS.index(tier)
+    next_tier = TIERS[index + 1] if index + 1 < len(TIERS) else None
+    return Projection(
+        monthly_participants=monthly_participants,
+        locations=locations,
+        total_participants=total,
+        tier=tier,
+        location_bonus=bonus,
+        per_participant=per_participant,
+        monthly=monthly,
+        annual=monthly * 12,
+        next_tier=next_tier,
+        participants_to_next=next_tier.min_participants - total if next_tier else 0,
+    )
+
+
+def script_values(daily_participants: int | None, locations: int = 1) -> dict[str, str]:
+    """
+    Values for the `{estimated_participants}` (monthly) and
+    `{projected_revenue}` placeholders of a script, from a lead's daily
+    participant estimate; empty without one.
+    """
+    if daily_participants is None or daily_participants < 0:
+        return {}
+    monthly_participants = monthly_from_daily(daily_participants)
+    projection = project(monthly_participants, max(locations, 1))
+    return {
+        "estimated_participants": f"{monthly_participants:,}",
+        "projected_revenue": f"{projection.monthly:,.0f}",
+    }
+
+
+# =============================================================================
+# BATCH PROJECTIONS
+# =============================================================================
+
+class BatchProjection(NamedTuple):
+    """Projections for many partners, one array element each."""
+
+    total_participants: np.ndarray
+    tier: np.ndarray  # index into TIERS
+    per_participant: np.ndarray
+    monthly: np.ndarray
+    annual: np.ndarray
+
+
+def tier_index(total_participants: np.ndarray) -> np.ndarray:
+    """Index into TIERS of each participant total."""
+    # The count of floors reached: five comparisons into an int8 column are
+    # a few times faster than np.searchsorted over 1M values.
+    tier = np.zeros(np.shape(total_participants), dtype=np.int8)
+    for floor in TIER_FLOORS[1:]:
+        tier += total_participants >= floor
+    return tier
+
+
+def monthly_commission(participants: np.ndarray) -> np.ndarray:
+    """Monthly commission in dollars for each participant count (single location)."""
+    participants = np.maximum(np.asarray(participants, dtype=np.float64), 0.0)
+    return participants * np.take(TIER_PER_PARTICIPANT, tier_index(participants))
+
+
+def project_batch(monthly_participants: np.ndarray, locations: np.ndarray | int = 1) -> BatchProjection:
+    """
+    `project` over arrays: participants per location and location counts
+    (an array of the same length, or one count for all). Negative counts
+    are treated as 0 participants and 1 location.
+    """
+    participants = np.maximum(np.asarray(monthly_participants, dtype=np.float64), 0.0)
+    locations = np.maximum(np.asarray(locations, dtype=np.int64), 1)
+    total = participants * locations
+    tier = tier_index(total)
+    bonus = np.take(_LOCATION_BONUSES, np.searchsorted(LOCATION_FLOORS, locations, side="right") - 1)
+    per_participant = np.take(TIER_PER_PARTICIPANT, tier) + bonus
+    monthly = total * per_participant
+    return BatchProjection(total, tier, per_participant, monthly, monthly * 12)
+
+
+def project_leads(leads: list[dict[str, Any]]) -> BatchProjection:
+    """
+    Projections for API-shaped lead dicts, from `estimatedParticipants`
+    (daily; missing counts as 0) and `locations` (missing counts as 1).
+    """
+    participants = monthly_from_daily(np.fromiter(
+        (lead.get("estimatedParticipants") or 0 for lead in leads), dtype=np.float64, count=len(leads)
+    ))
+    locations = np.fromiter((lead.get("locations") or 1 for lead in leads), dtype=np.int64, count=len(leads))
+    return project_batch(participants, locations)
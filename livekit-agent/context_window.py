@@ -0,0 +1,374 @@
+"""
+Daily Event Insurance - Bounded Chat Context
+Keeps the chat context of long calls under a token ceiling.
+
+Every user turn, agent reply and tool result is appended to the agent's chat
+context, and the whole context is sent (or kept server-side, for realtime
+models) on every turn - so a 45-minute support call gets slower and more
+expensive with each exchange. `ContextWindow` bounds it:
+
+- the last `keep_turns` turns (a user message and everything after it) stay
+  verbatim
+- older turns are folded into a single rolling summary message, computed in
+  the background between turns so it never delays a reply
+- the latest result of each pinned tool (lead context, recommended script,
+  partner account...) is kept verbatim even when its turn is folded, since
+  the model keeps needing those facts
+- if the verbatim part alone exceeds `max_tokens`, the oldest turns are
+  folded early, down to a single verbatim turn
+
+The summary is a system message with a fixed id, so each update replaces it
+in place (and in the realtime session's remote context) instead of adding
+another one. If the summarizer model fails, an extractive summary is used so
+the ceiling still holds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from livekit.agents import Agent, AgentSession, llm
+
+from prompts import count_tokens
+
+logger = logging.getLogger("context-window")
+
+SUMMARY_ID = "ctx_rolling_summary"
+SUMMARY_HEADER = "Summary of the call so far (older turns, condensed):"
+
+DEFAULT_SUMMARY_MODEL = "gpt-4o-mini"
+
+# Tool results the model keeps referring back to for the rest of the call
+DEFAULT_PINNED_TOOLS = (
+    "load_lead_context",
+    "get_recommended_script",
+    "schedule_demo",
+    "schedule_callback",
+    "get_partner_account",
+    "check_integration_status",
+    "create_support_ticket",
+)
+
+SUMMARY_INSTRUCTIONS = """You condense the earlier part of a phone call between an insurance partnership agent and a caller.
+Update the existing summary with the new transcript. Keep names, businesses, numbers, dates, commitments,
+objections raised and how they were handled, and anything the caller asked to be followed up. Drop pleasantries.
+Write at most 12 short bullet points."""
+
+Summarizer = Callable[[str, str], Awaitable[str]]
+
+
+# =============================================================================
+# SUMMARIZERS
+# =============================================================================
+
+def extractive_summary(previous: str, transcript: str, max_lines: int = 24) -> str:
+    """
+    Summarizer without a model: keeps the first sentence of each line of the
+    folded transcript, newest last, capped at `max_lines`.
+    """
+    lines = [line for line in previous.splitlines() if line.strip()]
+    for line in transcript.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        speaker, _, text = line.partition(": ")
+        sentence = text.split(". ")[0].strip()
+        if sentence:
+            lines.append(f"- {speaker}: {sentence[:160]}")
+    return "\n".join(lines[-max_lines:])
+
+
+def llm_summarizer(model: str = DEFAULT_SUMMARY_MODEL, timeout: float = 15.0) -> Summarizer:
+    """Summarizer backed by an OpenAI chat model."""
+
+    async def summarize(previous: str, transcript: str) -> str:
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(timeout=timeout)
+        response = await client.chat.completions.create(
+            model=model,
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                {"role": "user", "content": f"Existing summary:\n{previous or '(none)'}\n\nNew transcript:\n{transcript}"},
+            ],
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    return summarize
+
+
+# =============================================================================
+# CONTEXT WINDOW
+# =============================================================================
+
+def item_text(item: llm.ChatItem) -> str:
+    """Text an item contributes to the model's context."""
+    if item.type == "message":
+        return item.text_content or ""
+    if item.type == "function_call":
+        return f"{item.name}({item.arguments})"
+    if item.type == "function_call_output":
+        return item.output
+    return ""
+
+
+def item_tokens(item: llm.ChatItem) -> int:
+    # ~4 tokens of per-item framing, like the chat completion format
+    return count_tokens(item_text(item)) + 4
+
+
+def context_tokens(chat_ctx: llm.ChatContext) -> int:
+    return sum(item_tokens(item) for item in chat_ctx.items)
+
+
+def _transcript_line(item: llm.ChatItem) -> str:
+    if item.type == "message":
+        return f"{item.role}: {' '.join((item.text_content or '').split())}"
+    if item.type == "function_call":
+        return f"tool call: {item.name}({item.arguments})"
+    if item.type == "function_call_output":
+        return f"tool result ({item.name}): {' '.join(item.output.split())[:400]}"
+    return ""
+
+
+@dataclass
+class FoldPlan:
+    """Items to fold into the summary, decided from one chat context snapshot."""
+
+    fold_ids: set[str]
+    transcript: str
+    tokens: int
+    forced: bool = False
+
+
+@dataclass
+class WindowStats:
+    folds: int = 0
+    folded_items: int = 0
+    forced_folds: int = 0
+    summarizer_failures: int = 0
+    summarize_seconds: list[float] = field(default_factory=list)
+    peak_tokens: int = 0
+    last_tokens: int = 0
+
+
+class ContextWindow:
+    """
+    Bounds an agent's chat context with a rolling summary.
+
+    Args:
+        keep_turns: Most recent turns kept verbatim
+        max_tokens: Ceiling for summary + pinned results + verbatim turns
+        fold_min_tokens: Only fold once at least this much is out of the window,
+            so the summary is not rewritten after every turn
+        pinned_tools: Tools whose latest result is never folded
+        summarizer: async (previous summary, transcript) -> new summary;
+            defaults to `llm_summarizer()`
+    """
+
+    def __init__(
+        self,
+        keep_turns: int = 6,
+        max_tokens: int = 4000,
+        fold_min_tokens: int = 400,
+        pinned_tools: tuple[str, ...] = DEFAULT_PINNED_TOOLS,
+        summarizer: Summarizer | None = None,
+    ):
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+        self.fold_min_tokens = fold_min_tokens
+        self.pinned_tools = set(pinned_tools)
+        self.summarizer = summarizer or llm_summarizer()
+        self.stats = WindowStats()
+
+        self._agent: Agent | None = None
+        self._task: asyncio.Task | None = None
+        self._pending = False
+
+    # -------------------------------------------------------------------------
+    # Planning and applying (pure, synchronous)
+    # -------------------------------------------------------------------------
+
+    def plan(self, chat_ctx: llm.ChatContext) -> FoldPlan | None:
+        """Decide which items to fold, or None if the context is within bounds."""
+        items = chat_ctx.items
+        conversation = [i for i, item in enumerate(items) if self._is_conversation(item)]
+        turn_starts = [i for i in conversation if items[i].type == "message" and items[i].role == "user"]
+        if len(turn_starts) <= 1:
+            return None
+
+        summary = chat_ctx.get_by_id(SUMMARY_ID)
+        fixed_tokens = item_tokens(summary) if summary is not None else 0
+
+        # Shrink the verbatim window until it fits under the ceiling
+        keep = window = min(self.keep_turns, len(turn_starts))
+        while True:
+            tail_start = turn_starts[-keep]
+            old = [i for i in conversation if i < tail_start]
+            pinned = self._pinned(items, old)
+            fold = [i for i in old if items[i].id not in pinned]
+            kept_tokens = fixed_tokens + sum(
+                item_tokens(items[i]) for i in conversation if i >= tail_start or items[i].id in pinned
+            )
+            if kept_tokens <= self.max_tokens or keep == 1:
+                break
+            keep -= 1
+
+        if not fold:
+            return None
+        fold_tokens = sum(item_tokens(items[i]) for i in fold)
+        forced = keep < window
+        if fold_tokens < self.fold_min_tokens and not forced:
+            return None
+
+        return FoldPlan(
+            fold_ids={items[i].id for i in fold},
+            transcript="\n".join(line for i in fold if (line := _transcript_line(items[i]))),
+            tokens=fold_tokens,
+            forced=forced,
+        )
+
+    def apply(self, chat_ctx: llm.ChatContext, plan: FoldPlan, summary: str) -> llm.ChatContext:
+        """
+        Drop the folded items from `chat_ctx` (which may have grown since the
+        plan was made) and put `summary` in place of the previous one.
+        """
+        items = [item for item in chat_ctx.items if item.id not in plan.fold_ids and item.id != SUMMARY_ID]
+        insert_at = next((i for i, item in enumerate(items) if self._is_conversation(item)), len(items))
+        items.insert(
+            insert_at,
+            llm.ChatMessage(id=SUMMARY_ID, role="system", content=[f"{SUMMARY_HEADER}\n{summary}"]),
+        )
+        return llm.ChatContext(items)
+
+    async def summarize(self, chat_ctx: llm.ChatContext, plan: FoldPlan) -> str:
+        """Fold the plan's transcript into the current summary."""
+        previous = current_summary(chat_ctx)
+        started = time.perf_counter()
+        try:
+            summary = await self.summarizer(previous, plan.transcript)
+            if not summary:
+                raise ValueError("empty summary")
+        except Exception as e:
+            self.stats.summarizer_failures += 1
+            logger.warning(f"Summarizer failed, using extractive summary: {e}")
+            summary = extractive_summary(previous, plan.transcript)
+        self.stats.summarize_seconds.append(time.perf_counter() - started)
+        return summary
+
+    async def compact(self, chat_ctx: llm.ChatContext) -> llm.ChatContext | None:
+        """Plan, summarize and apply in one go. Returns None if nothing to fold."""
+        plan = self.plan(chat_ctx)
+        if plan is None:
+            return None
+        summary = await self.summarize(chat_ctx, plan)
+        self._record(plan)
+        return self.apply(chat_ctx, plan, summary)
+
+    # -------------------------------------------------------------------------
+    # Session integration
+    # -------------------------------------------------------------------------
+
+    def attach(self, session: AgentSession, agent: Agent) -> None:
+        """Compact `agent`'s context in the background after each of its replies."""
+        self._agent = agent
+
+        @session.on("agent_state_changed")
+        def on_agent_state_changed(event):
+            if event.new_state == "listening":
+                self.schedule()
+
+    def detach(self) -> None:
+        self._agent = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def schedule(self) -> None:
+        """Start a compaction pass unless one is running (then run one more after it)."""
+        if self._agent is None:
+            return
+        if self._task is not None and not self._task.done():
+            self._pending = True
+            return
+        self._task = asyncio.ensure_future(self._maintain())
+
+    async def _maintain(self) -> None:
+        while self._agent is not None:
+            self._pending = False
+            agent = self._agent
+            plan = self.plan(agent.chat_ctx)
+            if plan is not None:
+                try:
+                    summary = await self.summarize(agent.chat_ctx, plan)
+                    # Apply to the context as it is now - turns may have been added meanwhile
+                    await agent.update_chat_ctx(self.apply(agent.chat_ctx, plan, summary))
+                    self._record(plan)
+                    logger.info(
+                        f"Folded {len(plan.fold_ids)} items ({plan.tokens} tokens) into the summary, "
+                        f"context now {self.stats.last_tokens} tokens"
+                    )
+                except Exception as e:
+                    logger.warning(f"Context compaction failed: {e}")
+            self._observe(agent.chat_ctx)
+            if not self._pending:
+                return
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _is_conversation(item: llm.ChatItem) -> bool:
+        if item.type == "message":
+            return item.role in ("user", "assistant")
+        return item.type in ("function_call", "function_call_output")
+
+    def _pinned(self, items: list[llm.ChatItem], candidates: list[int]) -> set[str]:
+        """Ids of the latest output (and its call) of each pinned tool among `candidates`."""
+        latest: dict[str, llm.FunctionCallOutput] = {}
+        for i in candidates:
+            item = items[i]
+            if item.type == "function_call_output" and item.name in self.pinned_tools and not item.is_error:
+                latest[item.name] = item
+        call_ids = {output.call_id for output in latest.values()}
+        pinned = {output.id for output in latest.values()}
+        pinned.update(
+            items[i].id for i in candidates if items[i].type == "function_call" and items[i].call_id in call_ids
+        )
+        return pinned
+
+    def _record(self, plan: FoldPlan) -> None:
+        self.stats.folds += 1
+        self.stats.folded_items += len(plan.fold_ids)
+        if plan.forced:
+            self.stats.forced_folds += 1
+
+    def _observe(self, chat_ctx: llm.ChatContext) -> None:
+        tokens = context_tokens(chat_ctx)
+        self.stats.last_tokens = tokens
+        self.stats.peak_tokens = max(self.stats.peak_tokens, tokens)
+
+    def metrics(self) -> dict[str, Any]:
+        s = self.stats
+        return {
+            "folds": s.folds,
+            "folded_items": s.folded_items,
+            "forced_folds": s.forced_folds,
+            "summarizer_failures": s.summarizer_failures,
+            "avg_summarize_ms": round(sum(s.summarize_seconds) / len(s.summarize_seconds) * 1000, 1)
+            if s.summarize_seconds
+            else 0.0,
+            "context_tokens": s.last_tokens,
+            "peak_context_tokens": s.peak_tokens,
+        }
+
+
+def current_summary(chat_ctx: llm.ChatContext) -> str:
+    """The rolling summary text in `chat_ctx`, without its header."""
+    summary = chat_ctx.get_by_id(SUMMARY_ID)
+    if summary is None or summary.type != "message":
+        return ""
+    return (summary.text_content or "").removeprefix(SUMMARY_HEADER).strip()
@@ -0,0 +1,819 @@
+"""
+Daily Event Insurance - Campaign Dialer
+Turns a lead segment into a paced stream of outbound agent calls.
+
+Each call is one LiveKit job for the `daily-event-insurance` agent plus a SIP
+participant for the lead. The agent joins while the phone rings (see
+warmup.py), so a ringing call is cheap; what is scarce is agent seats, i.e.
+conversations the worker pool can carry at once. Dialing one lead per free
+seat leaves seats idle for the whole ring time and for every unanswered
+call, so the dialer overdials: it keeps enough calls ringing that the
+expected number of answers fills the free seats, using a running estimate of
+the answer rate.
+
+Overdialing means a pick-up sometimes arrives with no free seat (an
+overflow). Unlike a classic predictive dialer the call is not abandoned -
+it has its own agent job - but the workers then run above the capacity they
+were sized for. The pacer adjusts its aggressiveness so overflows stay near
+`target_overflow_rate`; raising it trades over-capacity for fewer idle
+seats.
+
+Each lead is tried at most `max_attempts` times, with `retry_delay` between
+attempts for no answer, busy, voicemail or failed calls. Every attempt is
+checked against the lead's local calling hours when it comes due; one
+outside them waits in the queue until they open.
+
+Usage:
+
+    leads = await load_segment(status="new", interest_level="hot")
+    dialer = CampaignDialer(LiveKitDispatcher(), seats=8)
+    await dialer.run(leads)
+    logger.info(dialer.metrics())
+
+`FakeDispatcher` simulates ring and talk times for tests and benchmarks.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Protocol
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import httpx
+
+from distributions import LatencyDistribution
+from dnc import DncIndex, dnc_index
+from phones import format_phone
+
+logger = logging.getLogger("campaign-dialer")
+
+AGENT_NAME = "daily-event-insurance"
+
+# =============================================================================
+# CALL OUTCOMES & DISPATCHERS
+# =============================================================================
+
+
+class CallOutcome(str, Enum):
+    ANSWERED = "answered"
+    NO_ANSWER = "no_answer"
+    BUSY = "busy"
+    VOICEMAIL = "voicemail"
+    FAILED = "failed"
+
+
+RETRYABLE = {CallOutcome.NO_ANSWER, CallOutcome.BUSY, CallOutcome.VOICEMAIL, CallOutcome.FAILED}
+
+
+@dataclass
+class CallResult:
+    outcome: CallOutcome
+    ring_seconds: float = 0.0
+    talk_seconds: float = 0.0
+    room_name: str | None = None
+
+
+class Dispatcher(Protocol):
+    async def place_call(self, lead: dict, metadata: dict, on_answer: Callable[[], None]) -> CallResult:
+        """
+        Place one call and return when it has ended.
+
+        Args:
+            lead: Lead record (needs "id" and "phone")
+            metadata: Job metadata for the agent
+            on_answer: Called once when the lead picks up
+        """
+        ...
+
+
+# Local calling hours, [start, end), as in lead_scoring.ScoringWeights
+CALLING_HOURS = (9, 20)
+# Leads without a known timezone are called on Pacific time, as lead_scoring ranks them
+DEFAULT_TIMEZONE = "America/Los_Angeles"
+
+
+@lru_cache(maxsize=64)
+def _zone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def seconds_until_callable(lead: dict, at: float, calling_hours: tuple[int, int] = CALLING_HOURS) -> float:
+    """0 if epoch `at` is within the lead's local calling hours, else seconds until they next open."""
+    local = datetime.fromtimestamp(at, _zone(lead.get("timezone")))
+    start, end = calling_hours
+    if start <= local.hour < end:
+        return 0.0
+    opens = local.replace(hour=start, minute=0, second=0, microsecond=0)
+    if local.hour >= end:
+        opens += timedelta(days=1)
+    return (opens - local).total_seconds()
+
+
+# SIP status codes LiveKit reports when an outbound call is not answered
+_SIP_BUSY = {"486", "600"}
+_SIP_NO_ANSWER = {"408", "480", "487"}
+
+
+class LiveKitDispatcher:
+    """
+    Dispatches the agent and dials the lead through a LiveKit SIP trunk.
+
+    Args:
+        agent_name: Agent to dispatch
+        sip_trunk_id: Outbound trunk (default LIVEKIT_SIP_TRUNK_ID)
+        ringing_timeout: Seconds to ring before giving up
+        poll_interval: Seconds between checks for the end of an answered call
+    """
+
+    def __init__(
+        self,
+        agent_name: str = AGENT_NAME,
+        sip_trunk_id: str | None = None,
+        ringing_timeout: float = 30.0,
+        poll_interval: float = 5.0,
+    ):
+        self.agent_name = agent_name
+        self.sip_trunk_id = sip_trunk_id or os.getenv("LIVEKIT_SIP_TRUNK_ID", "")
+        self.ringing_timeout = ringing_timeout
+        self.poll_interval = poll_interval
+        self._api = None
+
+    def _lkapi(self):
+        from livekit import api
+
+        if self._api is None:
+            self._api = api.LiveKitAPI()
+        return self._api
+
+    async def place_call(self, lead: dict, metadata: dict, on_answer: Callable[[], None]) -> CallResult:
+        from google.protobuf.duration_pb2 import Duration
+        from livekit import api
+
+        lkapi = self._lkapi()
+        room_name = f"call-{lead['id']}-{uuid.uuid4().hex[:8]}"
+        identity = f"phone-{lead['id']}"
+        started = time.monotonic()
+
+        await lkapi.agent_dispatch.create_dispatch(
+            api.CreateAgentDispatchRequest(agent_name=self.agent_name, room=room_name, metadata=json.dumps(metadata))
+        )
+        try:
+            await lkapi.sip.create_sip_participant(
+                api.CreateSIPParticipantRequest(
+                    sip_trunk_id=self.sip_trunk_id,
+                    sip_call_to=format_phone(lead.get("phone", "")) or "",
+                    room_name=room_name,
+                    participant_identity=identity,
+                    participant_name=metadata.get("lead_name", ""),
+                    participant_metadata=json.dumps({"type": "phone", "lead_id": lead["id"]}),
+                    ringing_timeout=Duration(seconds=int(self.ringing_timeout)),
+                    wait_until_answered=True,
+                )
+            )
+        except api.TwirpError as e:
+            status = (e.metadata or {}).get("sip_status_code", "")
+            outcome = (
+                CallOutcome.BUSY if status in _SIP_BUSY
+                else CallOutcome.NO_ANSWER if status in _SIP_NO_ANSWER
+                else CallOutcome.FAILED
+            )
+            if outcome == CallOutcome.FAILED:
+                logger.warning(f"Call to lead {lead['id']} failed: {e.message} (SIP {status or 'n/a'})")
+            await self._delete_room(room_name)
+            return CallResult(outcome, ring_seconds=time.monotonic() - started, room_name=room_name)
+
+        answered = time.monotonic()
+        on_answer()
+
+        # The agent hangs up by ending the job; wait for the lead's leg to go away
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                participants = await lkapi.room.list_participants(api.ListParticipantsRequest(room=room_name))
+            except api.TwirpError:
+                break
+            if not any(p.identity == identity for p in participants.participants):
+                break
+
+        await self._delete_room(room_name)
+        return CallResult(
+            CallOutcome.ANSWERED,
+            ring_seconds=answered - started,
+            talk_seconds=time.monotonic() - answered,
+            room_name=room_name,
+        )
+
+    async def _delete_room(self, room_name: str) -> None:
+        from livekit import api
+
+        try:
+            await self._lkapi().room.delete_room(api.DeleteRoomRequest(room=room_name))
+        except api.TwirpError:
+            pass
+
+    async def aclose(self) -> None:
+        if self._api is not None:
+            await self._api.aclose()
+            self._api = None
+
+
+class FakeDispatcher:
+    """
+    Simulated calls: rings, then answers with `answer_rate` (or is busy, goes
+    to voicemail), then talks.
+
+    `answer_rate` may be a callable of the clock so benchmarks can change it
+    mid-campaign. Pass the dialer's `clock` and `sleep` to run in scaled time.
+    """
+
+    def __init__(
+        self,
+        answer_rate: float | Callable[[float], float] = 0.3,
+        busy_rate: float = 0.05,
+        voicemail_rate: float = 0.15,
+        ring: LatencyDistribution = LatencyDistribution.lognormal(median=15.0, sigma=0.4),
+        unanswered_ring: LatencyDistribution = LatencyDistribution.uniform(25.0, 30.0),
+        talk: LatencyDistribution = LatencyDistribution.lognormal(median=150.0, sigma=0.6),
+        voicemail: LatencyDistribution = LatencyDistribution.uniform(25.0, 40.0),
+        seed: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.answer_rate = answer_rate
+        self.busy_rate = busy_rate
+        self.voicemail_rate = voicemail_rate
+        self.ring = ring
+        self.unanswered_ring = unanswered_ring
+        self.talk = talk
+        self.voicemail = voicemail
+        self.rng = random.Random(seed)
+        self._clock = clock
+        self._sleep = sleep
+        self.calls: list[tuple[str, dict, CallResult]] = []
+
+    async def place_call(self, lead: dict, metadata: dict, on_answer: Callable[[], None]) -> CallResult:
+        rate = self.answer_rate(self._clock()) if callable(self.answer_rate) else self.answer_rate
+        roll = self.rng.random()
+        if roll < rate:
+            ring = self.ring.sample(self.rng)
+            await self._sleep(ring)
+            on_answer()
+            talk = self.talk.sample(self.rng)
+            await self._sleep(talk)
+            result = CallResult(CallOutcome.ANSWERED, ring, talk)
+        elif roll < rate + self.busy_rate:
+            ring = self.rng.uniform(1.0, 3.0)
+            await self._sleep(ring)
+            result = CallResult(CallOutcome.BUSY, ring)
+        elif roll < rate + self.busy_rate + self.voicemail_rate:
+            # The agent detects voicemail and leaves a message (handle_voicemail)
+            ring = self.unanswered_ring.sample(self.rng)
+            await self._sleep(ring)
+            on_answer()
+            message = self.voicemail.sample(self.rng)
+            await self._sleep(message)
+            result = CallResult(CallOutcome.VOICEMAIL, ring, message)
+        else:
+            ring = self.unanswered_ring.sample(self.rng)
+            await self._sleep(ring)
+            result = CallResult(CallOutcome.NO_ANSWER, ring)
+        self.calls.append((lead["id"], metadata, result))
+        return result
+
+
+# =============================================================================
+# LEAD SEGMENTS
+# =============================================================================
+
+
+async def load_segment(
+    status: str | None = None,
+    source: str | None = None,
+    interest_level: str | None = None,
+    business_type: str | None = None,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+    page_size: int = 100,
+) -> list[dict]:
+    """
+    All leads matching the filters, paged from GET /api/admin/leads.
+
+    Args:
+        status: Lead status, e.g. "new"
+        source: Lead source, e.g. "website_quote"
+        interest_level: "cold", "warm" or "hot"
+        business_type: e.g. "gym"
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+        page_size: Leads per request (the API caps this at 100)
+    """
+    base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+    api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    filters = {"status": status, "source": source, "interestLevel": interest_level, "businessType": business_type}
+    params = {key: value for key, value in filters.items() if value}
+
+    leads: list[dict] = []
+    page = 1
+    async with httpx.AsyncClient(transport=transport) as client:
+        while True:
+            response = await client.get(
+                f"{base_url}/api/admin/leads",
+                params={**params, "page": page, "pageSize": page_size},
+                headers=headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            body = response.json()
+            leads.extend(body.get("data", []))
+            if not body.get("pagination", {}).get("hasNext"):
+                break
+            page += 1
+
+    logger.info(f"Loaded segment of {len(leads)} leads ({params or 'all'})")
+    return leads
+
+
+def call_metadata(lead: dict, campaign: str) -> dict:
+    """Job metadata for the agent (read by agent.py's entrypoint)."""
+    business_name = lead.get("businessName")
+    return {
+        "lead_id": lead["id"],
+        "lead_name": lead.get("firstName") or "there",
+        "business_name": business_name or "your business",
+        "direction": "outbound",
+        "campaign": campaign,
+    }
+
+
+# =============================================================================
+# PACING
+# =============================================================================
+
+
+class Pacer:
+    """
+    Decides how many calls should be ringing.
+
+    Seats to fill are the free seats plus the conversations expected to end
+    within one ring time (talking calls x ring time / talk time). The answer
+    rate is an exponentially weighted average of whether calls were picked
+    up by anyone, person or voicemail, since either occupies an agent;
+    ring and talk times are averaged the same way over picked-up calls.
+    `aggressiveness` scales the planned answers and is nudged after every
+    answer so the overflow rate converges to `target_overflow_rate`.
+
+    Each average is a plain mean until it has 1/smoothing observations, so
+    the priors are forgotten within a few calls. Until the answer rate has
+    that many calls behind it the pacer places one call per free seat and
+    leaves `aggressiveness` alone: overdialing on a wrong prior overflows
+    in a burst, and the aggressiveness it knocks off took hours to win back.
+
+    Args:
+        prior_answer_rate: Answer rate assumed before any calls finish
+        prior_ring_seconds: Ring time before pick-up assumed before any calls finish
+        prior_talk_seconds: Conversation length assumed before any calls finish
+        min_answer_rate: Floor for the estimate, bounding the overdial ratio
+        smoothing: Weight of the newest call in the averages
+        target_overflow_rate: Acceptable share of answers with no free seat
+        step: Aggressiveness adjustment per answer
+    """
+
+    def __init__(
+        self,
+        prior_answer_rate: float = 0.3,
+        prior_ring_seconds: float = 15.0,
+        prior_talk_seconds: float = 120.0,
+        min_answer_rate: float = 0.05,
+        smoothing: float = 0.02,
+        target_overflow_rate: float = 0.03,
+        step: float = 0.05,
+    ):
+        self.answer_rate = prior_answer_rate
+        self.ring_seconds = prior_ring_seconds
+        self.talk_seconds = prior_talk_seconds
+        self.min_answer_rate = min_answer_rate
+        self.smoothing = smoothing
+        self.target_overflow_rate = target_overflow_rate
+        self.step = step
+        self.aggressiveness = 1.0
+        # Observations behind each average; the prior counts as one
+        self._calls = 1
+        self._pickups = 1
+        self._talks = 1
+
+    def _weight(self, count: int) -> float:
+        """
+        Weight of the newest observation: a plain mean of everything seen until
+        there are 1/smoothing observations, then the exponential average, so
+        the prior is forgotten within a few calls rather than ~1/smoothing.
+        """
+        return max(self.smoothing, 1.0 / count)
+
+    @property
+    def warmed_up(self) -> bool:
+        """Whether the answer rate rests on a full averaging window of calls."""
+        return self._calls * self.smoothing >= 1.0
+
+    def observe_pickup(self, ring_seconds: float, overflow: bool) -> None:
+        """A call was picked up after `ring_seconds`; `overflow` if no seat was free."""
+        self._calls += 1
+        self._pickups += 1
+        self.answer_rate += self._weight(self._calls) * (1.0 - self.answer_rate)
+        self.ring_seconds += self._weight(self._pickups) * (ring_seconds - self.ring_seconds)
+        # Overflows while the estimates still lean on the priors say nothing
+        # about aggressiveness; correcting for them would undershoot for hours
+        if not self.warmed_up:
+            return
+        if overflow:
+            self.aggressiveness -= self.step * (1 - self.target_overflow_rate)
+        else:
+            self.aggressiveness += self.step * self.target_overflow_rate
+        self.aggressiveness = min(max(self.aggressiveness, 0.05), 2.0)
+
+    def observe_no_pickup(self) -> None:
+        self._calls += 1
+        self.answer_rate += self._weight(self._calls) * (0.0 - self.answer_rate)
+
+    def observe_talk(self, talk_seconds: float) -> None:
+        self._talks += 1
+        self.talk_seconds += self._weight(self._talks) * (max(talk_seconds, 1.0) - self.talk_seconds)
+
+    def target_ringing(self, free_seats: int, talking: int = 0) -> int:
+        """Calls that should be ringing given `free_seats` and `talking` conversations."""
+        if not self.warmed_up:
+            # One call per free seat until the answer rate is measured: an
+            # overdial from a wrong prior overflows in a burst
+            return max(free_seats, 0)
+        releasing = talking * min(1.0, self.ring_seconds / self.talk_seconds)
+        seats = (free_seats + releasing) * self.aggressiveness
+        if seats <= 0:
+            return 0
+        rate = max(self.answer_rate, self.min_answer_rate)
+        return max(1 if free_seats > 0 else 0, math.floor(seats / rate))
+
+
+# =============================================================================
+# DIALER
+# =============================================================================
+
+
+@dataclass(order=True)
+class _Attempt:
+    ready_at: float
+    seq: int
+    lead: dict = field(compare=False)
+
+
+@dataclass
+class LeadProgress:
+    attempts: int = 0
+    outcomes: list[CallOutcome] = field(default_factory=list)
+    done: bool = False
+
+
+class CampaignDialer:
+    """
+    Dials a lead segment through a dispatcher with adaptive pacing.
+
+    Args:
+        dispatcher: Places calls (LiveKitDispatcher, FakeDispatcher)
+        seats: Agent seats, or a callable returning current worker capacity
+        max_lines: Hard cap on calls in progress (trunk channels)
+        max_attempts: Calls per lead before giving up
+        retry_delay: Seconds before a lead is retried after no contact
+        adaptive: Overdial from the answer rate; if False, one call per seat
+        pacer: Pacing controller (defaults to Pacer())
+        campaign: Name passed to the agent in job metadata
+        clock: Monotonic clock (overridable for tests)
+        sleep: Sleep function matching `clock`
+        dnc: Do Not Call index checked when leads are added and again before
+            every dial (defaults to the host's, see dnc.py)
+        calling_hours: Local hours [start, end) a lead may be dialed in,
+            checked before every attempt; None to dial at any hour
+        wall_clock: Epoch seconds for the calling hours check (overridable
+            for tests, alongside `clock`)
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        seats: int | Callable[[], int] = 4,
+        max_lines: int = 50,
+        max_attempts: int = 3,
+        retry_delay: float = 4 * 3600,
+        adaptive: bool = True,
+        pacer: Pacer | None = None,
+        campaign: str = "default",
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        dnc: DncIndex | None = None,
+        calling_hours: tuple[int, int] | None = CALLING_HOURS,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.dispatcher = dispatcher
+        self._seats = seats
+        self.max_lines = max_lines
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.adaptive = adaptive
+        self.pacer = pacer or Pacer()
+        self.campaign = campaign
+        self._clock = clock
+        self._sleep = sleep
+        self.dnc = dnc if dnc is not None else dnc_index
+        self.calling_hours = calling_hours
+        self._wall_clock = wall_clock
+
+        self.progress: dict[str, LeadProgress] = {}
+        self._queue: list[_Attempt] = []
+        self._seq = 0
+        self._ringing = 0
+        self._talking = 0
+        self._wake = asyncio.Event()
+
+        self.outcomes: dict[str, int] = {outcome.value: 0 for outcome in CallOutcome}
+        self.skipped = 0
+        # Leads whose number went on the DNC list after they were queued
+        self.dnc_blocked = 0
+        # Attempts put back because the lead's local time was outside calling hours
+        self.outside_hours = 0
+        self.pickups = 0
+        self.overflows = 0
+        self.peak_ringing = 0
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._last_change = 0.0
+        self._seat_seconds = 0.0
+        self._busy_seat_seconds = 0.0
+
+    # -------------------------------------------------------------------------
+    # Capacity accounting
+    # -------------------------------------------------------------------------
+
+    def seats(self) -> int:
+        return self._seats() if callable(self._seats) else self._seats
+
+    def _account(self) -> None:
+        """Accumulate seat time up to now; call before every change in talking calls."""
+        now = self._clock()
+        elapsed = now - self._last_change
+        seats = self.seats()
+        self._seat_seconds += seats * elapsed
+        self._busy_seat_seconds += min(self._talking, seats) * elapsed
+        self._last_change = now
+
+    def _dialable(self) -> int:
+        """How many new calls to start now."""
+        free = self.seats() - self._talking
+        in_progress = self._ringing + self._talking
+        if self.adaptive:
+            wanted = self.pacer.target_ringing(free, self._talking) - self._ringing
+        else:
+            wanted = free - self._ringing
+        return max(0, min(wanted, self.max_lines - in_progress))
+
+    # -------------------------------------------------------------------------
+    # Leads
+    # -------------------------------------------------------------------------
+
+    def _eligible(self, lead: dict) -> bool:
+        return lead.get("status") != "dnc" and format_phone(lead.get("phone") or "") is not None
+
+    def add_leads(self, leads: list[dict]) -> int:
+        """Queue leads that are not already in the campaign; returns how many were added."""
+        added = 0
+        now = self._clock()
+        # The whole segment against the DNC index at once (Bloom filter first)
+        blocked = self.dnc.contains_many([lead.get("phone") for lead in leads]).tolist()
+        for lead, dnc in zip(leads, blocked):
+            if lead["id"] in self.progress:
+                continue
+            if dnc or not self._eligible(lead):
+                self.skipped += 1
+                continue
+            self.progress[lead["id"]] = LeadProgress()
+            self._push(lead, now)
+            added += 1
+        self._wake.set()
+        return added
+
+    def _push(self, lead: dict, ready_at: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._queue, _Attempt(ready_at, self._seq, lead))
+
+    def _until_callable(self, lead: dict) -> float:
+        if self.calling_hours is None:
+            return 0.0
+        return seconds_until_callable(lead, self._wall_clock(), self.calling_hours)
+
+    # -------------------------------------------------------------------------
+    # Calls
+    # -------------------------------------------------------------------------
+
+    async def _call(self, lead: dict) -> None:
+        progress = self.progress[lead["id"]]
+        progress.attempts += 1
+        answered = False
+        dialed_at = self._clock()
+
+        def on_answer():
+            nonlocal answered
+            if answered:
+                return
+            answered = True
+            overflow = self._talking >= self.seats()
+            self._account()
+            self._ringing -= 1
+            self._talking += 1
+            self.pickups += 1
+            if overflow:
+                self.overflows += 1
+            # Pick-ups are counted as they happen, not when the conversation ends,
+            # so the estimate does not lag by a talk time
+            self.pacer.observe_pickup(self._clock() - dialed_at, overflow)
+            self._wake.set()
+
+        try:
+            result = await self.dispatcher.place_call(lead, call_metadata(lead, self.campaign), on_answer)
+        except Exception as e:
+            logger.error(f"Dispatch failed for lead {lead['id']}: {e}")
+            result = CallResult(CallOutcome.FAILED)
+
+        self._account()
+        if answered:
+            self._talking -= 1
+        else:
+            self._ringing -= 1
+        self.outcomes[result.outcome.value] += 1
+        progress.outcomes.append(result.outcome)
+        if answered:
+            self.pacer.observe_talk(result.talk_seconds)
+        else:
+            self.pacer.observe_no_pickup()
+
+        if result.outcome in RETRYABLE and progress.attempts < self.max_attempts:
+            self._push(lead, self._clock() + self.retry_delay)
+        else:
+            progress.done = True
+        logger.debug(
+            f"Lead {lead['id']} attempt {progress.attempts}: {result.outcome.value} "
+            f"(ring {result.ring_seconds:.0f}s, talk {result.talk_seconds:.0f}s)"
+        )
+        self._wake.set()
+
+    async def run(self, leads: list[dict] | None = None, until: float | None = None) -> dict[str, Any]:
+        """
+        Dial until every queued lead is done; returns `metrics()`.
+
+        Args:
+            leads: Leads to add before starting
+            until: Clock time after which no new calls start (end of the calling
+                window); calls in progress finish and remaining leads stay queued
+        """
+        if leads:
+            self.add_leads(leads)
+        self._started_at = self._last_change = self._clock()
+        tasks: set[asyncio.Task] = set()
+
+        while tasks or (self._queue and (until is None or self._clock() < until)):
+            now = self._clock()
+            if until is not None and now >= until:
+                await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+                continue
+            for _ in range(self._dialable()):
+                if not self._queue or self._queue[0].ready_at > now:
+                    break
+                attempt = heapq.heappop(self._queue)
+                if self.dnc.contains(attempt.lead.get("phone")):
+                    self.progress[attempt.lead["id"]].done = True
+                    self.dnc_blocked += 1
+                    self._wake.set()
+                    continue
+                # Retries come due hours later, so every attempt is checked, not
+                # just the segment when it was ranked
+                wait = self._until_callable(attempt.lead)
+                if wait:
+                    self.outside_hours += 1
+                    self._push(attempt.lead, now + wait)
+                    self._wake.set()
+                    continue
+                self._ringing += 1
+                task = asyncio.create_task(self._call(attempt.lead))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            self.peak_ringing = max(self.peak_ringing, self._ringing)
+
+            self._wake.clear()
+            wait_for = [asyncio.create_task(self._wake.wait())]
+            if self._queue and self._queue[0].ready_at > now:
+                # Wake for the next retry (or the end of the window)
+                wake_at = self._queue[0].ready_at if until is None else min(self._queue[0].ready_at, until)
+                wait_for.append(asyncio.create_task(self._sleep(wake_at - now)))
+            elif until is not None:
+                wait_for.append(asyncio.create_task(self._sleep(until - now)))
+            _, pending = await asyncio.wait(wait_for, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+
+        self._account()
+        self._finished_at = self._clock()
+        metrics = self.metrics()
+        logger.info(f"Campaign {self.campaign} finished: {metrics}")
+        return metrics
+
+    def metrics(self) -> dict[str, Any]:
+        end = self._finished_at if self._finished_at is not None else self._clock()
+        hours = (end - self._started_at) / 3600 if self._started_at is not None else 0.0
+        dialed = sum(self.outcomes.values())
+        answered = self.outcomes[CallOutcome.ANSWERED.value]
+        return {
+            "leads": len(self.progress),
+            "skipped": self.skipped,
+            "dnc_blocked": self.dnc_blocked,
+            "outside_hours": self.outside_hours,
+            "completed": sum(1 for p in self.progress.values() if p.done),
+            "queued": len(self._queue),
+            "dialed": dialed,
+            "outcomes": dict(self.outcomes),
+            "answer_rate": round(answered / dialed, 3) if dialed else 0.0,
+            "estimated_pickup_rate": round(self.pacer.answer_rate, 3),
+            "calls_per_hour": round(dialed / hours, 1) if hours else 0.0,
+            "connects_per_hour": round(answered / hours, 1) if hours else 0.0,
+            "overflow_rate": round(self.overflows / self.pickups, 3) if self.pickups else 0.0,
+            "agent_idle": round(1 - self._busy_seat_seconds / self._seat_seconds, 3) if self._seat_seconds else 0.0,
+            "agent_idle_hours": round((self._seat_seconds - self._busy_seat_seconds) / 3600, 2),
+            "peak_ringing": self.peak_ringing,
+        }
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Dial a lead segment with the sales agent")
+    parser.add_argument("--campaign", default=f"campaign-{time.strftime('%Y%m%d')}")
+    parser.add_argument("--status", default="new")
+    parser.add_argument("--source")
+    parser.add_argument("--interest-level")
+    parser.add_argument("--business-type")
+    parser.add_argument("--seats", type=int, default=4, help="concurrent conversations the workers can carry")
+    parser.add_argument("--max-lines", type=int, default=20)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--retry-hours", type=float, default=4.0)
+    parser.add_argument("--fixed", action="store_true", help="one call per free seat instead of adaptive pacing")
+    parser.add_argument("--top", type=int, help="dial only the N highest-priority leads")
+    parser.add_argument("--no-rank", action="store_true", help="dial in backend order instead of by priority")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        from dnc import DncSync, dnc_index
+
+        # Current list before the first dial, then kept current for the campaign
+        await dnc_index.sync()
+        DncSync().start()
+        leads = await load_segment(args.status, args.source, args.interest_level, args.business_type)
+        if not args.no_rank:
+            from lead_scoring import rank_leads
+
+            leads = rank_leads(leads, limit=args.top)
+        dispatcher = LiveKitDispatcher()
+        dialer = CampaignDialer(
+            dispatcher,
+            seats=args.seats,
+            max_lines=args.max_lines,
+            max_attempts=args.max_attempts,
+            retry_delay=args.retry_hours * 3600,
+            adaptive=not args.fixed,
+            campaign=args.campaign,
+        )
+        try:
+            await dialer.run(leads)
+        finally:
+            await dispatcher.aclose()
+
+    asyncio.run(main())
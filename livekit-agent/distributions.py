@@ -0,0 +1,56 @@
+"""
+Daily Event Insurance - Sampled Durations
+Distributions for simulated service times, ring times and call lengths.
+
+Shared by the fake backend (per-endpoint latency) and the dialer's
+`FakeDispatcher` (ring, talk and voicemail durations), so production
+modules do not import the test backend.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class LatencyDistribution:
+    """Samples a per-request service time in seconds."""
+
+    kind: str = "fixed"  # fixed, uniform, normal, lognormal, exponential
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "LatencyDistribution":
+        return cls("fixed", seconds)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "LatencyDistribution":
+        return cls("uniform", low, high)
+
+    @classmethod
+    def normal(cls, mean: float, stddev: float) -> "LatencyDistribution":
+        return cls("normal", mean, stddev)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "LatencyDistribution":
+        return cls("lognormal", median, sigma)
+
+    @classmethod
+    def exponential(cls, mean: float) -> "LatencyDistribution":
+        return cls("exponential", mean)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value = self.a
+        elif self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        return max(0.0, value)
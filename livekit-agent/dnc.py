@@ -0,0 +1,582 @@
+"""
+Daily Event Insurance - Do Not Call Index
+Local Do Not Call check in front of every outbound dial.
+
+`add_to_dnc_list` used to only patch the lead's status, so the same number
+could still be dialed through another lead record, another campaign or a
+scheduled callback. This index holds every DNC number on the host, in a
+directory (tmpfs by default) shared by the agent workers, the dialer and
+the scheduler:
+
+- a snapshot: a blocked Bloom filter (one 64-bit word per number, four
+  bits set) that answers most checks - numbers not on the list - from one
+  memory read, and an exact store behind it. +1 numbers are kept as their
+  low 16 bits in buckets of 2^16 numbers (2 bytes a number plus 600KB of
+  bucket offsets), other numbers as a sorted int64 array.
+- a journal of numbers added since the snapshot was built. `add` appends
+  to it under a file lock and every process folds new entries in on its
+  next check, so a number the agent marks DNC mid-call is blocked
+  everywhere before the call ends.
+
+`sync` pulls DNC leads from the backend: leads changed since the last
+sync into the journal, and a full rebuild of the snapshot once a day.
+Numbers added locally are kept through rebuilds until the backend has
+them.
+
+    if dnc_index.contains(lead["phone"]):
+        ...  # never dial
+
+    dnc_index.add(lead.phone)  # agent job process
+"""
+
+import asyncio
+import atexit
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import httpx
+import numpy as np
+
+from callerid import LEAD, ChangeFeed
+from phones import number_key
+from shared_cache import default_base_directory
+
+logger = logging.getLogger("dnc-index")
+
+_MAGIC = b"DEIDNC01"
+_JOURNAL_MAGIC = b"DEIDNCJ1"
+FORMAT_VERSION = 1
+# magic, format, generation, Bloom words, built at, +1/other/local counts,
+# then the offsets of the Bloom words, bucket offsets, +1 lows, other
+# numbers and local additions
+_HEADER = struct.Struct("<8sIQQdQQQQQQQQ")
+# magic, version (bumped on every change), snapshot generation, entry count,
+# then the sync cursor
+_JOURNAL_HEADER = struct.Struct("<8sQQQ40s")
+_CURSOR = slice(32, _JOURNAL_HEADER.size)
+JOURNAL_CAPACITY = 65536
+
+# +1 numbers (a 1 and ten digits) as a key range, and its 2^16-number buckets
+NANP_FIRST = 10**10
+NANP_BUCKETS = ((NANP_FIRST - 1) >> 16) + 1
+
+BLOOM_BITS_PER_NUMBER = 10
+REBUILD_SECONDS = 24 * 3600
+
+_MULTIPLIER = 0x9E3779B97F4A7C15
+_MULTIPLIER_BITS = 0xC2B2AE3D27D4EB4F
+_MASK64 = (1 << 64) - 1
+
+
+def default_directory() -> Path:
+    """$DNC_INDEX_DIR, else a directory next to the worker caches (tmpfs when the host has one)."""
+    directory = os.getenv("DNC_INDEX_DIR")
+    return Path(directory) if directory else default_base_directory() / "dnc"
+
+
+def _snapshot_path(directory: Path, generation: int) -> Path:
+    return directory / f"dnc-{generation:012d}.bin"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    # np.sort and a neighbour comparison: several times faster than np.unique on millions of keys
+    keys = np.sort(np.asarray(keys, dtype=np.int64))
+    return keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if keys.size else keys
+
+
+def _in_sorted(keys: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    if not sorted_keys.size:
+        return np.zeros(keys.size, dtype=bool)
+    index = np.minimum(np.searchsorted(sorted_keys, keys), sorted_keys.size - 1)
+    return sorted_keys[index] == keys
+
+
+def _bloom_words(count: int) -> int:
+    return max(8, count * BLOOM_BITS_PER_NUMBER // 64 + 1)
+
+
+def _bloom_positions(keys: np.ndarray, words: int) -> tuple[np.ndarray, np.ndarray]:
+    """(word index, bit mask) of each key: the word from one hash, four bit positions from another."""
+    keys = keys.astype(np.uint64)
+    word = (((keys * np.uint64(_MULTIPLIER)) >> np.uint64(32)) * np.uint64(words)) >> np.uint64(32)
+    positions = (keys * np.uint64(_MULTIPLIER_BITS)) >> np.uint64(40)
+    one, six = np.uint64(1), np.uint64(63)
+    bits = (
+        (one << (positions & six)) | (one << ((positions >> np.uint64(6)) & six))
+        | (one << ((positions >> np.uint64(12)) & six)) | (one << (positions >> np.uint64(18)))
+    )
+    return word.astype(np.int64), bits
+
+
+# =============================================================================
+# SNAPSHOTS
+# =============================================================================
+
+def write_snapshot(path: str | os.PathLike, generation: int, keys: np.ndarray, local: np.ndarray) -> None:
+    """
+    Write DNC number keys (see `phones.number_key`) as a snapshot. `local`
+    are the numbers added on this host that the backend did not have yet.
+    """
+    keys = _sorted_unique(keys)
+    keys = keys[keys > 0]
+    local = _sorted_unique(local)
+
+    words = _bloom_words(keys.size)
+    bloom = np.zeros(words, dtype=np.uint64)
+    word, bits = _bloom_positions(keys, words)
+    np.bitwise_or.at(bloom, word, bits)
+
+    nanp = (keys >= NANP_FIRST) & (keys < 2 * NANP_FIRST)
+    offsets = keys[nanp] - NANP_FIRST
+    buckets = np.zeros(NANP_BUCKETS + 1, dtype=np.uint32)
+    np.cumsum(np.bincount(offsets >> 16, minlength=NANP_BUCKETS), out=buckets[1:])
+    lows = (offsets & 0xFFFF).astype(np.uint16)
+    others = keys[~nanp]
+
+    sections = [bloom, buckets, lows, others, local]
+    section_offsets = []
+    offset = _HEADER.size
+    for section in sections:
+        offset = _align(offset)
+        section_offsets.append(offset)
+        offset += section.nbytes
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, FORMAT_VERSION, generation, words, time.time(), lows.size, others.size, local.size,
+            *section_offsets,
+        ))
+        for section, section_offset in zip(sections, section_offsets):
+            f.seek(section_offset)
+            f.write(memoryview(section))
+        f.truncate(offset)
+    os.replace(tmp, path)
+
+
+class DncSnapshot:
+    """A mapped snapshot file."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.generation, self._words, self.built_at, nanp_count, other_count, local_count,
+         bloom_offset, buckets_offset, lows_offset, others_offset, local_offset) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} DNC snapshot: {path}")
+        view = memoryview(self._mmap)
+        # Scalar checks go through memoryviews; `keys` reads the same pages with NumPy
+        self._bloom = view[bloom_offset:bloom_offset + self._words * 8].cast("Q")
+        self._buckets = view[buckets_offset:buckets_offset + (NANP_BUCKETS + 1) * 4].cast("I")
+        self._lows = view[lows_offset:lows_offset + nanp_count * 2].cast("H")
+        self._others = view[others_offset:others_offset + other_count * 8].cast("q")
+        self.local = np.frombuffer(self._mmap, dtype=np.int64, count=local_count, offset=local_offset)
+        self.count = nanp_count + other_count
+        self.nbytes = len(self._mmap)
+
+    def contains_key(self, key: int) -> bool:
+        # Exact lookup only: in the interpreter the two 64-bit hashes of a
+        # Bloom probe cost more than the bucket bisect they would save
+        offset = key - NANP_FIRST
+        if 0 <= offset < NANP_FIRST:
+            buckets = self._buckets
+            bucket = offset >> 16
+            end = buckets[bucket + 1]
+            low = offset & 0xFFFF
+            index = bisect_left(self._lows, low, buckets[bucket], end)
+            return index < end and self._lows[index] == low
+        index = bisect_left(self._others, key)
+        return index < len(self._others) and self._others[index] == key
+
+    def contains_keys(self, keys: np.ndarray) -> np.ndarray:
+        """`contains_key` over an array: the Bloom filter rules out most absent numbers at once."""
+        keys = np.asarray(keys, dtype=np.int64)
+        word, bits = _bloom_positions(keys, self._words)
+        found = (np.frombuffer(self._bloom, dtype=np.uint64)[word] & bits) == bits
+        for i in np.flatnonzero(found).tolist():
+            found[i] = self.contains_key(int(keys[i]))
+        return found
+
+    def keys(self) -> np.ndarray:
+        """Every number key in the snapshot."""
+        buckets = np.frombuffer(self._buckets, dtype=np.uint32).astype(np.int64)
+        lows = np.frombuffer(self._lows, dtype=np.uint16).astype(np.int64)
+        nanp = NANP_FIRST + (np.repeat(np.arange(NANP_BUCKETS, dtype=np.int64), np.diff(buckets)) << 16) + lows
+        return np.concatenate([nanp, np.frombuffer(self._others, dtype=np.int64)])
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+def _absent(key: int) -> bool:
+    return False
+
+
+class DncIndex:
+    """
+    The host's DNC numbers: the current snapshot plus the journal.
+
+    Any process can check and add; the directory and journal are created
+    on first use.
+
+    Args:
+        directory: Index directory (default $DNC_INDEX_DIR, else tmpfs)
+        keep: Snapshot files kept for readers still switching over
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None, keep: int = 3):
+        self._directory = Path(directory) if directory else None
+        self.keep = keep
+        self._journal: mmap.mmap | None = None
+        self._header: memoryview | None = None  # [_, version, generation, count] as 64-bit words
+        self._entries: memoryview | None = None
+        self._snapshot: DncSnapshot | None = None
+        # The header's version word once attached; checks compare it with the
+        # version last folded in, so an unchanged list costs one read
+        self._changes: memoryview | tuple[int] = (0,)
+        self._version = -1
+        self._generation = 0
+        self._seen = 0
+        # Journal entries folded in since the snapshot, and the snapshot's check
+        self._recent: set[int] = set()
+        self._exact = _absent
+        self.checks = 0
+        self.blocked = 0
+        self.remaps = 0
+        # A DncSync thread and the event loop share one index: refreshes and
+        # the checks that read the state they swap in hold this lock
+        self._lock = threading.RLock()
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = default_directory()
+        return self._directory
+
+    def _attach(self) -> None:
+        with self._lock:
+            if self._header is not None:
+                return  # attached by another thread meanwhile
+            directory = self.directory
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / "journal"
+            with self._locked():
+                if not path.exists() or path.stat().st_size < _JOURNAL_HEADER.size + JOURNAL_CAPACITY * 8:
+                    tmp = path.with_suffix(".tmp")
+                    with open(tmp, "wb") as f:
+                        f.write(_JOURNAL_HEADER.pack(_JOURNAL_MAGIC, 0, 0, 0, b""))
+                        f.truncate(_JOURNAL_HEADER.size + JOURNAL_CAPACITY * 8)
+                    os.replace(tmp, path)
+            with open(path, "r+b") as f:
+                self._journal = mmap.mmap(f.fileno(), 0)
+            if self._journal[:8] != _JOURNAL_MAGIC:
+                raise ValueError(f"Not a DNC journal: {path}")
+            view = memoryview(self._journal)
+            self._header = view[:32].cast("Q")
+            self._changes = self._header[1:2]
+            self._entries = view[_JOURNAL_HEADER.size:].cast("q")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive across processes: journal writes, snapshot swaps."""
+        with open(self.directory / "lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Switch to the current snapshot and fold in new journal entries."""
+        with self._lock:
+            if self._header is None:
+                self._attach()
+            header = self._header
+            # Read before the rest, record once the rest is in: a change made
+            # meanwhile shows up on the next check
+            version = header[1]
+            for _ in range(3):
+                generation = header[2]
+                if generation == self._generation:
+                    break
+                try:
+                    self._snapshot = DncSnapshot(_snapshot_path(self.directory, generation)) if generation else None
+                except FileNotFoundError:
+                    continue  # superseded and pruned while we read the generation
+                self._exact = self._snapshot.contains_key if self._snapshot is not None else _absent
+                self._generation = generation
+                self._recent = set()
+                self._seen = 0
+                self.remaps += 1
+            count = min(header[3], JOURNAL_CAPACITY)
+            if count > self._seen:
+                self._recent.update(entry >> 1 for entry in self._entries[self._seen:count])
+                self._seen = count
+            self._version = version
+
+    # -------------------------------------------------------------------------
+    # Checks
+    # -------------------------------------------------------------------------
+
+    def contains_key(self, key: int) -> bool:
+        """Whether a number key (see `phones.number_key`) is on the list."""
+        with self._lock:
+            if self._changes[0] != self._version:
+                self._refresh()
+            return key in self._recent or self._exact(key)
+
+    def contains_keys(self, keys: np.ndarray) -> np.ndarray:
+        """`contains_key` over an array of keys, as a boolean array."""
+        keys = np.asarray(keys, dtype=np.int64)
+        with self._lock:
+            if self._changes[0] != self._version:
+                self._refresh()
+            snapshot = self._snapshot
+            recent = np.fromiter(self._recent, dtype=np.int64, count=len(self._recent))
+        found = snapshot.contains_keys(keys) if snapshot is not None else np.zeros(keys.size, dtype=bool)
+        if recent.size:
+            found |= _in_sorted(keys, _sorted_unique(recent))
+        return found & (keys > 0)
+
+    def contains_many(self, numbers: Iterable[str | int | None]) -> np.ndarray:
+        """`contains` for a whole segment, as a boolean array in the same order."""
+        found = self.contains_keys(np.fromiter((number_key(number) for number in numbers), dtype=np.int64))
+        self.checks += found.size
+        self.blocked += int(np.count_nonzero(found))
+        return found
+
+    def contains(self, number: str | int | None) -> bool:
+        """Whether a phone number (any format `phones.normalize_e164` takes) is on the list."""
+        key = number_key(number)
+        self.checks += 1
+        if key and self.contains_key(key):
+            self.blocked += 1
+            return True
+        return False
+
+    __contains__ = contains
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            snapshot = self._snapshot
+            return (snapshot.count if snapshot is not None else 0) + len(self._recent)
+
+    # -------------------------------------------------------------------------
+    # Changes
+    # -------------------------------------------------------------------------
+
+    def add(self, number: str | int | None) -> bool:
+        """Block a number on this host now; False if it is not a phone number or already blocked."""
+        key = number_key(number)
+        return bool(key) and self._append([key], local=True) > 0
+
+    def add_keys(self, keys: Iterable[int], cursor: str | None = None, local: bool = False) -> int:
+        """
+        Append number keys to the journal; returns how many were new.
+
+        Args:
+            keys: Number keys
+            cursor: The backend change feed cursor these come up to
+            local: Added on this host (kept through rebuilds until the backend has them)
+        """
+        return self._append([key for key in keys if key], local, cursor)
+
+    def _append(self, keys: list[int], local: bool, cursor: str | None = None) -> int:
+        if self._header is None:
+            self._attach()
+        with self._lock, self._locked():
+            self._refresh()
+            new = list(dict.fromkeys(key for key in keys if not self.contains_key(key)))
+            count = self._header[3]
+            if count + len(new) > JOURNAL_CAPACITY:
+                self._publish(self._all_keys(new), self._local_keys(new if local else []), cursor)
+            else:
+                for i, key in enumerate(new):
+                    self._entries[count + i] = key << 1 | local
+                if cursor is not None:
+                    self._set_cursor(cursor)
+                # Entries first, then the count and version readers go by
+                self._header[3] = count + len(new)
+                self._header[1] += 1
+            self._refresh()
+        if new and local:
+            logger.info(f"Blocked {len(new)} number(s) in {self.directory}")
+        return len(new)
+
+    def _journal_entries(self) -> np.ndarray:
+        count = min(self._header[3], JOURNAL_CAPACITY)
+        return np.frombuffer(self._journal, dtype=np.int64, count=count, offset=_JOURNAL_HEADER.size)
+
+    def _all_keys(self, extra: Iterable[int] = ()) -> np.ndarray:
+        snapshot_keys = self._snapshot.keys() if self._snapshot is not None else np.zeros(0, np.int64)
+        return np.concatenate([snapshot_keys, self._journal_entries() >> 1, np.fromiter(extra, np.int64)])
+
+    def _local_keys(self, extra: Iterable[int] = ()) -> np.ndarray:
+        entries = self._journal_entries()
+        snapshot_local = self._snapshot.local if self._snapshot is not None else np.zeros(0, np.int64)
+        return np.concatenate([snapshot_local, entries[(entries & 1) == 1] >> 1, np.fromiter(extra, np.int64)])
+
+    @property
+    def cursor(self) -> str | None:
+        if self._journal is None:
+            self._attach()
+        cursor = self._journal[_CURSOR].rstrip(b"\0").decode()
+        return cursor or None
+
+    def _set_cursor(self, cursor: str) -> None:
+        self._journal[_CURSOR] = cursor.encode()[:40].ljust(40, b"\0")
+
+    def _publish(self, keys: np.ndarray, local: np.ndarray, cursor: str | None) -> int:
+        """Write the next snapshot and empty the journal (lock held)."""
+        generation = self._header[2] + 1
+        write_snapshot(_snapshot_path(self.directory, generation), generation, keys, local)
+        if cursor is not None:
+            self._set_cursor(cursor)
+        # Readers that see the new generation reload before trusting the count
+        self._header[2] = generation
+        self._header[3] = 0
+        self._header[1] += 1
+        for old in sorted(self.directory.glob("dnc-*.bin"))[:-self.keep]:
+            old.unlink(missing_ok=True)
+        return generation
+
+    def compact(self) -> int:
+        """Fold the journal into a new snapshot; returns its generation."""
+        if self._header is None:
+            self._attach()
+        with self._lock, self._locked():
+            self._refresh()
+            generation = self._publish(self._all_keys(), self._local_keys(), None)
+            self._refresh()
+        return generation
+
+    def rebuild(self, backend_keys: np.ndarray, cursor: str | None = None) -> int:
+        """
+        Replace the list with the backend's DNC numbers plus the local
+        additions the backend does not have yet; returns the new generation.
+        """
+        if self._header is None:
+            self._attach()
+        backend_keys = _sorted_unique(backend_keys)
+        with self._lock, self._locked():
+            self._refresh()
+            local = _sorted_unique(self._local_keys())
+            local = local[~_in_sorted(local, backend_keys)]
+            generation = self._publish(np.concatenate([backend_keys, local]), local, cursor)
+            self._refresh()
+        return generation
+
+    # -------------------------------------------------------------------------
+    # Backend sync
+    # -------------------------------------------------------------------------
+
+    async def sync(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rebuild_interval: float = REBUILD_SECONDS,
+    ) -> int:
+        """
+        Pull DNC numbers from the backend: every DNC lead when the snapshot
+        is missing or older than `rebuild_interval`, else the DNC leads
+        changed since the last sync. Returns how many numbers were added.
+        """
+        from dialer import load_segment
+
+        self._refresh()
+        snapshot, cursor = self._snapshot, self.cursor
+        if snapshot is None or cursor is None or time.time() - snapshot.built_at > rebuild_interval:
+            leads = await load_segment(status="dnc", api_base_url=api_base_url, api_key=api_key, transport=transport)
+            keys = np.array([number_key(lead.get("phone")) for lead in leads], dtype=np.int64)
+            cursor = max((lead["updatedAt"] for lead in leads if lead.get("updatedAt")), default=cursor or _EPOCH)
+            before = len(self)
+            self.rebuild(keys[keys > 0], cursor)
+            return max(len(self) - before, 0)
+
+        added = 0
+        feed = ChangeFeed(api_base_url, api_key, transport)
+        try:
+            # Only DNC leads: the rest of the lead table never adds a number
+            async for page, cursor in feed.pages(LEAD, cursor, status="dnc"):
+                added += self.add_keys(
+                    (number_key(lead.get("phone")) for lead in page if lead.get("status") == "dnc"), cursor
+                )
+        finally:
+            await feed.aclose()
+        if self._header[3] > JOURNAL_CAPACITY // 2:
+            self.compact()
+        return added
+
+    def metrics(self) -> dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "generation": self._generation,
+            "numbers": (snapshot.count if snapshot is not None else 0) + len(self._recent),
+            "checks": self.checks,
+            "blocked": self.blocked,
+            "remaps": self.remaps,
+        }
+
+
+# Cursor of a full sync when the backend has no DNC leads yet
+_EPOCH = "1970-01-01T00:00:00Z"
+
+dnc_index = DncIndex()
+
+
+class DncSync:
+    """
+    Keeps the host's DNC index in sync with the backend from a background
+    thread. Any long-running process can run one; the file lock keeps
+    concurrent syncs from different processes consistent.
+
+    Args:
+        interval: Seconds between syncs (default $DNC_REFRESH, else 60)
+        index: Index to sync (default the shared `dnc_index`)
+        **sync_options: Passed to `DncIndex.sync` (api_base_url, api_key, transport)
+    """
+
+    def __init__(self, interval: float | None = None, index: DncIndex | None = None, **sync_options: Any):
+        self.interval = interval if interval is not None else float(os.getenv("DNC_REFRESH", "60"))
+        self.index = index or dnc_index
+        self.sync_options = sync_options
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        atexit.register(self.stop)
+        self._thread = threading.Thread(target=self._run, name="dnc-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"DNC index at {self.index.directory}, syncing every {self.interval:g}s")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                added = asyncio.run(self.index.sync(**self.sync_options))
+                if added:
+                    logger.info(f"DNC index synced: {added} new numbers, {len(self.index)} total")
+            except Exception as e:
+                logger.warning(f"DNC sync failed, keeping the current list: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
@@ -0,0 +1,680 @@
+"""
+Daily Event Insurance - Local Fake Backend
+Self-contained ASGI stand-in for the Next.js API used by the voice agent tools.
+
+Serves every endpoint the agents call (leads, communications, scheduling, SMS,
+escalations, support tickets, partner integration, scripts, scheduled
+actions and funnel rollups) from seeded in-memory data, with per-endpoint latency distributions,
+error rates and slow-tail injection so the agent's I/O paths can be measured
+and hardened without touching the production API.
+
+Responses use the same `{"success": true, "data": ...}` envelope as
+`lib/api-responses.ts`. Request bodies may be JSON or the compact msgpack +
+zstd encoding from `wire.py`, which responses advertise in `Accept-Post`.
+
+In-process usage (tests and benchmarks):
+
+    backend = FakeBackend(seed=7)
+    backend.configure("get_lead", EndpointProfile(
+        latency=LatencyDistribution.lognormal(median=0.08, sigma=0.6),
+        error_rate=0.05,
+        slow_tail_rate=0.02,
+        slow_tail_seconds=4.0,
+    ))
+    init_workflow(
+        lead_id=backend.lead_ids[0],
+        api_base_url="http://fake-backend",
+        transport=httpx.ASGITransport(app=backend),
+        dnc=DncIndex(tempfile.mkdtemp()),  # not the host's DNC list
+    )
+
+Standalone usage (requires uvicorn; give agents pointed at it a scratch
+`DNC_INDEX_DIR`):
+
+    python fake_backend.py --port 3001 --profile profiles.json
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import parse_qs
+
+import wire
+from distributions import LatencyDistribution
+from funnel import FunnelStore
+
+logger = logging.getLogger("fake-backend")
+
+# =============================================================================
+# LATENCY & FAILURE PROFILES
+# =============================================================================
+
+
+@dataclass
+class EndpointProfile:
+    """Latency and failure behaviour for one endpoint."""
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    error_status: int = 503
+    slow_tail_rate: float = 0.0
+    slow_tail_seconds: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EndpointProfile":
+        latency = data.get("latency", {})
+        return cls(
+            latency=LatencyDistribution(
+                kind=latency.get("kind", "fixed"),
+                a=float(latency.get("a", 0.0)),
+                b=float(latency.get("b", 0.0)),
+            ),
+            error_rate=float(data.get("error_rate", 0.0)),
+            error_status=int(data.get("error_status", 503)),
+            slow_tail_rate=float(data.get("slow_tail_rate", 0.0)),
+            slow_tail_seconds=float(data.get("slow_tail_seconds", 0.0)),
+        )
+
+
+@dataclass
+class EndpointStats:
+    """Counters collected per endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    slow_tails: int = 0
+    total_delay: float = 0.0
+
+
+# =============================================================================
+# SEED DATA
+# =============================================================================
+
+_FIRST_NAMES = ["Maya", "Jordan", "Chris", "Priya", "Diego", "Avery", "Sam", "Noor", "Taylor", "Elena"]
+_LAST_NAMES = ["Lopez", "Nguyen", "Patel", "Kim", "Garcia", "Okafor", "Smith", "Rossi", "Cohen", "Brooks"]
+_BUSINESS_TYPES = ["gym", "climbing", "rental", "adventure", "other"]
+_BUSINESS_SUFFIX = {
+    "gym": "Fitness",
+    "climbing": "Climbing Co",
+    "rental": "Rentals",
+    "adventure": "Adventures",
+    "other": "Events",
+}
+_LOCATIONS = [
+    ("San Diego", "CA"), ("Los Angeles", "CA"), ("Denver", "CO"), ("Austin", "TX"),
+    ("Seattle", "WA"), ("Boulder", "CO"), ("Portland", "OR"), ("Miami", "FL"),
+]
+_INTEREST_LEVELS = ["cold", "warm", "hot"]
+_LEAD_STATUSES = ["new", "contacted", "qualified"]
+
+
+def _seed_leads(rng: random.Random, count: int) -> dict[str, dict[str, Any]]:
+    leads = {}
+    for i in range(count):
+        first = rng.choice(_FIRST_NAMES)
+        last = rng.choice(_LAST_NAMES)
+        business_type = rng.choice(_BUSINESS_TYPES)
+        city, state = rng.choice(_LOCATIONS)
+        lead_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        leads[lead_id] = {
+            "id": lead_id,
+            "source": rng.choice(["website_quote", "partner_referral", "cold_list", "ad_campaign"]),
+            "firstName": first,
+            "lastName": last,
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "phone": f"+1555{rng.randrange(10**7):07d}",
+            "businessType": business_type,
+            "businessName": f"{last} {_BUSINESS_SUFFIX[business_type]}",
+            "estimatedParticipants": rng.choice([50, 120, 400, 900, 1500, 3000, 8000]),
+            "interestLevel": rng.choice(_INTEREST_LEVELS),
+            "interestScore": rng.randrange(101),
+            "city": city,
+            "state": state,
+            "timezone": "America/Los_Angeles",
+            "status": rng.choice(_LEAD_STATUSES),
+            "statusReason": None,
+            "createdAt": (datetime(2026, 1, 1) + timedelta(minutes=i)).isoformat(),
+            "updatedAt": (datetime(2026, 1, 1) + timedelta(minutes=i)).isoformat(),
+        }
+    return leads
+
+
+def _seed_partners(rng: random.Random, count: int) -> dict[str, dict[str, Any]]:
+    partners = {}
+    for i in range(count):
+        partner_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        business_type = rng.choice(_BUSINESS_TYPES)
+        partners[partner_id] = {
+            "id": partner_id,
+            "businessName": f"{rng.choice(_LAST_NAMES)} {_BUSINESS_SUFFIX[business_type]}",
+            "businessType": business_type,
+            "plan": rng.choice(["Standard", "Premium", "Enterprise"]),
+            "status": "Active",
+            "integrationStatus": rng.choice(["Pending", "In Progress", "Live"]),
+            "commissionRate": rng.choice([15, 20, 25]),
+            "totalPolicies": rng.randrange(5000),
+            "phone": f"+1555{rng.randrange(10**7):07d}",
+            "integration": {
+                "widgetInstalled": rng.random() < 0.7,
+                "apiKeyGenerated": rng.random() < 0.8,
+                "webhooksConfigured": rng.random() < 0.5,
+                "domainWhitelisted": rng.random() < 0.6,
+                "testCompleted": rng.random() < 0.5,
+                "liveEnabled": rng.random() < 0.4,
+                "lastActivity": (datetime(2026, 1, 1) + timedelta(hours=i)).isoformat(),
+            },
+            "updatedAt": (datetime(2026, 1, 1) + timedelta(hours=i)).isoformat(),
+        }
+    return partners
+
+
+def _seed_scripts() -> dict[str, dict[str, Any]]:
+    scripts = {}
+    for priority, (business_type, interest_level) in enumerate(
+        [("gym", "cold"), ("climbing", "warm"), (None, "hot"), (None, "cold")]
+    ):
+        script_id = f"script-{priority + 1}"
+        scripts[script_id] = {
+            "id": script_id,
+            "name": f"{(interest_level or 'any').title()} Lead - {business_type or 'Any Business'}",
+            "businessType": business_type,
+            "interestLevel": interest_level,
+            "geographicRegion": None,
+            "systemPrompt": "You are Sarah from Daily Event Insurance.",
+            "openingScript": "Hi {first_name}, this is Sarah from Daily Event Insurance.",
+            "keyPoints": json.dumps(["Zero cost to implement", "Commission on every policy"]),
+            "objectionHandlers": json.dumps({"already have insurance": "This protects participants."}),
+            "closingScript": "Can I set up a quick 15-minute demo?",
+            "isActive": True,
+            "priority": priority,
+        }
+    return scripts
+
+
+# =============================================================================
+# FAKE BACKEND APP
+# =============================================================================
+
+Handler = Callable[[dict[str, str], dict[str, list[str]], Any], Awaitable[tuple[int, Any]]]
+
+
+class FakeBackend:
+    """
+    ASGI application emulating the agent-facing Next.js API routes.
+
+    Args:
+        seed: Seed for both the generated data and the latency/error sampling
+        lead_count: Number of leads to seed
+        partner_count: Number of partners to seed
+        default_profile: Profile used for endpoints without an explicit one
+        sleep: Awaitable used to inject latency (override for virtual time)
+        accept_compact: Accept (and advertise) msgpack + zstd request bodies (see wire.py)
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        lead_count: int = 50,
+        partner_count: int = 10,
+        default_profile: EndpointProfile | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        accept_compact: bool = True,
+    ):
+        self.rng = random.Random(seed)
+        self.leads = _seed_leads(self.rng, lead_count)
+        self.partners = _seed_partners(self.rng, partner_count)
+        self.scripts = _seed_scripts()
+        self.communications: dict[str, list[dict[str, Any]]] = {}
+        self.schedules: dict[str, list[dict[str, Any]]] = {}
+        self.sms: dict[str, list[dict[str, Any]]] = {}
+        self.escalations: dict[str, list[dict[str, Any]]] = {}
+        self.tickets: dict[str, dict[str, Any]] = {}
+        self.transfers: list[dict[str, Any]] = []
+        self.scheduled_actions: dict[str, dict[str, Any]] = {}
+        self.funnel = FunnelStore()
+        self._last_update: datetime | None = None
+
+        self.default_profile = default_profile or EndpointProfile()
+        self.profiles: dict[str, EndpointProfile] = {}
+        self.stats: dict[str, EndpointStats] = {}
+        self.request_log: list[tuple[float, str, str, int]] = []
+        self._sleep = sleep
+        self.accept_compact = accept_compact
+        # Request body bytes received, by content type
+        self.body_bytes: dict[str, int] = {wire.JSON_TYPE: 0, wire.COMPACT_TYPE: 0}
+
+        self._routes: list[tuple[str, str, re.Pattern, Handler]] = []
+        self._register_routes()
+
+    @property
+    def lead_ids(self) -> list[str]:
+        return list(self.leads)
+
+    @property
+    def partner_ids(self) -> list[str]:
+        return list(self.partners)
+
+    @property
+    def route_names(self) -> list[str]:
+        return [name for name, _, _, _ in self._routes]
+
+    def configure(self, route: str, profile: EndpointProfile) -> None:
+        """Set the profile for a route name, or "*" for the default."""
+        if route == "*":
+            self.default_profile = profile
+            return
+        if route not in self.route_names:
+            raise KeyError(f"Unknown route: {route}")
+        self.profiles[route] = profile
+
+    def configure_from_dict(self, profiles: dict[str, dict[str, Any]]) -> None:
+        """Load profiles from a `{route: {...}}` mapping (e.g. a JSON file)."""
+        for route, data in profiles.items():
+            self.configure(route, EndpointProfile.from_dict(data))
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
+        self.request_log.clear()
+        self.body_bytes = dict.fromkeys(self.body_bytes, 0)
+
+    # -------------------------------------------------------------------------
+    # Routing
+    # -------------------------------------------------------------------------
+
+    def _route(self, name: str, method: str, pattern: str, handler: Handler) -> None:
+        regex = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern) + "$")
+        self._routes.append((name, method, regex, handler))
+
+    def _register_routes(self) -> None:
+        self._route("list_leads", "GET", "/api/admin/leads", self._list_leads)
+        self._route("get_lead", "GET", "/api/admin/leads/{lead_id}", self._get_lead)
+        self._route("update_lead", "PATCH", "/api/admin/leads/{lead_id}", self._update_lead)
+        self._route("log_communication", "POST", "/api/admin/leads/{lead_id}/communications", self._log_communication)
+        self._route("list_communications", "GET", "/api/admin/communications", self._list_communications)
+        self._route("schedule", "POST", "/api/admin/leads/{lead_id}/schedule", self._schedule)
+        self._route("send_sms", "POST", "/api/admin/leads/{lead_id}/sms", self._send_sms)
+        self._route("escalate", "POST", "/api/admin/leads/{lead_id}/escalate", self._escalate)
+        self._route("create_ticket", "POST", "/api/support/tickets", self._create_ticket)
+        self._route("transfer", "POST", "/api/support/transfer", self._transfer)
+        self._route("list_partners", "GET", "/api/admin/partners", self._list_partners)
+        self._route("get_partner", "GET", "/api/partners/{partner_id}", self._get_partner)
+        self._route("get_integration", "GET", "/api/partners/{partner_id}/integration", self._get_integration)
+        self._route("list_scripts", "GET", "/api/admin/scripts", self._list_scripts)
+        self._route("get_script", "GET", "/api/admin/scripts/{script_id}", self._get_script)
+        self._route("list_scheduled_actions", "GET", "/api/admin/scheduled-actions", self._list_scheduled_actions)
+        self._route("create_scheduled_action", "POST", "/api/admin/scheduled-actions", self._create_scheduled_action)
+        self._route("update_scheduled_action", "PATCH", "/api/admin/scheduled-actions/{action_id}", self._update_scheduled_action)
+        self._route("flush_funnel", "POST", "/api/admin/analytics/funnel", self._flush_funnel)
+        self._route("read_funnel", "GET", "/api/admin/analytics/funnel", self._read_funnel)
+
+    def _match(self, method: str, path: str) -> tuple[str, Handler, dict[str, str]] | None:
+        for name, route_method, regex, handler in self._routes:
+            if route_method != method:
+                continue
+            match = regex.match(path)
+            if match:
+                return name, handler, match.groupdict()
+        return None
+
+    # -------------------------------------------------------------------------
+    # ASGI entry point
+    # -------------------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+        query = parse_qs(scope.get("query_string", b"").decode())
+
+        matched = self._match(method, path)
+        if matched is None:
+            await self._respond(send, 404, _error("Not Found", f"No route for {method} {path}"))
+            return
+
+        name, handler, params = matched
+        headers = {key.decode().lower(): value.decode() for key, value in scope.get("headers", [])}
+        status, payload = await self._handle(
+            name, handler, params, query, body, headers.get("content-type"), headers.get("content-encoding")
+        )
+        await self._respond(send, status, payload, self.accept_compact)
+
+    async def _handle(
+        self,
+        name: str,
+        handler: Handler,
+        params: dict[str, str],
+        query: dict[str, list[str]],
+        body: bytes,
+        content_type: str | None = None,
+        content_encoding: str | None = None,
+    ) -> tuple[int, Any]:
+        profile = self.profiles.get(name, self.default_profile)
+        stats = self.stats.setdefault(name, EndpointStats())
+        stats.requests += 1
+
+        delay = profile.latency.sample(self.rng)
+        if profile.slow_tail_rate and self.rng.random() < profile.slow_tail_rate:
+            delay += profile.slow_tail_seconds
+            stats.slow_tails += 1
+        stats.total_delay += delay
+        if delay > 0:
+            await self._sleep(delay)
+
+        if profile.error_rate and self.rng.random() < profile.error_rate:
+            stats.errors += 1
+            status, payload = profile.error_status, _error("Injected Failure", f"Injected failure on {name}")
+        else:
+            compact = (content_type or "").startswith(wire.COMPACT_TYPE)
+            if compact and not self.accept_compact:
+                return 415, _error("Unsupported Media Type", f"{wire.COMPACT_TYPE} bodies are not accepted")
+            try:
+                data = wire.decode(body, content_type, content_encoding)
+            except wire.UnsupportedMediaType as e:
+                return 415, _error("Unsupported Media Type", str(e))
+            except ValueError:
+                return 400, _error("Bad Request", "Invalid request body")
+            self.body_bytes[wire.COMPACT_TYPE if compact else wire.JSON_TYPE] += len(body)
+            status, payload = await handler(params, query, data)
+
+        self.request_log.append((time.monotonic(), name, json.dumps(params), status))
+        return status, payload
+
+    @staticmethod
+    async def _respond(send, status: int, payload: Any, accept_compact: bool = False) -> None:
+        body = json.dumps(payload).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if accept_compact:
+            headers.append((b"accept-post", f"{wire.JSON_TYPE}, {wire.COMPACT_TYPE}".encode()))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers,
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    # -------------------------------------------------------------------------
+    # Handlers
+    # -------------------------------------------------------------------------
+
+    async def _list_leads(self, params, query, data):
+        page = int(query.get("page", ["1"])[0])
+        page_size = min(int(query.get("pageSize", ["20"])[0]), 100)
+        filters = {
+            field: query[param][0]
+            for param, field in (("status", "status"), ("source", "source"),
+                                 ("interestLevel", "interestLevel"), ("businessType", "businessType"))
+            if query.get(param, [""])[0]
+        }
+        leads = [lead for lead in self.leads.values() if all(lead[f] == v for f, v in filters.items())]
+        if "updatedSince" in query:
+            return self._changed(leads, query)
+        start = (page - 1) * page_size
+        return 200, _paginated(leads[start:start + page_size], page, page_size, len(leads))
+
+    async def _get_lead(self, params, query, data):
+        lead = self.leads.get(params["lead_id"])
+        if lead is None:
+            return 404, _error("Not Found", "Lead not found")
+        return 200, _success({**lead, "communications": self.communications.get(lead["id"], [])})
+
+    async def _update_lead(self, params, query, data):
+        lead = self.leads.get(params["lead_id"])
+        if lead is None:
+            return 404, _error("Not Found", "Lead not found")
+        lead.update({k: v for k, v in (data or {}).items() if k != "id"})
+        lead["updatedAt"] = self._updated_at()
+        return 200, _success(lead, "Lead updated")
+
+    async def _log_communication(self, params, query, data):
+        if params["lead_id"] not in self.leads:
+            return 404, _error("Not Found", "Lead not found")
+        return 201, _success(self.add_communication(params["lead_id"], data or {}), "Communication logged")
+
+    async def _list_communications(self, params, query, data):
+        # Change feed for the transcript index: in (createdAt, id) order, after
+        # the (`createdSince`, `afterId`) cursor
+        page_size = min(int(query.get("pageSize", ["100"])[0]), 1000)
+        channel = query.get("channel", [""])[0]
+        after = (query.get("createdSince", [""])[0], query.get("afterId", [""])[0])
+        records = sorted(
+            (record for records in self.communications.values() for record in records
+             if (not channel or record.get("channel") == channel) and (record["createdAt"], record["id"]) > after),
+            key=lambda record: (record["createdAt"], record["id"]),
+        )
+        return 200, _paginated(records[:page_size], 1, page_size, len(records))
+
+    async def _schedule(self, params, query, data):
+        if params["lead_id"] not in self.leads:
+            return 404, _error("Not Found", "Lead not found")
+        record = {"id": str(uuid.uuid4()), "leadId": params["lead_id"], **(data or {})}
+        self.schedules.setdefault(params["lead_id"], []).append(record)
+        # Lead schedules become scheduled actions for the executor
+        self.add_scheduled_action({"leadId": params["lead_id"], **(data or {})})
+        return 201, _success(record, "Scheduled")
+
+    async def _send_sms(self, params, query, data):
+        if params["lead_id"] not in self.leads:
+            return 404, _error("Not Found", "Lead not found")
+        record = {"id": str(uuid.uuid4()), "leadId": params["lead_id"], "smsStatus": "sent", **(data or {})}
+        self.sms.setdefault(params["lead_id"], []).append(record)
+        return 200, _success(record, "SMS sent")
+
+    async def _escalate(self, params, query, data):
+        if params["lead_id"] not in self.leads:
+            return 404, _error("Not Found", "Lead not found")
+        record = {"id": str(uuid.uuid4()), "leadId": params["lead_id"], **(data or {})}
+        self.escalations.setdefault(params["lead_id"], []).append(record)
+        return 201, _success(record, "Escalation created")
+
+    async def _create_ticket(self, params, query, data):
+        ticket_number = f"TKT-{len(self.tickets) + 1000}"
+        self.tickets[ticket_number] = {"ticketNumber": ticket_number, "status": "open", **(data or {})}
+        return 201, _success({"ticket": self.tickets[ticket_number]}, "Ticket created successfully")
+
+    async def _transfer(self, params, query, data):
+        self.transfers.append(data or {})
+        return 200, _success({"queued": True}, "Transfer requested")
+
+    async def _list_partners(self, params, query, data):
+        return self._changed(self.partners.values(), query, exclude=("integration",))
+
+    async def _get_partner(self, params, query, data):
+        partner = self.partners.get(params["partner_id"])
+        if partner is None:
+            return 404, _error("Not Found", "Partner not found")
+        return 200, _success({k: v for k, v in partner.items() if k != "integration"})
+
+    async def _get_integration(self, params, query, data):
+        partner = self.partners.get(params["partner_id"])
+        if partner is None:
+            return 404, _error("Not Found", "Partner not found")
+        return 200, _success(partner["integration"])
+
+    async def _list_scripts(self, params, query, data):
+        business_type = query.get("businessType", [None])[0]
+        interest_level = query.get("interestLevel", [None])[0]
+        active_only = query.get("activeOnly", ["false"])[0] == "true"
+        scripts = [
+            script for script in self.scripts.values()
+            if (business_type is None or script["businessType"] in (None, business_type))
+            and (interest_level is None or script["interestLevel"] in (None, interest_level))
+            and (not active_only or script["isActive"])
+        ]
+        return 200, _success(scripts)
+
+    async def _get_script(self, params, query, data):
+        script = self.scripts.get(params["script_id"])
+        if script is None:
+            return 404, _error("Not Found", "Script not found")
+        return 200, _success(script)
+
+    @staticmethod
+    def _changed(records: Iterable[dict[str, Any]], query: dict[str, list[str]], exclude: tuple[str, ...] = ()):
+        # Change feed for the caller ID and DNC indexes: records updated after
+        # `updatedSince`, paged in creation order like the rest of the list
+        page = int(query.get("page", ["1"])[0])
+        page_size = min(int(query.get("pageSize", ["20"])[0]), 100)
+        since = query.get("updatedSince", [""])[0]
+        changed = [record for record in records if record["updatedAt"] > since]
+        start = (page - 1) * page_size
+        data = [{k: v for k, v in record.items() if k not in exclude} for record in changed[start:start + page_size]]
+        return 200, _paginated(data, page, page_size, len(changed))
+
+    def _updated_at(self) -> str:
+        """Strictly increasing `updatedAt`, so change-feed cursors never skip a write."""
+        now = datetime.utcnow()
+        if self._last_update is not None and now <= self._last_update:
+            now = self._last_update + timedelta(microseconds=1)
+        self._last_update = now
+        return now.isoformat(timespec="microseconds") + "Z"
+
+    def add_communication(self, lead_id: str, data: dict[str, Any], created_at: str | None = None) -> dict[str, Any]:
+        """Log a communication for a lead (also used to seed benchmarks, `created_at` to force ties)."""
+        record = {"id": str(uuid.uuid4()), "leadId": lead_id, **data, "createdAt": created_at or self._updated_at()}
+        self.communications.setdefault(lead_id, []).append(record)
+        return record
+
+    def add_scheduled_action(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Create a pending scheduled action (also used to seed benchmarks)."""
+        action_id = data.get("id") or str(uuid.uuid4())
+        updated_at = self._updated_at()
+        action = {"status": "pending", "attempts": 0, "maxAttempts": 3, "createdAt": updated_at, **data,
+                  "id": action_id, "updatedAt": updated_at}
+        self.scheduled_actions[action_id] = action
+        return action
+
+    async def _list_scheduled_actions(self, params, query, data):
+        status = query.get("status", [None])[0]
+        since = query.get("updatedSince", [None])[0]
+        actions = [
+            a for a in self.scheduled_actions.values()
+            if (status is None or a["status"] == status) and (since is None or a["updatedAt"] > since)
+        ]
+        if "pageSize" in query:
+            actions.sort(key=lambda a: a["updatedAt"])
+            actions = actions[:int(query["pageSize"][0])]
+        return 200, _success(actions)
+
+    async def _create_scheduled_action(self, params, query, data):
+        return 201, _success(self.add_scheduled_action(data or {}), "Scheduled action created")
+
+    async def _update_scheduled_action(self, params, query, data):
+        action = self.scheduled_actions.get(params["action_id"])
+        if action is None:
+            return 404, _error("Not Found", "Scheduled action not found")
+        data = dict(data or {})
+        # Conditional update (a claim): only applies while the status still matches
+        expected = data.pop("expectedStatus", None)
+        if expected is not None and action["status"] != expected:
+            return 409, _error("Conflict", f"Scheduled action is {action['status']}")
+        action.update({k: v for k, v in data.items() if k != "id"})
+        action["updatedAt"] = self._updated_at()
+        return 200, _success(action, "Scheduled action updated")
+
+    async def _flush_funnel(self, params, query, data):
+        # Counts since each agent process's last flush, added to the rollups
+        try:
+            rows = self.funnel.apply(data or {})
+        except (TypeError, ValueError) as e:
+            return 400, _error("Bad Request", f"Invalid funnel rollup: {e}")
+        return 200, _success({"rows": rows})
+
+    async def _read_funnel(self, params, query, data):
+        rollups = self.funnel.query(
+            window=query.get("window", ["day"])[0],
+            since=query.get("since", [None])[0],
+            until=query.get("until", [None])[0],
+            script=query.get("script", [None])[0],
+            business_type=query.get("businessType", [None])[0],
+        )
+        return 200, _success([rollup.to_dict() for rollup in rollups])
+
+
+def _success(data: Any, message: str | None = None) -> dict[str, Any]:
+    response = {"success": True, "data": data}
+    if message:
+        response["message"] = message
+    return response
+
+
+def _paginated(data: list, page: int, page_size: int, total: int) -> dict[str, Any]:
+    total_pages = math.ceil(total / page_size) if page_size else 0
+    return {
+        "success": True,
+        "data": data,
+        "pagination": {
+            "page": page,
+            "pageSize": page_size,
+            "total": total,
+            "totalPages": total_pages,
+            "hasNext": page < total_pages,
+            "hasPrev": page > 1,
+        },
+    }
+
+
+def _error(error: str, message: str) -> dict[str, Any]:
+    return {"success": False, "error": error, "message": message}
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the fake Daily Event Insurance API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--leads", type=int, default=50)
+    parser.add_argument("--partners", type=int, default=10)
+    parser.add_argument("--profile", help="JSON file mapping route names to endpoint profiles")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    backend = FakeBackend(seed=args.seed, lead_count=args.leads, partner_count=args.partners)
+    if args.profile:
+        with open(args.profile) as f:
+            backend.configure_from_dict(json.load(f))
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The standalone fake backend needs uvicorn: pip install uvicorn")
+
+    logger.info(f"Seeded {len(backend.leads)} leads and {len(backend.partners)} partners")
+    for lead_id in backend.lead_ids[:3]:
+        logger.info(f"  sample lead: {lead_id}")
+    uvicorn.run(backend, host=args.host, port=args.port)
@@ -0,0 +1,308 @@
+"""
+Daily Event Insurance - Fake Realtime Server
+Local websocket stand-in for the OpenAI Realtime API.
+
+Speaks the subset of the GA realtime protocol the LiveKit OpenAI plugin uses
+to configure a session and stream a reply: `session.update` is acknowledged
+with `session.updated`, and `response.create` produces a response with a
+single message - silent PCM audio deltas, or text deltas when the session's
+output modality is text (hybrid pipeline). Handshake, session configuration
+and time-to-first-audio delays are configurable, so the cost of opening the
+connection after the callee answers can be measured without network access
+or API keys.
+
+It also serves the REST endpoints of the cascade pipeline - transcription,
+streamed chat completions and PCM speech - each with its own delay, so the
+three pipeline modes of agent_core.py can be compared against the same fake
+provider. Transcripts and replies are taken in order from `transcripts` and
+`replies`.
+
+Every `session.update` is merged into `FakeRealtimeServer.session`, which
+lets tests check that instructions, tools, voice and turn detection were
+configured before the call was answered.
+
+In-process usage (tests and benchmarks):
+
+    async with FakeRealtimeServer(connect_delay=0.4) as server:
+        model = openai.realtime.RealtimeModel(base_url=server.base_url, api_key="fake")
+        rt_session = model.session()
+
+Standalone usage:
+
+    python fake_realtime.py --port 8765
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+logger = logging.getLogger("fake-realtime")
+
+SAMPLE_RATE = 24000
+
+
+def _id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+
+
+def _merge(target: dict, update: dict) -> None:
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class FakeRealtimeServer:
+    """
+    Fake OpenAI Realtime websocket server.
+
+    Args:
+        connect_delay: Seconds before the websocket upgrade completes (TLS + handshake)
+        session_update_delay: Seconds to apply each `session.update`
+        first_audio_delay: Seconds from `response.create` to the first audio delta
+        audio_chunks: Number of 100ms silent audio deltas per response
+        stt_delay: Seconds to transcribe an uploaded utterance
+        llm_first_token_delay: Seconds from a chat completion request to its first token
+        token_interval: Seconds between streamed text tokens (chat and realtime text)
+        tts_first_audio_delay: Seconds from a speech request to its first audio bytes
+        transcripts: Transcription results, returned in order (cycled)
+        replies: Reply texts for chat completions and realtime text responses (cycled)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(
+        self,
+        connect_delay: float = 0.4,
+        session_update_delay: float = 0.1,
+        first_audio_delay: float = 0.3,
+        audio_chunks: int = 5,
+        stt_delay: float = 0.25,
+        llm_first_token_delay: float = 0.35,
+        token_interval: float = 0.01,
+        tts_first_audio_delay: float = 0.2,
+        transcripts: list[str] | None = None,
+        replies: list[str] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.connect_delay = connect_delay
+        self.session_update_delay = session_update_delay
+        self.first_audio_delay = first_audio_delay
+        self.audio_chunks = audio_chunks
+        self.stt_delay = stt_delay
+        self.llm_first_token_delay = llm_first_token_delay
+        self.token_interval = token_interval
+        self.tts_first_audio_delay = tts_first_audio_delay
+        self.transcripts = transcripts or ["Yes, I have a minute."]
+        self.replies = replies or ["Great. Tell me a little about your business."]
+        self.host = host
+        self.port = port
+
+        self.session: dict[str, Any] = {}
+        self.connections = 0
+        self.responses = 0
+        self.events: list[tuple[float, str]] = []
+        self.requests: dict[str, int] = {}
+
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Pass as `RealtimeModel(base_url=...)`."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> "FakeRealtimeServer":
+        app = web.Application()
+        app.router.add_get("/v1/realtime", self._handle)
+        app.router.add_post("/v1/audio/transcriptions", self._transcribe)
+        app.router.add_post("/v1/chat/completions", self._chat)
+        app.router.add_post("/v1/audio/speech", self._speech)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Fake realtime server listening on {self.base_url}")
+        return self
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeRealtimeServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def reset(self) -> None:
+        self.session = {}
+        self.connections = 0
+        self.responses = 0
+        self.events = []
+        self.requests = {}
+
+    # =========================================================================
+    # PROTOCOL
+    # =========================================================================
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        await asyncio.sleep(self.connect_delay)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        session_id = _id("sess")
+        await self._send(ws, {"type": "session.created", "session": {"id": session_id, **self.session}})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            event = json.loads(msg.data)
+            event_type = event.get("type")
+            self.events.append((time.perf_counter(), event_type))
+
+            if event_type == "session.update":
+                await asyncio.sleep(self.session_update_delay)
+                _merge(self.session, event.get("session", {}))
+                await self._send(ws, {"type": "session.updated", "session": {"id": session_id, **self.session}})
+            elif event_type == "response.create":
+                await self._respond(ws, event.get("response") or {})
+            elif event_type == "input_audio_buffer.append":
+                pass
+            else:
+                logger.debug(f"Ignoring client event {event_type}")
+        return ws
+
+    async def _respond(self, ws: web.WebSocketResponse, params: dict) -> None:
+        self.responses += 1
+        response_id = _id("resp")
+        item_id = _id("item")
+        response = {
+            "id": response_id,
+            "object": "realtime.response",
+            "status": "in_progress",
+            "metadata": params.get("metadata"),
+            "output": [],
+        }
+        item = {"id": item_id, "type": "message", "role": "assistant", "status": "in_progress", "content": []}
+        where = {"response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0}
+
+        await self._send(ws, {"type": "response.created", "response": response})
+        await self._send(ws, {"type": "response.output_item.added", "response_id": response_id, "output_index": 0, "item": item})
+        if "audio" in self.session.get("output_modalities", ["audio"]):
+            await self._send(ws, {"type": "response.content_part.added", **where, "part": {"type": "audio", "transcript": ""}})
+            await asyncio.sleep(self.first_audio_delay)
+            chunk = base64.b64encode(bytes(SAMPLE_RATE // 10 * 2)).decode()  # 100ms of silence
+            for _ in range(self.audio_chunks):
+                await self._send(ws, {"type": "response.output_audio.delta", **where, "delta": chunk})
+            await self._send(ws, {"type": "response.output_audio.done", **where})
+            content = [{"type": "output_audio", "transcript": ""}]
+        else:
+            text = self._next("realtime", self.replies)
+            await self._send(ws, {"type": "response.content_part.added", **where, "part": {"type": "text", "text": ""}})
+            await asyncio.sleep(self.first_audio_delay)
+            for token in _tokens(text):
+                await self._send(ws, {"type": "response.output_text.delta", **where, "delta": token})
+                await asyncio.sleep(self.token_interval)
+            await self._send(ws, {"type": "response.output_text.done", **where, "text": text})
+            content = [{"type": "output_text", "text": text}]
+
+        item = {**item, "status": "completed", "content": content}
+        await self._send(ws, {"type": "response.output_item.done", "response_id": response_id, "output_index": 0, "item": item})
+        await self._send(ws, {"type": "response.done", "response": {**response, "status": "completed", "output": [item]}})
+
+    async def _send(self, ws: web.WebSocketResponse, event: dict) -> None:
+        event.setdefault("event_id", _id("event"))
+        await ws.send_str(json.dumps(event))
+
+
+    def _next(self, kind: str, items: list[str]) -> str:
+        count = self.requests.get(kind, 0)
+        self.requests[kind] = count + 1
+        return items[count % len(items)]
+
+    # =========================================================================
+    # REST (cascade pipeline)
+    # =========================================================================
+
+    async def _transcribe(self, request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(self.stt_delay)
+        return web.json_response({"text": self._next("transcriptions", self.transcripts)})
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        text = self._next("chat", self.replies)
+        completion_id = _id("chatcmpl")
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": body.get("model", "fake")}
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await asyncio.sleep(self.llm_first_token_delay)
+        for i, token in enumerate(_tokens(text)):
+            delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+            chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(self.token_interval)
+        done = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        await response.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def _speech(self, request: web.Request) -> web.StreamResponse:
+        await request.json()
+        self.requests["speech"] = self.requests.get("speech", 0) + 1
+        response = web.StreamResponse(headers={"Content-Type": "audio/pcm", "x-request-id": _id("req")})
+        await response.prepare(request)
+        await asyncio.sleep(self.tts_first_audio_delay)
+        for _ in range(self.audio_chunks):
+            await response.write(bytes(SAMPLE_RATE // 10 * 2))  # 100ms of silence
+        await response.write_eof()
+        return response
+
+
+def _tokens(text: str) -> list[str]:
+    """Word-sized deltas that join back into `text`."""
+    words = text.split(" ")
+    return [words[0]] + [f" {word}" for word in words[1:]]
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the fake OpenAI Realtime server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connect-delay", type=float, default=0.4)
+    parser.add_argument("--session-update-delay", type=float, default=0.1)
+    parser.add_argument("--first-audio-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def _serve():
+        async with FakeRealtimeServer(
+            connect_delay=args.connect_delay,
+            session_update_delay=args.session_update_delay,
+            first_audio_delay=args.first_audio_delay,
+            host=args.host,
+            port=args.port,
+        ) as server:
+            logger.info(f"Set OPENAI_BASE_URL={server.base_url} to point the agents at it")
+            await asyncio.Event().wait()
+
+    asyncio.run(_serve())
@@ -0,0 +1,245 @@
+"""
+Daily Event Insurance - Latency-Masking Fillers
+Plays a short pre-cached acknowledgement when a tool call runs long.
+
+While a tool like `schedule_demo` or `check_integration_status` waits on the
+API, the caller hears silence. Tools decorated with `@masked` are timed
+against a per-tool threshold; once it is exceeded, a clip such as "One sec,
+let me pull that up." is played from the TTS audio cache on the
+`BackgroundAudioPlayer` track. The clip never enters the chat context or the
+speech queue, so the model's turn and the tool result are untouched, and it
+fades out as soon as the agent starts speaking. Clips that are not cached
+are skipped (and filled for next time) rather than synthesized live.
+
+Fillers are rate limited per call (cooldown and cap) so a degraded backend
+does not turn into a string of "one moment"s. Per-tool counters show how
+often each tool crosses its threshold and how often a filler actually played.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+from tts_cache import TTSAudioCache, audio_cache
+from utterances import (
+    FILLER_CHECKING,
+    FILLER_CONNECTING,
+    FILLER_GENERIC,
+    FILLER_LOOKUP,
+    FILLER_SCHEDULING,
+    FILLER_SENDING,
+)
+
+logger = logging.getLogger("latency-fillers")
+
+T = TypeVar("T")
+
+# BackgroundAudioPlayer mixes at 48kHz
+PLAYER_SAMPLE_RATE = 48000
+
+
+@dataclass
+class FillerConfig:
+    """
+    Filler settings for one tool.
+
+    Args:
+        threshold: Seconds the tool may run before a filler plays
+        clips: Candidate clip texts (must be in FIXED_UTTERANCES to be cached)
+    """
+
+    threshold: float
+    clips: list[str] = field(default_factory=lambda: [FILLER_GENERIC])
+
+
+DEFAULT_FILLERS: dict[str, FillerConfig] = {
+    # Sales workflow tools
+    "load_lead_context": FillerConfig(1.0, [FILLER_LOOKUP, FILLER_GENERIC]),
+    "get_recommended_script": FillerConfig(1.0, [FILLER_GENERIC]),
+    "schedule_callback": FillerConfig(0.8, [FILLER_SCHEDULING, FILLER_GENERIC]),
+    "schedule_demo": FillerConfig(0.8, [FILLER_SCHEDULING, FILLER_GENERIC]),
+    "send_sms": FillerConfig(1.0, [FILLER_SENDING]),
+    "escalate_to_specialist": FillerConfig(1.0, [FILLER_GENERIC]),
+    # Support tools
+    "get_partner_account": FillerConfig(0.8, [FILLER_LOOKUP, FILLER_CHECKING]),
+    "check_integration_status": FillerConfig(0.7, [FILLER_CHECKING, FILLER_LOOKUP]),
+    "create_support_ticket": FillerConfig(1.0, [FILLER_GENERIC]),
+    "transfer_to_human": FillerConfig(1.0, [FILLER_CONNECTING]),
+}
+
+
+@dataclass
+class FillerStats:
+    """Counters for one tool within a call."""
+
+    calls: int = 0
+    slow: int = 0
+    fired: int = 0
+    suppressed: int = 0
+    uncached: int = 0
+
+    @property
+    def fire_rate(self) -> float:
+        return self.fired / self.calls if self.calls else 0.0
+
+
+class FillerPlayer:
+    """
+    Times tool calls and plays filler clips on a background audio track.
+
+    Args:
+        config: Per-tool filler settings (tools not listed never get fillers)
+        cooldown: Minimum seconds between two fillers
+        max_per_call: Maximum fillers per call
+        volume: Clip playback volume
+        cache: Audio cache the clips are read from
+        clock: Monotonic clock (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        config: dict[str, FillerConfig] | None = None,
+        cooldown: float = 6.0,
+        max_per_call: int = 4,
+        volume: float = 1.0,
+        cache: TTSAudioCache = audio_cache,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = dict(DEFAULT_FILLERS if config is None else config)
+        self.cooldown = cooldown
+        self.max_per_call = max_per_call
+        self.volume = volume
+        self.cache = cache
+        self._clock = clock
+        self._rng = random.Random()
+
+        self._player = None
+        self._voice: str | None = None
+        self._handle = None
+        self._last_clip: str | None = None
+        self._last_fired_at = float("-inf")
+        self._fired_this_call = 0
+        self.stats: dict[str, FillerStats] = {}
+
+    def attach(self, player: Any, voice: str, session: Any = None) -> None:
+        """
+        Play fillers on `player` (a started `BackgroundAudioPlayer`) in the
+        agent's `voice`. With `session`, a clip is faded out when the agent
+        starts speaking.
+        """
+        self._player = player
+        self._voice = voice
+        if session is not None:
+            session.on("agent_state_changed", self._on_agent_state_changed)
+
+    def detach(self) -> None:
+        self.stop()
+        self._player = None
+
+    def configure(self, tool: str, config: FillerConfig | None) -> None:
+        """Set (or with None, disable) fillers for one tool."""
+        if config is None:
+            self.config.pop(tool, None)
+        else:
+            self.config[tool] = config
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self._fired_this_call = 0
+        self._last_fired_at = float("-inf")
+        self._last_clip = None
+
+    def stop(self) -> None:
+        if self._handle is not None and not self._handle.done():
+            self._handle.stop()
+        self._handle = None
+
+    async def run(self, tool: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run a tool call, playing a filler if it exceeds the tool's threshold."""
+        config = self.config.get(tool)
+        if config is None:
+            return await factory()
+
+        stats = self.stats.setdefault(tool, FillerStats())
+        stats.calls += 1
+        task = asyncio.ensure_future(factory())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=config.threshold)
+            if not done:
+                stats.slow += 1
+                self._fire(tool, config, stats)
+            return await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def _fire(self, tool: str, config: FillerConfig, stats: FillerStats) -> None:
+        now = self._clock()
+        if (
+            self._player is None
+            or self._fired_this_call >= self.max_per_call
+            or now - self._last_fired_at < self.cooldown
+            or (self._handle is not None and not self._handle.done())
+        ):
+            stats.suppressed += 1
+            return
+
+        # Avoid repeating the previous clip when there is a choice
+        candidates = [clip for clip in config.clips if clip != self._last_clip] or config.clips
+        text = self._rng.choice(candidates)
+        audio = self.cache.get(text, self._voice)
+        if audio is None:
+            stats.uncached += 1
+            self.cache.fill_in_background(text, self._voice)
+            return
+
+        from livekit.agents import AudioConfig
+
+        self._handle = self._player.play(
+            AudioConfig(audio.aframes(sample_rate=PLAYER_SAMPLE_RATE), volume=self.volume, fade_out=0.15)
+        )
+        self._last_clip = text
+        self._last_fired_at = now
+        self._fired_this_call += 1
+        stats.fired += 1
+        logger.info(f"Filler for slow {tool} after {config.threshold}s: {text}")
+
+    def _on_agent_state_changed(self, event) -> None:
+        if event.new_state == "speaking":
+            self.stop()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-tool call, threshold-crossing and filler counters."""
+        return {
+            tool: {
+                "calls": s.calls,
+                "slow": s.slow,
+                "fired": s.fired,
+                "suppressed": s.suppressed,
+                "uncached": s.uncached,
+                "fire_rate": round(s.fire_rate, 3),
+            }
+            for tool, s in self.stats.items()
+        }
+
+
+# Shared by every tool module in the job process; agents attach it to their
+# background audio track at job start.
+filler_player = FillerPlayer()
+
+
+def masked(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Mask a slow async tool with a filler clip. Apply beneath `@function_tool`
+    so the tool schema still comes from the original signature.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await filler_player.run(fn.__name__, lambda: fn(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,528 @@
+"""
+Daily Event Insurance - Conversion Funnel Rollups
+Streaming funnel, conversion and sentiment counts per script, business type and time window.
+
+Dispositions (`update_disposition`) and sentiment readings
+(`analyze_sentiment`) were written one at a time and only aggregated by
+dashboard queries scanning lead communications. Each agent process now
+counts them as they happen:
+
+- one row of counters per (window, window start, script, business type),
+  for hourly and daily windows: a counter per disposition and per sentiment
+- funnel stages (dialed, reached, qualified, demo, proposal), conversion
+  rates, the sentiment mix and the mean sentiment are derived from those
+  counters, so rollups from any number of processes simply add up
+
+Rows hold the counts since the last flush. `flush` posts them to
+`/api/admin/analytics/funnel` as positional rows, every `FUNNEL_FLUSH`
+seconds (default 60) and when a call ends; the backend adds them to its
+rollups (`FunnelStore`) and dashboards read the rollups back from the same
+route instead of scanning communications. A failed flush keeps its counts
+for the next one, up to `max_pending_rows`; past that the oldest windows
+are dropped.
+
+Only the fake backend serves that route so far, so posting is off unless
+`AGENT_FUNNEL_FLUSH=1`; with it off, `flush` just discards the counts.
+
+    funnel.record_disposition("demo_scheduled", script="script-2", business_type="gym")
+    await funnel.flush()
+
+    rollups = await FunnelClient().read(window="day", since="2026-10-12T00:00:00Z")
+    combine(rollups, by="script")["script-2"].conversion["demo"]   # demos per dialed call
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+import httpx
+
+logger = logging.getLogger("conversion-funnel")
+
+FORMAT_VERSION = 1
+
+DISPOSITIONS = (
+    "reached_qualified",
+    "demo_scheduled",
+    "proposal_sent",
+    "left_voicemail",
+    "no_answer",
+    "callback_requested",
+    "not_interested",
+    "bad_fit",
+    "do_not_call",
+)
+SENTIMENTS = ("very_positive", "positive", "neutral", "negative", "very_negative")
+# Matches workflow.analyze_sentiment
+SENTIMENT_SCORES = {"very_positive": 1.0, "positive": 0.5, "neutral": 0.0, "negative": -0.5, "very_negative": -1.0}
+
+# Counter layout of a row (append only: flushed rows name their columns, so
+# a backend reading an older layout maps them by name)
+COLUMNS = DISPOSITIONS + SENTIMENTS
+_COLUMN = {name: i for i, name in enumerate(COLUMNS)}
+
+# Funnel stages, in order, and the dispositions that got at least that far
+STAGES = {
+    "dialed": DISPOSITIONS,
+    "reached": tuple(d for d in DISPOSITIONS if d not in ("left_voicemail", "no_answer")),
+    "qualified": ("reached_qualified", "demo_scheduled", "proposal_sent"),
+    "demo": ("demo_scheduled", "proposal_sent"),
+    "proposal": ("proposal_sent",),
+}
+_STAGE_COLUMNS = {stage: tuple(_COLUMN[d] for d in dispositions) for stage, dispositions in STAGES.items()}
+
+# Window name -> seconds; windows start on UTC boundaries
+WINDOWS = {"hour": 3600, "day": 86400}
+
+# Script or business type not known when the event was recorded
+UNKNOWN = "unknown"
+
+
+def _epoch(value: str | float | None) -> float | None:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# =============================================================================
+# ROLLUPS
+# =============================================================================
+
+@dataclass
+class Rollup:
+    """Counts for one window of one script and business type, and what dashboards derive from them."""
+
+    window: str
+    start: int
+    script: str
+    business_type: str
+    counts: list[int] = field(default_factory=lambda: [0] * len(COLUMNS))
+
+    def add(self, counts: list[int]) -> None:
+        for i, count in enumerate(counts):
+            self.counts[i] += count
+
+    @property
+    def dispositions(self) -> dict[str, int]:
+        return {d: self.counts[i] for i, d in enumerate(DISPOSITIONS) if self.counts[i]}
+
+    @property
+    def sentiments(self) -> dict[str, int]:
+        offset = len(DISPOSITIONS)
+        return {s: self.counts[offset + i] for i, s in enumerate(SENTIMENTS) if self.counts[offset + i]}
+
+    @property
+    def funnel(self) -> dict[str, int]:
+        """Calls that reached each stage."""
+        return {stage: sum(self.counts[i] for i in columns) for stage, columns in _STAGE_COLUMNS.items()}
+
+    @property
+    def conversion(self) -> dict[str, float]:
+        """Share of dialed calls that reached each stage."""
+        funnel = self.funnel
+        dialed = funnel["dialed"]
+        return {stage: round(count / dialed, 4) if dialed else 0.0 for stage, count in funnel.items()}
+
+    @property
+    def step_conversion(self) -> dict[str, float]:
+        """Share of the calls at the previous stage that reached each stage."""
+        funnel = self.funnel
+        stages = list(funnel)
+        return {
+            stage: round(funnel[stage] / funnel[previous], 4) if funnel[previous] else 0.0
+            for previous, stage in zip(stages, stages[1:])
+        }
+
+    @property
+    def sentiment_mix(self) -> dict[str, float]:
+        sentiments = self.sentiments
+        total = sum(sentiments.values())
+        return {s: round(count / total, 4) for s, count in sentiments.items()} if total else {}
+
+    @property
+    def mean_sentiment(self) -> float | None:
+        sentiments = self.sentiments
+        total = sum(sentiments.values())
+        if not total:
+            return None
+        return round(sum(SENTIMENT_SCORES[s] * count for s, count in sentiments.items()) / total, 4)
+
+    @classmethod
+    def from_row(cls, row: list, columns: Iterable[str] = COLUMNS) -> "Rollup":
+        """
+        A flushed row, [window, start, script, business type, *counts]. Counts
+        are mapped by column name; unknown columns are dropped.
+        """
+        window, start, script, business_type, *counts = row
+        rollup = cls(window, int(start), script, business_type)
+        for name, count in zip(columns, counts):
+            if name in _COLUMN:
+                rollup.counts[_COLUMN[name]] += int(count)
+        return rollup
+
+    def to_dict(self) -> dict[str, Any]:
+        """The rollup as dashboards read it."""
+        return {
+            "window": self.window,
+            "start": _iso(self.start),
+            "script": self.script,
+            "businessType": self.business_type,
+            "dispositions": self.dispositions,
+            "sentiments": self.sentiments,
+            "funnel": self.funnel,
+            "conversion": self.conversion,
+            "stepConversion": self.step_conversion,
+            "sentimentMix": self.sentiment_mix,
+            "meanSentiment": self.mean_sentiment,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Rollup":
+        rollup = cls(data["window"], int(_epoch(data["start"])), data["script"], data["businessType"])
+        for name, count in {**data.get("dispositions", {}), **data.get("sentiments", {})}.items():
+            if name in _COLUMN:
+                rollup.counts[_COLUMN[name]] = int(count)
+        return rollup
+
+
+def combine(rollups: Iterable[Rollup], by: str | tuple[str, ...] = ()) -> dict[Any, Rollup]:
+    """
+    Sum rollups across windows, grouped by "script", "business_type" or
+    both (a tuple); everything into one rollup under None when `by` is empty.
+    """
+    fields = (by,) if isinstance(by, str) else tuple(by)
+    combined: dict[Any, Rollup] = {}
+    for rollup in rollups:
+        values = tuple(getattr(rollup, f) for f in fields)
+        key = values[0] if len(values) == 1 else (values or None)
+        total = combined.get(key)
+        if total is None:
+            total = combined[key] = Rollup(
+                rollup.window, rollup.start,
+                rollup.script if "script" in fields else "*",
+                rollup.business_type if "business_type" in fields else "*",
+            )
+        total.start = min(total.start, rollup.start)
+        total.add(rollup.counts)
+    return combined
+
+
+class FunnelStore:
+    """
+    Rollups summed from flushes: what the backend keeps for dashboards
+    (fake_backend.FakeBackend serves one).
+    """
+
+    def __init__(self):
+        # Window -> (start, script, business type) -> rollup
+        self._rollups: dict[str, dict[tuple[int, str, str], Rollup]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(rollups) for rollups in self._rollups.values())
+
+    def apply(self, payload: dict[str, Any]) -> int:
+        """Add a flush payload's rows; returns how many rows it carried."""
+        columns = payload.get("columns") or COLUMNS
+        rows = payload.get("rows") or []
+        for row in rows:
+            delta = Rollup.from_row(row, columns)
+            rollups = self._rollups.setdefault(delta.window, {})
+            key = (delta.start, delta.script, delta.business_type)
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollups[key] = delta
+            else:
+                rollup.add(delta.counts)
+        return len(rows)
+
+    def query(
+        self,
+        window: str = "day",
+        since: str | float | None = None,
+        until: str | float | None = None,
+        script: str | None = None,
+        business_type: str | None = None,
+    ) -> list[Rollup]:
+        """Rollups of one window size starting in [since, until), oldest first."""
+        since, until = _epoch(since), _epoch(until)
+        return sorted(
+            (
+                rollup for (start, s, b), rollup in self._rollups.get(window, {}).items()
+                if (since is None or start >= since) and (until is None or start < until)
+                and (script is None or s == script) and (business_type is None or b == business_type)
+            ),
+            key=lambda rollup: (rollup.start, rollup.script, rollup.business_type),
+        )
+
+
+# =============================================================================
+# AGGREGATOR
+# =============================================================================
+
+class FunnelAggregator:
+    """
+    Counts dispositions and sentiment readings as they are recorded and
+    flushes the counts to the backend.
+
+    Args:
+        windows: Window name -> seconds (default hourly and daily)
+        flush_interval: Seconds between flushes (default $FUNNEL_FLUSH, else 60)
+        flushing: Post flushes to the backend (default $AGENT_FUNNEL_FLUSH=1, else off)
+        max_pending_rows: Rows kept after failed flushes (default $FUNNEL_MAX_PENDING_ROWS, else 10000)
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+        clock: Wall clock in epoch seconds (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        windows: dict[str, int] | None = None,
+        flush_interval: float | None = None,
+        flushing: bool | None = None,
+        max_pending_rows: int | None = None,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock=time.time,
+    ):
+        self._windows = tuple((windows or WINDOWS).items())
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else float(os.getenv("FUNNEL_FLUSH", "60"))
+        )
+        self.flushing = flushing if flushing is not None else os.getenv("AGENT_FUNNEL_FLUSH", "0") == "1"
+        self.max_pending_rows = (
+            max_pending_rows if max_pending_rows is not None else int(os.getenv("FUNNEL_MAX_PENDING_ROWS", "10000"))
+        )
+        self.configure(api_base_url, api_key, transport)
+        self._clock = clock
+        self._rows: dict[tuple[str, int, str, str], list[int]] = {}
+        self._last_flush = clock()
+        self._flushing: asyncio.Task | None = None
+        self.events = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.dropped_rows = 0
+
+    def configure(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Point flushes at a backend (the workflow does this per call)."""
+        self.base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+        self.api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+        self.transport = transport
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def _record(self, column: int, script: str | None, business_type: str | None, at: float | None) -> None:
+        at = self._clock() if at is None else at
+        script, business_type = script or UNKNOWN, business_type or UNKNOWN
+        rows = self._rows
+        for window, seconds in self._windows:
+            key = (window, int(at // seconds * seconds), script, business_type)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = [0] * len(COLUMNS)
+            row[column] += 1
+        self.events += 1
+        self._flush_if_due()
+
+    def record_disposition(
+        self, disposition: str, script: str | None = None, business_type: str | None = None, at: float | None = None
+    ) -> None:
+        """Count a call outcome (one of DISPOSITIONS) at `at` (default now)."""
+        column = _COLUMN.get(disposition)
+        if column is None or column >= len(DISPOSITIONS):
+            logger.warning(f"Not counting unknown disposition: {disposition}")
+            return
+        self._record(column, script, business_type, at)
+
+    def record_sentiment(
+        self, sentiment: str, script: str | None = None, business_type: str | None = None, at: float | None = None
+    ) -> None:
+        """Count a sentiment reading (one of SENTIMENTS) at `at` (default now)."""
+        column = _COLUMN.get(sentiment)
+        if column is None or column < len(DISPOSITIONS):
+            logger.warning(f"Not counting unknown sentiment: {sentiment}")
+            return
+        self._record(column, script, business_type, at)
+
+    def rollups(self) -> list[Rollup]:
+        """The counts not flushed yet."""
+        return [Rollup(*key, counts=list(counts)) for key, counts in self._rows.items()]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # -------------------------------------------------------------------------
+    # Flushing
+    # -------------------------------------------------------------------------
+
+    def _flush_if_due(self) -> None:
+        if self._clock() - self._last_flush < self.flush_interval:
+            return
+        if self._flushing is not None and not self._flushing.done():
+            return
+        try:
+            self._flushing = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            pass  # no event loop: the next flush() call sends these
+
+    def payload(self, rows: dict[tuple[str, int, str, str], list[int]]) -> dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "columns": list(COLUMNS),
+            "rows": [[*key, *counts] for key, counts in rows.items()],
+        }
+
+    async def flush(self) -> int:
+        """Post the counts since the last flush; returns how many rows were sent."""
+        self._last_flush = self._clock()
+        rows, self._rows = self._rows, {}
+        if not rows:
+            return 0
+        if not self.flushing:
+            self.dropped_rows += len(rows)
+            return 0
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        try:
+            async with httpx.AsyncClient(transport=self.transport, headers=headers, timeout=10.0) as client:
+                response = await client.post(f"{self.base_url}/api/admin/analytics/funnel", json=self.payload(rows))
+            response.raise_for_status()
+        except Exception as e:
+            # Put the counts back (events recorded meanwhile add to them) for the next flush
+            for key, counts in rows.items():
+                row = self._rows.setdefault(key, [0] * len(COLUMNS))
+                for i, count in enumerate(counts):
+                    row[i] += count
+            self.failed_flushes += 1
+            logger.warning(f"Funnel flush of {len(rows)} rows failed, keeping them: {e}")
+            self._trim()
+            return 0
+        self.flushes += 1
+        self.flushed_rows += len(rows)
+        return len(rows)
+
+    def _trim(self) -> None:
+        """Drop the oldest windows' rows past `max_pending_rows`, so a backend that keeps failing can't grow them."""
+        excess = len(self._rows) - self.max_pending_rows
+        if excess <= 0:
+            return
+        for key in sorted(self._rows, key=lambda key: key[1])[:excess]:
+            del self._rows[key]
+        self.dropped_rows += excess
+        logger.warning(f"Funnel rows past {self.max_pending_rows}: dropped the oldest {excess}")
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "events": self.events,
+            "pending_rows": len(self._rows),
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "dropped_rows": self.dropped_rows,
+        }
+
+
+funnel = FunnelAggregator()
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+class FunnelClient:
+    """
+    `/api/admin/analytics/funnel` reader: the precomputed rollups dashboards use.
+
+    Args:
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+    """
+
+    def __init__(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+        api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(transport=transport, headers=headers, timeout=30.0)
+
+    async def read(
+        self,
+        window: str = "day",
+        since: str | None = None,
+        until: str | None = None,
+        script: str | None = None,
+        business_type: str | None = None,
+    ) -> list[Rollup]:
+        """Rollups of one window size starting in [since, until), oldest first."""
+        filters = {"window": window, "since": since, "until": until, "script": script, "businessType": business_type}
+        response = await self._client.get(
+            f"{self.base_url}/api/admin/analytics/funnel",
+            params={key: value for key, value in filters.items() if value},
+        )
+        response.raise_for_status()
+        return [Rollup.from_dict(data) for data in response.json().get("data", [])]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import timedelta
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Print conversion funnel rollups")
+    parser.add_argument("--window", choices=list(WINDOWS), default="day")
+    parser.add_argument("--days", type=float, default=7.0, help="how far back")
+    parser.add_argument("--by", choices=["script", "business_type"], default="script")
+    parser.add_argument("--script")
+    parser.add_argument("--business-type")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        client = FunnelClient()
+        since = _iso((datetime.now(timezone.utc) - timedelta(days=args.days)).timestamp())
+        try:
+            rollups = await client.read(args.window, since, script=args.script, business_type=args.business_type)
+        finally:
+            await client.aclose()
+        print(f"{args.by:<24} {'dialed':>7} {'reached':>8} {'qualified':>10} {'demo':>6} {'proposal':>9} {'sentiment':>10}")
+        for key, rollup in sorted(combine(rollups, by=args.by).items()):
+            funnel, conversion = rollup.funnel, rollup.conversion
+            mean = rollup.mean_sentiment
+            print(
+                f"{key:<24} {funnel['dialed']:>7} {conversion['reached']:>8.1%} {conversion['qualified']:>10.1%} "
+                f"{conversion['demo']:>6.1%} {conversion['proposal']:>9.1%} {mean if mean is not None else '-':>10}"
+            )
+
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+"""
+Daily Event Insurance - Cache Invalidation
+Webhook listener that drops cached leads, scripts and partners when they change.
+
+The shared cache (shared_cache.py) is refreshed on a timer, so an edit in
+the dashboard could be served stale to calls for up to a refresh interval.
+This listener runs in the worker's main process next to the cache owner and
+accepts change events pushed by the dashboard:
+
+    POST /cache/invalidate
+    x-dei-signature: t=<unix seconds>,v1=<hex HMAC-SHA256 of "<t>.<body>">
+
+    {"entity": "lead", "id": "lead_123", "action": "updated"}
+
+The body is one event or a JSON array of them. Each event invalidates
+exactly the affected entry, in place, so job processes miss on their next
+lookup and read the record from the API. The writer remembers the
+invalidation, so a refresh that was already fetching when the change
+happened doesn't put the stale record back. With pushes in place the
+timed refresh only has to pick up new records, and its interval can be long.
+The listener is opt-in (`CACHE_INVALIDATION=1`) until the dashboard sends events.
+
+Signatures use the dashboard's webhook scheme (lib/api-client/webhooks.ts)
+with `CACHE_WEBHOOK_SECRET`. Without a secret the listener only binds to
+loopback, for a local stand-in.
+
+    listener = InvalidationListener(owner.writer)
+    listener.start()
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Literal
+
+import msgspec
+
+from shared_cache import SharedCacheWriter
+
+logger = logging.getLogger("cache-invalidation")
+
+PATH = "/cache/invalidate"
+SIGNATURE_HEADER = "x-dei-signature"
+# Maximum age of a signed event, as in the dashboard's webhook verification
+TOLERANCE_SECONDS = 300
+# Largest request body accepted
+MAX_BODY_BYTES = 1 << 20
+
+_LOOPBACK = ("127.0.0.1", "::1", "localhost")
+
+
+class ChangeEvent(msgspec.Struct):
+    """A dashboard change to one record."""
+    entity: Literal["lead", "script", "partner"]
+    id: str
+    action: str = "updated"
+
+
+_events = msgspec.json.Decoder(ChangeEvent | list[ChangeEvent])
+
+
+# =============================================================================
+# SIGNATURES
+# =============================================================================
+
+def sign(body: bytes, secret: str, timestamp: int | None = None) -> str:
+    """The signature header value for `body`."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify(body: bytes, header: str | None, secret: str, tolerance: int = TOLERANCE_SECONDS) -> bool:
+    """True if `header` is a current signature of `body` under `secret`."""
+    parts = dict(part.split("=", 1) for part in (header or "").split(",") if "=" in part)
+    try:
+        timestamp = int(parts["t"])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = sign(body, secret, timestamp).partition(",v1=")[2]
+    return hmac.compare_digest(expected, parts.get("v1", ""))
+
+
+# =============================================================================
+# LISTENER
+# =============================================================================
+
+class InvalidationListener:
+    """
+    HTTP endpoint for change events, invalidating entries of a
+    `SharedCacheWriter` from a background thread.
+
+    Args:
+        writer: The worker's cache writer (`SharedCacheOwner.writer`)
+        host: Bind address (default $CACHE_INVALIDATION_HOST, else 0.0.0.0
+            with a secret and 127.0.0.1 without)
+        port: Bind port (default $CACHE_INVALIDATION_PORT, else 8089; 0 picks a free one)
+        secret: Signing secret (default $CACHE_WEBHOOK_SECRET)
+
+    Raises:
+        ValueError: No secret while binding to a non-loopback address
+    """
+
+    def __init__(self, writer: SharedCacheWriter, host: str | None = None, port: int | None = None,
+                 secret: str | None = None):
+        self.writer = writer
+        self.secret = secret if secret is not None else os.getenv("CACHE_WEBHOOK_SECRET", "")
+        self.host = host or os.getenv("CACHE_INVALIDATION_HOST") or ("0.0.0.0" if self.secret else "127.0.0.1")
+        self.port = port if port is not None else int(os.getenv("CACHE_INVALIDATION_PORT", "8089"))
+        if not self.secret and self.host not in _LOOPBACK:
+            raise ValueError("CACHE_WEBHOOK_SECRET is required to listen beyond loopback")
+        self.events = 0
+        self.invalidated = 0
+        self.rejected = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"http://{host}:{port}{PATH}"
+
+    def handle(self, events: list[ChangeEvent]) -> int:
+        """Invalidate the entries `events` name; returns how many readers could see."""
+        invalidated = 0
+        for event in events:
+            if self.writer.invalidate(event.entity, event.id):
+                invalidated += 1
+            logger.debug(f"Invalidated {event.entity} {event.id} ({event.action})")
+        self.events += len(events)
+        self.invalidated += invalidated
+        return invalidated
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cache-invalidation", daemon=True)
+        self._thread.start()
+        logger.info(f"Cache invalidation listener at {self.url}")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def metrics(self) -> dict[str, int]:
+        return {"events": self.events, "invalidated": self.invalidated, "rejected": self.rejected}
+
+
+def _handler(listener: InvalidationListener) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path != PATH:
+                self._reply(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self._reply(413, {"error": "body too large"})
+                return
+            body = self.rfile.read(length)
+            if listener.secret and not verify(body, self.headers.get(SIGNATURE_HEADER), listener.secret):
+                listener.rejected += 1
+                self._reply(401, {"error": "invalid signature"})
+                return
+            try:
+                decoded = _events.decode(body)
+            except msgspec.DecodeError as e:
+                listener.rejected += 1
+                self._reply(400, {"error": str(e)})
+                return
+            events = decoded if isinstance(decoded, list) else [decoded]
+            self._reply(200, {"received": len(events), "invalidated": listener.handle(events)})
+
+        def _reply(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(format % args)
+
+    return Handler
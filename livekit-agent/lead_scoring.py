@@ -0,0 +1,268 @@
+"""
+Daily Event Insurance - Lead Scoring
+Ranks leads for the next dialing window with vectorized NumPy scoring.
+
+Lead attributes are loaded once into column arrays (`LeadArrays`):
+categorical fields become small integer codes and numeric fields float
+arrays. A score is then a handful of table lookups and multiply-adds over
+the whole segment, and the top k come from `np.argpartition` instead of a
+full sort.
+
+The priority is a weighted sum (see `ScoringWeights`) of:
+
+- interest level (cold/warm/hot) and the 0-100 interest score
+- expected monthly commission from `estimatedParticipants` (daily, so
+  converted to monthly first) at the partner commission tiers
+  (commission.py), log-scaled
+- business type and lead source
+- recency of the lead's last activity (exponential decay)
+- status (new leads first; dnc, converted and lost leads are never ranked)
+
+Leads whose local time at the start of the dialing window falls outside
+calling hours are left out.
+
+    ranked = rank_leads(await load_segment(status="new"), limit=500)
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+from commission import monthly_commission as expected_commission
+from commission import monthly_from_daily
+
+logger = logging.getLogger("lead-scoring")
+
+EXCLUDED_STATUSES = ("dnc", "converted", "lost")
+
+
+# =============================================================================
+# WEIGHTS
+# =============================================================================
+
+
+@dataclass
+class ScoringWeights:
+    """
+    Priority weights. Category tables map a value to a 0-1 factor (unknown
+    values get `default_factor`); each term is multiplied by its weight.
+    """
+
+    interest: float = 3.0
+    interest_score: float = 2.0
+    commission: float = 3.0
+    business_type: float = 1.0
+    source: float = 1.0
+    recency: float = 1.5
+    status: float = 1.0
+
+    interest_levels: dict[str, float] = field(default_factory=lambda: {"cold": 0.1, "warm": 0.6, "hot": 1.0})
+    business_types: dict[str, float] = field(default_factory=lambda: {
+        "climbing": 1.0, "adventure": 0.9, "gym": 0.8, "rental": 0.7,
+    })
+    sources: dict[str, float] = field(default_factory=lambda: {
+        "partner_referral": 1.0, "website_quote": 0.9, "ad_campaign": 0.5, "cold_list": 0.2,
+    })
+    statuses: dict[str, float] = field(default_factory=lambda: {
+        "new": 1.0, "contacted": 0.6, "qualified": 0.9, "demo_scheduled": 0.3, "proposal_sent": 0.5,
+    })
+    default_factor: float = 0.3
+
+    # Commission at which the (log-scaled) commission term reaches 1.0
+    commission_reference: float = 100_000.0
+    recency_half_life_days: float = 14.0
+
+    # Local calling hours, [start, end)
+    calling_hours: tuple[int, int] = (9, 20)
+
+
+# =============================================================================
+# COLUMN ARRAYS
+# =============================================================================
+
+
+class _Codes:
+    """Stable value -> small integer code mapping for one categorical column."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def code(self, value: Any) -> int:
+        key = str(value) if value is not None else ""
+        code = self._index.get(key)
+        if code is None:
+            code = self._index[key] = len(self.values)
+            self.values.append(key)
+        return code
+
+    def table(self, factors: dict[str, float], default: float) -> np.ndarray:
+        return np.array([factors.get(value, default) for value in self.values], dtype=np.float64)
+
+
+def _epoch(value: Any) -> float:
+    """Epoch seconds of an ISO timestamp (naive means UTC); NaN when missing or unparseable."""
+    if not value:
+        return math.nan
+    try:
+        when = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return math.nan
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class LeadArrays:
+    """Lead attributes as NumPy columns, ready for batch scoring."""
+
+    CATEGORICAL = ("interestLevel", "businessType", "source", "status", "timezone")
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.codes = {name: _Codes() for name in self.CATEGORICAL}
+        self.columns: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_leads(cls, leads: list[dict]) -> "LeadArrays":
+        """Columns from API lead records (GET /api/admin/leads)."""
+        arrays = cls()
+        arrays.ids = [lead["id"] for lead in leads]
+        for name in cls.CATEGORICAL:
+            codes = arrays.codes[name]
+            arrays.columns[name] = np.fromiter(
+                (codes.code(lead.get(name)) for lead in leads), dtype=np.intp, count=len(leads)
+            )
+        arrays.columns["estimatedParticipants"] = np.fromiter(
+            (lead.get("estimatedParticipants") or 0 for lead in leads), dtype=np.float64, count=len(leads)
+        )
+        arrays.columns["interestScore"] = np.fromiter(
+            (lead.get("interestScore") or 0 for lead in leads), dtype=np.float64, count=len(leads)
+        )
+        arrays.columns["lastActivityAt"] = np.fromiter(
+            (_epoch(lead.get("lastActivityAt") or lead.get("createdAt")) for lead in leads),
+            dtype=np.float64, count=len(leads),
+        )
+        return arrays
+
+    @classmethod
+    def from_columns(cls, ids: list[str], columns: dict[str, Any]) -> "LeadArrays":
+        """
+        Columns built directly, e.g. from a database export. Categorical
+        columns are given as (values, codes) pairs; numeric ones as arrays.
+        """
+        arrays = cls()
+        arrays.ids = list(ids)
+        for name in cls.CATEGORICAL:
+            values, codes = columns[name]
+            for value in values:
+                arrays.codes[name].code(value)
+            arrays.columns[name] = np.asarray(codes, dtype=np.intp)
+        for name in ("estimatedParticipants", "interestScore", "lastActivityAt"):
+            arrays.columns[name] = np.asarray(columns[name], dtype=np.float64)
+        return arrays
+
+
+# =============================================================================
+# SCORING
+# =============================================================================
+
+
+def _utc_offsets(zones: list[str], at: float) -> np.ndarray:
+    """UTC offset in hours of each timezone name at epoch `at` (unknown zones: Pacific)."""
+    offsets = []
+    for name in zones:
+        try:
+            zone = ZoneInfo(name or "America/Los_Angeles")
+        except (ZoneInfoNotFoundError, ValueError):
+            zone = ZoneInfo("America/Los_Angeles")
+        offset = datetime.fromtimestamp(at, zone).utcoffset()
+        offsets.append(offset.total_seconds() / 3600 if offset else 0.0)
+    return np.array(offsets, dtype=np.float64)
+
+
+class LeadScorer:
+    """
+    Vectorized priority scoring.
+
+    Args:
+        weights: Term weights and category factors
+    """
+
+    def __init__(self, weights: ScoringWeights | None = None):
+        self.weights = weights or ScoringWeights()
+
+    def score(self, arrays: LeadArrays, window_start: float | None = None) -> np.ndarray:
+        """
+        Priority per lead; -inf for leads that must not be dialed in this window.
+
+        Args:
+            arrays: Lead columns
+            window_start: Epoch seconds the dialing window opens (default now)
+        """
+        w = self.weights
+        now = time.time() if window_start is None else window_start
+        cols, codes = arrays.columns, arrays.codes
+
+        # Per-category tables with the weight folded in; excluded statuses and
+        # timezones outside calling hours map to -inf, so every term is one
+        # take-and-add over the column.
+        def term(name: str, factors: dict[str, float], weight: float) -> np.ndarray:
+            return np.take(weight * codes[name].table(factors, w.default_factor), cols[name])
+
+        statuses = w.status * codes["status"].table(w.statuses, w.default_factor)
+        statuses[[value in EXCLUDED_STATUSES for value in codes["status"].values]] = -np.inf
+        local_hour = (now / 3600.0 + _utc_offsets(codes["timezone"].values, now)) % 24
+        start, end = w.calling_hours
+        zones = np.where((local_hour >= start) & (local_hour < end), 0.0, -np.inf)
+
+        score = term("interestLevel", w.interest_levels, w.interest)
+        score += np.take(statuses, cols["status"])
+        score += np.take(zones, cols["timezone"])
+        score += term("businessType", w.business_types, w.business_type)
+        score += term("source", w.sources, w.source)
+        score += (w.interest_score / 100.0) * cols["interestScore"]
+        score += (w.commission / math.log1p(w.commission_reference)) * np.log1p(
+            expected_commission(monthly_from_daily(cols["estimatedParticipants"]))
+        )
+        # Never-active leads count as a year old
+        age_days = (now - cols["lastActivityAt"]) / 86400.0
+        np.nan_to_num(age_days, copy=False, nan=365.0)
+        np.maximum(age_days, 0.0, out=age_days)
+        score += w.recency * np.exp2(age_days / -w.recency_half_life_days)
+        return score
+
+    def top_k(self, arrays: LeadArrays, k: int, window_start: float | None = None) -> list[tuple[str, float]]:
+        """The k highest-priority dialable leads as (lead id, score), best first."""
+        scores = self.score(arrays, window_start)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(arrays.ids[i], float(scores[i])) for i in top if scores[i] != -np.inf]
+
+
+def rank_leads(
+    leads: list[dict],
+    limit: int | None = None,
+    weights: ScoringWeights | None = None,
+    window_start: float | None = None,
+) -> list[dict]:
+    """Leads in priority order (dialable in the window only), at most `limit`."""
+    if not leads:
+        return []
+    arrays = LeadArrays.from_leads(leads)
+    ranked = LeadScorer(weights).top_k(arrays, limit or len(leads), window_start)
+    by_id = {lead["id"]: lead for lead in leads}
+    logger.info(f"Ranked {len(ranked)} of {len(leads)} leads for dialing")
+    return [by_id[lead_id] for lead_id, _ in ranked]
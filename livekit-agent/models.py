@@ -0,0 +1,256 @@
+"""
+Daily Event Insurance - API Models
+Typed lead, script and partner records decoded straight from API responses.
+
+Tools used to `response.json()` the whole body (a lead comes back with its
+full communication history) and then format it with a run of `.get()`
+lookups. These models are msgspec Structs: the decoder validates and
+converts the fields a tool needs in one pass over the bytes, skips
+everything else without building Python objects for it, and the summary
+text the model sees is formatted once per record and cached on it.
+
+Decoding is lenient where the API is loose: unknown fields are ignored,
+missing ones fall back to defaults, and numeric strings are accepted for
+numbers. A body that does not fit (e.g. a lead without an id) raises
+`msgspec.ValidationError`, a ValueError, at the boundary.
+
+    lead = decode_response(response.content, Lead)
+    return lead.summary
+"""
+
+import json
+import logging
+from functools import cached_property, lru_cache
+from typing import Any, Generic, TypeVar
+
+import msgspec
+
+logger = logging.getLogger("api-models")
+
+T = TypeVar("T")
+
+
+# Fields are plain slots; `dict=True` only adds the instance dict the cached
+# summaries live in, created the first time one is read.
+class _Model(msgspec.Struct, kw_only=True, rename="camel", dict=True):
+    pass
+
+
+# =============================================================================
+# LEADS
+# =============================================================================
+
+
+class Lead(_Model):
+    """A lead record (GET /api/admin/leads/{id})."""
+
+    id: str
+    source: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    email: str | None = None
+    phone: str | None = None
+    business_type: str | None = None
+    business_name: str | None = None
+    estimated_participants: int | None = None
+    interest_level: str | None = None
+    interest_score: int | None = None
+    last_activity_at: str | None = None
+    city: str | None = None
+    state: str | None = None
+    timezone: str | None = None
+    status: str | None = None
+    status_reason: str | None = None
+    created_at: str | None = None
+
+    @cached_property
+    def summary(self) -> str:
+        """The lead as `load_lead_context` presents it to the model."""
+        participants = self.estimated_participants
+        return f"""Lead Information:
+- Name: {self.first_name or ''} {self.last_name or ''}
+- Business: {self.business_name or 'Unknown'} ({self.business_type or 'Unknown type'})
+- Email: {self.email or ''}
+- Phone: {self.phone or ''}
+- Location: {self.city or ''}, {self.state or ''}
+- Interest Level: {self.interest_level or 'cold'}
+- Status: {self.status or 'new'}
+- Source: {self.source or 'Unknown'}
+- Estimated Daily Visitors: {participants if participants is not None else 'Unknown'}"""
+
+
+# =============================================================================
+# SCRIPTS
+# =============================================================================
+
+
+class Script(_Model):
+    """An agent script (GET /api/admin/scripts, agent_scripts table)."""
+
+    id: str
+    name: str | None = None
+    description: str | None = None
+    business_type: str | None = None
+    interest_level: str | None = None
+    geographic_region: str | None = None
+    system_prompt: str | None = None
+    opening_script: str | None = None
+    # JSON text in the database
+    key_points: str | None = None
+    objection_handlers: str | None = None
+    closing_script: str | None = None
+    max_call_duration: int | None = None
+    voice_id: str | None = None
+    is_active: bool = True
+    priority: int = 0
+
+    @cached_property
+    def key_point_list(self) -> list[str]:
+        return _json_field(self.key_points, list)
+
+    @cached_property
+    def objection_map(self) -> dict[str, str]:
+        return _json_field(self.objection_handlers, dict)
+
+    def closing_for(self, lead: Lead, locations: int = 1) -> str | None:
+        """
+        `closing_script` for `lead`: its name, business and email filled in,
+        and `{estimated_participants}` / `{projected_revenue}` computed from
+        its daily participants (see commission.py). Placeholders without a
+        value are left as they are.
+        """
+        from commission import script_values
+
+        if self.closing_script is None:
+            return None
+        values = {
+            "first_name": lead.first_name,
+            "last_name": lead.last_name,
+            "business_name": lead.business_name,
+            "email": lead.email,
+            **script_values(lead.estimated_participants, locations),
+        }
+        return self.closing_script.format_map(_Placeholders((k, v) for k, v in values.items() if v))
+
+
+class _Placeholders(dict):
+    """Leaves `{name}` in place for a placeholder without a value."""
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+def _json_field(text: str | None, kind: type) -> Any:
+    """A JSON-text column parsed, or an empty `kind` if it is missing or malformed."""
+    if not text:
+        return kind()
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning("Ignoring malformed JSON script field")
+        return kind()
+    return value if isinstance(value, kind) else kind()
+
+
+# =============================================================================
+# PARTNERS
+# =============================================================================
+
+
+class Partner(_Model):
+    """A partner account (GET /api/partners/{id})."""
+
+    id: str
+    business_name: str | None = None
+    business_type: str | None = None
+    plan: str | None = None
+    status: str | None = None
+    integration_status: str | None = None
+    commission_rate: float | None = None
+    total_policies: int | None = None
+    phone: str | None = None
+
+    @cached_property
+    def summary(self) -> str:
+        """The account as `get_partner_account` presents it to the model."""
+        rate = self.commission_rate if self.commission_rate is not None else 15
+        return f"""
+Partner Account Details:
+- Business: {self.business_name or 'Unknown'}
+- Plan: {self.plan or 'Standard'}
+- Status: {self.status or 'Active'}
+- Integration: {self.integration_status or 'Pending'}
+- Commission Rate: {rate:g}%
+- Total Policies Sold: {self.total_policies or 0}
+"""
+
+
+class PartnerIntegration(_Model):
+    """A partner's integration checklist (GET /api/partners/{id}/integration)."""
+
+    widget_installed: bool = False
+    api_key_generated: bool = False
+    webhooks_configured: bool = False
+    domain_whitelisted: bool = False
+    test_completed: bool = False
+    live_enabled: bool = False
+    last_activity: str | None = None
+
+    @cached_property
+    def summary(self) -> str:
+        """The checklist as `check_integration_status` presents it to the model."""
+
+        def done(flag: bool) -> str:
+            return "Yes" if flag else "No"
+
+        return f"""
+Integration Status:
+- Widget Installed: {done(self.widget_installed)}
+- API Key Generated: {done(self.api_key_generated)}
+- Webhooks Configured: {done(self.webhooks_configured)}
+- Domain Whitelisted: {done(self.domain_whitelisted)}
+- Test Mode Completed: {done(self.test_completed)}
+- Live Mode Enabled: {done(self.live_enabled)}
+
+Last Activity: {self.last_activity or 'Unknown'}
+"""
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+
+class _Envelope(msgspec.Struct, Generic[T]):
+    """The API's `{"success": ..., "data": ...}` wrapper; other fields are skipped."""
+
+    data: T | None = None
+
+
+@lru_cache(maxsize=None)
+def _decoders(model: Any) -> tuple[msgspec.json.Decoder, msgspec.json.Decoder]:
+    return (
+        msgspec.json.Decoder(_Envelope[model], strict=False),
+        msgspec.json.Decoder(model, strict=False),
+    )
+
+
+def decode_response(content: bytes | str, model: Any) -> Any:
+    """
+    Decode an API response body into `model` (a model class, or e.g.
+    `list[Script]`), unwrapping the `data` envelope when there is one.
+
+    Raises:
+        msgspec.ValidationError: The payload doesn't fit the model
+        msgspec.DecodeError: The body isn't JSON
+    """
+    enveloped, bare = _decoders(model)
+    if content[:1] in (b"[", "["):
+        return bare.decode(content)
+    data = enveloped.decode(content).data
+    return data if data is not None else bare.decode(content)
+
+
+def decode_record(content: bytes | memoryview, model: Any) -> Any:
+    """Decode a bare record (no envelope), e.g. one held in `shared_cache`."""
+    return _decoders(model)[1].decode(content)
@@ -0,0 +1,47 @@
+"""
+Daily Event Insurance - Phone Numbers
+E.164 normalization shared by the dialer, the caller ID index and the DNC index.
+
+`format_phone` follows the same rules as lib/livekit.ts; `number_key` turns
+a number into the int64 key the caller ID and DNC indexes store.
+"""
+
+
+def format_phone(phone: str) -> str | None:
+    """E.164 for a US number, or None if it cannot be dialed (same rules as lib/livekit.ts)."""
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    if len(digits) == 10:
+        return f"+1{digits}"
+    if len(digits) == 11 and digits.startswith("1"):
+        return f"+{digits}"
+    if phone.strip().startswith("+") and len(digits) > 7:
+        return f"+{digits}"
+    return None
+
+
+def normalize_e164(raw: str | None) -> str | None:
+    """
+    E.164 for a phone field or a SIP caller ID. SIP and tel URIs
+    ("sip:+15551234567@trunk", "tel:+1-555-123-4567;ext=2") are reduced to
+    their number first; the rest follows `format_phone`.
+    """
+    if not raw:
+        return None
+    number = str(raw).strip()
+    scheme, separator, rest = number.partition(":")
+    if separator and scheme.lower() in ("sip", "sips", "tel"):
+        number = rest
+    return format_phone(number.split("@", 1)[0].split(";", 1)[0])
+
+
+def number_key(number: str | int | None) -> int:
+    """The index key of a number (its E.164 digits), 0 if it is not a phone number."""
+    if isinstance(number, int):
+        return number if 0 < number < 10**15 else 0
+    # Fast path for numbers already in E.164, as SIP trunks send them (ten
+    # digits after the "+" still read as a US number, as in `format_phone`)
+    if number and number[0] == "+" and 9 <= len(number) <= 16 and len(number) != 11 and number[1:].isdigit():
+        return int(number[1:])
+    e164 = normalize_e164(number)
+    # E.164 allows at most 15 digits, which keeps every key within an int64
+    return int(e164[1:]) if e164 and len(e164) <= 16 else 0
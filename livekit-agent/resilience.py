@@ -0,0 +1,350 @@
+"""
+Daily Event Insurance - Backend Call Resilience
+Per-endpoint circuit breakers and hedged requests for the agent's API calls.
+
+When the Next.js API degrades, a tool should not wait out its full timeout
+call after call. Each endpoint gets a circuit breaker that opens after
+repeated failures, rejects calls immediately while open, and lets a single
+probe through once the recovery timeout has elapsed (half-open). Idempotent
+reads can additionally be hedged: if the first attempt has not answered
+within the endpoint's recent p95 latency, a second identical request is sent
+and whichever finishes first wins.
+
+The module is transport-agnostic - calls are passed in as coroutine
+factories - so it is shared by workflow.py and support_agent.py.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+logger = logging.getLogger("agent-resilience")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its endpoint's breaker is open."""
+
+    def __init__(self, endpoint: str):
+        super().__init__(f"Circuit open for {endpoint}")
+        self.endpoint = endpoint
+
+
+# =============================================================================
+# CIRCUIT BREAKER
+# =============================================================================
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Args:
+        name: Endpoint name used in logs and metrics
+        failure_threshold: Consecutive failures that open the breaker
+        recovery_timeout: Seconds to stay open before allowing a probe
+        half_open_max_calls: Concurrent probes allowed while half-open
+        clock: Monotonic clock (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 15.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        """Reserve a slot for a call, or return False if it must be rejected."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+            self._half_open_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self._state == HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            self._open()
+        elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a half-open slot for a call that was cancelled."""
+        if self._state == HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit {self.name}: {self._state} -> {state}")
+        self._state = state
+        if state != HALF_OPEN:
+            self._half_open_in_flight = 0
+        if state == CLOSED:
+            self._consecutive_failures = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+# =============================================================================
+# HEDGED REQUESTS
+# =============================================================================
+
+
+@dataclass
+class HedgeStats:
+    """Counters for hedged calls on one endpoint."""
+
+    calls: int = 0
+    hedges_sent: int = 0
+    hedge_wins: int = 0
+
+    @property
+    def hedge_win_rate(self) -> float:
+        return self.hedge_wins / self.hedges_sent if self.hedges_sent else 0.0
+
+
+class LatencyWindow:
+    """Sliding window of recent successful latencies."""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))
+        return ordered[index]
+
+
+async def hedged(
+    factory: Callable[[], Awaitable[T]],
+    delay: float,
+    stats: HedgeStats | None = None,
+    is_failure: Callable[[T], bool] | None = None,
+) -> T:
+    """
+    Run `factory()`, and start a second attempt if the first has not
+    finished after `delay` seconds. Returns the first successful result and
+    cancels the loser. Exceptions and results matching `is_failure` (a fast
+    5xx) don't win while the other attempt is still running; when every
+    attempt fails, the last failed result is returned, or the last
+    exception raised.
+    """
+    if stats is None:
+        stats = HedgeStats()
+    stats.calls += 1
+
+    primary = asyncio.ensure_future(factory())
+    pending = {primary}
+    error: BaseException | None = None
+    failed: list[T] = []
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return primary.result()
+
+        backup = asyncio.ensure_future(factory())
+        stats.hedges_sent += 1
+        pending.add(backup)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif is_failure is not None and is_failure(task.result()):
+                    failed.append(task.result())
+                else:
+                    if task is backup:
+                        stats.hedge_wins += 1
+                    return task.result()
+        if failed:
+            return failed[-1]
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# =============================================================================
+# PER-ENDPOINT GUARD
+# =============================================================================
+
+
+class EndpointGuard:
+    """Circuit breaker, latency window and hedge counters for one endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 15.0,
+        hedge_min_delay: float = 0.05,
+        hedge_default_delay: float = 0.5,
+        hedge_min_samples: int = 20,
+        hedging: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.breaker = CircuitBreaker(name, failure_threshold, recovery_timeout, clock=clock)
+        self.latency = LatencyWindow()
+        self.hedge_stats = HedgeStats()
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.hedging = hedging
+
+    @property
+    def hedge_delay(self) -> float:
+        """Recent p95 latency, or the default until enough samples exist."""
+        if len(self.latency) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, self.latency.percentile(95))
+
+    async def call(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        hedge: bool = False,
+        is_failure: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Run a call through the breaker, optionally hedged.
+
+        Raises CircuitOpenError without calling `factory` if the breaker is
+        open. Exceptions and results matching `is_failure` count as failures.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name)
+
+        # A half-open probe should be a single request, not a hedged pair.
+        use_hedge = hedge and self.hedging and self.breaker.state == CLOSED
+        start = time.perf_counter()
+        try:
+            if use_hedge:
+                result = await hedged(factory, self.hedge_delay, self.hedge_stats, is_failure)
+            else:
+                result = await factory()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        if is_failure is not None and is_failure(result):
+            self.breaker.record_failure()
+        else:
+            self.latency.record(time.perf_counter() - start)
+            self.breaker.record_success()
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.breaker.snapshot(),
+            "hedge_calls": self.hedge_stats.calls,
+            "hedges_sent": self.hedge_stats.hedges_sent,
+            "hedge_wins": self.hedge_stats.hedge_wins,
+            "hedge_win_rate": round(self.hedge_stats.hedge_win_rate, 3),
+            "hedge_delay": round(self.hedge_delay, 4),
+            "p95_latency": round(self.latency.percentile(95), 4),
+        }
+
+
+class GuardRegistry:
+    """Lazily creates one EndpointGuard per endpoint name."""
+
+    def __init__(self, **guard_options):
+        self._options = guard_options
+        self._guards: dict[str, EndpointGuard] = {}
+
+    def get(self, name: str) -> EndpointGuard:
+        guard = self._guards.get(name)
+        if guard is None:
+            guard = self._guards[name] = EndpointGuard(name, **self._options)
+        return guard
+
+    def configure(self, **guard_options) -> None:
+        """Replace the guard options and drop all existing guards."""
+        self._options = guard_options
+        self._guards.clear()
+
+    def reset(self) -> None:
+        self._guards.clear()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Breaker state and hedge counters for every endpoint seen so far."""
+        return {name: guard.snapshot() for name, guard in self._guards.items()}
+
+
+def is_server_error(response: Any) -> bool:
+    """Treat 5xx and 429 responses as endpoint failures (4xx are caller errors)."""
+    status = getattr(response, "status_code", 0)
+    return status >= 500 or status == 429
+
+
+# Shared by every tool module in the job process so an endpoint's breaker
+# state is the same whichever tool calls it.
+backend_guards = GuardRegistry()
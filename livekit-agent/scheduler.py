@@ -0,0 +1,671 @@
+"""
+Daily Event Insurance - Scheduled Actions Executor
+Fires scheduled calls, SMS and emails when they are due.
+
+The agents create actions through `/api/admin/scheduled-actions` and
+`/api/admin/leads/{id}/schedule`; the Next.js cron
+(`/api/cron/process-actions`) only looks at them every 5 minutes. This is a
+long-running executor instead:
+
+- `ActionStore` keeps every pending action in a local SQLite file indexed by
+  due time, plus the sync cursor
+- `TimerWheel` holds only the actions due within `horizon` seconds, bucketed
+  by `tick`, so adding and cancelling are O(1) however many actions exist
+- `ActionExecutor` pulls changes incrementally (`updatedSince` the last
+  cursor), so a cancel or reschedule reaches the wheel within one sync, and
+  runs due actions on a bounded pool of workers with the cron's retry
+  backoff
+
+An action is claimed before it runs with a conditional update (pending ->
+processing, `expectedStatus`) that fails with 409 when another executor or
+the Next.js cron got there first; the cron leaves the types this executor
+handles to it (SCHEDULED_ACTIONS_EXECUTOR_TYPES, default call and sms).
+
+On restart the store is reopened and only the next horizon is read back
+into the wheel; actions that were running when the process died are run
+again (at-least-once). Nothing is rescanned from the API except changes
+since the saved cursor.
+
+    executor = ActionExecutor(backend_handlers(LiveKitDispatcher()), api=ScheduledActionsAPI())
+    await executor.run()
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import httpx
+
+logger = logging.getLogger("action-executor")
+
+Handler = Callable[[dict], Awaitable[Any]]
+
+# =============================================================================
+# TIMES
+# =============================================================================
+
+
+def due_timestamp(action: dict) -> float:
+    """
+    Epoch seconds of an action's `scheduledFor`.
+
+    Times without an offset are read in the action's `timezone` (as sent by
+    workflow.schedule_callback), else UTC.
+    """
+    when = datetime.fromisoformat(str(action["scheduledFor"]).replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        try:
+            zone = ZoneInfo(action.get("timezone") or "UTC")
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown timezone {action.get('timezone')!r} on action {action.get('id')}, using UTC")
+            zone = timezone.utc
+        when = when.replace(tzinfo=zone)
+    return when.timestamp()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def backoff_delay(attempts: int, base: float = 300.0, cap: float = 7200.0, rng: random.Random | None = None) -> float:
+    """Retry delay after `attempts` failures: base * 2^(attempts-1) plus 10% jitter, capped (as the cron does)."""
+    delay = base * 2 ** (attempts - 1)
+    return min(delay + (rng or random).random() * 0.1 * delay, cap)
+
+
+# =============================================================================
+# TIMER WHEEL
+# =============================================================================
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: actions bucketed into `tick`-second slots.
+
+    Add and cancel are dict operations. Occupied slot numbers are kept in a
+    heap, so idle ticks cost nothing and the next due time is known without
+    scanning. Actions fire at most one tick late, never early.
+    """
+
+    def __init__(self, tick: float = 1.0):
+        self.tick = tick
+        self._slots: dict[int, dict[str, Any]] = {}
+        self._occupied: list[int] = []
+        self._slot_of: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, action_id: str) -> bool:
+        return action_id in self._slot_of
+
+    def add(self, action_id: str, due: float, item: Any) -> None:
+        """Schedule `item` at `due`, replacing any earlier entry for `action_id`."""
+        if action_id in self._slot_of:
+            self.cancel(action_id)
+        slot = math.ceil(due / self.tick)
+        bucket = self._slots.get(slot)
+        if bucket is None:
+            bucket = self._slots[slot] = {}
+            heapq.heappush(self._occupied, slot)
+        bucket[action_id] = item
+        self._slot_of[action_id] = slot
+
+    def cancel(self, action_id: str) -> bool:
+        slot = self._slot_of.pop(action_id, None)
+        if slot is None:
+            return False
+        # An emptied bucket stays in the heap and is dropped when reached
+        del self._slots[slot][action_id]
+        return True
+
+    def pop_due(self, now: float) -> list[Any]:
+        """Remove and return everything due at or before `now`, oldest slot first."""
+        due: list[Any] = []
+        current = math.floor(now / self.tick)
+        while self._occupied and self._occupied[0] <= current:
+            slot = heapq.heappop(self._occupied)
+            bucket = self._slots.pop(slot)
+            for action_id, item in bucket.items():
+                del self._slot_of[action_id]
+                due.append(item)
+        return due
+
+    def next_due(self) -> float | None:
+        """Start of the earliest occupied slot, or None if empty."""
+        while self._occupied and not self._slots[self._occupied[0]]:
+            del self._slots[heapq.heappop(self._occupied)]
+        return self._occupied[0] * self.tick if self._occupied else None
+
+
+# =============================================================================
+# LOCAL STORE
+# =============================================================================
+
+
+class ActionStore:
+    """
+    Pending actions in SQLite, indexed by due time.
+
+    `state` is "pending" or "running"; finished and cancelled actions are
+    deleted. The `meta` table holds the sync cursor.
+
+    Args:
+        path: Database file (defaults to $SCHEDULER_DB), or ":memory:"
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        path = path or os.getenv("SCHEDULER_DB") or Path.home() / ".cache" / "daily-event-insurance" / "scheduler.db"
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS actions (
+                id TEXT PRIMARY KEY,
+                due REAL NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                body TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_actions_state_due ON actions (state, due);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM actions").fetchone()[0]
+
+    def upsert(self, rows: Iterable[tuple[str, float, str]]) -> None:
+        """Insert or replace (id, due, body JSON) rows as pending."""
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO actions (id, due, state, body) VALUES (?, ?, 'pending', ?) "
+                "ON CONFLICT (id) DO UPDATE SET due = excluded.due, state = 'pending', body = excluded.body",
+                rows,
+            )
+
+    def delete(self, action_ids: Iterable[str]) -> None:
+        with self._db:
+            self._db.executemany("DELETE FROM actions WHERE id = ?", ((i,) for i in action_ids))
+
+    def mark_running(self, action_ids: Iterable[str]) -> None:
+        with self._db:
+            self._db.executemany("UPDATE actions SET state = 'running' WHERE id = ?", ((i,) for i in action_ids))
+
+    def pending_between(self, start: float, end: float) -> list[tuple[str, float, str]]:
+        """Pending rows with start <= due < end (an index range scan)."""
+        return self._db.execute(
+            "SELECT id, due, body FROM actions WHERE state = 'pending' AND due >= ? AND due < ? ORDER BY due",
+            (start, end),
+        ).fetchall()
+
+    def running(self) -> list[tuple[str, float, str]]:
+        return self._db.execute("SELECT id, due, body FROM actions WHERE state = 'running'").fetchall()
+
+    def get_meta(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# =============================================================================
+# BACKEND
+# =============================================================================
+
+
+class ScheduledActionsAPI:
+    """
+    `/api/admin/scheduled-actions` client: incremental change feed and status updates.
+
+    Args:
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+        page_size: Changes per request
+    """
+
+    def __init__(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        page_size: int = 500,
+    ):
+        self.base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+        api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.page_size = page_size
+        self._client = httpx.AsyncClient(transport=transport, headers=self.headers, timeout=10.0)
+
+    async def changes(self, since: str | None) -> tuple[list[dict], str | None]:
+        """Actions created or updated after `since` (all pending ones if None), and the new cursor."""
+        params: dict[str, Any] = {"pageSize": self.page_size}
+        if since:
+            params["updatedSince"] = since
+        else:
+            params["status"] = "pending"
+        actions: list[dict] = []
+        cursor = since
+        while True:
+            response = await self._client.get(f"{self.base_url}/api/admin/scheduled-actions", params=params)
+            response.raise_for_status()
+            page = response.json().get("data", [])
+            actions.extend(page)
+            for action in page:
+                updated = action.get("updatedAt") or action.get("createdAt")
+                if updated and (cursor is None or updated > cursor):
+                    cursor = updated
+            if len(page) < self.page_size or cursor is None:
+                break
+            params = {"pageSize": self.page_size, "updatedSince": cursor}
+        return actions, cursor
+
+    async def claim(self, action_id: str, attempts: int, expected: str = "pending") -> bool:
+        """
+        Move an action from `expected` to processing; False if its status no
+        longer matches (someone else claimed it).
+        """
+        response = await self._client.patch(
+            f"{self.base_url}/api/admin/scheduled-actions/{action_id}",
+            json={"status": "processing", "attempts": attempts, "expectedStatus": expected},
+        )
+        if response.status_code == 409:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def update(self, action_id: str, fields: dict) -> None:
+        response = await self._client.patch(f"{self.base_url}/api/admin/scheduled-actions/{action_id}", json=fields)
+        if response.status_code != 200:
+            logger.warning(f"Failed to update action {action_id}: {response.status_code}")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def backend_handlers(
+    dispatcher=None,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Handler]:
+    """
+    Handlers for "call" (dials the lead through `dispatcher`, see dialer.py)
+    and "sms" (POST /api/admin/leads/{id}/sms). There is no email provider
+    yet; pass an "email" handler to enable email actions.
+    """
+    from dialer import CallOutcome, call_metadata
+    from dnc import dnc_index
+
+    base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+    api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    def client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=transport, headers=headers, timeout=10.0)
+
+    async def call(action: dict) -> str:
+        if dispatcher is None:
+            raise RuntimeError("No dispatcher configured for call actions")
+        async with client() as c:
+            response = await c.get(f"{base_url}/api/admin/leads/{action['leadId']}")
+        response.raise_for_status()
+        lead = response.json().get("data", {})
+        if lead.get("status") == "dnc" or dnc_index.contains(lead.get("phone")):
+            return "skipped: lead is on the Do Not Call list"
+        metadata = {**call_metadata(lead, "scheduled-action"), "reason": action.get("reason"), "script_id": action.get("scriptId")}
+        result = await dispatcher.place_call(lead, metadata, lambda: None)
+        if result.outcome != CallOutcome.ANSWERED:
+            raise RuntimeError(f"call {result.outcome.value}")
+        return f"call answered ({result.talk_seconds:.0f}s)"
+
+    async def sms(action: dict) -> str:
+        message = action.get("customMessage") or "Hi, this is Sarah from Daily Event Insurance following up as promised."
+        async with client() as c:
+            response = await c.post(
+                f"{base_url}/api/admin/leads/{action['leadId']}/sms",
+                json={"message": message, "channel": "sms"},
+            )
+        response.raise_for_status()
+        return "sms sent"
+
+    return {"call": call, "sms": sms}
+
+
+# =============================================================================
+# EXECUTOR
+# =============================================================================
+
+
+class ActionExecutor:
+    """
+    Runs scheduled actions at their due time.
+
+    Args:
+        handlers: Coroutine per `actionType`; raising counts as a failed attempt
+        store: Local store (defaults to ActionStore())
+        api: Backend change feed and status updates; None to feed `schedule`/`cancel` directly
+        concurrency: Actions running at once
+        horizon: Seconds of upcoming actions kept in the wheel
+        tick: Wheel slot width in seconds (maximum firing delay)
+        sync_interval: Seconds between change-feed polls
+        backoff_base: First retry delay in seconds
+        backoff_max: Longest retry delay in seconds
+        clock: Wall clock in epoch seconds (overridable for tests)
+        sleep: Sleep function matching `clock`
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Handler],
+        store: ActionStore | None = None,
+        api: ScheduledActionsAPI | None = None,
+        concurrency: int = 8,
+        horizon: float = 900.0,
+        tick: float = 1.0,
+        sync_interval: float = 30.0,
+        backoff_base: float = 300.0,
+        backoff_max: float = 7200.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.handlers = handlers
+        self.store = store if store is not None else ActionStore()
+        self.api = api
+        self.concurrency = concurrency
+        self.horizon = horizon
+        self.sync_interval = sync_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+
+        self.wheel = TimerWheel(tick)
+        self._horizon_end = 0.0
+        self._ready: asyncio.Queue[dict] = asyncio.Queue()
+        self._running: set[str] = set()
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+        self.counts = {
+            "fired": 0, "completed": 0, "retried": 0, "failed": 0, "cancelled": 0, "synced": 0, "claimed_elsewhere": 0,
+        }
+        self.lags: deque[float] = deque(maxlen=10_000)
+        self._active = 0
+        self.peak_running = 0
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    def schedule_many(self, actions: Iterable[dict]) -> None:
+        """Add, reschedule or (if no longer pending) remove actions."""
+        rows: list[tuple[str, float, str]] = []
+        gone: list[str] = []
+        for action in actions:
+            action_id = action["id"]
+            if action_id in self._running:
+                continue  # our own status updates coming back through the feed
+            if action.get("status", "pending") != "pending":
+                self.wheel.cancel(action_id)
+                if action.get("status") == "cancelled":
+                    self.counts["cancelled"] += 1
+                gone.append(action_id)
+                continue
+            due = due_timestamp(action)
+            rows.append((action_id, due, json.dumps(action)))
+            if due < self._horizon_end:
+                self.wheel.add(action_id, due, (due, action))
+            else:
+                self.wheel.cancel(action_id)  # rescheduled past the horizon
+        if rows:
+            self.store.upsert(rows)
+        if gone:
+            self.store.delete(gone)
+        self._wake.set()
+
+    def schedule(self, action: dict) -> None:
+        self.schedule_many([action])
+
+    def cancel(self, action_id: str) -> bool:
+        """Drop an action locally (the API's cancel arrives the same way through `sync`)."""
+        found = self.wheel.cancel(action_id)
+        self.store.delete([action_id])
+        if found:
+            self.counts["cancelled"] += 1
+        return found
+
+    def _extend_horizon(self, now: float) -> None:
+        """Load actions due before now + horizon that are not in the wheel yet."""
+        end = now + self.horizon
+        if end - self._horizon_end < self.horizon / 2 and self._horizon_end > 0:
+            return
+        start = self._horizon_end if self._horizon_end > 0 else float("-inf")
+        for action_id, due, body in self.store.pending_between(start, end):
+            if action_id not in self._running:
+                self.wheel.add(action_id, due, (due, json.loads(body)))
+        self._horizon_end = end
+
+    async def sync(self) -> int:
+        """Apply changes from the API since the saved cursor; returns how many."""
+        if self.api is None:
+            return 0
+        actions, cursor = await self.api.changes(self.store.get_meta("cursor"))
+        self.schedule_many(actions)
+        if cursor:
+            self.store.set_meta("cursor", cursor)
+        self.counts["synced"] += len(actions)
+        return len(actions)
+
+    def restore(self) -> int:
+        """Reload the wheel after a restart: requeue interrupted actions and read the next horizon."""
+        interrupted = self.store.running()
+        if interrupted:
+            logger.warning(f"Re-running {len(interrupted)} actions interrupted by a restart")
+            # Claimed before the restart: the backend has them as processing
+            self.store.upsert(
+                (action_id, due, json.dumps({**json.loads(body), "status": "processing"}))
+                for action_id, due, body in interrupted
+            )
+        self._horizon_end = 0.0
+        self._extend_horizon(self._clock())
+        return len(self.wheel)
+
+    # -------------------------------------------------------------------------
+    # Running
+    # -------------------------------------------------------------------------
+
+    async def _execute(self, action: dict) -> None:
+        action_id = action["id"]
+        attempts = int(action.get("attempts") or 0) + 1
+        max_attempts = int(action.get("maxAttempts") or 3)
+        handler = self.handlers.get(action.get("actionType"))
+        try:
+            if not await self._claim(action, attempts):
+                self.counts["claimed_elsewhere"] += 1
+                self.store.delete([action_id])
+                logger.info(f"Action {action_id} was claimed elsewhere, skipping")
+                return
+            if handler is None:
+                raise RuntimeError(f"Unknown action type: {action.get('actionType')}")
+            message = await handler(action)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if attempts >= max_attempts:
+                self.counts["failed"] += 1
+                self.store.delete([action_id])
+                logger.warning(f"Action {action_id} failed after {attempts} attempts: {error}")
+                update = {"status": "failed", "processedAt": _iso(self._clock()), "error": error}
+            else:
+                self.counts["retried"] += 1
+                retry_at = self._clock() + backoff_delay(attempts, self.backoff_base, self.backoff_max)
+                retry = {**action, "status": "pending", "attempts": attempts, "scheduledFor": _iso(retry_at),
+                         "error": error}
+                retry.pop("timezone", None)
+                self._running.discard(action_id)
+                self.schedule(retry)
+                logger.info(f"Action {action_id} attempt {attempts}/{max_attempts} failed ({error}), retry at {_iso(retry_at)}")
+                update = {"status": "pending", "attempts": attempts, "scheduledFor": retry["scheduledFor"], "error": error}
+        else:
+            self.counts["completed"] += 1
+            self.store.delete([action_id])
+            logger.info(f"Action {action_id} ({action.get('actionType')}) completed: {message}")
+            update = {"status": "completed", "attempts": attempts, "processedAt": _iso(self._clock()), "error": None}
+        finally:
+            self._running.discard(action_id)
+        await self._report(action_id, update)
+
+    async def _claim(self, action: dict, attempts: int) -> bool:
+        """Claim an action on the backend before running it; False if someone else has."""
+        if self.api is None:
+            return True
+        if action.get("status") == "processing":
+            # Re-run after a restart: usually claimed by this executor before it stopped
+            if await self.api.claim(action["id"], attempts, "processing"):
+                return True
+        return await self.api.claim(action["id"], attempts, "pending")
+
+    async def _report(self, action_id: str, fields: dict) -> None:
+        if self.api is None:
+            return
+        try:
+            await self.api.update(action_id, fields)
+        except Exception as e:
+            logger.error(f"Failed to report action {action_id}: {e}")
+
+    async def _worker(self) -> None:
+        while True:
+            action = await self._ready.get()
+            self._active += 1
+            self.peak_running = max(self.peak_running, self._active)
+            try:
+                await self._execute(action)
+            finally:
+                self._active -= 1
+                self._ready.task_done()
+
+    def _fire_due(self, now: float) -> int:
+        due = self.wheel.pop_due(now)
+        if not due:
+            return 0
+        self.store.mark_running(action["id"] for _, action in due)
+        for due_at, action in due:
+            self._running.add(action["id"])
+            self.lags.append(now - due_at)
+            self._ready.put_nowait(action)
+        self.counts["fired"] += len(due)
+        return len(due)
+
+    async def run(self) -> None:
+        """Run until `stop()`: sync, keep the horizon loaded and fire due actions."""
+        self.restore()
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        next_sync = self._clock()
+        logger.info(f"Action executor started: {len(self.store)} pending, {len(self.wheel)} within {self.horizon:.0f}s")
+        try:
+            while not self._stopping:
+                now = self._clock()
+                if self.api is not None and now >= next_sync:
+                    try:
+                        await self.sync()
+                    except Exception as e:
+                        logger.error(f"Scheduled action sync failed: {e}")
+                    next_sync = now + self.sync_interval
+                self._extend_horizon(now)
+                self._fire_due(now)
+
+                wake_at = min(now + self.horizon / 2, next_sync if self.api is not None else math.inf)
+                next_due = self.wheel.next_due()
+                if next_due is not None:
+                    wake_at = min(wake_at, next_due)
+                self._wake.clear()
+                waiter = asyncio.create_task(self._wake.wait())
+                sleeper = asyncio.create_task(self._sleep(max(0.0, wake_at - now)))
+                await asyncio.wait({waiter, sleeper}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                sleeper.cancel()
+            await self._ready.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            logger.info(f"Action executor stopped: {self.metrics()}")
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+
+    def metrics(self) -> dict[str, Any]:
+        lags = sorted(self.lags)
+        return {
+            **self.counts,
+            "in_wheel": len(self.wheel),
+            "queued": self._ready.qsize(),
+            "running": self._active,
+            "peak_running": self.peak_running,
+            "lag_p50": round(lags[len(lags) // 2], 3) if lags else 0.0,
+            "lag_max": round(lags[-1], 3) if lags else 0.0,
+        }
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the scheduled actions executor")
+    parser.add_argument("--db", help="SQLite store (default $SCHEDULER_DB or ~/.cache/daily-event-insurance/scheduler.db)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--horizon", type=float, default=900.0)
+    parser.add_argument("--sync-interval", type=float, default=30.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        from dialer import LiveKitDispatcher
+        from dnc import DncSync
+
+        DncSync().start()
+        dispatcher = LiveKitDispatcher()
+        api = ScheduledActionsAPI()
+        executor = ActionExecutor(
+            backend_handlers(dispatcher),
+            store=ActionStore(args.db),
+            api=api,
+            concurrency=args.concurrency,
+            horizon=args.horizon,
+            sync_interval=args.sync_interval,
+        )
+        try:
+            await executor.run()
+        finally:
+            await api.aclose()
+            await dispatcher.aclose()
+
+    asyncio.run(main())
@@ -19,7 +19,7 @@ sudo chown $USER:$USER $APP_DIR
 
 # Copy agent files
 echo "Setting up agent files..."
-cp agent_realtime.py $APP_DIR/
+cp *.py $APP_DIR/
 cp requirements.txt $APP_DIR/
 cp .env $APP_DIR/
 
@@ -0,0 +1,456 @@
+"""
+Daily Event Insurance - Shared Cache
+Read-mostly cache of API records shared by every job process of a worker.
+
+LiveKit runs each job in its own subprocess, so a cache built inside a job
+starts cold on every call. Here the worker's main process owns the cache:
+it pages leads and scripts from the API into an immutable snapshot file in
+shared memory (/dev/shm where available) and job processes map it
+read-only. A lookup is a probe of the snapshot's open-addressing hash table
+and returns a memoryview of the record's JSON, which `models` decodes
+without an intermediate copy. Every job shares the same physical pages.
+
+Versioning: each snapshot is written to a new file and renamed into place,
+then a control file's generation counter is bumped. Readers compare the
+generation on every lookup and remap when it moves, so a job never sees a
+half-written snapshot. Invalidation is in place: the owner clears an
+entry's live flag in the current snapshot (readers miss immediately and
+fall back to the API), and the record is left out of the next snapshot.
+
+The owner exports `SHARED_CACHE_DIR` to its job processes; without it the
+reader is disabled and every lookup misses.
+
+    # worker main process, before cli.run_app
+    SharedCacheOwner().start()
+
+    # job process
+    lead = shared_cache.get_model("lead", lead_id, Lead)
+"""
+
+import asyncio
+import atexit
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+import httpx
+import msgspec
+
+from models import decode_record
+
+logger = logging.getLogger("shared-cache")
+
+_MAGIC = b"DEISHC01"
+FORMAT_VERSION = 1
+# magic, format, entry count, generation, created, slot count, slots/entries/flags offsets
+_HEADER = struct.Struct("<8sIIQdQQQQ")
+_SLOT = struct.Struct("<II")  # key hash, entry index + 1 (0 = empty)
+_ENTRY = struct.Struct("<QIIQ")  # key offset, key length, value length, value offset
+_CONTROL = struct.Struct("<8sQ")  # magic, current generation
+_GENERATION = struct.Struct("<Q")
+
+LIVE, INVALIDATED = 1, 0
+
+
+def _key(namespace: str, key: str) -> bytes:
+    return f"{namespace}\x00{key}".encode()
+
+
+def default_base_directory() -> Path:
+    """Where worker cache directories go: tmpfs when the host has one."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / "daily-event-insurance"
+    return Path(tempfile.gettempdir()) / "daily-event-insurance"
+
+
+def _snapshot_path(directory: Path, generation: int) -> Path:
+    return directory / f"snapshot-{generation:012d}.bin"
+
+
+# =============================================================================
+# SNAPSHOTS
+# =============================================================================
+
+
+def write_snapshot(path: Path, generation: int, records: dict[bytes, bytes]) -> None:
+    """
+    Write `records` (cache key -> JSON value) as a snapshot file: header,
+    hash slots (load factor <= 0.5), entry table, live flags, then keys and
+    values back to back.
+    """
+    count = len(records)
+    slot_count = 1 << max(3, (2 * count - 1).bit_length())
+    slots_offset = _HEADER.size
+    entries_offset = slots_offset + slot_count * _SLOT.size
+    flags_offset = entries_offset + count * _ENTRY.size
+    data_offset = flags_offset + count
+
+    slots = bytearray(slot_count * _SLOT.size)
+    entries = bytearray(count * _ENTRY.size)
+    data = bytearray()
+    mask = slot_count - 1
+    for index, (key, value) in enumerate(records.items()):
+        key_offset = data_offset + len(data)
+        data += key
+        value_offset = data_offset + len(data)
+        data += value
+        _ENTRY.pack_into(entries, index * _ENTRY.size, key_offset, len(key), len(value), value_offset)
+        digest = zlib.crc32(key)
+        slot = digest & mask
+        while _SLOT.unpack_from(slots, slot * _SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(slots, slot * _SLOT.size, digest, index + 1)
+
+    header = _HEADER.pack(
+        _MAGIC, FORMAT_VERSION, count, generation, time.time(),
+        slot_count, slots_offset, entries_offset, flags_offset,
+    )
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(slots)
+        f.write(entries)
+        f.write(bytes([LIVE]) * count)
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """A mapped snapshot file. `writable` is for the owner's in-place invalidations."""
+
+    def __init__(self, path: Path, writable: bool = False):
+        self.path = path
+        with open(path, "r+b" if writable else "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        (magic, version, self.count, self.generation, self.created, self._slot_count,
+         self._slots, self._entries, self._flags) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} cache snapshot: {path}")
+        self._view = memoryview(self._mmap)
+
+    def find(self, key: bytes) -> tuple[int, int, int] | None:
+        """(entry index, value offset, value length) of `key`, or None."""
+        if not self.count:
+            return None
+        mm = self._mmap
+        digest = zlib.crc32(key)
+        mask = self._slot_count - 1
+        slot = digest & mask
+        while True:
+            slot_digest, entry = _SLOT.unpack_from(mm, self._slots + slot * _SLOT.size)
+            if not entry:
+                return None
+            if slot_digest == digest:
+                key_offset, key_length, value_length, value_offset = _ENTRY.unpack_from(
+                    mm, self._entries + (entry - 1) * _ENTRY.size
+                )
+                if mm[key_offset:key_offset + key_length] == key:
+                    return entry - 1, value_offset, value_length
+            slot = (slot + 1) & mask
+
+    def get(self, key: bytes) -> memoryview | None:
+        """Zero-copy view of a live entry's value."""
+        found = self.find(key)
+        if found is None:
+            return None
+        index, offset, length = found
+        return self._view[offset:offset + length] if self._mmap[self._flags + index] == LIVE else None
+
+    def invalidate(self, key: bytes) -> bool:
+        """Clear a live entry's flag (writable snapshots only)."""
+        found = self.find(key)
+        if found is None or self._mmap[self._flags + found[0]] != LIVE:
+            return False
+        self._mmap[self._flags + found[0]] = INVALIDATED
+        return True
+
+
+# =============================================================================
+# OWNER (worker main process)
+# =============================================================================
+
+
+class SharedCacheWriter:
+    """
+    The single writer of a cache directory.
+
+    Records are staged with `put`/`replace_namespace` and become visible to
+    readers on `publish`; `invalidate` takes effect immediately.
+
+    Args:
+        directory: Cache directory (created if missing)
+        keep: Snapshot files kept for readers still switching over
+    """
+
+    def __init__(self, directory: str | os.PathLike, keep: int = 3):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self._records: dict[bytes, bytes] = {}
+        # When each key was last invalidated (monotonic), so a refresh that
+        # was fetched before the change can't put the stale record back
+        self._invalidated: dict[bytes, float] = {}
+        self._lock = threading.Lock()
+        self._snapshot: Snapshot | None = None
+
+        control = self.directory / "control"
+        if not control.exists():
+            control.write_bytes(_CONTROL.pack(_MAGIC, 0))
+        with open(control, "r+b") as f:
+            self._control = mmap.mmap(f.fileno(), _CONTROL.size)
+        self.generation = _CONTROL.unpack_from(self._control, 0)[1]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def put(self, namespace: str, key: str, value: bytes) -> None:
+        """Stage one record's JSON."""
+        with self._lock:
+            self._records[_key(namespace, key)] = value
+
+    def replace_namespace(self, namespace: str, values: dict[str, bytes], fetched_at: float | None = None) -> None:
+        """
+        Stage a full refresh of a namespace; records not in `values` are dropped.
+
+        Args:
+            namespace: Record namespace ("lead", "script")
+            values: Every record of the namespace, by key
+            fetched_at: `time.monotonic()` when the fetch of `values` began;
+                records invalidated since then are left out
+        """
+        prefix = f"{namespace}\x00".encode()
+        with self._lock:
+            changed = {
+                key for key, at in self._invalidated.items()
+                if key.startswith(prefix) and fetched_at is not None and at >= fetched_at
+            }
+            self._invalidated = {
+                key: at for key, at in self._invalidated.items() if not key.startswith(prefix) or key in changed
+            }
+            self._records = {key: value for key, value in self._records.items() if not key.startswith(prefix)}
+            self._records.update(
+                (cache_key, value) for cache_key, value in
+                ((_key(namespace, key), value) for key, value in values.items())
+                if cache_key not in changed
+            )
+
+    def invalidate(self, namespace: str, key: str) -> bool:
+        """Drop a record now; True if readers could see it."""
+        cache_key = _key(namespace, key)
+        with self._lock:
+            self._invalidated[cache_key] = time.monotonic()
+            self._records.pop(cache_key, None)
+            return self._snapshot.invalidate(cache_key) if self._snapshot is not None else False
+
+    def publish(self) -> int:
+        """Write the staged records as the next snapshot; returns its generation."""
+        with self._lock:
+            generation = self.generation + 1
+            path = _snapshot_path(self.directory, generation)
+            write_snapshot(path, generation, self._records)
+            self._snapshot = Snapshot(path, writable=True)
+            _GENERATION.pack_into(self._control, 8, generation)
+            self.generation = generation
+        for old in sorted(self.directory.glob("snapshot-*.bin"))[:-self.keep]:
+            old.unlink(missing_ok=True)
+        logger.debug(f"Published cache generation {generation} ({len(self._records)} records)")
+        return generation
+
+    def close(self, remove: bool = False) -> None:
+        self._control.close()
+        if remove:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _records(items: Iterable[dict]) -> dict[str, bytes]:
+    return {str(item["id"]): msgspec.json.encode(item) for item in items if item.get("id")}
+
+
+async def refresh(
+    writer: SharedCacheWriter,
+    api_base_url: str | None = None,
+    api_key: str | None = None,
+    statuses: tuple[str, ...] = ("new", "contacted", "qualified"),
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> int:
+    """
+    Reload leads in `statuses` and the active scripts from the API and
+    publish them; returns the record count.
+    """
+    from dialer import load_segment
+
+    base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+    api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+    fetched_at = time.monotonic()
+    leads: list[dict] = []
+    for status in statuses:
+        leads.extend(await load_segment(status=status, api_base_url=base_url, api_key=api_key, transport=transport))
+
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get(f"{base_url}/api/admin/scripts", headers=headers, timeout=10.0)
+    response.raise_for_status()
+    body = response.json()
+    scripts = body.get("data", body) if isinstance(body, dict) else body
+
+    writer.replace_namespace("lead", _records(leads), fetched_at)
+    writer.replace_namespace("script", _records(scripts), fetched_at)
+    writer.publish()
+    return len(writer)
+
+
+class SharedCacheOwner:
+    """
+    Owns a worker's cache directory and keeps it fresh from a background
+    thread in the main process.
+
+    Args:
+        interval: Seconds between full refreshes (default $SHARED_CACHE_REFRESH, else 300)
+        base_directory: Parent of the per-worker directory (default tmpfs)
+        **refresh_options: Passed to `refresh` (api_base_url, api_key, statuses, transport)
+    """
+
+    def __init__(self, interval: float | None = None, base_directory: str | os.PathLike | None = None,
+                 **refresh_options: Any):
+        self.interval = interval if interval is not None else float(os.getenv("SHARED_CACHE_REFRESH", "300"))
+        base = Path(base_directory) if base_directory else default_base_directory()
+        self.writer = SharedCacheWriter(base / f"worker-{os.getpid()}")
+        self.refresh_options = refresh_options
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def directory(self) -> Path:
+        return self.writer.directory
+
+    def refresh_now(self) -> int:
+        return asyncio.run(refresh(self.writer, **self.refresh_options))
+
+    def start(self) -> None:
+        """Publish an empty snapshot, export the directory to job processes and start refreshing."""
+        self.writer.publish()
+        os.environ["SHARED_CACHE_DIR"] = str(self.directory)
+        atexit.register(self.stop)
+        self._thread = threading.Thread(target=self._run, name="shared-cache-refresh", daemon=True)
+        self._thread.start()
+        logger.info(f"Shared cache at {self.directory}, refreshing every {self.interval:g}s")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                count = self.refresh_now()
+                logger.info(f"Shared cache refreshed: {count} records in {time.perf_counter() - started:.1f}s")
+            except Exception as e:
+                logger.warning(f"Shared cache refresh failed, keeping generation {self.writer.generation}: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.writer.close(remove=True)
+
+
+# =============================================================================
+# READER (job processes)
+# =============================================================================
+
+
+class SharedCache:
+    """
+    Read side of a worker's cache. Attaches lazily; if the directory is
+    not there (no owner, or a standalone run) every lookup misses.
+
+    Args:
+        directory: Cache directory (default $SHARED_CACHE_DIR)
+    """
+
+    # How long to wait before looking for a missing cache directory again
+    RETRY_SECONDS = 5.0
+
+    def __init__(self, directory: str | os.PathLike | None = None):
+        self._directory = directory
+        self._control: mmap.mmap | None = None
+        self._snapshot: Snapshot | None = None
+        self._retry_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.remaps = 0
+
+    def _attach(self) -> bool:
+        if self._control is not None:
+            return True
+        now = time.monotonic()
+        directory = self._directory or os.getenv("SHARED_CACHE_DIR")
+        if not directory or now < self._retry_at:
+            return False
+        try:
+            with open(Path(directory) / "control", "rb") as f:
+                self._control = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            self._retry_at = now + self.RETRY_SECONDS
+            return False
+        self._directory = directory
+        return True
+
+    def _current(self) -> Snapshot | None:
+        """The snapshot of the current generation, remapped when the owner published a new one."""
+        if not self._attach():
+            return None
+        for _ in range(3):
+            generation = _GENERATION.unpack_from(self._control, 8)[0]
+            if self._snapshot is not None and self._snapshot.generation == generation:
+                return self._snapshot
+            if not generation:
+                return None
+            try:
+                # The old mapping is released once no returned view references it
+                self._snapshot = Snapshot(_snapshot_path(Path(self._directory), generation))
+                self.remaps += 1
+                return self._snapshot
+            except FileNotFoundError:
+                continue  # superseded and pruned while we read the generation
+        return self._snapshot
+
+    def get(self, namespace: str, key: str) -> memoryview | None:
+        """The record's JSON as a view into shared memory, or None."""
+        snapshot = self._current()
+        value = snapshot.get(_key(namespace, key)) if snapshot is not None else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_model(self, namespace: str, key: str, model: Any) -> Any:
+        """The record decoded into a `models` type, or None (missing or invalid)."""
+        value = self.get(namespace, key)
+        if value is None:
+            return None
+        try:
+            return decode_record(value, model)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid cached {namespace} {key}: {e}")
+            return None
+
+    @property
+    def generation(self) -> int:
+        snapshot = self._current()
+        return snapshot.generation if snapshot is not None else 0
+
+    def metrics(self) -> dict[str, Any]:
+        return {"generation": self.generation, "hits": self.hits, "misses": self.misses, "remaps": self.remaps}
+
+
+shared_cache = SharedCache()
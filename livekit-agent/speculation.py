@@ -0,0 +1,139 @@
+"""
+Daily Event Insurance - Speculative Tool Execution
+Pre-executes side-effect-free tools as soon as their inputs are known.
+
+The realtime model spends a round trip deciding to call tools like
+`load_lead_context` or `get_recommended_script`, and then the tool itself
+has to run. When the inputs are already known - the lead ID from job
+metadata at job start, the business type once the prospect mentions it -
+the agent starts the work speculatively. When the model does call the tool
+with the same arguments, the cached (or in-flight) result is served
+immediately; anything never asked for is counted as wasted work.
+
+Only read-only tools may be speculated.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger("tool-speculation")
+
+
+def _key(tool: str, args: dict[str, Any]) -> tuple:
+    return (tool, tuple(sorted(args.items())))
+
+
+@dataclass
+class _Speculation:
+    task: asyncio.Task
+    started_at: float
+    finished_at: float | None = None
+    consumed: bool = False
+
+
+@dataclass
+class SpeculationStats:
+    """Counters for speculative execution within one call."""
+
+    launched: int = 0
+    hits: int = 0
+    misses: int = 0
+    wasted: int = 0
+    wasted_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Speculator:
+    """Cache of speculatively started tool executions, keyed by tool and arguments."""
+
+    def __init__(self):
+        self._entries: dict[tuple, _Speculation] = {}
+        self.stats = SpeculationStats()
+
+    def speculate(self, tool: str, args: dict[str, Any], factory: Callable[[], Awaitable[Any]]) -> None:
+        """Start `factory()` in the background unless the same call is already cached."""
+        key = _key(tool, args)
+        if key in self._entries:
+            return
+
+        async def _run() -> Any:
+            # Stamped before the task completes: done callbacks run a loop
+            # iteration later, after `take` may already have seen it done
+            try:
+                return await factory()
+            finally:
+                entry.finished_at = time.perf_counter()
+
+        entry = _Speculation(task=asyncio.ensure_future(_run()), started_at=time.perf_counter())
+        self._entries[key] = entry
+        self.stats.launched += 1
+        logger.info(f"Speculating {tool}({args})")
+
+    async def take(self, tool: str, args: dict[str, Any]) -> tuple[bool, Any]:
+        """
+        Return `(True, result)` if a speculative execution for this call
+        exists and succeeded (awaiting it if still in flight), otherwise
+        `(False, None)` so the caller runs the tool live.
+        """
+        entry = self._entries.get(_key(tool, args))
+        if entry is None or entry.consumed:
+            self.stats.misses += 1
+            return False, None
+
+        entry.consumed = True
+        ready = entry.task.done()
+        taken_at = time.perf_counter()
+        finished_at = entry.finished_at or taken_at
+        try:
+            result = await asyncio.shield(entry.task)
+        except Exception as e:
+            logger.warning(f"Speculative {tool} failed, running live: {e}")
+            self.stats.misses += 1
+            return False, None
+        if result is None:
+            self.stats.misses += 1
+            return False, None
+
+        self.stats.hits += 1
+        # Time the live call would have spent that already elapsed in the background
+        self.stats.saved_seconds += finished_at - entry.started_at
+        logger.info(f"Speculation hit for {tool} ({'ready' if ready else 'in flight'})")
+        return True, result
+
+    def close(self) -> SpeculationStats:
+        """Cancel unfinished speculations and account for unused ones as wasted work."""
+        now = time.perf_counter()
+        for entry in self._entries.values():
+            if entry.consumed:
+                continue
+            self.stats.wasted += 1
+            self.stats.wasted_seconds += (entry.finished_at or now) - entry.started_at
+            if not entry.task.done():
+                entry.task.cancel()
+            elif not entry.task.cancelled():
+                entry.task.exception()  # mark retrieved so asyncio doesn't warn
+        self._entries.clear()
+        return self.stats
+
+    def reset(self) -> None:
+        self.close()
+        self.stats = SpeculationStats()
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "launched": self.stats.launched,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": round(self.stats.hit_rate, 3),
+            "wasted": self.stats.wasted,
+            "wasted_seconds": round(self.stats.wasted_seconds, 4),
+            "saved_seconds": round(self.stats.saved_seconds, 4),
+        }
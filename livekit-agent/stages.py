@@ -0,0 +1,193 @@
+"""
+Daily Event Insurance - Conversation Stages
+Tracks where a sales call is and trims the instructions to that stage.
+
+The full sales prompt carries the opening, discovery, qualification,
+objection handling and close guidance on every turn, although only one
+stage is relevant at a time. `StageTracker` follows the call through
+Opening -> Discovery -> Qualification -> Next Step -> Close, driven by tool
+calls and by signals in the caller's final transcripts, and the agent's
+instructions are swapped for the `sales.<stage>` prompt whenever the stage
+changes: the full sales prompt, unchanged so it stays a cached prefix at the
+provider, followed by that stage's guidance.
+
+Tracking is deterministic and forward-only: the same transcript and tool
+calls always produce the same stages, and a stray keyword never sends the
+call back to an earlier one. If the caller raises an objection during
+opening or discovery, a note pointing the model at the objection playbook
+is appended to the current stage's prompt until the stage moves on.
+
+The sales agent doesn't use the tracker. The trimmed core below the full
+prompt is under the provider's 1024-token caching minimum, and the full
+prompt plus a stage section costs more tokens than the full prompt alone, so
+with prompt caching counted neither is faster (`python -m benchmarks.stages`).
+"""
+
+import asyncio
+import logging
+import re
+from enum import Enum
+
+from prompts import PROMPTS, SALES_OBJECTION_RAISED
+from workflow import detect_business_type
+
+logger = logging.getLogger("conversation-stages")
+
+
+class Stage(str, Enum):
+    OPENING = "opening"
+    DISCOVERY = "discovery"
+    QUALIFICATION = "qualification"
+    NEXT_STEP = "next_step"
+    CLOSE = "close"
+
+
+STAGE_ORDER = list(Stage)
+
+# Tools that show the call has reached (at least) a stage
+TOOL_STAGES = {
+    "load_lead_context": Stage.DISCOVERY,
+    "get_recommended_script": Stage.QUALIFICATION,
+    "escalate_to_specialist": Stage.NEXT_STEP,
+    "schedule_demo": Stage.CLOSE,
+    "schedule_callback": Stage.CLOSE,
+    "send_sms": Stage.CLOSE,
+    "add_to_dnc_list": Stage.CLOSE,
+    "update_disposition": Stage.CLOSE,
+}
+
+# Discovery items from the script: business type is matched with
+# workflow.detect_business_type, the rest with these patterns
+_DISCOVERY_PATTERNS = {
+    "size": re.compile(r"\b(\d[\d,]*|hundreds?|thousands?|dozens?)\b.*\b(visitors?|members?|people|customers?|locations?|a day|per day|a week|a month)\b|\b(locations?|sites?|branches)\b", re.I),
+    "insurance": re.compile(r"\b(insurance|insured|coverage|policy|liability|waivers?)\b", re.I),
+    "timeline": re.compile(r"\b(asap|soon|next (week|month|quarter|season)|this (week|month|quarter|season)|spring|summer|fall|winter|timeline|no rush)\b", re.I),
+}
+
+_READY_PATTERN = re.compile(
+    r"\b(demo|sounds good|sign (us )?up|get started|next steps?|send (me|it|that|over)|email me|"
+    r"call me (back|later)|follow[- ]up|not interested|not a fit|no thanks)\b",
+    re.I,
+)
+
+_OBJECTION_PATTERN = re.compile(
+    r"\b(already have (insurance|coverage)|won't pay|wont pay|don't have time|no time|"
+    r"what does it cost|how much|too expensive|send me (some )?info(rmation)?)\b",
+    re.I,
+)
+
+
+class StageTracker:
+    """
+    Deterministic, forward-only tracker of the sales call stage.
+
+    Args:
+        discovery_items: Discovery items (of business type, size, insurance,
+            timeline) to hear before moving to Qualification
+        max_turns: Caller turns a stage may last before moving on anyway
+            (Opening always moves on after the first caller turn)
+    """
+
+    def __init__(
+        self,
+        discovery_items: int = 2,
+        max_turns: dict[Stage, int] | None = None,
+    ):
+        self.discovery_items = discovery_items
+        self.max_turns = {Stage.DISCOVERY: 4, Stage.QUALIFICATION: 3, **(max_turns or {})}
+
+        self.stage = Stage.OPENING
+        self.history: list[tuple[Stage, str]] = [(Stage.OPENING, "start")]
+        self.heard: set[str] = set()
+        self.objection = False
+        self._turns_in_stage = 0
+
+    def advance(self, stage: Stage, reason: str) -> bool:
+        """Move forward to `stage`; never moves back. Returns True on a change."""
+        if STAGE_ORDER.index(stage) <= STAGE_ORDER.index(self.stage):
+            return False
+        logger.info(f"Stage {self.stage.value} -> {stage.value} ({reason})")
+        self.stage = stage
+        self.history.append((stage, reason))
+        self._turns_in_stage = 0
+        # The later stages' guidance already covers objections
+        self.objection = False
+        return True
+
+    def observe_tool(self, name: str) -> bool:
+        stage = TOOL_STAGES.get(name)
+        return stage is not None and self.advance(stage, f"tool {name}")
+
+    def observe_transcript(self, text: str) -> bool:
+        """Feed one final caller transcript. Returns True if the stage or prompt changed."""
+        self._turns_in_stage += 1
+        changed = False
+
+        if _OBJECTION_PATTERN.search(text) and self.stage in (Stage.OPENING, Stage.DISCOVERY) and not self.objection:
+            self.objection = True
+            changed = True
+
+        if detect_business_type(text):
+            self.heard.add("business_type")
+        for item, pattern in _DISCOVERY_PATTERNS.items():
+            if pattern.search(text):
+                self.heard.add(item)
+
+        if self.stage == Stage.OPENING:
+            changed |= self.advance(Stage.DISCOVERY, "caller responded")
+        elif self.stage == Stage.DISCOVERY:
+            if len(self.heard) >= self.discovery_items:
+                changed |= self.advance(Stage.QUALIFICATION, f"heard {', '.join(sorted(self.heard))}")
+            elif self._turns_in_stage >= self.max_turns[Stage.DISCOVERY]:
+                changed |= self.advance(Stage.QUALIFICATION, "discovery turn limit")
+        elif self.stage == Stage.QUALIFICATION:
+            if _READY_PATTERN.search(text):
+                changed |= self.advance(Stage.NEXT_STEP, "caller ready for next step")
+            elif self._turns_in_stage >= self.max_turns[Stage.QUALIFICATION]:
+                changed |= self.advance(Stage.NEXT_STEP, "qualification turn limit")
+        return changed
+
+    @property
+    def prompt_name(self) -> str:
+        return f"sales.{self.stage.value}"
+
+    def instructions(self, call_context: dict[str, str] | None = None) -> str:
+        """Instructions for the current stage, with per-call context appended."""
+        instructions = PROMPTS.render(self.prompt_name, call_context)
+        if self.objection:
+            instructions = f"{instructions}\n\n{SALES_OBJECTION_RAISED.strip()}"
+        return instructions
+
+    def attach(self, session, agent, call_context: dict[str, str] | None = None) -> None:
+        """
+        Follow `session` and update `agent`'s instructions on each change. With
+        a realtime model the caller's transcript arrives while the reply is
+        already being generated, so a new stage applies from the next reply.
+        """
+
+        def on_updated(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Failed to update stage instructions: {task.exception()}")
+
+        def apply() -> None:
+            task = asyncio.ensure_future(agent.update_instructions(self.instructions(call_context)))
+            task.add_done_callback(on_updated)
+
+        @session.on("user_input_transcribed")
+        def on_user_input_transcribed(event):
+            if event.is_final and self.observe_transcript(event.transcript):
+                apply()
+
+        @session.on("function_tools_executed")
+        def on_function_tools_executed(event):
+            changed = False
+            for call in event.function_calls:
+                changed |= self.observe_tool(call.name)
+            if changed:
+                apply()
+
+    def metrics(self) -> dict:
+        return {
+            "stage": self.stage.value,
+            "path": [f"{stage.value} ({reason})" for stage, reason in self.history],
+        }
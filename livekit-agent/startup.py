@@ -0,0 +1,210 @@
+"""
+Daily Event Insurance - Startup Profiler
+Where an agent worker's startup time goes, from process start to the first job.
+
+A deploy or an autoscale event waits for the worker to import its
+entrypoint and register with LiveKit, and then for a job process to be
+ready to take a call. Phases are marked as they happen, in each process,
+relative to the start of that process:
+
+- main process: "imported" (entrypoint module loaded), "worker registered"
+- job processes: "job process ready" (prewarm done), "job started",
+  "session ready" (the first job's session is up)
+
+Each mark is logged with its time; one past its budget in `BUDGETS_MS` is
+logged as a warning. `python startup.py imports <module>` prints the
+import-time tree of an entrypoint (from `python -X importtime`) and checks
+its import time against the budget; `python -m benchmarks.startup` does
+that for every entrypoint.
+
+    startup.mark("imported")
+
+    python startup.py imports agent --min-ms 20
+"""
+
+import argparse
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("startup")
+
+# Budgets per phase, in milliseconds since the process started
+BUDGETS_MS = {
+    "imported": 2500,
+    "worker registered": 4000,
+    "job process ready": 4000,
+    "session ready": 6000,
+}
+
+# Import budgets per entrypoint module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "agent": 2500,
+    "agent_realtime": 2500,
+    "agent_realtime_hybrid": 2500,
+    "agent_openai_only": 2500,
+    "agent_v2": 2500,
+    "agent_simple": 2500,
+    "support_agent": 2500,
+}
+
+
+def process_started_at() -> float:
+    """When this process started (epoch seconds), from /proc where available."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name, which may contain spaces
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/stat") as f:
+            boot = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, StopIteration, IndexError):
+        return _imported_at
+
+
+_imported_at = time.time()
+
+
+# =============================================================================
+# PHASES
+# =============================================================================
+
+class StartupProfile:
+    """Phase marks of this process, each recorded once."""
+
+    def __init__(self):
+        self.started_at = process_started_at()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        """Record `phase` now (first call only); returns seconds since process start."""
+        if phase in self.phases:
+            return self.phases[phase]
+        elapsed = self.phases[phase] = time.time() - self.started_at
+        budget = BUDGETS_MS.get(phase)
+        if budget is not None and elapsed * 1000 > budget:
+            logger.warning(f"Startup: {phase} at {elapsed * 1000:.0f}ms (budget {budget}ms, pid {os.getpid()})")
+        else:
+            logger.info(f"Startup: {phase} at {elapsed * 1000:.0f}ms (pid {os.getpid()})")
+        return elapsed
+
+    def worker_starting(self) -> None:
+        """Mark "imported" and watch for registration; call just before `cli.run_app`."""
+        self.mark("imported")
+        self.watch_registration()
+
+    def watch_registration(self) -> None:
+        """Mark "worker registered" when the SDK logs the worker's registration."""
+        profile = self
+
+        class _Registered(logging.Filter):
+            def filter(self, record: logging.LogRecord) -> bool:
+                if record.msg == "registered worker":
+                    profile.mark("worker registered")
+                return True
+
+        logging.getLogger("livekit.agents").addFilter(_Registered())
+
+    def over_budget(self) -> dict[str, float]:
+        return {
+            phase: elapsed for phase, elapsed in self.phases.items()
+            if phase in BUDGETS_MS and elapsed * 1000 > BUDGETS_MS[phase]
+        }
+
+
+startup = StartupProfile()
+
+
+# =============================================================================
+# IMPORT TREE
+# =============================================================================
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list["ImportNode"] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> list[ImportNode]:
+    """
+    Parse `python -X importtime` output into a tree. Lines come children
+    first, each indented two spaces deeper than its parent.
+    """
+    pending: dict[int, list[ImportNode]] = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us), pending.pop(depth + 1, []))
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def import_tree(module: str) -> list[ImportNode]:
+    """The import-time tree of importing `module` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def format_tree(roots: list[ImportNode], min_ms: float = 20.0, max_depth: int = 6) -> str:
+    """The tree as indented lines, slowest first, leaving out imports under `min_ms`."""
+    lines = []
+
+    def walk(nodes: list[ImportNode], depth: int) -> None:
+        for node in sorted(nodes, key=lambda n: n.cumulative_us, reverse=True):
+            if node.cumulative_us < min_ms * 1000:
+                break
+            lines.append(f"{node.cumulative_us / 1000:8.1f}ms {node.self_us / 1000:7.1f}ms  {'  ' * depth}{node.name}")
+            if depth + 1 < max_depth:
+                walk(node.children, depth + 1)
+
+    walk(roots, 0)
+    return "\n".join([f"{'cumul':>10} {'self':>9}  module", *lines])
+
+
+def import_seconds(module: str, runs: int = 3) -> float:
+    """Median wall time of importing `module` in a fresh interpreter (no importtime overhead)."""
+    code = f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["imports"])
+    parser.add_argument("module", help="entrypoint module, e.g. agent")
+    parser.add_argument("--min-ms", type=float, default=20.0, help="leave out imports faster than this")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=3, help="fresh imports timed for the budget check")
+    parser.add_argument("--budget-ms", type=float, default=None, help="default: IMPORT_BUDGETS_MS")
+    args = parser.parse_args()
+
+    print(format_tree(import_tree(args.module), args.min_ms, args.depth))
+    seconds = import_seconds(args.module, args.runs)
+    budget = args.budget_ms or IMPORT_BUDGETS_MS.get(args.module)
+    verdict = "" if budget is None else (" - over budget" if seconds * 1000 > budget else " - ok")
+    print(f"\nimport {args.module}: {seconds * 1000:.0f}ms (budget {budget or '-'}ms){verdict}")
+    if budget is not None and seconds * 1000 > budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
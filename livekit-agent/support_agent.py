@@ -20,89 +20,24 @@ import os
 from datetime import datetime
 from typing import Literal, Optional
 from livekit import agents
-from livekit.agents import AgentSession, Agent
-from livekit.agents.llm import function_tool, ToolContext
-from livekit.plugins import openai
+from livekit.agents import Agent, BackgroundAudioPlayer
+from livekit.agents.llm import function_tool
+
+from agent_core import ModelSettings, build_session, parse_metadata, prewarm, resolve_mode, start_worker_services
+from assets import text as asset_text
+from callerid import caller_ids
+from context_window import ContextWindow
+from fillers import filler_player, masked
+from models import Partner, PartnerIntegration, decode_response
+from prompts import PROMPTS
+from resilience import backend_guards, is_server_error
+from startup import startup
+from tts_cache import cached_frames
+from utterances import SUPPORT_GREETING, SUPPORT_VOICE
 
 logger = logging.getLogger("partner-support-agent")
 logging.basicConfig(level=logging.INFO)
 
-# =============================================================================
-# SUPPORT AGENT SYSTEM PROMPT
-# =============================================================================
-
-SUPPORT_PROMPT = """You are Alex, a Partner Success Specialist at Daily Event Insurance.
-You help EXISTING partners with technical integration, account questions, and onboarding support.
-
-## YOUR ROLE
-- You support partners who have already signed up for our embedded insurance platform
-- You help with integration setup, troubleshooting, and technical questions
-- You are NOT a sales agent - do not try to sell or upsell
-- Be helpful, patient, and technically knowledgeable
-
-## WHAT YOU CAN HELP WITH
-
-### 1. Integration Support
-- API setup and configuration
-- Webhook integration
-- Embed code placement
-- Testing and sandbox mode
-- Going live checklist
-
-### 2. Account Questions
-- Commission reports and payouts
-- Policy sales dashboard
-- User management
-- Billing inquiries
-
-### 3. Technical Troubleshooting
-- Widget not appearing
-- API errors
-- Data sync issues
-- Coverage display problems
-
-### 4. Onboarding Assistance
-- Walk through setup steps
-- Explain features
-- Best practices
-- Training resources
-
-## COMMON QUESTIONS & ANSWERS
-
-**"How do I get my API key?"**
-> "You can find your API key in the Partner Dashboard under Settings → API Access. If you don't see it,
-> you may need admin permissions. I can help you request access if needed."
-
-**"The widget isn't showing on my site"**
-> "Let's troubleshoot this together. First, can you confirm:
-> 1. The embed code is placed in your HTML, ideally before the closing </body> tag
-> 2. Your domain is whitelisted in the Partner Dashboard
-> 3. You're not in sandbox mode (unless testing)
-> What do you see when you inspect the console for errors?"
-
-**"When do I get paid?"**
-> "Commissions are processed on the 1st and 15th of each month. Payments are sent via your
-> selected method (ACH or PayPal) within 3-5 business days. You can see pending commissions
-> in your dashboard under Reports → Commission Summary."
-
-## ESCALATION TRIGGERS
-
-Transfer to a human when:
-- Billing disputes or refund requests
-- Legal or compliance questions
-- Custom enterprise integrations
-- Bug reports that need engineering
-- Partner is frustrated (3+ messages showing frustration)
-
-## TONE & STYLE
-- Friendly, patient, technically competent
-- Use clear, step-by-step instructions
-- Confirm understanding before moving on
-- Offer to stay on until issue is resolved
-- Be honest if you don't know something - offer to find out
-"""
-
-
 # =============================================================================
 # WORKFLOW STATE (module-level)
 # =============================================================================
@@ -111,6 +46,7 @@ _support_state = {
     "partner_id": None,
     "api_base_url": "http://localhost:3000",
     "api_key": "",
+    "transport": None,
 }
 
 
@@ -118,11 +54,13 @@ def init_support_workflow(
     partner_id: str | None = None,
     api_base_url: str = "http://localhost:3000",
     api_key: str = "",
+    transport=None,
 ):
     """Initialize support workflow state."""
     _support_state["partner_id"] = partner_id
     _support_state["api_base_url"] = api_base_url.rstrip("/")
     _support_state["api_key"] = api_key
+    _support_state["transport"] = transport
 
 
 def _get_headers() -> dict:
@@ -132,24 +70,29 @@ def _get_headers() -> dict:
     return headers
 
 
+def _client():
+    """Create an API client bound to the configured transport."""
+    import httpx
+
+    return httpx.AsyncClient(transport=_support_state["transport"])
+
+
+async def _request(client, method: str, endpoint: str, url: str, hedge: bool = False, **kwargs):
+    """Send an API request through the endpoint's circuit breaker (see workflow._request)."""
+    return await backend_guards.get(endpoint).call(
+        lambda: client.request(method, url, headers=_get_headers(), timeout=10.0, **kwargs),
+        hedge=hedge,
+        is_failure=is_server_error,
+    )
+
+
 # =============================================================================
 # SUPPORT FUNCTION TOOLS
 # =============================================================================
 
-@function_tool(description="Search the knowledge base for answers to partner questions.")
-async def search_knowledge_base(
-    query: str,
-    category: Literal["integration", "billing", "technical", "general"] = "general",
-) -> str:
-    """
-    Searches the partner knowledge base for relevant articles.
-
-    Args:
-        query: The question or topic to search for
-        category: Category to search within
-    """
-    knowledge = {
-        "integration": """
+# Knowledge base articles by category (precompiled into the asset bundle, see assets.py)
+KNOWLEDGE_ARTICLES = {
+    "integration": """
 Integration Documentation:
 
 1. API Setup:
@@ -172,7 +115,7 @@ Integration Documentation:
    - Set mode: 'sandbox' in widget initialization
    - Use test card: 4242 4242 4242 4242
 """,
-        "billing": """
+    "billing": """
 Billing & Payouts:
 
 1. Commission Structure:
@@ -190,7 +133,7 @@ Billing & Payouts:
    - PayPal
    - Wire (enterprise only)
 """,
-        "technical": """
+    "technical": """
 Technical Troubleshooting:
 
 1. Widget Not Loading:
@@ -205,7 +148,7 @@ Technical Troubleshooting:
    - 429: Rate limit exceeded
    - 500: Contact support
 """,
-        "general": """
+    "general": """
 Partner Quick Reference:
 
 1. Getting Started:
@@ -219,15 +162,31 @@ Partner Quick Reference:
    - Reports: Detailed analytics and exports
    - Settings: Configuration and team management
    - Support: Help center and contact
-"""
-    }
+""",
+}
+
 
-    result = knowledge.get(category, knowledge["general"])
+@function_tool(description="Search the knowledge base for answers to partner questions.")
+async def search_knowledge_base(
+    query: str,
+    category: Literal["integration", "billing", "technical", "general"] = "general",
+) -> str:
+    """
+    Searches the partner knowledge base for relevant articles.
+
+    Args:
+        query: The question or topic to search for
+        category: Category to search within
+    """
+    result = asset_text("knowledge", category)
+    if result is None:
+        result = KNOWLEDGE_ARTICLES.get(category, KNOWLEDGE_ARTICLES["general"])
     logger.info(f"Knowledge search: {query} in {category}")
     return f"Found relevant documentation:\n{result}"
 
 
 @function_tool(description="Create a support ticket for issues requiring human follow-up.")
+@masked
 async def create_support_ticket(
     subject: str,
     description: str,
@@ -244,8 +203,6 @@ async def create_support_ticket(
         category: Issue category
     """
     try:
-        import httpx
-
         payload = {
             "subject": subject,
             "description": description,
@@ -255,12 +212,13 @@ async def create_support_ticket(
             "source": "chat_agent",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with _client() as client:
+            response = await _request(
+                client,
+                "POST",
+                "create_ticket",
                 f"{_support_state['api_base_url']}/api/support/tickets",
-                headers=_get_headers(),
                 json=payload,
-                timeout=10.0,
             )
 
             if response.status_code in [200, 201]:
@@ -283,6 +241,7 @@ async def create_support_ticket(
 
 
 @function_tool(description="Transfer the conversation to a human support agent.")
+@masked
 async def transfer_to_human(
     reason: str,
     department: Literal["technical", "billing", "enterprise", "general"] = "general",
@@ -295,8 +254,6 @@ async def transfer_to_human(
         department: Which department to transfer to
     """
     try:
-        import httpx
-
         payload = {
             "partnerId": _support_state["partner_id"],
             "reason": reason,
@@ -304,12 +261,13 @@ async def transfer_to_human(
             "requestedAt": datetime.utcnow().isoformat(),
         }
 
-        async with httpx.AsyncClient() as client:
-            await client.post(
+        async with _client() as client:
+            await _request(
+                client,
+                "POST",
+                "transfer",
                 f"{_support_state['api_base_url']}/api/support/transfer",
-                headers=_get_headers(),
                 json=payload,
-                timeout=10.0,
             )
 
         logger.info(f"Transfer requested to {department}: {reason}")
@@ -321,6 +279,7 @@ async def transfer_to_human(
 
 
 @function_tool(description="Look up the partner's account details and status.")
+@masked
 async def get_partner_account() -> str:
     """Retrieves the partner's account information."""
     partner_id = _support_state["partner_id"]
@@ -329,26 +288,17 @@ async def get_partner_account() -> str:
         return "No partner ID available. Please ask them to confirm their account email or partner ID."
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        async with _client() as client:
+            response = await _request(
+                client,
+                "GET",
+                "get_partner",
                 f"{_support_state['api_base_url']}/api/partners/{partner_id}",
-                headers=_get_headers(),
-                timeout=10.0,
+                hedge=True,
             )
 
             if response.status_code == 200:
-                partner = response.json()
-                return f"""
-Partner Account Details:
-- Business: {partner.get('businessName', 'Unknown')}
-- Plan: {partner.get('plan', 'Standard')}
-- Status: {partner.get('status', 'Active')}
-- Integration: {partner.get('integrationStatus', 'Pending')}
-- Commission Rate: {partner.get('commissionRate', '15')}%
-- Total Policies Sold: {partner.get('totalPolicies', 0)}
-"""
+                return decode_response(response.content, Partner).summary
 
         return "Could not load partner account. Please verify their partner ID."
 
@@ -358,6 +308,7 @@ Partner Account Details:
 
 
 @function_tool(description="Check the status of a partner's integration setup.")
+@masked
 async def check_integration_status() -> str:
     """Returns the current status of the partner's integration."""
     partner_id = _support_state["partner_id"]
@@ -366,28 +317,17 @@ async def check_integration_status() -> str:
         return "No partner ID. Cannot check integration status."
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        async with _client() as client:
+            response = await _request(
+                client,
+                "GET",
+                "get_integration",
                 f"{_support_state['api_base_url']}/api/partners/{partner_id}/integration",
-                headers=_get_headers(),
-                timeout=10.0,
+                hedge=True,
             )
 
             if response.status_code == 200:
-                data = response.json()
-                return f"""
-Integration Status:
-- Widget Installed: {'Yes' if data.get('widgetInstalled') else 'No'}
-- API Key Generated: {'Yes' if data.get('apiKeyGenerated') else 'No'}
-- Webhooks Configured: {'Yes' if data.get('webhooksConfigured') else 'No'}
-- Domain Whitelisted: {'Yes' if data.get('domainWhitelisted') else 'No'}
-- Test Mode Completed: {'Yes' if data.get('testCompleted') else 'No'}
-- Live Mode Enabled: {'Yes' if data.get('liveEnabled') else 'No'}
-
-Last Activity: {data.get('lastActivity', 'Unknown')}
-"""
+                return decode_response(response.content, PartnerIntegration).summary
 
         return "Integration status unavailable. Let me help troubleshoot manually."
 
@@ -414,7 +354,13 @@ class SupportAgent(Agent):
     """Partner Support Agent using OpenAI Realtime API."""
 
     def __init__(self, partner_name: Optional[str] = None):
-        super().__init__(instructions=SUPPORT_PROMPT)
+        # Per-call details go after the static prompt so its prefix stays cacheable
+        super().__init__(
+            instructions=PROMPTS.render(
+                "support",
+                {"Partner": partner_name if partner_name != "there" else None},
+            )
+        )
         self.partner_name = partner_name or "there"
 
     async def on_enter(self):
@@ -425,10 +371,13 @@ class SupportAgent(Agent):
                 f"This is Alex from Daily Event Insurance Partner Support. How can I help you today?'"
             )
         else:
-            greeting = (
-                "Greet the caller warmly. Say: 'Hi! This is Alex from Daily Event Insurance "
-                "Partner Support. How can I help you today?'"
-            )
+            # The generic greeting never changes, so play cached audio when available
+            audio = cached_frames(SUPPORT_GREETING, SUPPORT_VOICE)
+            if audio is not None:
+                logger.info("Playing cached support agent greeting")
+                self.session.say(SUPPORT_GREETING, audio=audio)
+                return
+            greeting = f"Greet the caller warmly. Say: '{SUPPORT_GREETING}'"
 
         logger.info("Generating support agent greeting")
         self.session.generate_reply(instructions=greeting)
@@ -440,13 +389,15 @@ class SupportAgent(Agent):
 
 async def entrypoint(ctx: agents.JobContext):
     """Support agent entry point."""
+    startup.mark("job started")
     logger.info(f"Support agent starting for room: {ctx.room.name}")
 
     # Connect to room
     await ctx.connect()
 
     # Extract partner context from job metadata
-    room_metadata = ctx.job.metadata if ctx.job.metadata else {}
+    room_metadata = parse_metadata(ctx.job.metadata)
+    mode = resolve_mode(room_metadata)
     partner_id = room_metadata.get("partner_id")
     partner_name = room_metadata.get("partner_name", "there")
 
@@ -456,6 +407,13 @@ async def entrypoint(ctx: agents.JobContext):
     participant = await ctx.wait_for_participant()
     logger.info(f"Participant joined: {participant.identity}")
 
+    # Partners calling the support line are identified by their number
+    if not partner_id:
+        caller = caller_ids.lookup(participant.attributes.get("sip.phoneNumber"))
+        if caller is not None and caller.kind == "partner":
+            partner_id = caller.id
+            logger.info(f"Caller {caller.number} is partner {partner_id}")
+
     # Initialize the support workflow state
     init_support_workflow(
         partner_id=partner_id,
@@ -463,28 +421,48 @@ async def entrypoint(ctx: agents.JobContext):
         api_key=os.getenv("AGENT_API_KEY", ""),
     )
 
-    # Create tool context with support tools
-    tool_ctx = ToolContext(SUPPORT_TOOLS)
-
-    # Create the agent session with OpenAI Realtime
-    session = AgentSession(
-        llm=openai.realtime.RealtimeModel(
-            voice="alloy",  # Neutral, helpful voice for support
-            temperature=0.6,
-            model="gpt-4o-realtime-preview",
-        ),
-        fnc_ctx=tool_ctx,
+    # Support calls run long; keep the chat context bounded
+    context_window = ContextWindow()
+
+    # Report per-endpoint breaker state, hedge win rates, filler usage and
+    # context compaction when the call ends
+    async def log_backend_metrics():
+        logger.info(f"Backend endpoint metrics: {backend_guards.metrics()}")
+        filler_player.detach()
+        logger.info(f"Filler metrics: {filler_player.metrics()}")
+        context_window.detach()
+        logger.info(f"Context window metrics: {context_window.metrics()}")
+        logger.info(f"Caller ID metrics: {caller_ids.metrics()}")
+
+    ctx.add_shutdown_callback(log_backend_metrics)
+
+    # Create the agent session with the support tools in the selected pipeline mode
+    session = build_session(
+        mode,
+        SUPPORT_VOICE,  # Neutral, helpful voice for support
+        tools=SUPPORT_TOOLS,
+        settings=ModelSettings(temperature=0.6),
+        vad_model=ctx.proc.userdata.get("vad"),
     )
 
     # Create the support agent
     agent = SupportAgent(partner_name=partner_name)
 
+    context_window.attach(session, agent)
+
     # Start the session
     await session.start(
         room=ctx.room,
         agent=agent,
         participant=participant,
     )
+    startup.mark("session ready")
+
+    # Acknowledge slow tool calls on a separate track instead of leaving silence
+    background_audio = BackgroundAudioPlayer()
+    await background_audio.start(room=ctx.room)
+    filler_player.reset()
+    filler_player.attach(background_audio, SUPPORT_VOICE, session)
 
     logger.info("Support agent session started")
 
@@ -498,10 +476,16 @@ if __name__ == "__main__":
     print("  Daily Event Insurance - Partner Support Agent")
     print("  Alex - Partner Success Specialist")
     print("=" * 60)
+    startup.worker_starting()
+
+    # Partners calling in are identified by the caller ID index; support
+    # looks up no leads and places no calls
+    start_worker_services(shared_cache=False, dnc_sync=False)
 
     agents.cli.run_app(
         agents.WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
             agent_name="partner-support",
         ),
     )
@@ -0,0 +1,559 @@
+"""
+Daily Event Insurance - Transcript Index
+Local full-text search over call transcripts and call analysis for QA review.
+
+Calls are ingested incrementally from two places:
+
+- call communications (`log_communication`): the transcript JSON, summary
+  and disposition, read from the `/api/admin/communications` change feed
+- `voice_call_logs` rows (via Supabase): the analysis worker's call summary,
+  transcript summary, improvement items and notes, re-read for a while after
+  the call since the analysis lands after the row is created
+
+Everything goes into one SQLite file (`TRANSCRIPT_INDEX_DB`): a `calls`
+table with the filterable fields (disposition, created time, lead, sentiment)
+and an FTS5 table over transcript, summary and analysis text with the porter
+stemmer and prefix indexes. Queries take phrases and prefixes:
+
+    index = TranscriptIndex()
+    index.search('"already have insurance" cancel*', disposition="not_interested", since="2026-01-01")
+
+Run the ingestion job and searches from the command line:
+
+    python transcript_index.py sync --watch 60
+    python transcript_index.py search '"too expensive"' --disposition callback_requested
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import httpx
+
+logger = logging.getLogger("transcript-index")
+
+# Analysis for a voice_call_logs row lands minutes after the row is created
+DEFAULT_REANALYSIS_WINDOW = 3600.0
+
+
+# =============================================================================
+# DOCUMENTS
+# =============================================================================
+
+
+def transcript_text(value: Any) -> str:
+    """
+    Plain "role: text" lines from a stored transcript.
+
+    Accepts the JSON string written to `callTranscript`, a list of turns
+    (`{"role", "content" | "text"}` dicts or strings), a dict wrapping one
+    (`items`, `messages`, `turns`, `segments`), or plain text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if not stripped or stripped[0] not in "[{":
+            return stripped
+        try:
+            value = json.loads(stripped)
+        except json.JSONDecodeError:
+            return stripped
+    if isinstance(value, dict):
+        for key in ("items", "messages", "turns", "segments"):
+            if isinstance(value.get(key), list):
+                return transcript_text(value[key])
+        return str(value.get("text") or value.get("content") or "")
+    if not isinstance(value, list):
+        return str(value)
+    lines = []
+    for turn in value:
+        if isinstance(turn, str):
+            lines.append(turn)
+            continue
+        if not isinstance(turn, dict):
+            continue
+        content = turn.get("content", turn.get("text", ""))
+        if isinstance(content, list):
+            content = " ".join(part for part in content if isinstance(part, str))
+        if content:
+            role = turn.get("role") or turn.get("speaker")
+            lines.append(f"{role}: {content}" if role else str(content))
+    return "\n".join(lines)
+
+
+def _epoch(value: Any) -> float | None:
+    """Epoch seconds of an ISO timestamp or date (naive means UTC)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    when = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def from_communication(record: dict) -> dict:
+    """Index document for a `lead_communications` call record."""
+    return {
+        "id": f"comm:{record['id']}",
+        "source": "communication",
+        "lead_id": record.get("leadId"),
+        "disposition": record.get("disposition"),
+        "created": _epoch(record.get("createdAt")) or time.time(),
+        "duration": record.get("callDuration"),
+        "sentiment": _float(record.get("sentimentScore")),
+        "transcript": transcript_text(record.get("callTranscript")),
+        "summary": record.get("callSummary") or "",
+        "analysis": " ".join(filter(None, (record.get("outcome"), record.get("agentScriptUsed")))),
+    }
+
+
+def from_call_log(row: dict) -> dict:
+    """Index document for a `voice_call_logs` row."""
+    improvements = row.get("improvement_items") or []
+    if isinstance(improvements, str):
+        improvements = [improvements]
+    return {
+        "id": f"log:{row['id']}",
+        "source": "voice_call_log",
+        "lead_id": None,
+        "disposition": row.get("outcome"),
+        "created": _epoch(row.get("created_at")) or time.time(),
+        "duration": row.get("call_duration_seconds"),
+        "sentiment": _float(row.get("sentiment_score")),
+        "transcript": "",
+        "summary": "\n".join(filter(None, (row.get("call_summary"), row.get("transcript_summary")))),
+        "analysis": "\n".join(filter(None, [*improvements, row.get("notes"), row.get("sentiment_label")])),
+    }
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+_QUERY_TOKEN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def match_expression(query: str) -> str:
+    """
+    FTS5 MATCH expression for a reviewer query.
+
+    `"exact phrase"` is a phrase, `word*` a prefix, `-word` or `-"phrase"`
+    excludes, and everything else must all appear (in any field). Words are
+    quoted, so punctuation and FTS5 keywords in the query are matched as text.
+    """
+    include, exclude = [], []
+    for neg_phrase, phrase, neg_word, word in _QUERY_TOKEN.findall(query):
+        if phrase or neg_phrase:
+            terms, text, prefix = (exclude if neg_phrase else include), phrase, False
+        else:
+            terms, text = (exclude if neg_word else include), word
+            prefix = text.endswith("*")
+            text = text.rstrip("*")
+        text = text.replace('"', "").strip()
+        if not text:
+            continue
+        terms.append(f'"{text}"' + ("*" if prefix else ""))
+    if not include:
+        raise ValueError("Query needs at least one term to match")
+    expression = " AND ".join(include)
+    for term in exclude:
+        expression = f"({expression}) NOT {term}"
+    return expression
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+
+class TranscriptIndex:
+    """
+    SQLite FTS5 index over call transcripts and analysis.
+
+    `calls` rows hold the filterable fields; `calls_fts` shares their rowid.
+    Re-ingesting a call replaces its row. The `meta` table holds the sync
+    cursors.
+
+    Args:
+        path: Database file (defaults to $TRANSCRIPT_INDEX_DB), or ":memory:"
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        path = path or os.getenv("TRANSCRIPT_INDEX_DB") or (
+            Path.home() / ".cache" / "daily-event-insurance" / "transcripts.db"
+        )
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS calls (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                lead_id TEXT,
+                disposition TEXT,
+                created REAL NOT NULL,
+                duration INTEGER,
+                sentiment REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_calls_disposition_created ON calls (disposition, created);
+            CREATE INDEX IF NOT EXISTS idx_calls_created ON calls (created);
+            CREATE VIRTUAL TABLE IF NOT EXISTS calls_fts USING fts5 (
+                transcript, summary, analysis,
+                tokenize = 'porter unicode61', prefix = '2 3'
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM calls").fetchone()[0]
+
+    def upsert(self, documents: Iterable[dict]) -> int:
+        """Insert or replace documents (see `from_communication`); returns how many were written."""
+        docs = list({doc["id"]: doc for doc in documents}.values())
+        if not docs:
+            return 0
+        ids = [doc["id"] for doc in docs]
+        with self._db:
+            replaced = self._rowids(ids)
+            self._db.executemany(
+                "INSERT INTO calls (id, source, lead_id, disposition, created, duration, sentiment) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET lead_id = coalesce(excluded.lead_id, lead_id), "
+                "disposition = excluded.disposition, created = excluded.created, "
+                "duration = excluded.duration, sentiment = excluded.sentiment",
+                ((doc["id"], doc["source"], doc.get("lead_id"), doc.get("disposition"), doc["created"],
+                  doc.get("duration"), doc.get("sentiment")) for doc in docs),
+            )
+            rowids = self._rowids(ids)
+            self._db.executemany("DELETE FROM calls_fts WHERE rowid = ?", ((r,) for r in replaced.values()))
+            self._db.executemany(
+                "INSERT INTO calls_fts (rowid, transcript, summary, analysis) VALUES (?, ?, ?, ?)",
+                ((rowids[doc["id"]], doc.get("transcript", ""), doc.get("summary", ""), doc.get("analysis", ""))
+                 for doc in docs),
+            )
+        return len(docs)
+
+    def _rowids(self, call_ids: list[str], chunk: int = 500) -> dict[str, int]:
+        rowids = {}
+        for i in range(0, len(call_ids), chunk):
+            ids = call_ids[i:i + chunk]
+            rowids.update(self._db.execute(
+                f"SELECT id, rowid FROM calls WHERE id IN ({', '.join('?' * len(ids))})", ids
+            ).fetchall())
+        return rowids
+
+    def delete(self, call_ids: Iterable[str]) -> None:
+        with self._db:
+            for call_id in call_ids:
+                row = self._db.execute("DELETE FROM calls WHERE id = ? RETURNING rowid", (call_id,)).fetchone()
+                if row:
+                    self._db.execute("DELETE FROM calls_fts WHERE rowid = ?", row)
+
+    def search(
+        self,
+        query: str,
+        disposition: str | list[str] | None = None,
+        since: str | float | None = None,
+        until: str | float | None = None,
+        limit: int = 50,
+        order: str = "recent",
+    ) -> list[dict]:
+        """
+        Calls matching `query` (see `match_expression`).
+
+        Args:
+            query: Reviewer query: words, "phrases", prefix*, -excluded
+            disposition: Only calls with this disposition (or any of these)
+            since: Only calls at or after this time (ISO date/timestamp or epoch)
+            until: Only calls before this time
+            limit: Maximum results
+            order: "recent" (newest indexed first) or "relevance" (bm25)
+        """
+        where, params = ["calls_fts MATCH ?"], [match_expression(query)]
+        dispositions = [disposition] if isinstance(disposition, str) else list(disposition or [])
+        if dispositions:
+            where.append(f"c.disposition IN ({', '.join('?' * len(dispositions))})")
+            params.extend(dispositions)
+        since, until = _epoch(since), _epoch(until)
+        if since is not None:
+            where.append("c.created >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("c.created < ?")
+            params.append(until)
+        rowids = self._rowid_range(since, until)
+        if rowids:
+            where.append("calls_fts.rowid BETWEEN ? AND ?")
+            params.extend(rowids)
+        # Both orders come straight out of the FTS5 index, so the scan stops at `limit`
+        order_by = "calls_fts.rank" if order == "relevance" else "calls_fts.rowid DESC"
+        rows = self._db.execute(
+            "SELECT c.id, c.source, c.lead_id, c.disposition, c.created, c.duration, c.sentiment, "
+            "snippet(calls_fts, -1, '[', ']', '...', 12) "
+            "FROM calls_fts JOIN calls c ON c.rowid = calls_fts.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [
+            {
+                "id": call_id,
+                "source": source,
+                "leadId": lead_id,
+                "disposition": disposition,
+                "createdAt": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+                "duration": duration,
+                "sentiment": sentiment,
+                "snippet": snippet,
+            }
+            for call_id, source, lead_id, disposition, created, duration, sentiment, snippet in rows
+        ]
+
+    def _rowid_range(self, since: float | None, until: float | None) -> tuple[int, int] | None:
+        """
+        Rowid bounds of the calls inside a narrow date range, or None.
+
+        Every call in the range has a rowid between the range's min and max,
+        so FTS5 can seek straight to that stretch of its doclists instead of
+        walking back from the newest match. Finding the bounds scans the
+        range in the created index, so it is only worth it when the range is
+        a small part of the index (estimated from the overall time span).
+        """
+        if since is None and until is None:
+            return None
+        # Separate subqueries, so each is a single index seek
+        first, last = self._db.execute(
+            "SELECT (SELECT MIN(created) FROM calls), (SELECT MAX(created) FROM calls)"
+        ).fetchone()
+        if first is None:
+            return None
+        low, high = max(since or first, first), min(until or last, last)
+        if high < low:
+            return (0, -1)
+        if last > first and (high - low) / (last - first) > 0.5:
+            return None
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created < ?")
+            params.append(until)
+        lowest, highest = self._db.execute(
+            f"SELECT MIN(rowid), MAX(rowid) FROM calls INDEXED BY idx_calls_created WHERE {' AND '.join(conditions)}", params
+        ).fetchone()
+        return (lowest, highest) if lowest is not None else (0, -1)
+
+    def count(self, query: str) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM calls_fts WHERE calls_fts MATCH ?", (match_expression(query),)
+        ).fetchone()[0]
+
+    def optimize(self) -> None:
+        """Merge the FTS5 segments (worth running after a large backfill)."""
+        with self._db:
+            self._db.execute("INSERT INTO calls_fts (calls_fts) VALUES ('optimize')")
+
+    def get_meta(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# =============================================================================
+# INGESTION
+# =============================================================================
+
+
+class CommunicationsFeed:
+    """
+    `/api/admin/communications` client: call communications created after a cursor.
+
+    The cursor is the last record's `createdAt` and id ("<createdAt>|<id>"),
+    sent as `createdSince` and `afterId`: the feed is ordered by both, so
+    records that share a timestamp across a page boundary are not skipped.
+
+    Args:
+        api_base_url: API root (default API_BASE_URL)
+        api_key: Bearer token (default AGENT_API_KEY)
+        transport: Optional transport, e.g. httpx.ASGITransport(app=FakeBackend())
+        page_size: Records per request
+    """
+
+    def __init__(
+        self,
+        api_base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        page_size: int = 500,
+    ):
+        self.base_url = (api_base_url or os.getenv("API_BASE_URL", "http://localhost:3000")).rstrip("/")
+        api_key = api_key if api_key is not None else os.getenv("AGENT_API_KEY", "")
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.page_size = page_size
+        self._client = httpx.AsyncClient(transport=transport, headers=self.headers, timeout=30.0)
+
+    async def pages(self, since: str | None):
+        """Yield (records, cursor) pages of call communications after the `since` cursor, oldest first."""
+        cursor = since
+        while True:
+            params: dict[str, Any] = {"channel": "call", "pageSize": self.page_size}
+            if cursor:
+                # A bare timestamp (an older cursor) re-reads its ties, which upsert absorbs
+                params["createdSince"], _, after_id = cursor.partition("|")
+                if after_id:
+                    params["afterId"] = after_id
+            response = await self._client.get(f"{self.base_url}/api/admin/communications", params=params)
+            response.raise_for_status()
+            page = response.json().get("data", [])
+            if page and page[-1].get("createdAt"):
+                cursor = f"{page[-1]['createdAt']}|{page[-1]['id']}"
+            yield page, cursor
+            if len(page) < self.page_size:
+                return
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+async def sync_communications(index: TranscriptIndex, feed: CommunicationsFeed) -> int:
+    """Index call communications logged since the last sync; returns how many were indexed."""
+    indexed = 0
+    async for page, cursor in feed.pages(index.get_meta("communications_cursor")):
+        indexed += index.upsert(from_communication(record) for record in page)
+        if cursor:
+            index.set_meta("communications_cursor", cursor)
+    return indexed
+
+
+def sync_call_logs(
+    index: TranscriptIndex,
+    supabase=None,
+    page_size: int = 1000,
+    reanalysis_window: float = DEFAULT_REANALYSIS_WINDOW,
+) -> int:
+    """
+    Index `voice_call_logs` rows created since the last sync, re-reading the
+    last `reanalysis_window` seconds so analysis written after the row was
+    created is picked up. Returns how many rows were indexed.
+
+    Pages are read in (created_at, id) order from the last page's timestamp
+    inclusive, skipping the rows at that timestamp already read, so rows
+    that share a timestamp across a page boundary are not skipped.
+    """
+    if supabase is None:
+        url, key = os.getenv("NEXT_PUBLIC_SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        if not url or not key:
+            logger.warning("Supabase credentials not found. Skipping voice_call_logs.")
+            return 0
+        from supabase import create_client
+
+        supabase = create_client(url, key)
+
+    cursor = index.get_meta("call_logs_cursor")
+    since = None
+    if cursor:
+        since = (datetime.fromisoformat(cursor.replace("Z", "+00:00")) - timedelta(seconds=reanalysis_window)).isoformat()
+    indexed = skip = 0
+    while True:
+        query = supabase.table("voice_call_logs").select("*").order("created_at").order("id")
+        if since:
+            query = query.gte("created_at", since)
+        rows = query.range(skip, skip + page_size - 1).execute().data or []
+        indexed += index.upsert(from_call_log(row) for row in rows)
+        if rows:
+            last = rows[-1]["created_at"]
+            ties = sum(1 for row in rows if row["created_at"] == last)
+            skip = skip + ties if last == since else ties
+            since = last
+            if cursor is None or last > cursor:
+                cursor = last
+                index.set_meta("call_logs_cursor", cursor)
+        if len(rows) < page_size:
+            return indexed
+
+
+async def sync(index: TranscriptIndex, feed: CommunicationsFeed | None = None, supabase=None) -> dict[str, int]:
+    """One ingestion pass over both sources."""
+    started = time.perf_counter()
+    own_feed = feed is None
+    feed = feed or CommunicationsFeed()
+    try:
+        communications = await sync_communications(index, feed)
+    finally:
+        if own_feed:
+            await feed.aclose()
+    call_logs = await asyncio.to_thread(sync_call_logs, index, supabase)
+    logger.info(
+        f"Indexed {communications} communications and {call_logs} call logs "
+        f"in {time.perf_counter() - started:.1f}s ({len(index)} calls)"
+    )
+    return {"communications": communications, "call_logs": call_logs}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Index call transcripts and search them")
+    parser.add_argument("--db", help="index file (default $TRANSCRIPT_INDEX_DB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync_parser = commands.add_parser("sync", help="ingest new calls")
+    sync_parser.add_argument("--watch", type=float, help="keep syncing every N seconds")
+    search_parser = commands.add_parser("search", help="search indexed calls")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--disposition", action="append")
+    search_parser.add_argument("--since")
+    search_parser.add_argument("--until")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--relevance", action="store_true", help="order by bm25 instead of newest first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    index = TranscriptIndex(args.db)
+
+    if args.command == "sync":
+        async def main():
+            while True:
+                await sync(index)
+                if not args.watch:
+                    return
+                await asyncio.sleep(args.watch)
+
+        asyncio.run(main())
+    else:
+        for hit in index.search(args.query, args.disposition, args.since, args.until, args.limit,
+                                "relevance" if args.relevance else "recent"):
+            print(f"{hit['createdAt'][:19]}  {hit['disposition'] or '-':<20} {hit['id']}\n    {hit['snippet']}")
+    index.close()
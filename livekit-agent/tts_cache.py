@@ -0,0 +1,327 @@
+"""
+Daily Event Insurance - TTS Audio Cache
+Disk-backed cache of synthesized PCM audio for utterances spoken verbatim.
+
+Greetings, the voicemail message and standard closers are the same on every
+call, yet were synthesized fresh each time. Entries are keyed by
+(text, voice, TTS model, sample rate) and stored as one file per utterance:
+a 16-byte header followed by raw 16-bit little-endian PCM. Reads go through
+`mmap`, so playback starts without decoding and concurrent job processes
+share the pages. Eviction is LRU by file mtime (bumped on every hit), which
+stays correct when several processes use the same directory.
+
+Pre-populate the cache before deploying:
+
+    python tts_cache.py prepopulate
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+
+if TYPE_CHECKING:
+    from livekit import rtc
+
+logger = logging.getLogger("tts-audio-cache")
+
+DEFAULT_TTS_MODEL = "gpt-4o-mini-tts"
+OPENAI_PCM_SAMPLE_RATE = 24000
+
+_MAGIC = b"DEIPCM01"
+_HEADER = struct.Struct("<8sIHH")  # magic, sample_rate, num_channels, reserved
+_SUFFIX = ".pcm"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(text: str, voice: str, model: str, sample_rate: int) -> str:
+    """Stable key for an utterance; whitespace differences do not matter."""
+    raw = "\x00".join([_normalize(text), voice, model, str(sample_rate)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CachedAudio:
+    """A memory-mapped cached utterance, or one held in memory only (`from_pcm`)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.sample_rate, self.num_channels, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a cached audio file: {path}")
+        self.pcm = memoryview(self._mmap)[_HEADER.size:]
+
+    @classmethod
+    def from_pcm(cls, pcm: bytes, sample_rate: int, num_channels: int = 1) -> "CachedAudio":
+        """Audio that never touches the cache directory."""
+        audio = cls.__new__(cls)
+        audio.path = None
+        audio._mmap = None
+        audio.sample_rate = sample_rate
+        audio.num_channels = num_channels
+        audio.pcm = memoryview(pcm)
+        return audio
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / (2 * self.num_channels * self.sample_rate)
+
+    def frames(self, frame_ms: int = 20) -> Iterator["rtc.AudioFrame"]:
+        """Slice the mapped PCM into LiveKit audio frames."""
+        from livekit import rtc
+
+        samples_per_frame = self.sample_rate * frame_ms // 1000
+        frame_bytes = samples_per_frame * self.num_channels * 2
+        for offset in range(0, len(self.pcm), frame_bytes):
+            chunk = self.pcm[offset:offset + frame_bytes]
+            yield rtc.AudioFrame(
+                data=chunk,
+                sample_rate=self.sample_rate,
+                num_channels=self.num_channels,
+                samples_per_channel=len(chunk) // (2 * self.num_channels),
+            )
+
+    async def aframes(self, frame_ms: int = 20, sample_rate: int | None = None) -> AsyncIterator["rtc.AudioFrame"]:
+        """
+        Async frame iterator for `AgentSession.say(text, audio=...)`, optionally
+        resampled (e.g. to 48kHz for `BackgroundAudioPlayer`).
+        """
+        if sample_rate is None or sample_rate == self.sample_rate:
+            for frame in self.frames(frame_ms):
+                yield frame
+            return
+
+        from livekit import rtc
+
+        resampler = rtc.AudioResampler(self.sample_rate, sample_rate, num_channels=self.num_channels)
+        for frame in self.frames(frame_ms):
+            for resampled in resampler.push(frame):
+                yield resampled
+        for resampled in resampler.flush():
+            yield resampled
+
+
+class TTSAudioCache:
+    """
+    Directory of cached utterances with a size-bounded LRU policy.
+
+    Args:
+        directory: Cache directory (defaults to $TTS_CACHE_DIR)
+        max_bytes: Evict least-recently-used entries beyond this total size
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None, max_bytes: int | None = None):
+        self.directory = Path(
+            directory
+            or os.getenv("TTS_CACHE_DIR")
+            or Path.home() / ".cache" / "daily-event-insurance" / "tts"
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._filling: set[str] = set()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def get(
+        self,
+        text: str,
+        voice: str,
+        model: str = DEFAULT_TTS_MODEL,
+        sample_rate: int = OPENAI_PCM_SAMPLE_RATE,
+    ) -> CachedAudio | None:
+        path = self._path(cache_key(text, voice, model, sample_rate))
+        try:
+            audio = CachedAudio(path)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: most recently used has the newest mtime
+        except OSError:
+            pass
+        self.hits += 1
+        return audio
+
+    def put(
+        self,
+        text: str,
+        voice: str,
+        pcm: bytes,
+        model: str = DEFAULT_TTS_MODEL,
+        sample_rate: int = OPENAI_PCM_SAMPLE_RATE,
+        num_channels: int = 1,
+    ) -> Path:
+        """Store PCM audio atomically and evict old entries if over budget."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(cache_key(text, voice, model, sample_rate))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, sample_rate, num_channels, 0))
+                f.write(pcm)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Remove least-recently-used entries until under `max_bytes`."""
+        if not self.directory.exists():
+            return 0
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} cached utterances")
+        return removed
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        model: str = DEFAULT_TTS_MODEL,
+        store: bool = True,
+    ) -> CachedAudio:
+        """
+        Synthesize with OpenAI TTS (24kHz mono PCM), store, and return the
+        entry; with `store=False` the audio is only kept in memory.
+        """
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI()
+        response = await client.audio.speech.create(
+            model=model,
+            voice=voice,
+            input=_normalize(text),
+            response_format="pcm",
+        )
+        if not store:
+            return CachedAudio.from_pcm(response.content, OPENAI_PCM_SAMPLE_RATE)
+        self.put(text, voice, response.content, model=model, sample_rate=OPENAI_PCM_SAMPLE_RATE)
+        return self.get(text, voice, model)
+
+    async def presynthesize(
+        self,
+        text: str,
+        voice: str,
+        model: str = DEFAULT_TTS_MODEL,
+        store: bool = True,
+    ) -> CachedAudio:
+        """
+        Return the cached entry, synthesizing it first if needed. Pass
+        `store=False` for text that is never spoken again (a greeting with the
+        lead's name): it is synthesized into memory and never written to disk.
+        """
+        if not store:
+            return await self.synthesize(text, voice, model, store=False)
+        audio = self.get(text, voice, model)
+        if audio is not None:
+            return audio
+        return await self.synthesize(text, voice, model)
+
+    def fill_in_background(self, text: str, voice: str, model: str = DEFAULT_TTS_MODEL) -> None:
+        """Populate a missed entry so the next call gets it from disk."""
+        key = cache_key(text, voice, model, OPENAI_PCM_SAMPLE_RATE)
+        if key in self._filling:
+            return
+        self._filling.add(key)
+
+        async def _fill():
+            try:
+                await self.synthesize(text, voice, model)
+            except Exception as e:
+                logger.warning(f"Could not cache utterance: {e}")
+            finally:
+                self._filling.discard(key)
+
+        asyncio.ensure_future(_fill())
+
+
+# Shared by the agents in this worker
+audio_cache = TTSAudioCache()
+
+
+def cached_frames(
+    text: str,
+    voice: str,
+    model: str = DEFAULT_TTS_MODEL,
+    fill_on_miss: bool = True,
+) -> AsyncIterator["rtc.AudioFrame"] | None:
+    """
+    Frames for `session.say(text, audio=...)` if the utterance is cached,
+    otherwise None (and optionally start filling the cache for next time).
+    """
+    audio = audio_cache.get(text, voice, model)
+    if audio is not None:
+        return audio.aframes()
+    if fill_on_miss:
+        audio_cache.fill_in_background(text, voice, model)
+    return None
+
+
+async def prepopulate(model: str = DEFAULT_TTS_MODEL, force: bool = False) -> None:
+    """Synthesize every fixed utterance that is not cached yet."""
+    from utterances import FIXED_UTTERANCES
+
+    for text, voice in FIXED_UTTERANCES:
+        if not force and audio_cache.get(text, voice, model) is not None:
+            logger.info(f"Cached: [{voice}] {text[:50]}")
+            continue
+        audio = await audio_cache.synthesize(text, voice, model)
+        logger.info(f"Synthesized {audio.duration:.1f}s: [{voice}] {text[:50]}")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Manage the TTS audio cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pre = sub.add_parser("prepopulate", help="Synthesize all fixed utterances")
+    pre.add_argument("--model", default=DEFAULT_TTS_MODEL)
+    pre.add_argument("--force", action="store_true", help="Re-synthesize cached entries")
+    sub.add_parser("evict", help="Apply the LRU size limit now")
+    args = parser.parse_args()
+
+    if args.command == "prepopulate":
+        asyncio.run(prepopulate(args.model, args.force))
+    elif args.command == "evict":
+        audio_cache.evict()
@@ -22,6 +22,10 @@ cd livekit-agent
 echo "Updating dependencies..."
 pip install -r requirements.txt --upgrade
 
+# Precompile prompts, scripts and tool schemas
+echo "Building asset bundle..."
+python assets.py build
+
 # Restart the service
 echo "Restarting voice agent service..."
 sudo systemctl restart voice-agent
@@ -0,0 +1,87 @@
+"""
+Daily Event Insurance - Fixed Utterances
+Lines the agents speak word-for-word on every call.
+
+Keeping them in one place lets the TTS audio cache pre-synthesize exactly
+the text the agents will say, in the voice each agent uses.
+"""
+
+# Voices used by each agent (see the RealtimeModel / TTS configuration)
+SALES_VOICE = "coral"
+SUPPORT_VOICE = "alloy"
+HYBRID_VOICE = "nova"
+
+HYBRID_GREETING = (
+    "Hello! Welcome to Daily Event Insurance. "
+    "I'm your insurance specialist. How can I help you today?"
+)
+
+SUPPORT_GREETING = (
+    "Hi! This is Alex from Daily Event Insurance Partner Support. "
+    "How can I help you today?"
+)
+
+VOICEMAIL_MESSAGE = (
+    "Hi, this is Sarah from Daily Event Insurance. "
+    "I'm following up on your recent inquiry about offering insurance coverage to your members. "
+    "We help gyms and fitness businesses earn extra revenue by offering same-day coverage. "
+    "Please give us a call back at your convenience, or reply to our email. "
+    "Thanks, and have a great day!"
+)
+
+OUTBOUND_GREETING = (
+    "Hi, this is Sarah calling from Daily Event Insurance. We help gyms, climbing facilities, "
+    "and rental businesses offer same-day insurance to their members. I'm following up on an "
+    "inquiry we received. Do you have a quick moment?"
+)
+
+INBOUND_GREETING = "Thank you for calling Daily Event Insurance! This is Sarah. How can I help you today?"
+
+
+def sales_greeting(call_direction: str, lead_name: str = "there", business_name: str = "your business") -> str:
+    """
+    The sales agent's opening line. Fully determined by job metadata, so it
+    can be synthesized while an outbound call is still ringing.
+    """
+    if call_direction != "outbound":
+        return INBOUND_GREETING
+    if lead_name == "there":
+        return OUTBOUND_GREETING
+    return (
+        f"Hi {lead_name}, this is Sarah calling from Daily Event Insurance. You recently "
+        f"submitted an inquiry about offering insurance coverage at {business_name}. "
+        f"Do you have a quick moment?"
+    )
+
+
+SALES_CLOSER = "Thank you for your time today. Have a great day!"
+SUPPORT_CLOSER = "Thanks for reaching out to Partner Support. Have a great day!"
+
+# Short acknowledgements played while a slow tool call runs (see fillers.py)
+FILLER_LOOKUP = "One sec, let me pull that up."
+FILLER_CHECKING = "Just a moment while I check on that."
+FILLER_SCHEDULING = "Okay, let me get that on the calendar."
+FILLER_SENDING = "Sure, sending that over now."
+FILLER_CONNECTING = "Okay, one moment while I connect you."
+FILLER_GENERIC = "Bear with me for just a second."
+
+FILLER_CLIPS = [
+    FILLER_LOOKUP,
+    FILLER_CHECKING,
+    FILLER_SCHEDULING,
+    FILLER_SENDING,
+    FILLER_CONNECTING,
+    FILLER_GENERIC,
+]
+
+# (text, voice) pairs pre-synthesized by `python tts_cache.py prepopulate`
+FIXED_UTTERANCES = [
+    (HYBRID_GREETING, HYBRID_VOICE),
+    (SUPPORT_GREETING, SUPPORT_VOICE),
+    (OUTBOUND_GREETING, SALES_VOICE),
+    (INBOUND_GREETING, SALES_VOICE),
+    (VOICEMAIL_MESSAGE, SALES_VOICE),
+    (SALES_CLOSER, SALES_VOICE),
+    (SUPPORT_CLOSER, SUPPORT_VOICE),
+    *[(text, voice) for voice in (SALES_VOICE, SUPPORT_VOICE) for text in FILLER_CLIPS],
+]
@@ -0,0 +1,125 @@
+"""
+Daily Event Insurance - Session Warm-up
+Opens and configures the realtime model connection while the phone rings.
+
+Constructing the realtime session only after `ctx.wait_for_participant()`
+returned meant the websocket handshake and the session configuration
+(instructions, tools, voice, turn detection) happened while the callee was
+already saying "hello?". `start_before_answer` starts the `AgentSession` -
+which connects and configures the realtime model in the background -
+concurrently with waiting for the participant and for the SIP call to be
+answered. Input audio is held off until pickup so ringback never reaches the
+model's turn detection, and agents await `CallAnswer.wait()` in `on_enter`
+before greeting.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from livekit import rtc
+from livekit.agents import Agent, AgentSession, JobContext
+
+from startup import startup
+
+logger = logging.getLogger("session-warmup")
+
+
+class CallAnswer:
+    """Resolves when the callee answers (True) or the call ends unanswered (False)."""
+
+    def __init__(self):
+        self._answered: asyncio.Future[bool] = asyncio.get_event_loop().create_future()
+        self.answered_at: float | None = None
+        self.first_audio_at: float | None = None
+
+    def resolve(self, answered: bool) -> None:
+        if self._answered.done():
+            return
+        if answered:
+            self.answered_at = time.perf_counter()
+        self._answered.set_result(answered)
+
+    async def wait(self) -> bool:
+        return await asyncio.shield(self._answered)
+
+    def track_first_audio(self, session: AgentSession, describe: Callable[[], str] = lambda: "live") -> None:
+        """Log pickup-to-first-audio latency the first time the agent speaks."""
+
+        @session.on("agent_state_changed")
+        def on_agent_state_changed(event):
+            if event.new_state != "speaking" or self.answered_at is None or self.first_audio_at is not None:
+                return
+            self.first_audio_at = time.perf_counter()
+            latency_ms = (self.first_audio_at - self.answered_at) * 1000
+            logger.info(f"Pickup-to-first-audio: {latency_ms:.0f}ms ({describe()})")
+
+
+async def wait_for_pickup(ctx: JobContext, participant: rtc.RemoteParticipant) -> bool:
+    """
+    Wait until a SIP callee answers. The SIP participant joins the room as
+    soon as dialing starts, so ring time is spent before this returns.
+    Returns False if the call ended without being answered.
+    """
+    status = participant.attributes.get("sip.callStatus")
+    if participant.kind != rtc.ParticipantKind.PARTICIPANT_KIND_SIP or status in (None, "active"):
+        return True
+    if status == "hangup":
+        return False
+
+    answered: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def on_attributes_changed(changed: dict, p: rtc.Participant):
+        if p.identity != participant.identity or answered.done():
+            return
+        status = p.attributes.get("sip.callStatus")
+        if status in ("active", "hangup"):
+            answered.set_result(status == "active")
+
+    def on_disconnected(p: rtc.RemoteParticipant):
+        if p.identity == participant.identity and not answered.done():
+            answered.set_result(False)
+
+    ctx.room.on("participant_attributes_changed", on_attributes_changed)
+    ctx.room.on("participant_disconnected", on_disconnected)
+    try:
+        return await answered
+    finally:
+        ctx.room.off("participant_attributes_changed", on_attributes_changed)
+        ctx.room.off("participant_disconnected", on_disconnected)
+
+
+async def start_before_answer(
+    ctx: JobContext,
+    session: AgentSession,
+    agent: Agent,
+    answer: CallAnswer,
+) -> rtc.RemoteParticipant | None:
+    """
+    Start `session` while waiting for the participant and the pickup.
+
+    Returns the participant once the call is answered, or None (after
+    closing the session) if it never was.
+    """
+    participant_task = asyncio.ensure_future(ctx.wait_for_participant())
+
+    started_at = time.perf_counter()
+    await session.start(room=ctx.room, agent=agent)
+    startup.mark("session ready")
+    session.input.set_audio_enabled(False)
+    logger.info(f"Agent session started before answer in {(time.perf_counter() - started_at) * 1000:.0f}ms")
+
+    participant = await participant_task
+    logger.info(f"Participant joined: {participant.identity}")
+
+    answered = await wait_for_pickup(ctx, participant)
+    answer.resolve(answered)
+    if not answered:
+        logger.info("Call ended before it was answered")
+        await session.aclose()
+        return None
+
+    session.input.set_audio_enabled(True)
+    logger.info(f"Call answered {(answer.answered_at - started_at) * 1000:.0f}ms after session start")
+    return participant
@@ -0,0 +1,263 @@
+"""
+Daily Event Insurance - Wire Format
+Compact msgpack + zstd encoding for communication and transcript uploads.
+
+Communication payloads carry the whole call transcript, and as JSON every
+turn repeats its field names and the transcript is escaped into a string.
+The compact encoding:
+
+- replaces known field names with small integers from a versioned table
+  (`FIELDS`; append only, so old decoders keep working)
+- keeps the transcript as structured turns instead of a JSON string, packed
+  as a table: each distinct set of turn fields once, then positional rows
+- packs with msgpack and compresses with zstd above `MIN_COMPRESS` bytes
+
+It is negotiated per API host. A backend that accepts it lists
+`COMPACT_TYPE` in an `Accept-Post` response header; uploads switch to it
+after the first such response, and fall back to JSON (remembered for the
+host) if it is ever rejected with 415 or 400. `AGENT_WIRE_FORMAT` picks the
+mode: "auto" (default), "json" (never compact) or "msgpack" (try it first).
+Without the msgpack and zstandard packages everything stays JSON.
+
+    body, headers = encode(payload, compact=negotiator.compact(url))
+    payload = decode(body, content_type, content_encoding)
+"""
+
+import json
+import logging
+import os
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("wire-format")
+
+JSON_TYPE = "application/json"
+COMPACT_TYPE = "application/msgpack"
+ZSTD = "zstd"
+
+# Payloads smaller than this are sent uncompressed (zstd framing would not pay off)
+MIN_COMPRESS = 256
+ZSTD_LEVEL = 3
+
+# Interned field names, version 1. Append only: a field's id is its position.
+FIELDS = (
+    # lead_communications
+    "channel", "direction", "callDuration", "callRecordingUrl", "callTranscript", "callSummary",
+    "smsContent", "smsStatus", "disposition", "nextFollowUpAt", "agentId", "agentScriptUsed",
+    "agentConfidenceScore", "sentimentScore", "outcome", "livekitRoomId", "livekitSessionId",
+    # transcript turns (workflow.log_conversation_segment, analyze_sentiment, chat items)
+    "speaker", "text", "timestamp", "type", "sentiment", "score", "indicators", "role", "content",
+    # lead updates
+    "status", "statusReason", "leadId", "id", "createdAt",
+)
+FIELDS_VERSION = 1
+_FIELD_IDS = {name: i for i, name in enumerate(FIELDS)}
+
+# Fields the JSON API takes as a JSON string but the compact form keeps structured
+STRUCTURED_STRING_FIELDS = ("callTranscript",)
+
+
+class UnsupportedMediaType(ValueError):
+    """The body's content type or encoding can't be decoded here."""
+
+
+def compact_available() -> bool:
+    """True when msgpack and zstandard are installed."""
+    return _codec() is not None
+
+
+_codecs: tuple | None | bool = False
+
+
+def _codec():
+    """(msgpack, compressor, decompressor), or None without the packages."""
+    global _codecs
+    if _codecs is False:
+        try:
+            import msgpack
+            import zstandard
+        except ImportError:
+            _codecs = None
+        else:
+            _codecs = (msgpack, zstandard.ZstdCompressor(level=ZSTD_LEVEL), zstandard.ZstdDecompressor())
+    return _codecs
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+
+# Reserved keys marking a list of records packed as a table
+_TABLE_SHAPES, _TABLE_ROWS = -1, -2
+
+
+def _intern(payload: Any) -> Any:
+    """
+    Field ids for the top-level keys, and lists of records (transcript turns)
+    as a table: each distinct key set once, then one positional row per
+    record. Cheaper than renaming every key of every turn, and smaller.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    return {_FIELD_IDS.get(key, key): _table(value) for key, value in payload.items()}
+
+
+def _table(value: Any) -> Any:
+    if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value):
+        return value
+    shapes: dict[tuple, int] = {}
+    rows = []
+    for item in value:
+        shape = shapes.setdefault(tuple(item), len(shapes))
+        rows.append([shape, *item.values()])
+    return {
+        _TABLE_SHAPES: [[_FIELD_IDS.get(key, key) for key in shape] for shape in shapes],
+        _TABLE_ROWS: rows,
+    }
+
+
+def _expand(payload: Any) -> Any:
+    if not isinstance(payload, dict):
+        return payload
+    return {(FIELDS[key] if isinstance(key, int) else key): _untable(value) for key, value in payload.items()}
+
+
+def _untable(value: Any) -> Any:
+    if not isinstance(value, dict) or _TABLE_SHAPES not in value:
+        return value
+    shapes = [[FIELDS[key] if isinstance(key, int) else key for key in shape] for shape in value[_TABLE_SHAPES]]
+    return [dict(zip(shapes[row[0]], row[1:])) for row in value[_TABLE_ROWS]]
+
+
+def _json_ready(payload: Any) -> Any:
+    """Structured transcript fields as the JSON strings the API expects."""
+    if not isinstance(payload, dict) or not any(
+        not isinstance(payload.get(name), (str, type(None))) for name in STRUCTURED_STRING_FIELDS
+    ):
+        return payload
+    return {
+        key: json.dumps(value) if key in STRUCTURED_STRING_FIELDS and not isinstance(value, (str, type(None)))
+        else value
+        for key, value in payload.items()
+    }
+
+
+def encode(payload: Any, compact: bool = False) -> tuple[bytes, dict[str, str]]:
+    """
+    Body and content headers for an upload.
+
+    Structured `callTranscript` values are sent as-is in the compact form
+    and as a JSON string otherwise.
+    """
+    codec = _codec() if compact else None
+    if codec is None:
+        return json.dumps(_json_ready(payload)).encode(), {"Content-Type": JSON_TYPE}
+    msgpack, compressor, _ = codec
+    if isinstance(payload, dict):
+        payload = {
+            key: _structured(value) if key in STRUCTURED_STRING_FIELDS else value for key, value in payload.items()
+        }
+    body = msgpack.packb([FIELDS_VERSION, _intern(payload)], use_bin_type=True)
+    headers = {"Content-Type": COMPACT_TYPE}
+    if len(body) >= MIN_COMPRESS:
+        body = compressor.compress(body)
+        headers["Content-Encoding"] = ZSTD
+    return body, headers
+
+
+def _structured(value: Any) -> Any:
+    """A JSON-string transcript as data, so its field names can be interned."""
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def decode(body: bytes, content_type: str | None = None, content_encoding: str | None = None) -> Any:
+    """
+    Payload of a request body in either format (empty body: None).
+
+    Structured transcript fields come back as JSON strings, matching what a
+    JSON upload would have stored.
+
+    Raises:
+        UnsupportedMediaType: Unknown content type or encoding, or compact
+            without the msgpack/zstandard packages
+        ValueError: Malformed body
+    """
+    media_type = (content_type or JSON_TYPE).split(";")[0].strip().lower()
+    encoding = (content_encoding or "").strip().lower()
+    if media_type == JSON_TYPE and not encoding:
+        return json.loads(body) if body else None
+    if media_type != COMPACT_TYPE or encoding not in ("", ZSTD):
+        raise UnsupportedMediaType(f"Unsupported body: {media_type} {encoding}".strip())
+    codec = _codec()
+    if codec is None:
+        raise UnsupportedMediaType("Compact bodies need the msgpack and zstandard packages")
+    msgpack, _, decompressor = codec
+    if not body:
+        return None
+    try:
+        if encoding == ZSTD:
+            body = decompressor.decompress(body)
+        version, payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise ValueError(f"Malformed compact body: {e}") from e
+    if version > FIELDS_VERSION:
+        raise UnsupportedMediaType(f"Field table version {version} is newer than {FIELDS_VERSION}")
+    return _json_ready(_expand(payload))
+
+
+# =============================================================================
+# NEGOTIATION
+# =============================================================================
+
+
+class WireNegotiator:
+    """
+    Per-host choice between JSON and the compact encoding.
+
+    Args:
+        mode: "auto", "json" or "msgpack" (default $AGENT_WIRE_FORMAT, else "auto")
+    """
+
+    def __init__(self, mode: str | None = None):
+        self.mode = (mode or os.getenv("AGENT_WIRE_FORMAT", "auto")).lower()
+        self._hosts: dict[str, bool] = {}
+
+    @staticmethod
+    def _host(url: str | httpx.URL) -> str:
+        url = httpx.URL(str(url))
+        return f"{url.scheme}://{url.netloc.decode()}"
+
+    def compact(self, url: str | httpx.URL) -> bool:
+        """Whether uploads to `url`'s host should use the compact encoding."""
+        if self.mode == "json" or not compact_available():
+            return False
+        return self._hosts.get(self._host(url), self.mode == "msgpack")
+
+    def observe(self, response: httpx.Response) -> None:
+        """Note a host that advertises the compact encoding in `Accept-Post`."""
+        accepted = response.headers.get("accept-post")
+        if accepted and COMPACT_TYPE in accepted:
+            host = self._host(response.request.url)
+            if host not in self._hosts:
+                logger.info(f"{host} accepts {COMPACT_TYPE} uploads")
+            self._hosts.setdefault(host, True)
+
+    def reject(self, url: str | httpx.URL) -> None:
+        """Stop sending compact bodies to `url`'s host."""
+        host = self._host(url)
+        if self._hosts.get(host) is not False:
+            logger.warning(f"{host} rejected {COMPACT_TYPE}; falling back to JSON")
+        self._hosts[host] = False
+
+    def reset(self) -> None:
+        self._hosts.clear()
+
+
+negotiator = WireNegotiator()
@@ -6,12 +6,27 @@ Updated for LiveKit Agents SDK v1.x with @function_tool decorator.
 """
 
 import logging
-import os
+import re
 import httpx
 from datetime import datetime
 from typing import Literal
+from livekit.agents import RunContext
 from livekit.agents.llm import function_tool
 
+from assets import text as asset_text
+from commission import project
+from dnc import DncIndex, dnc_index
+from fillers import masked
+from funnel import funnel
+from models import Lead, Script, decode_response
+from resilience import backend_guards, is_server_error
+from shared_cache import shared_cache
+from speculation import Speculator
+from tts_cache import cached_frames
+from utterances import SALES_VOICE, VOICEMAIL_MESSAGE
+from wire import encode as encode_body
+from wire import negotiator as wire_negotiator
+
 logger = logging.getLogger("partnership-workflow")
 
 # =============================================================================
@@ -22,24 +37,50 @@ _workflow_state = {
     "lead_id": None,
     "api_base_url": "http://localhost:3000",
     "api_key": "",
-    "lead_context": {},
+    "lead_context": None,
     "call_transcript": [],
     "call_start_time": datetime.utcnow(),
+    "transport": None,
+    "dnc": dnc_index,
+    # Funnel dimensions (see funnel.py): the script from the job metadata,
+    # else the recommended talking points; the business type if the lead has none
+    "script_id": None,
+    "recommended_script": None,
+    "business_type": None,
 }
 
+# Speculative results for read-only tools, reset per call
+speculator = Speculator()
+
 
 def init_workflow(
     lead_id: str | None = None,
     api_base_url: str = "http://localhost:3000",
     api_key: str = "",
+    transport: httpx.AsyncBaseTransport | None = None,
+    script_id: str | None = None,
+    dnc: DncIndex | None = None,
 ):
-    """Initialize workflow state for a new call."""
+    """Initialize workflow state for a new call.
+
+    `transport` lets tests and benchmarks route requests to an in-process
+    app such as `fake_backend.FakeBackend` via `httpx.ASGITransport`;
+    `dnc` keeps their DNC additions off the host's index (see dnc.py).
+    `script_id` is the agent script the call was placed with, if any.
+    """
     _workflow_state["lead_id"] = lead_id
     _workflow_state["api_base_url"] = api_base_url.rstrip("/")
     _workflow_state["api_key"] = api_key
-    _workflow_state["lead_context"] = {}
+    _workflow_state["transport"] = transport
+    _workflow_state["dnc"] = dnc if dnc is not None else dnc_index
+    speculator.reset()
+    _workflow_state["lead_context"] = None
     _workflow_state["call_transcript"] = []
     _workflow_state["call_start_time"] = datetime.utcnow()
+    _workflow_state["script_id"] = script_id
+    _workflow_state["recommended_script"] = None
+    _workflow_state["business_type"] = None
+    funnel.configure(api_base_url, api_key, transport)
 
 
 def _get_headers() -> dict:
@@ -50,11 +91,134 @@ def _get_headers() -> dict:
     return headers
 
 
+def _client() -> httpx.AsyncClient:
+    """Create an API client bound to the configured transport."""
+    return httpx.AsyncClient(transport=_workflow_state["transport"])
+
+
+async def _request(
+    client: httpx.AsyncClient,
+    method: str,
+    endpoint: str,
+    url: str,
+    hedge: bool = False,
+    headers: dict | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send an API request through the endpoint's circuit breaker.
+
+    Raises resilience.CircuitOpenError immediately while the endpoint is
+    failing, so tools fall back without waiting out the timeout. Only
+    idempotent reads should pass `hedge=True`.
+    """
+    response = await backend_guards.get(endpoint).call(
+        lambda: client.request(method, url, headers={**_get_headers(), **(headers or {})}, timeout=10.0, **kwargs),
+        hedge=hedge,
+        is_failure=is_server_error,
+    )
+    wire_negotiator.observe(response)
+    return response
+
+
+async def _upload(client: httpx.AsyncClient, endpoint: str, url: str, payload: dict) -> httpx.Response:
+    """
+    POST a payload in the wire format negotiated for the host (see wire.py),
+    resending it as JSON if the compact body is rejected.
+    """
+    compact = wire_negotiator.compact(url)
+    body, headers = encode_body(payload, compact=compact)
+    response = await _request(client, "POST", endpoint, url, headers=headers, content=body)
+    if compact and response.status_code in (400, 415):
+        wire_negotiator.reject(url)
+        body, headers = encode_body(payload)
+        response = await _request(client, "POST", endpoint, url, headers=headers, content=body)
+    return response
+
+
 # =============================================================================
 # FUNCTION TOOLS
 # =============================================================================
 
+async def _fetch_lead(lead_id: str) -> Lead | None:
+    """
+    Fetch a lead record, or None if it could not be loaded. Served from the
+    worker's shared cache (see shared_cache.py) when the lead is in it.
+    """
+    lead = shared_cache.get_model("lead", lead_id, Lead)
+    if lead is not None:
+        return lead
+
+    async with _client() as client:
+        response = await _request(
+            client,
+            "GET",
+            "get_lead",
+            f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}",
+            hedge=True,
+        )
+
+    if response.status_code != 200:
+        logger.warning(f"Failed to load lead: {response.status_code}")
+        return None
+
+    try:
+        return decode_response(response.content, Lead)
+    except ValueError as e:
+        logger.warning(f"Invalid lead payload: {e}")
+        return None
+
+
+async def _fetch_script(script_id: str) -> Script | None:
+    """The agent script the call was placed with, from the shared cache or the API."""
+    script = shared_cache.get_model("script", script_id, Script)
+    if script is not None:
+        return script
+
+    async with _client() as client:
+        response = await _request(
+            client,
+            "GET",
+            "get_script",
+            f"{_workflow_state['api_base_url']}/api/admin/scripts/{script_id}",
+        )
+
+    if response.status_code != 200:
+        logger.warning(f"Failed to load script: {response.status_code}")
+        return None
+
+    try:
+        return decode_response(response.content, Script)
+    except ValueError as e:
+        logger.warning(f"Invalid script payload: {e}")
+        return None
+
+
+def _funnel_dimensions() -> dict[str, str | None]:
+    """The script and business type this call's dispositions and sentiment are counted under."""
+    lead = _workflow_state["lead_context"]
+    return {
+        "script": _workflow_state["script_id"] or _workflow_state["recommended_script"],
+        "business_type": (lead.business_type if lead is not None else None) or _workflow_state["business_type"],
+    }
+
+
+async def _block_number(lead_id: str) -> None:
+    """
+    Put the lead's number on the DNC index (the host's unless `init_workflow`
+    was given one, see dnc.py) right away, before the backend hears about
+    it: other lead records and campaigns may share the number.
+    """
+    try:
+        lead = _workflow_state["lead_context"] or await _fetch_lead(lead_id)
+        if lead is not None and lead.phone:
+            _workflow_state["dnc"].add(lead.phone)
+    except Exception as e:
+        logger.error(f"Could not add lead {lead_id} to the local DNC index: {e}")
+
+
 @function_tool(description="Load the lead's information from the database to personalize the conversation.")
+@masked
 async def load_lead_context() -> str:
     """
     Fetches lead information including name, business, history.
@@ -65,35 +229,19 @@ async def load_lead_context() -> str:
         return "No lead ID provided. This appears to be an inbound call without lead context."
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}",
-                headers=_get_headers(),
-                timeout=10.0,
-            )
-
-            if response.status_code == 200:
-                _workflow_state["lead_context"] = response.json()
-                lead = _workflow_state["lead_context"]
-
-                return f"""Lead Information:
-- Name: {lead.get('firstName', '')} {lead.get('lastName', '')}
-- Business: {lead.get('businessName', 'Unknown')} ({lead.get('businessType', 'Unknown type')})
-- Email: {lead.get('email', '')}
-- Phone: {lead.get('phone', '')}
-- Location: {lead.get('city', '')}, {lead.get('state', '')}
-- Interest Level: {lead.get('interestLevel', 'cold')}
-- Status: {lead.get('status', 'new')}
-- Source: {lead.get('source', 'Unknown')}
-- Estimated Daily Visitors: {lead.get('estimatedParticipants', 'Unknown')}"""
-            else:
-                logger.warning(f"Failed to load lead: {response.status_code}")
-                return "Could not load lead information. Proceed with discovery questions."
-
+        hit, lead = await speculator.take("load_lead_context", {"lead_id": lead_id})
+        if not hit:
+            lead = await _fetch_lead(lead_id)
     except Exception as e:
         logger.error(f"Error loading lead context: {e}")
         return "Could not load lead information. Proceed with discovery questions."
 
+    if lead is None:
+        return "Could not load lead information. Proceed with discovery questions."
+
+    _workflow_state["lead_context"] = lead
+    return lead.summary
+
 
 @function_tool(description="Update the lead's status and call disposition after the conversation.")
 async def update_disposition(
@@ -120,6 +268,8 @@ async def update_disposition(
         notes: Brief summary of the conversation and key points discussed
         next_action: Recommended next action, e.g., 'Schedule demo for Tuesday'
     """
+    funnel.record_disposition(disposition, **_funnel_dimensions())
+
     lead_id = _workflow_state["lead_id"]
     if not lead_id:
         logger.info(f"Disposition (no lead): {disposition} - {notes}")
@@ -138,6 +288,9 @@ async def update_disposition(
         "do_not_call": "dnc",
     }
 
+    if disposition == "do_not_call":
+        await _block_number(lead_id)
+
     try:
         call_duration = int((datetime.utcnow() - _workflow_state["call_start_time"]).total_seconds())
 
@@ -149,25 +302,28 @@ async def update_disposition(
             "callSummary": notes,
             "agentId": "sarah-voice-agent",
         }
+        if _workflow_state["call_transcript"]:
+            comm_payload["callTranscript"] = _workflow_state["call_transcript"]
 
-        async with httpx.AsyncClient() as client:
+        async with _client() as client:
             status_payload = {
                 "status": status_map.get(disposition, "contacted"),
                 "statusReason": notes[:500] if notes else None,
             }
 
-            await client.patch(
+            await _request(
+                client,
+                "PATCH",
+                "update_lead",
                 f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}",
-                headers=_get_headers(),
                 json=status_payload,
-                timeout=10.0,
             )
 
-            await client.post(
+            await _upload(
+                client,
+                "log_communication",
                 f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}/communications",
-                headers=_get_headers(),
-                json=comm_payload,
-                timeout=10.0,
+                comm_payload,
             )
 
         logger.info(f"Updated lead {lead_id}: {disposition}")
@@ -179,6 +335,7 @@ async def update_disposition(
 
 
 @function_tool(description="Schedule a callback for a specific date/time when the prospect requests one.")
+@masked
 async def schedule_callback(
     callback_date: str,
     callback_time: str,
@@ -206,12 +363,13 @@ async def schedule_callback(
                 "timezone": timezone,
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            async with _client() as client:
+                response = await _request(
+                    client,
+                    "POST",
+                    "schedule",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}/schedule",
-                    headers=_get_headers(),
                     json=payload,
-                    timeout=10.0,
                 )
 
                 if response.status_code in [200, 201]:
@@ -227,6 +385,7 @@ async def schedule_callback(
 
 
 @function_tool(description="Schedule a product demo when the prospect is ready to see the platform.")
+@masked
 async def schedule_demo(
     demo_date: str,
     demo_time: str,
@@ -257,19 +416,21 @@ async def schedule_demo(
         }
 
         if lead_id:
-            async with httpx.AsyncClient() as client:
-                await client.patch(
+            async with _client() as client:
+                await _request(
+                    client,
+                    "PATCH",
+                    "update_lead",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}",
-                    headers=_get_headers(),
                     json={"status": "demo_scheduled"},
-                    timeout=10.0,
                 )
 
-                await client.post(
+                await _request(
+                    client,
+                    "POST",
+                    "schedule",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}/schedule",
-                    headers=_get_headers(),
                     json=payload,
-                    timeout=10.0,
                 )
 
         logger.info(f"Demo scheduled: {demo_date} {demo_time} for {attendee_name} at {business_name}")
@@ -281,6 +442,7 @@ async def schedule_demo(
 
 
 @function_tool(description="Send an SMS message to the prospect, such as a follow-up link or information.")
+@masked
 async def send_sms(
     message: str,
     include_info_link: bool = False,
@@ -293,7 +455,7 @@ async def send_sms(
         include_info_link: Whether to include a link to partner information
     """
     lead_context = _workflow_state["lead_context"]
-    phone = lead_context.get("phone") if lead_context else None
+    phone = lead_context.phone if lead_context is not None else None
     lead_id = _workflow_state["lead_id"]
 
     if not phone and not lead_id:
@@ -310,12 +472,13 @@ async def send_sms(
         }
 
         if lead_id:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            async with _client() as client:
+                response = await _request(
+                    client,
+                    "POST",
+                    "send_sms",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}/sms",
-                    headers=_get_headers(),
                     json=payload,
-                    timeout=10.0,
                 )
 
                 if response.status_code in [200, 201]:
@@ -331,6 +494,7 @@ async def send_sms(
 
 
 @function_tool(description="Escalate to a licensed insurance specialist when the prospect has technical insurance questions.")
+@masked
 async def escalate_to_specialist(
     reason: str,
     urgency: Literal["low", "medium", "high"] = "medium",
@@ -351,12 +515,13 @@ async def escalate_to_specialist(
                 "urgency": urgency,
             }
 
-            async with httpx.AsyncClient() as client:
-                await client.post(
+            async with _client() as client:
+                await _request(
+                    client,
+                    "POST",
+                    "escalate",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}/escalate",
-                    headers=_get_headers(),
                     json=payload,
-                    timeout=10.0,
                 )
 
         logger.info(f"Escalation created: {reason} (urgency: {urgency})")
@@ -371,6 +536,7 @@ async def escalate_to_specialist(
 
 @function_tool(description="Handle when you detect that a voicemail system has answered instead of a person.")
 async def handle_voicemail(
+    context: RunContext,
     leave_message: bool = True,
 ) -> str:
     """
@@ -380,13 +546,6 @@ async def handle_voicemail(
         leave_message: Whether to leave a voicemail message
     """
     if leave_message:
-        voicemail_script = """
-        Hi, this is Sarah from Daily Event Insurance.
-        I'm following up on your recent inquiry about offering insurance coverage to your members.
-        We help gyms and fitness businesses earn extra revenue by offering same-day coverage.
-        Please give us a call back at your convenience, or reply to our email.
-        Thanks, and have a great day!
-        """
         logger.info(f"Leaving voicemail for lead {_workflow_state['lead_id']}")
 
         if _workflow_state["lead_id"]:
@@ -395,7 +554,13 @@ async def handle_voicemail(
                 notes="Voicemail detected. Left standard follow-up message.",
             )
 
-        return f"Voicemail detected. Leave this message: {voicemail_script.strip()}"
+        # The message is fixed, so play pre-synthesized audio when it is cached
+        audio = cached_frames(VOICEMAIL_MESSAGE, SALES_VOICE)
+        if audio is not None:
+            context.session.say(VOICEMAIL_MESSAGE, audio=audio, allow_interruptions=False)
+            return "Voicemail detected. The standard message is now playing - do not say anything else."
+
+        return f"Voicemail detected. Leave this message: {VOICEMAIL_MESSAGE}"
     else:
         if _workflow_state["lead_id"]:
             await update_disposition(
@@ -429,6 +594,7 @@ def analyze_sentiment(
 
     score = sentiment_scores.get(sentiment, 0.0)
     logger.info(f"Sentiment analysis: {sentiment} ({score}) - {indicators}")
+    funnel.record_sentiment(sentiment, **_funnel_dimensions())
 
     _workflow_state["call_transcript"].append({
         "type": "sentiment",
@@ -444,54 +610,53 @@ def analyze_sentiment(
     return f"Sentiment recorded: {sentiment}. Continue with empathy and active listening."
 
 
-@function_tool(description="Get the recommended script based on lead's business type and interest level.")
-def get_recommended_script(
-    business_type: Literal["gym", "climbing", "rental", "adventure", "other"],
-    interest_level: Literal["hot", "warm", "cold"],
-) -> str:
-    """
-    Returns talking points customized for the business type and interest level.
+# Talking points per business type and approach per interest level, for
+# get_recommended_script (precompiled into the asset bundle, see assets.py)
+BUSINESS_VALUE_PROPS = {
+    "gym": {
+        "main_value": "day-pass and drop-in coverage for non-members",
+        "pain_point": "liability exposure from daily visitors",
+        "revenue_example": "Partners with 50+ daily visitors typically earn $500-1500/month in commissions",
+    },
+    "climbing": {
+        "main_value": "first-timer and visitor accident protection",
+        "pain_point": "high-risk activity liability concerns",
+        "revenue_example": "Climbing gyms see 60-70% opt-in rates due to perceived risk",
+    },
+    "rental": {
+        "main_value": "equipment damage and injury coverage bundled",
+        "pain_point": "equipment damage disputes and liability claims",
+        "revenue_example": "Rental shops reduce damage disputes by 80% with our coverage",
+    },
+    "adventure": {
+        "main_value": "high-risk activity coverage on demand",
+        "pain_point": "finding affordable coverage for adventure activities",
+        "revenue_example": "Adventure operators see the highest opt-in rates at 75%+",
+    },
+    "other": {
+        "main_value": "flexible same-day coverage for your participants",
+        "pain_point": "liability exposure and participant safety",
+        "revenue_example": "Partners typically earn 15-25% commission on every policy",
+    },
+}
 
-    Args:
-        business_type: The type of business
-        interest_level: How interested they seem
-    """
-    business_value_props = {
-        "gym": {
-            "main_value": "day-pass and drop-in coverage for non-members",
-            "pain_point": "liability exposure from daily visitors",
-            "revenue_example": "Partners with 50+ daily visitors typically earn $500-1500/month in commissions",
-        },
-        "climbing": {
-            "main_value": "first-timer and visitor accident protection",
-            "pain_point": "high-risk activity liability concerns",
-            "revenue_example": "Climbing gyms see 60-70% opt-in rates due to perceived risk",
-        },
-        "rental": {
-            "main_value": "equipment damage and injury coverage bundled",
-            "pain_point": "equipment damage disputes and liability claims",
-            "revenue_example": "Rental shops reduce damage disputes by 80% with our coverage",
-        },
-        "adventure": {
-            "main_value": "high-risk activity coverage on demand",
-            "pain_point": "finding affordable coverage for adventure activities",
-            "revenue_example": "Adventure operators see the highest opt-in rates at 75%+",
-        },
-        "other": {
-            "main_value": "flexible same-day coverage for your participants",
-            "pain_point": "liability exposure and participant safety",
-            "revenue_example": "Partners typically earn 15-25% commission on every policy",
-        },
-    }
+INTEREST_APPROACHES = {
+    "hot": "Move quickly to demo/proposal. They're ready to buy.",
+    "warm": "Focus on specific benefits. Answer questions thoroughly.",
+    "cold": "Start with rapport building. Understand their pain points first.",
+}
 
-    interest_approaches = {
-        "hot": "Move quickly to demo/proposal. They're ready to buy.",
-        "warm": "Focus on specific benefits. Answer questions thoroughly.",
-        "cold": "Start with rapport building. Understand their pain points first.",
-    }
 
-    props = business_value_props.get(business_type, business_value_props["other"])
-    approach = interest_approaches.get(interest_level, interest_approaches["warm"])
+def _recommended_script(business_type: str, interest_level: str) -> str:
+    """Talking points for a business type and interest level, precompiled when bundled."""
+    script = asset_text("recommended_scripts", f"{business_type}/{interest_level}")
+    return script if script is not None else render_recommended_script(business_type, interest_level)
+
+
+def render_recommended_script(business_type: str, interest_level: str) -> str:
+    """Build the talking points for a business type and interest level."""
+    props = BUSINESS_VALUE_PROPS.get(business_type, BUSINESS_VALUE_PROPS["other"])
+    approach = INTEREST_APPROACHES.get(interest_level, INTEREST_APPROACHES["warm"])
 
     return f"""
 RECOMMENDED APPROACH for {business_type.upper()} ({interest_level} lead):
@@ -510,6 +675,64 @@ Quick Objection Handlers:
 """
 
 
+@function_tool(description="Get the recommended script based on lead's business type and interest level.")
+@masked
+async def get_recommended_script(
+    business_type: Literal["gym", "climbing", "rental", "adventure", "other"],
+    interest_level: Literal["hot", "warm", "cold"],
+) -> str:
+    """
+    Returns talking points customized for the business type and interest level,
+    followed by the call's script closing filled in for the lead (with their
+    projected commission) when the call was placed with a script.
+
+    Args:
+        business_type: The type of business
+        interest_level: How interested they seem
+    """
+    _workflow_state["recommended_script"] = f"recommended-{business_type}-{interest_level}"
+    _workflow_state["business_type"] = business_type
+    hit, script = await speculator.take(
+        "get_recommended_script",
+        {"business_type": business_type, "interest_level": interest_level},
+    )
+    if not hit:
+        script = _recommended_script(business_type, interest_level)
+
+    script_id = _workflow_state["script_id"]
+    lead = _workflow_state["lead_context"]
+    if script_id and lead is not None:
+        try:
+            agent_script = await _fetch_script(script_id)
+        except Exception as e:
+            logger.warning(f"Could not load script {script_id}: {e}")
+            agent_script = None
+        closing = agent_script.closing_for(lead) if agent_script is not None else None
+        if closing:
+            script += f"\nClosing:\n\"{closing}\"\n"
+    return script
+
+
+@function_tool(description="Calculate a partner's exact monthly and annual commission from their participants and locations.")
+def calculate_partner_earnings(
+    monthly_participants: int,
+    locations: int = 1,
+) -> str:
+    """
+    Projects commission at the partner tiers with the multi-location bonus.
+
+    Args:
+        monthly_participants: Participants per month at each location
+        locations: Number of locations
+    """
+    try:
+        projection = project(monthly_participants, locations)
+    except ValueError as e:
+        return f"Can't project earnings: {e}"
+    logger.info(f"Earnings projection: {monthly_participants} x {locations} -> ${projection.monthly:,.0f}/month")
+    return projection.summary
+
+
 @function_tool(description="Add the prospect to the Do Not Call list when they explicitly request it.")
 async def add_to_dnc_list(
     reason: str = "Requested removal",
@@ -523,17 +746,19 @@ async def add_to_dnc_list(
     try:
         lead_id = _workflow_state["lead_id"]
         if lead_id:
+            await _block_number(lead_id)
             payload = {
                 "status": "dnc",
                 "statusReason": f"DNC requested: {reason}",
             }
 
-            async with httpx.AsyncClient() as client:
-                await client.patch(
+            async with _client() as client:
+                await _request(
+                    client,
+                    "PATCH",
+                    "update_lead",
                     f"{_workflow_state['api_base_url']}/api/admin/leads/{lead_id}",
-                    headers=_get_headers(),
                     json=payload,
-                    timeout=10.0,
                 )
 
         logger.info(f"DNC added for lead {lead_id}: {reason}")
@@ -564,6 +789,51 @@ def log_transcript_segment(
     return "Logged."
 
 
+# =============================================================================
+# SPECULATION
+# =============================================================================
+
+_BUSINESS_TYPE_PATTERNS = {
+    "climbing": re.compile(r"\b(climbing|bouldering|boulder gym|crag)\b", re.I),
+    "gym": re.compile(r"\b(gym|fitness|crossfit|yoga|pilates|studio)\b", re.I),
+    "rental": re.compile(r"\b(rental|rentals|rent out|renting)\b", re.I),
+    "adventure": re.compile(r"\b(adventure|rafting|zipline|zip line|kayak\w*|paddle\w*|tours?)\b", re.I),
+}
+
+
+def detect_business_type(text: str) -> str | None:
+    """Map a transcript snippet to a get_recommended_script business type."""
+    for business_type, pattern in _BUSINESS_TYPE_PATTERNS.items():
+        if pattern.search(text):
+            return business_type
+    return None
+
+
+def speculate_lead_context() -> None:
+    """Start fetching the lead as soon as the lead ID is known (job start)."""
+    lead_id = _workflow_state["lead_id"]
+    if lead_id:
+        speculator.speculate("load_lead_context", {"lead_id": lead_id}, lambda: _fetch_lead(lead_id))
+
+
+def speculate_recommended_script(business_type: str) -> None:
+    """
+    Precompute talking points once the prospect mentions their business type.
+    Only when the lead's interest level is known: the model picks the level
+    itself otherwise, and guessing all three wastes two builds per call.
+    """
+    lead = _workflow_state["lead_context"]
+    interest_level = lead.interest_level if lead is not None else None
+    if interest_level not in ("hot", "warm", "cold"):
+        return
+    args = {"business_type": business_type, "interest_level": interest_level}
+
+    async def build() -> str:
+        return _recommended_script(**args)
+
+    speculator.speculate("get_recommended_script", args, build)
+
+
 # =============================================================================
 # TOOL COLLECTION
 # =============================================================================
@@ -579,6 +849,7 @@ ALL_TOOLS = [
     handle_voicemail,
     analyze_sentiment,
     get_recommended_script,
+    calculate_partner_earnings,
     add_to_dnc_list,
     log_transcript_segment,
 ]